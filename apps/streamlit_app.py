@@ -96,6 +96,23 @@ def call_api_prediction(resume_text: str, job_text: str):
         st.error(f"Erro ao conectar com API: {e}")
         return None
 
+def call_api_batch_prediction(resume_texts: dict, job_text: str):
+    """Chama a API Flask uma única vez para todos os currículos ({id: texto})"""
+    try:
+        payload = {
+            "candidates": {cand_id: {"cv_pt": text} for cand_id, text in resume_texts.items()},
+            "vacancy": {"5186": {"infos_basicas": {"titulo_vaga": job_text}}}
+        }
+        response = requests.post(f"{API_URL}/predict/batch", json=payload, timeout=60)
+        if response.status_code == 200:
+            return {item['candidate_id']: item['score'] for item in response.json().get('results', [])}
+        else:
+            st.error(f"Erro na API: {response.status_code}")
+            return {}
+    except Exception as e:
+        st.error(f"Erro ao conectar com API: {e}")
+        return {}
+
 # Sidebar Inputs
 st.sidebar.header("Configuração")
 job_file = st.sidebar.file_uploader("Descrição da Vaga (.docx)", type=["docx"], key=job_key)
@@ -150,14 +167,22 @@ if st.session_state.avaliar:
                     requisitos.append(m2.group(1).strip())
             total_req = len(requisitos)
 
-            results = []
-            for pdf in candidate_files:
+            resume_texts = {}
+            for idx, pdf in enumerate(candidate_files):
                 resume_text = extract_pdf(pdf)
                 if not resume_text.strip() or not job_text.strip():
                     st.warning(f"Arquivo '{pdf.name}' ou descrição da vaga está vazia. Não foi possível avaliar este currículo.")
                     continue
-                # Chama a API Flask para gerar métricas de inferência
-                api_result = call_api_prediction(resume_text, job_text)
+                resume_texts[str(idx)] = resume_text
+
+            # Uma única chamada à API Flask para todos os currículos
+            api_scores = call_api_batch_prediction(resume_texts, job_text) if resume_texts else {}
+
+            results = []
+            for idx, pdf in enumerate(candidate_files):
+                if str(idx) not in resume_texts:
+                    continue
+                resume_text = resume_texts[str(idx)]
                 # Continua com lógica original para interface
                 resume_text_lower = resume_text.lower()
                 matched_count = 0
@@ -176,9 +201,8 @@ if st.session_state.avaliar:
                     'details': matched_details
                 }
                 # Adiciona predição da API se disponível
-                if api_result:
-                    result_data['api_prediction'] = api_result.get('prediction', 'N/A')
-                    result_data['api_probabilities'] = api_result.get('probabilities', [])
+                if str(idx) in api_scores:
+                    result_data['api_prediction'] = api_scores[str(idx)]
                 results.append(result_data)
             
             # Ordena todos os resultados por score (maior para menor)
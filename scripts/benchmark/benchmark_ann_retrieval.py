@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark de recuperação de candidatos: IVF (ANN) x força bruta
+===============================================================
+
+Gera embeddings sintéticos agrupados (como vetores de documento de CVs de
+áreas parecidas), monta o `IVFIndex` e mede, para vários valores de
+`n_probe`, a latência por consulta e o recall@k em relação à busca exata.
+
+Uso:
+    python scripts/benchmark/benchmark_ann_retrieval.py --candidates 200000 --k 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.matching import unit_rows
+from src.models.retrieval import IVFIndex, brute_force_search
+
+
+def synthetic_embeddings(n_rows: int, dim: int, n_clusters: int, noise: float,
+                         rng: np.random.Generator) -> np.ndarray:
+    """Vetores unitários em torno de `n_clusters` tópicos."""
+    topics = rng.normal(size=(n_clusters, dim))
+    labels = rng.integers(n_clusters, size=n_rows)
+    return unit_rows((topics[labels] + rng.normal(scale=noise, size=(n_rows, dim))).astype(np.float32))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Recall x latência do índice IVF contra força bruta')
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=200, help='Dimensão do embedding de recuperação')
+    parser.add_argument('--clusters', type=int, default=300)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=200, help='Tamanho da shortlist')
+    parser.add_argument('--n-probe', type=int, nargs='+', default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument('--noise', type=float, default=1.0, help='Dispersão em torno de cada tópico')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = synthetic_embeddings(args.candidates, args.dim, args.clusters, args.noise, rng)
+    queries = synthetic_embeddings(args.queries, args.dim, args.clusters, args.noise, rng)
+    ids = [str(i) for i in range(args.candidates)]
+
+    start = time.perf_counter()
+    index = IVFIndex(seed=args.seed)
+    index.build(ids, vectors)
+    build_seconds = time.perf_counter() - start
+    print(f"{args.candidates} candidatos, dim {args.dim}: {len(index.centroids)} listas, "
+          f"build em {build_seconds:.2f}s")
+
+    start = time.perf_counter()
+    exact = [set(brute_force_search(vectors, query, args.k)[0].tolist()) for query in queries]
+    brute_ms = (time.perf_counter() - start) / args.queries * 1000
+    print(f"{'método':<16}{'ms/consulta':>12}{'recall@' + str(args.k):>14}")
+    print(f"{'força bruta':<16}{brute_ms:>12.2f}{1.0:>14.3f}")
+
+    for n_probe in args.n_probe:
+        start = time.perf_counter()
+        found = [index.search(query, args.k, n_probe=n_probe)[0] for query in queries]
+        ivf_ms = (time.perf_counter() - start) / args.queries * 1000
+        recall = np.mean([
+            len(truth & {int(i) for i in result}) / len(truth) for truth, result in zip(exact, found)
+        ])
+        print(f"{'IVF n_probe=' + str(n_probe):<16}{ivf_ms:>12.2f}{recall:>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark da predição: XGBRegressor.predict x NativePredictor x TreeEnsemble
+============================================================================
+
+Mede a latência de uma linha e de lotes do modelo de produção
+(`artifacts/model.joblib`) pelos quatro caminhos:
+
+- `model.predict(DataFrame)`: caminho com DataFrame do `_prepare_data`;
+- `model.predict(ndarray)`: caminho rápido/micro-batching antes do booster nativo;
+- `NativePredictor.predict(ndarray)`: `Booster.inplace_predict` sobre float32,
+  carregado do booster exportado em UBJSON;
+- `TreeEnsemble.predict(ndarray)`: árvores avaliadas em NumPy (backend 'numpy').
+
+Verifica que os quatro retornam exatamente os mesmos scores antes de medir.
+
+Uso:
+    python scripts/benchmark/benchmark_native_predict.py --batch-sizes 1 64 1024
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.native_model import NativePredictor, export_booster
+from src.models.tree_ensemble import TreeEnsemble
+
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Mediana da latência em microssegundos."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return float(np.median(tempos)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Latência de XGBRegressor.predict x NativePredictor x TreeEnsemble')
+    parser.add_argument('--model', default=os.path.join(PROJECT_ROOT, 'artifacts', 'model.joblib'))
+    parser.add_argument('--artifacts', default=os.path.join(PROJECT_ROOT, 'artifacts', 'preprocessing_artifacts.joblib'))
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 16, 256, 4096])
+    parser.add_argument('--repeticoes', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    features = joblib.load(args.artifacts)['model_features']
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        predictor = NativePredictor.load(export_booster(model, os.path.join(tmp_dir, 'model.ubj'), features))
+    ensemble = TreeEnsemble.from_booster(model, features)
+
+    rng = np.random.default_rng(args.seed)
+    dados = rng.normal(scale=2.0, size=(max(args.batch_sizes), len(features)))
+
+    df = pd.DataFrame(dados, columns=features)
+    esperado = model.predict(df)
+    assert np.array_equal(model.predict(dados), esperado)
+    assert np.array_equal(predictor.predict(dados), esperado)
+    assert np.array_equal(ensemble.predict(dados), esperado)
+    print(f"Paridade OK ({len(dados)} linhas x {len(features)} features)")
+
+    print(f"{'linhas':>8}{'predict(DataFrame) µs':>24}{'predict(ndarray) µs':>22}"
+          f"{'inplace_predict µs':>21}{'numpy µs':>12}{'speedup':>10}")
+    for n in args.batch_sizes:
+        lote = dados[:n]
+        lote_df = df.iloc[:n]
+        lote_f32 = np.ascontiguousarray(lote, dtype=np.float32)
+        repeticoes = max(5, args.repeticoes // max(1, n // 256))
+        com_df = medir(lambda: model.predict(lote_df), repeticoes)
+        com_array = medir(lambda: model.predict(lote), repeticoes)
+        nativo = medir(lambda: predictor.predict(lote_f32), repeticoes)
+        em_numpy = medir(lambda: ensemble.predict(lote_f32), repeticoes)
+        print(f"{n:>8}{com_df:>24.1f}{com_array:>22.1f}{nativo:>21.1f}{em_numpy:>12.1f}"
+              f"{com_array / nativo:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
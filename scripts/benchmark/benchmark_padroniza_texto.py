@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark da padronização de texto: implementação em três passadas x passada única
+==================================================================================
+
+Compara `utils.padroniza_texto` com a implementação anterior (lower/strip,
+`unicodedata.normalize` por célula e `re.sub` por célula) em colunas
+sintéticas com o perfil das bases de treino: CVs longos com acentos e campos
+curtos muito repetidos (`nivel_academico`, `areas_atuacao`). Verifica a
+paridade célula a célula antes de medir.
+
+Uso:
+    python scripts/benchmark/benchmark_padroniza_texto.py --rows 20000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models import utils
+
+
+PALAVRAS = [
+    'Análise', 'de', 'dados', 'experiência', 'gestão', 'projetos', 'Python', 'SQL', 'ção',
+    'Técnico', 'São', 'Paulo', 'informática', 'configuração', 'negócios', 'ﬁnanceiro', '—',
+    'C++', 'Node.js', 'e-mail:', 'R$', '100%', 'Sênior', 'Júnior', 'coordenação', 'ÁREA'
+]
+NIVEIS = ['Ensino Superior Completo', 'Pós Graduação Completo', 'Ensino Médio Completo', 'Mestrado Incompleto']
+AREAS = ['TI - Desenvolvimento/Programação', 'Administrativa', 'Gestão e Alocação de Recursos de TI']
+
+
+def padroniza_texto_tres_passadas(df: pd.DataFrame, features_list) -> None:
+    """Implementação anterior de `utils.padroniza_texto` (referência de paridade)."""
+    for feature in features_list:
+        df[feature] = df[feature].str.lower().str.strip()
+        df[feature] = df[feature].apply(
+            lambda x: unicodedata.normalize('NFKD', str(x)).encode('ascii', 'ignore').decode('utf-8'))
+        df[feature] = df[feature].apply(lambda x: re.sub(r'[^a-zA-Z0-9\s]', '', str(x)))
+
+
+def dados_sinteticos(n_rows: int, palavras_por_cv: int, rng: np.random.Generator) -> pd.DataFrame:
+    cvs = [' '.join(rng.choice(PALAVRAS, palavras_por_cv)) for _ in range(n_rows)]
+    cvs[::50] = [None] * len(cvs[::50])
+    return pd.DataFrame({
+        'cv_pt': cvs,
+        'nivel_academico': rng.choice(NIVEIS, n_rows),
+        'areas_atuacao': rng.choice(AREAS, n_rows)
+    })
+
+
+def medir(funcao, df: pd.DataFrame, colunas) -> float:
+    copia = df.copy()
+    inicio = time.perf_counter()
+    funcao(copia, colunas)
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Paridade e speedup de utils.padroniza_texto')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--palavras-por-cv', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    df = dados_sinteticos(args.rows, args.palavras_por_cv, rng)
+
+    for coluna in df.columns:
+        esperado, obtido = df[[coluna]].copy(), df[[coluna]].copy()
+        padroniza_texto_tres_passadas(esperado, [coluna])
+        utils.padroniza_texto(obtido, [coluna])
+        assert esperado[coluna].tolist() == obtido[coluna].tolist(), f"Divergência na coluna {coluna}"
+    print(f"Paridade OK ({args.rows} linhas x {len(df.columns)} colunas)")
+
+    print(f"{'coluna':<18}{'três passadas (s)':>20}{'passada única (s)':>20}{'speedup':>10}")
+    for coluna in df.columns:
+        antes = medir(padroniza_texto_tres_passadas, df, [coluna])
+        depois = medir(utils.padroniza_texto, df, [coluna])
+        print(f"{coluna:<18}{antes:>20.3f}{depois:>20.3f}{antes / depois:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Configuração do gunicorn para servir a API em produção
+
+    gunicorn -c src/app/gunicorn_conf.py src.app.wsgi:app
+
+- `preload_app`: o master importa a aplicação uma única vez (PredictionService,
+  booster do XGBoost, matriz do Word2Vec, store de candidatos) antes do fork;
+  os workers compartilham essas páginas copy-on-write.
+- `gc.freeze()` no master move os objetos carregados para a geração
+  permanente, de forma que o coletor dos workers não os percorra (e não suje
+  as páginas compartilhadas).
+- Métricas do Prometheus em modo multiprocesso: cada worker grava em
+  `PROMETHEUS_MULTIPROC_DIR` e `/metrics` agrega todos os arquivos.
+- Drift: cada worker publica as contagens dos seus histogramas em
+  `DRIFT_SHARED_DIR` e os checks de PSI/JS somam as de todos os workers.
+
+Variáveis de ambiente: PORT, WEB_CONCURRENCY (workers), GUNICORN_THREADS,
+GUNICORN_TIMEOUT, PROMETHEUS_MULTIPROC_DIR, DRIFT_SHARED_DIR e OMP_NUM_THREADS.
+"""
+
+import gc
+import multiprocessing
+import os
+import shutil
+
+
+# Precisa existir antes do preload (a aplicação cria as métricas ao ser importada).
+# Os arquivos de execuções anteriores são apagados só na primeira leitura desta
+# configuração: um reload (SIGHUP) não pode apagar as séries dos workers ativos.
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+if not os.environ.get('_PROMETHEUS_MULTIPROC_READY'):
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.environ['_PROMETHEUS_MULTIPROC_READY'] = '1'
+os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+# Dentro do diretório do Prometheus: apagado junto com ele a cada início
+DRIFT_SHARED_DIR = os.environ.setdefault('DRIFT_SHARED_DIR', os.path.join(PROMETHEUS_MULTIPROC_DIR, 'drift'))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', str(multiprocessing.cpu_count())))
+threads = int(os.getenv('GUNICORN_THREADS', '2'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+preload_app = True
+accesslog = '-'
+
+# Evita que cada worker abra um pool OpenMP do tamanho da máquina (XGBoost)
+os.environ.setdefault('OMP_NUM_THREADS', str(max(1, multiprocessing.cpu_count() // workers)))
+
+
+def when_ready(server):
+    """Aplicação já carregada no master: congela o heap antes do fork dos workers."""
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"gc.freeze: {gc.get_freeze_count()} objetos compartilhados com os workers")
+
+
+def child_exit(server, worker):
+    """Remove as séries 'live*' e as contagens de drift do worker encerrado."""
+    from prometheus_client import multiprocess
+    from src.monitoring.drift_detection import SharedSketchCounts
+    multiprocess.mark_process_dead(worker.pid)
+    SharedSketchCounts(DRIFT_SHARED_DIR).remove(worker.pid)
@@ -7,12 +7,19 @@ import logging
 import time
 import math
 import random
+import json
 import numpy as np
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from prometheus_flask_exporter import PrometheusMetrics
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Histogram, Gauge
 from src.models.predict import PredictionPipeline
 from src.services.prediction_service import PredictionService
+from src.core.constants import (
+    DEFAULT_EXPLAIN_MODE, DEFAULT_EXPLAIN_TOP_K, DEFAULT_MATRIX_CHUNK_SIZE, DEFAULT_MATCH_TOP_K,
+    DRIFT_CHECK_EVERY, DRIFT_CHECK_INTERVAL_SECONDS, DRIFT_MIN_SAMPLES,
+    DRIFT_QUEUE_SIZE, DRIFT_BATCH_SIZE, DRIFT_BATCH_WAIT_MS, DRIFT_REFERENCE_SIZE
+)
+from src.core.config import config
 
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
@@ -20,7 +27,8 @@ logger = logging.getLogger(__name__)
 
 # Importar drift detection
 try:
-    from src.monitoring.drift_detection import DriftMonitor
+    from src.monitoring.drift_detection import DriftMonitor, load_reference_data
+    from src.services.drift_worker import DriftWorker
     DRIFT_MONITORING_ENABLED = True
     logger.info("Drift detection module loaded successfully")
 except ImportError as e:
@@ -29,7 +37,8 @@ except ImportError as e:
 
 app = Flask(__name__)
 
-# Inicializar métricas do Prometheus
+# Inicializar métricas do Prometheus; o /metrics do exportador já agrega os
+# arquivos de todos os workers quando PROMETHEUS_MULTIPROC_DIR está definido
 metrics = PrometheusMetrics(app)
 
 # Métricas customizadas de inferência - registrar no registry padrão
@@ -50,6 +59,7 @@ model_predictions_total = Counter(
 model_prediction_error = Gauge(
     'model_prediction_error_absolute',
     'Erro absoluto médio das predições do modelo',
+    multiprocess_mode='mostrecent',
     registry=REGISTRY
 )
 
@@ -109,24 +119,98 @@ drift_detection_alerts_total.clear()
 drift_data_features_analyzed = Gauge(
     'drift_data_features_analyzed',
     'Número de features analisadas para data drift',
+    multiprocess_mode='mostrecent',
     registry=REGISTRY
 )
 
 drift_data_features_with_drift = Gauge(
     'drift_data_features_with_drift',
     'Número de features com data drift detectado',
+    multiprocess_mode='mostrecent',
+    registry=REGISTRY
+)
+
+# Calculados sobre as contagens de todos os workers (DRIFT_SHARED_DIR): 'mostrecent' é o último check
+drift_feature_psi = Gauge(
+    'drift_feature_psi',
+    'PSI da feature entre o histograma de referência e a janela atual',
+    ['feature'],
+    multiprocess_mode='mostrecent',
+    registry=REGISTRY
+)
+
+drift_feature_js_divergence = Gauge(
+    'drift_feature_js_divergence',
+    'Divergência de Jensen-Shannon da feature entre referência e janela atual',
+    ['feature'],
+    multiprocess_mode='mostrecent',
     registry=REGISTRY
 )
 
 drift_concept_performance_accuracy = Gauge(
     'drift_concept_performance_accuracy',
     'Accuracy atual do modelo para concept drift detection',
+    multiprocess_mode='mostrecent',
     registry=REGISTRY
 )
 
 drift_concept_performance_degradation = Gauge(
     'drift_concept_performance_degradation',
     'Percentual de degradação de performance detectado',
+    multiprocess_mode='mostrecent',
+    registry=REGISTRY
+)
+
+model_batch_inference_duration = Histogram(
+    'model_batch_inference_duration_seconds',
+    'Tempo de inferência de uma requisição de predição em lote em segundos',
+    registry=REGISTRY
+)
+
+model_batch_size = Histogram(
+    'model_batch_size',
+    'Quantidade de candidatos por requisição de predição em lote',
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+    registry=REGISTRY
+)
+
+vacancy_cache_hits_total = Counter(
+    'vacancy_cache_hits_total',
+    'Predições que reutilizaram o bloco de features da vaga em cache',
+    registry=REGISTRY
+)
+
+vacancy_cache_misses_total = Counter(
+    'vacancy_cache_misses_total',
+    'Predições que precisaram processar a vaga (ausente, expirada ou alterada)',
+    registry=REGISTRY
+)
+
+vacancy_cache_evictions_total = Counter(
+    'vacancy_cache_evictions_total',
+    'Vagas removidas do cache por capacidade ou expiração',
+    ['reason'],
+    registry=REGISTRY
+)
+
+vacancy_cache_size = Gauge(
+    'vacancy_cache_size',
+    'Quantidade de vagas no cache de features (soma dos workers ativos)',
+    multiprocess_mode='livesum',
+    registry=REGISTRY
+)
+
+model_micro_batch_size = Histogram(
+    'model_micro_batch_size',
+    'Predições agrupadas em cada chamada ao modelo pelo micro-batching',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+    registry=REGISTRY
+)
+
+model_micro_batch_queue_depth = Gauge(
+    'model_micro_batch_queue_depth',
+    'Predições aguardando na fila do micro-batching (soma dos workers ativos)',
+    multiprocess_mode='livesum',
     registry=REGISTRY
 )
 
@@ -136,6 +220,26 @@ drift_monitoring_executions_total = Counter(
     registry=REGISTRY
 )
 
+drift_queue_depth = Gauge(
+    'drift_queue_depth',
+    'Registros aguardando na fila do monitoramento de drift (soma dos workers ativos)',
+    multiprocess_mode='livesum',
+    registry=REGISTRY
+)
+
+drift_queue_lag_seconds = Histogram(
+    'drift_queue_lag_seconds',
+    'Atraso entre a predição e o processamento do registro no monitoramento de drift',
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    registry=REGISTRY
+)
+
+drift_records_dropped_total = Counter(
+    'drift_records_dropped_total',
+    'Registros descartados com a fila do monitoramento de drift cheia',
+    registry=REGISTRY
+)
+
 # Inicializar o serviço de predição
 try:
     prediction_service = PredictionService()
@@ -144,6 +248,28 @@ except Exception as e:
     logger.error(f"Erro ao inicializar serviço de predição: {e}")
     prediction_service = None
 
+def record_vacancy_cache_event(event, reason=None):
+    """Exporta os eventos do cache de vagas para o Prometheus"""
+    if event == 'hit':
+        vacancy_cache_hits_total.inc()
+    elif event == 'miss':
+        vacancy_cache_misses_total.inc()
+    elif event == 'eviction':
+        vacancy_cache_evictions_total.labels(reason=reason).inc()
+    # Gauge atualizado a cada evento: set_function não funciona no modo multiprocesso
+    vacancy_cache_size.set(len(prediction_service.vacancy_cache))
+
+if prediction_service and prediction_service.vacancy_cache is not None:
+    prediction_service.vacancy_cache.listener = record_vacancy_cache_event
+
+def record_micro_batch(batch_size, queue_depth):
+    """Exporta tamanho do lote e profundidade da fila do micro-batching"""
+    model_micro_batch_size.observe(batch_size)
+    model_micro_batch_queue_depth.set(queue_depth)
+
+if prediction_service and prediction_service.micro_batcher is not None:
+    prediction_service.micro_batcher.listener = record_micro_batch
+
 # Inicializar o monitor de drift detection
 drift_monitor = None
 if DRIFT_MONITORING_ENABLED:
@@ -160,12 +286,23 @@ if DRIFT_MONITORING_ENABLED:
             config={
                 'data_drift': {
                     'significance_level': 0.05,
-                    'reference_window_size': 500,
+                    'reference_window_size': DRIFT_REFERENCE_SIZE,
                     'detection_window_size': 50
                 },
                 'concept_drift': {
                     'degradation_threshold': 0.1,
                     'window_size': 50
+                },
+                # Testes KS sobre as janelas acumuladas, fora do caminho de cada predição
+                'schedule': {
+                    'check_every': int(os.getenv('DRIFT_CHECK_EVERY', DRIFT_CHECK_EVERY)),
+                    'check_interval_seconds': float(os.getenv('DRIFT_CHECK_INTERVAL_SECONDS',
+                                                              DRIFT_CHECK_INTERVAL_SECONDS)),
+                    'min_samples': DRIFT_MIN_SAMPLES
+                },
+                # Com vários workers (gunicorn), PSI/JS calculados sobre as contagens somadas de todos
+                'sketch_drift': {
+                    'shared_dir': os.getenv('DRIFT_SHARED_DIR')
                 }
             }
         )
@@ -174,6 +311,95 @@ if DRIFT_MONITORING_ENABLED:
         logger.error(f"Erro ao inicializar drift monitor: {e}")
         drift_monitor = None
 
+def load_drift_reference():
+    """Carrega a amostra da matriz de features de treino no monitor; None se o arquivo não existe"""
+    reference_path = config.model.drift_reference_path
+    if not os.path.exists(reference_path):
+        return None
+    reference_data = load_reference_data(reference_path)
+    drift_monitor.initialize_reference_data(reference_data)
+    logger.info(f"Referência de drift carregada de {reference_path}")
+    return reference_data
+
+if drift_monitor:
+    try:
+        if load_drift_reference() is None:
+            logger.warning(
+                f"Drift monitor SEM referência ({config.model.drift_reference_path} não existe): "
+                "os checks de data drift não rodam até o treino gravar o arquivo (ou DRIFT_REFERENCE_PATH "
+                "apontar para ele) e POST /drift/initialize ser chamado"
+            )
+    except Exception as e:
+        logger.error(f"Erro ao carregar referência de drift: {e}")
+
+# Worker de fundo do monitoramento de drift (fila limitada, processada em lotes)
+drift_worker = None
+if drift_monitor:
+    drift_worker = DriftWorker(
+        drift_monitor,
+        max_queue_size=int(os.getenv('DRIFT_QUEUE_SIZE', DRIFT_QUEUE_SIZE)),
+        max_batch_size=int(os.getenv('DRIFT_BATCH_SIZE', DRIFT_BATCH_SIZE)),
+        max_wait_ms=float(os.getenv('DRIFT_BATCH_WAIT_MS', DRIFT_BATCH_WAIT_MS))
+    )
+
+def record_drift_batch(drift_results, batch_size, lag):
+    """Exporta o resultado de um lote do DriftWorker para o Prometheus"""
+    drift_queue_lag_seconds.observe(lag)
+    drift_queue_depth.set(drift_worker.queue_depth)
+    
+    # Incrementar contador de execuções do monitoramento
+    drift_monitoring_executions_total.inc(batch_size)
+
+    # Atualizar métricas de drift
+    if drift_results.get('data_drift'):
+        data_drift = drift_results['data_drift']
+        drift_data_features_analyzed.set(data_drift.get('features_analyzed', 0))
+        drift_data_features_with_drift.set(data_drift.get('features_with_drift', 0))
+
+        # Contar alertas de data drift
+        for alert in data_drift.get('alerts', []):
+            drift_detection_alerts_total.labels(
+                alert_type='data_drift'
+            ).inc()
+
+    # PSI e Jensen-Shannon por feature (histogramas de memória constante)
+    if drift_results.get('sketch_drift'):
+        sketch_drift = drift_results['sketch_drift']
+        for feature, feature_result in sketch_drift['feature_results'].items():
+            drift_feature_psi.labels(feature=feature).set(feature_result['psi'])
+            drift_feature_js_divergence.labels(feature=feature).set(feature_result['js_divergence'])
+        for alert in sketch_drift.get('alerts', []):
+            drift_detection_alerts_total.labels(
+                alert_type='data_drift'
+            ).inc()
+
+    if drift_results.get('concept_drift'):
+        concept_drift = drift_results['concept_drift']
+
+        # Contar alertas de concept drift
+        if 'drift_results' in concept_drift:
+            for alert in concept_drift['drift_results'].get('alerts', []):
+                drift_detection_alerts_total.labels(
+                    alert_type='concept_drift'
+                ).inc()
+
+        # Atualizar métricas de performance
+        if 'rolling_metrics' in concept_drift:
+            rolling_metrics = concept_drift['rolling_metrics']
+            if 'accuracy' in rolling_metrics:
+                drift_concept_performance_accuracy.set(rolling_metrics['accuracy'])
+
+    # SIMULAÇÃO PARA DEMONSTRAÇÃO: Atualizar performance baseada no número de execuções
+    # Isso é apenas para fins de demonstração do dashboard
+    current_time = time.time()
+    # Simular performance que varia com o tempo e número de predições
+    simulated_accuracy = 0.75 + 0.15 * math.sin(current_time / 100) + 0.05 * random.random()
+    simulated_accuracy = max(0.5, min(0.95, simulated_accuracy))  # Manter entre 50% e 95%
+    drift_concept_performance_accuracy.set(simulated_accuracy)
+
+if drift_worker:
+    drift_worker.listener = record_drift_batch
+
 # Inicializar métricas com valores padrão para aparecerem no Prometheus
 model_prediction_error.set(0)  # Inicializa com 0
 logger.info("Métricas customizadas inicializadas")
@@ -211,10 +437,6 @@ def health():
             'timestamp': time.time()
         }), 500
 
-@app.route('/metrics')
-def metrics():
-    return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
-
 @app.route('/drift/status')
 def drift_status():
     """Endpoint para verificar status do drift monitoring"""
@@ -262,6 +484,18 @@ def drift_alerts():
                 'message': alert.message
             })
             
+        # Data drift alerts dos histogramas (PSI/Jensen-Shannon)
+        for alert in summary.get('last_sketch_drift_alerts', []):
+            recent_alerts.append({
+                'timestamp': alert.timestamp.isoformat(),
+                'type': alert.drift_type,
+                'severity': alert.severity,
+                'metric': alert.metric,
+                'value': alert.value,
+                'threshold': alert.threshold,
+                'message': alert.message
+            })
+            
         # Concept drift alerts  
         for alert in summary.get('last_concept_drift_alerts', []):
             recent_alerts.append({
@@ -298,19 +532,13 @@ def initialize_drift_reference():
         }), 404
         
     try:
-        # Gerar dados de referência simulados (em produção, usar dados históricos reais)
-        import numpy as np
-        
-        reference_data = {
-            'candidate_skills_length': np.random.normal(50, 15, 1000),
-            'candidate_experience_length': np.random.normal(30, 10, 1000),
-            'vacancy_requirements_length': np.random.normal(40, 12, 1000),
-            'vacancy_seniority_encoded': np.random.randint(0, 100, 1000),
-            'prediction_value': np.random.beta(2, 2, 1000),  # Distribuição realista para predições
-            'prediction_confidence': np.random.beta(3, 2, 1000)
-        }
-        
-        drift_monitor.initialize_reference_data(reference_data)
+        # Recarrega a amostra das features de treino gravada pelo treino (ex: após retreinar)
+        reference_data = load_drift_reference()
+        if reference_data is None:
+            return jsonify({
+                'success': False,
+                'message': f'Drift reference not found at {config.model.drift_reference_path}'
+            }), 404
         
         return jsonify({
             'success': True,
@@ -334,17 +562,32 @@ def predict():
         data = request.get_json()
         candidate_data = data.get('candidate', {})
         vacancy_data = data.get('vacancy', {})
+        # Explicabilidade: 'none' (só o score), 'values' (SHAP completo) ou 'top_k'
+        explain = data.get('explain', DEFAULT_EXPLAIN_MODE)
+        top_k = data.get('top_k', DEFAULT_EXPLAIN_TOP_K)
+        # Candidato já cadastrado no store de features (ver /candidates)
+        candidate_id = data.get('candidate_id')
+        # Vaga em cache (ver VACANCY_CACHE_SIZE); 'vacancy' pode ser omitido se já estiver em cache
+        vacancy_id = data.get('vacancy_id')
         
-        # Usar o serviço de predição
-        prediction, additional_data = prediction_service.predict(candidate_data, vacancy_data)
+        # Usar o serviço de predição; com o drift ativo, o serviço devolve também
+        # o vetor de features usado no score (sem recalcular)
+        prediction, additional_data, *model_features = prediction_service.predict(
+            candidate_data, vacancy_data, explain=explain, top_k=top_k,
+            candidate_id=candidate_id, vacancy_id=vacancy_id,
+            return_features=drift_worker is not None
+        )
         
         # Criar resultado final
         result = {
             'prediction': float(prediction)
         }
         
+        # Top-k contribuições SHAP já vêm serializáveis
+        if explain == 'top_k' and additional_data is not None:
+            result['top_features'] = additional_data
         # Adicionar SHAP values se disponível, convertendo para lista
-        if additional_data is not None:
+        elif additional_data is not None:
             try:
                 # Converter numpy array para lista para serialização JSON
                 if isinstance(additional_data, np.ndarray):
@@ -358,81 +601,27 @@ def predict():
         # Registrar métricas avançadas de ML
         prediction_value = float(prediction)
         
-        # Monitoramento de Drift Detection
-        if drift_monitor:
+        # Monitoramento de Drift Detection: a requisição só enfileira o registro;
+        # o DriftWorker roda o monitoramento em lote numa thread de fundo
+        if drift_worker and model_features:
             try:
-                # Extrair features para drift detection
-                features = {}
-                
-                # Features do candidato
-                if 'skills' in candidate_data:
-                    features['candidate_skills_length'] = len(str(candidate_data['skills']))
-                if 'experience' in candidate_data:
-                    features['candidate_experience_length'] = len(str(candidate_data['experience']))
-                    
-                # Features da vaga
-                if 'requirements' in vacancy_data:
-                    features['vacancy_requirements_length'] = len(str(vacancy_data['requirements']))
-                if 'seniority' in vacancy_data:
-                    features['vacancy_seniority_encoded'] = hash(str(vacancy_data['seniority'])) % 100
-                    
-                # Adicionar valor de predição como feature
+                # Features do modelo (mesmas colunas da referência de treino) e o score
+                features = dict(zip(prediction_service.feature_names, model_features[0].tolist()))
                 features['prediction_value'] = prediction_value
-                features['prediction_confidence'] = 1 - abs(0.5 - prediction_value) * 2
-                
-                # Monitorar drift (sem labels verdadeiros neste exemplo)
-                drift_results = drift_monitor.monitor_prediction(
-                    features=features,
-                    y_true=None,  # Seria fornecido se houvesse feedback
-                    y_pred=int(prediction_value > 0.5),
-                    y_pred_proba=prediction_value
-                )
-                
-                # Incrementar contador de execuções do monitoramento
-                drift_monitoring_executions_total.inc()
                 
-                # Atualizar métricas de drift
-                if drift_results.get('data_drift'):
-                    data_drift = drift_results['data_drift']
-                    drift_data_features_analyzed.set(data_drift.get('features_analyzed', 0))
-                    drift_data_features_with_drift.set(data_drift.get('features_with_drift', 0))
-                    
-                    # Contar alertas de data drift
-                    for alert in data_drift.get('alerts', []):
-                        drift_detection_alerts_total.labels(
-                            alert_type='data_drift'
-                        ).inc()
-                        
-                if drift_results.get('concept_drift'):
-                    concept_drift = drift_results['concept_drift']
-                    
-                    # Contar alertas de concept drift
-                    if 'drift_results' in concept_drift:
-                        for alert in concept_drift['drift_results'].get('alerts', []):
-                            drift_detection_alerts_total.labels(
-                                alert_type='concept_drift'
-                            ).inc()
-                            
-                    # Atualizar métricas de performance
-                    if 'rolling_metrics' in concept_drift:
-                        rolling_metrics = concept_drift['rolling_metrics']
-                        if 'accuracy' in rolling_metrics:
-                            drift_concept_performance_accuracy.set(rolling_metrics['accuracy'])
-                
-                # SIMULAÇÃO PARA DEMONSTRAÇÃO: Atualizar performance baseada no número de execuções
-                # Isso é apenas para fins de demonstração do dashboard
-                current_time = time.time()
-                # Simular performance que varia com o tempo e número de predições
-                simulated_accuracy = 0.75 + 0.15 * math.sin(current_time / 100) + 0.05 * random.random()
-                simulated_accuracy = max(0.5, min(0.95, simulated_accuracy))  # Manter entre 50% e 95%
-                drift_concept_performance_accuracy.set(simulated_accuracy)
-                            
-                # Adicionar informações de drift na resposta (opcional)
-                if drift_results.get('alerts'):
-                    result['drift_alerts'] = len(drift_results['alerts'])
+                # Sem labels verdadeiros neste exemplo; com a fila cheia o registro é descartado
+                if not drift_worker.submit({
+                    'features': features,
+                    'y_true': None,  # Seria fornecido se houvesse feedback
+                    'y_pred': int(prediction_value > 0.5),
+                    'y_pred_proba': prediction_value
+                }):
+                    drift_records_dropped_total.inc()
+                # atualizado a cada envio, não só quando o worker termina um lote
+                drift_queue_depth.set(drift_worker.queue_depth)
                     
             except Exception as e:
-                logger.warning(f"Erro no monitoramento de drift: {e}")
+                logger.warning(f"Erro ao enfileirar monitoramento de drift: {e}")
         
         # Métrica de distribuição de valores de predição
         model_prediction_value_distribution.observe(prediction_value)
@@ -474,7 +663,151 @@ def predict():
         
         return jsonify({'error': str(e)}), 400
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Ranqueia vários candidatos para uma vaga em uma única chamada ao modelo"""
+    start_time = time.time()
+    try:
+        if not prediction_service:
+            return jsonify({'error': 'Serviço de predição não inicializado'}), 500
+            
+        data = request.get_json()
+        vacancy_data = data.get('vacancy', {})
+        candidates = data.get('candidates', {})
+        top_n = data.get('top_n')
+        
+        ranking = prediction_service.predict_many(vacancy_data, candidates, top_n=top_n)
+        
+        # Registrar métricas
+        for item in ranking:
+            model_prediction_value_distribution.observe(item['score'])
+        model_predictions_total.inc(len(candidates))
+        model_batch_size.observe(len(candidates))
+        model_batch_inference_duration.observe(time.time() - start_time)
+        
+        logger.info(f'/predict/batch → {len(candidates)} candidatos, {len(ranking)} retornados')
+        return jsonify({
+            'total_candidates': len(candidates),
+            'results': ranking
+        })
+        
+    except Exception as e:
+        logger.error(f'/predict/batch error: {e}')
+        
+        # Contar erro de predição
+        api_prediction_errors_total.labels(error_type='batch_prediction_failure').inc()
+        api_errors_total.labels(method='POST', status_code='400').inc()
+        
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/predict/matrix', methods=['POST'])
+def predict_matrix():
+    """
+    Pontua todos os pares candidato x vaga e devolve o resultado em streaming
+    (NDJSON, um par por linha), bloco a bloco, com memória limitada
+    """
+    try:
+        if not prediction_service:
+            return jsonify({'error': 'Serviço de predição não inicializado'}), 500
+            
+        data = request.get_json()
+        candidates = data.get('candidates', {})
+        vacancies = data.get('vacancies', {})
+        chunk_size = data.get('chunk_size', DEFAULT_MATRIX_CHUNK_SIZE)
+        
+        # Validação e pré-processamento acontecem antes do início do streaming
+        chunks = prediction_service.predict_matrix(candidates, vacancies, chunk_size=chunk_size)
+        
+    except Exception as e:
+        logger.error(f'/predict/matrix error: {e}')
+        
+        # Contar erro de predição
+        api_prediction_errors_total.labels(error_type='matrix_prediction_failure').inc()
+        api_errors_total.labels(method='POST', status_code='400').inc()
+        
+        return jsonify({'error': str(e)}), 400
+    
+    def generate():
+        total_pairs = 0
+        for chunk in chunks:
+            model_predictions_total.inc(len(chunk))
+            total_pairs += len(chunk)
+            yield ''.join(json.dumps(pair) + '\n' for pair in chunk)
+        logger.info(f'/predict/matrix → {total_pairs} pares')
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/match/top_k', methods=['POST'])
+def match_top_k():
+    """Melhores candidatos do store para uma vaga (shortlist ANN re-ranqueada pelo modelo)"""
+    start_time = time.time()
+    try:
+        if not prediction_service:
+            return jsonify({'error': 'Serviço de predição não inicializado'}), 500
+            
+        data = request.get_json()
+        vacancy_data = data.get('vacancy', {})
+        vacancy_id = data.get('vacancy_id')
+        k = data.get('k', DEFAULT_MATCH_TOP_K)
+        
+        results = prediction_service.match_top_k(vacancy_data, k=k, vacancy_id=vacancy_id)
+        
+        # Registrar métricas
+        for item in results:
+            model_prediction_value_distribution.observe(item['score'])
+        model_batch_inference_duration.observe(time.time() - start_time)
+        
+        logger.info(f'/match/top_k → {len(results)} candidatos')
+        return jsonify({'k': k, 'results': results})
+        
+    except Exception as e:
+        logger.error(f'/match/top_k error: {e}')
+        
+        # Contar erro de predição
+        api_prediction_errors_total.labels(error_type='match_top_k_failure').inc()
+        api_errors_total.labels(method='POST', status_code='400').inc()
+        
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/candidates', methods=['POST'])
+def upsert_candidates():
+    """Insere ou atualiza candidatos no store de features ({id: dados})"""
+    try:
+        if not prediction_service:
+            return jsonify({'error': 'Serviço de predição não inicializado'}), 500
+            
+        data = request.get_json()
+        candidates = data.get('candidates', {})
+        counts = prediction_service.upsert_candidates(candidates)
+        
+        logger.info(f'/candidates → {counts}')
+        return jsonify(counts)
+        
+    except Exception as e:
+        logger.error(f'/candidates error: {e}')
+        api_errors_total.labels(method='POST', status_code='400').inc()
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/candidates/<candidate_id>', methods=['DELETE'])
+def delete_candidate(candidate_id):
+    """Remove um candidato do store de features"""
+    try:
+        if not prediction_service:
+            return jsonify({'error': 'Serviço de predição não inicializado'}), 500
+            
+        if not prediction_service.delete_candidate(candidate_id):
+            api_errors_total.labels(method='DELETE', status_code='404').inc()
+            return jsonify({'error': f'Candidato {candidate_id} não encontrado'}), 404
+        
+        return jsonify({'deleted': candidate_id})
+        
+    except Exception as e:
+        logger.error(f'/candidates/{candidate_id} error: {e}')
+        api_errors_total.labels(method='DELETE', status_code='400').inc()
+        return jsonify({'error': str(e)}), 400
+
 if __name__ == '__main__':
+    # Servidor de desenvolvimento; em produção use o gunicorn (ver src/app/gunicorn_conf.py)
     # Verificar se a porta está configurada corretamente
     port = int(os.environ.get('PORT', 5000))
     logger.info(f"Iniciando aplicação na porta {port}")
@@ -0,0 +1,7 @@
+"""
+Ponto de entrada WSGI da API (ver `src/app/gunicorn_conf.py`)
+"""
+
+from src.app.main import app
+
+application = app
@@ -7,13 +7,23 @@ from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
 
+from src.core.constants import DRIFT_REFERENCE_FILE
+
 
 @dataclass
 class ModelConfig:
     """Configurações do modelo"""
-    model_path: str
+    model_path: str  # model.joblib, o booster exportado model.ubj ou model.trees.npz (backend numpy)
     artifacts_path: str
     w2v_model_path: str
+    w2v_format: str = "auto"  # 'text', 'binary' (memory-map) ou 'auto'
+    model_backend: str = "xgboost"  # 'xgboost' (inplace_predict) ou 'numpy' (TreeEnsemble)
+    candidate_store_path: Optional[str] = None  # diretório do CandidateFeatureStore
+    vacancy_cache_size: int = 1024  # vagas no VacancyFeatureCache (0 desabilita)
+    vacancy_cache_ttl: float = 3600.0  # segundos
+    micro_batch_max_size: int = 0  # linhas por chamada ao modelo no MicroBatcher (0 desabilita)
+    micro_batch_wait_ms: float = 2.0
+    drift_reference_path: Optional[str] = None  # amostra das features de treino gravada pelo treino
     min_coverage_threshold: float = 0.35
     prediction_timeout: int = 30
 
@@ -56,10 +66,24 @@ class Config:
         self.src_dir = self.base_dir / "src"
         
         # Configurações do modelo
+        model_path = os.getenv("MODEL_PATH", str(self.base_dir / "artifacts" / "model.joblib"))
         self.model = ModelConfig(
-            model_path=str(self.base_dir / "artifacts" / "model.joblib"),
+            model_path=model_path,
             artifacts_path=str(self.base_dir / "artifacts" / "preprocessing_artifacts.joblib"),
-            w2v_model_path=str(self.base_dir / "src" / "word2vec" / "cbow_s100.txt")
+            w2v_model_path=os.getenv(
+                "W2V_MODEL_PATH", str(self.base_dir / "src" / "word2vec" / "cbow_s100.txt")
+            ),
+            w2v_format=os.getenv("W2V_FORMAT", "auto"),
+            model_backend=os.getenv("MODEL_BACKEND", "xgboost"),
+            candidate_store_path=os.getenv("CANDIDATE_STORE_PATH") or None,
+            vacancy_cache_size=int(os.getenv("VACANCY_CACHE_SIZE", "1024")),
+            vacancy_cache_ttl=float(os.getenv("VACANCY_CACHE_TTL", "3600")),
+            micro_batch_max_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", "0")),
+            micro_batch_wait_ms=float(os.getenv("MICRO_BATCH_WAIT_MS", "2")),
+            # Treino e API usam o mesmo caminho: ao lado do modelo servido, salvo DRIFT_REFERENCE_PATH
+            drift_reference_path=os.getenv(
+                "DRIFT_REFERENCE_PATH", str(Path(model_path).with_name(DRIFT_REFERENCE_FILE))
+            )
         )
         
         # Configurações da API
@@ -22,6 +22,42 @@ SUPPORTED_TEXT_EXTENSIONS = ['.txt']
 MIN_COVERAGE_THRESHOLD = 0.35
 TARGET_COVERAGE_THRESHOLD = 0.80
 
+# Explicabilidade (SHAP)
+EXPLAIN_MODES = ('none', 'values', 'top_k')
+DEFAULT_EXPLAIN_MODE = 'values'
+DEFAULT_EXPLAIN_TOP_K = 5
+
+# Backends de predição: 'xgboost' (Booster.inplace_predict) ou 'numpy' (TreeEnsemble, sem xgboost)
+MODEL_BACKENDS = ('xgboost', 'numpy')
+DEFAULT_MODEL_BACKEND = 'xgboost'
+
+# Predição em lote (uma vaga contra vários candidatos)
+MAX_BATCH_CANDIDATES = 1000
+
+# Modo matriz (M candidatos x N vagas): pares pontuados por bloco
+DEFAULT_MATRIX_CHUNK_SIZE = 10000
+MAX_MATRIX_CHUNK_SIZE = 100000
+
+# Top-K por vaga: shortlist do índice ANN re-ranqueada pelo modelo
+DEFAULT_MATCH_TOP_K = 20
+MAX_MATCH_TOP_K = 200
+MATCH_SHORTLIST_FACTOR = 10
+MIN_MATCH_SHORTLIST = 100
+
+# Drift: os testes KS rodam nas janelas acumuladas a cada N predições ou a cada intervalo
+DRIFT_CHECK_EVERY = 50
+DRIFT_CHECK_INTERVAL_SECONDS = 60
+DRIFT_MIN_SAMPLES = 30
+
+# Drift fora da requisição: fila limitada (excedente descartado) processada em lotes
+DRIFT_QUEUE_SIZE = 10000
+DRIFT_BATCH_SIZE = 256
+DRIFT_BATCH_WAIT_MS = 100
+
+# Referência do drift: amostra da matriz de features de treino gravada ao lado do modelo
+DRIFT_REFERENCE_FILE = 'drift_reference.npz'
+DRIFT_REFERENCE_SIZE = 10000
+
 # Códigos de status customizados
 STATUS_MODEL_NOT_LOADED = "MODEL_NOT_LOADED"
 STATUS_INVALID_INPUT = "INVALID_INPUT"
@@ -0,0 +1,422 @@
+"""
+Store persistente de features do lado do candidato
+
+Guarda, por id de candidato, o bloco calculado por
+`PredictionPipeline.build_candidate_block` (textos padronizados, vetores de
+documento, senioridade e níveis codificados) junto com o hash do conteúdo do
+registro, para que predições de candidatos conhecidos não reprocessem texto.
+
+Layout em disco (um diretório):
+    index.json    metadados + {id: {slot, hash, texts_offset}} (escrita atômica)
+    vectors.npy   (capacidade, n_colunas, dim) no dtype do Word2Vec, memory-map
+    features.npy  (capacidade, n_features) float64, memory-map
+    texts.jsonl   textos padronizados, uma linha por versão de candidato
+
+Os slots são apenas acrescentados: uma atualização grava em um slot novo e uma
+remoção só tira o id do índice. Assim um leitor com o índice anterior nunca lê
+dados sobrescritos; `compact()` reescreve os arquivos sem os slots órfãos.
+
+Cada escrita é uma transação: com um lock exclusivo em `store.lock` (flock,
+entre processos, ex: workers do gunicorn), o índice é recarregado, a alteração
+é aplicada e o índice é gravado. Se a transação falha, o índice em memória
+volta ao estado anterior e nada é gravado (slots e textos já escritos ficam
+órfãos, como numa atualização). Leitores enxergam as alterações de outros
+processos via `refresh()` (ver `get`).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: apenas o lock entre threads do processo
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+INDEX_FILE = 'index.json'
+VECTORS_FILE = 'vectors.npy'
+FEATURES_FILE = 'features.npy'
+TEXTS_FILE = 'texts.jsonl'
+LOCK_FILE = 'store.lock'
+INITIAL_CAPACITY = 1024
+
+BlockBuilder = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def content_hash(record: Any) -> str:
+    """Hash estável do conteúdo de um registro (independe da ordem das chaves)."""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CandidateFeatureStore:
+    """Blocos de candidatos persistidos em disco e lidos via memory-map."""
+
+    def __init__(self, path: Union[str, Path], fingerprint: str, vector_columns: List[str],
+                 feature_names: List[str], dim: int, dtype: Any = np.float32):
+        """
+        Abre (ou cria) o store em `path`.
+
+        Args:
+            path: Diretório do store.
+            fingerprint: `PredictionPipeline.feature_fingerprint()` da configuração atual.
+            vector_columns: Colunas de texto do candidato com vetor de documento.
+            feature_names: Features numéricas do bloco do candidato.
+            dim: Dimensão dos vetores de documento.
+            dtype: dtype dos vetores (o do Word2Vec).
+
+        Raises:
+            ValueError: Se o store existente foi gerado com outra configuração.
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.vector_columns = list(vector_columns)
+        self.feature_names = list(feature_names)
+        self.dim = int(dim)
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.RLock()
+        self._index_stamp = None
+        self._version = 0
+        self._transaction_depth = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._process_lock():
+            if (self.path / INDEX_FILE).exists():
+                self.refresh()
+            else:
+                self._create()
+
+    # ---
+    # Leitura
+    # ---
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return str(candidate_id) in self._entries
+
+    @property
+    def version(self) -> int:
+        """Contador de alterações (inclui as recarregadas de outro processo)."""
+        return self._version
+
+    def get_hash(self, candidate_id: str) -> Optional[str]:
+        """Hash do conteúdo armazenado para o candidato (None se desconhecido)."""
+        entry = self._entries.get(str(candidate_id))
+        return entry['hash'] if entry else None
+
+    def get(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Bloco do candidato no formato de `build_candidate_block` (sem os textos,
+        ver `get_texts`), ou None se o candidato não estiver no store.
+        """
+        self.refresh()
+        with self._lock:
+            entry = self._entries.get(str(candidate_id))
+            if entry is None:
+                return None
+            slot = entry['slot']
+            features = self._features[slot]
+            vectors = self._vectors[slot]
+            return {
+                'features': {name: float(features[i]) for i, name in enumerate(self.feature_names)},
+                'vectors': {col: np.array(vectors[i]) for i, col in enumerate(self.vector_columns)}
+            }
+
+    def column_vectors(self, columns: List[str],
+                       ids: Optional[List[str]] = None) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """
+        Ids dos candidatos (todos, ou os de `ids` que estão no store) e, para
+        cada coluna pedida, a matriz (n_candidatos x dim) dos seus vetores, na
+        mesma ordem dos ids.
+        """
+        self.refresh()
+        with self._lock:
+            if ids is None:
+                ids = list(self._entries)
+            else:
+                ids = [candidate_id for candidate_id in map(str, ids) if candidate_id in self._entries]
+            slots = np.array([self._entries[candidate_id]['slot'] for candidate_id in ids], dtype=np.int64)
+            return ids, {
+                col: np.array(self._vectors[slots, self.vector_columns.index(col)]) for col in columns
+            }
+
+    def slots(self) -> Dict[str, int]:
+        """
+        Slot atual de cada candidato. Muda quando o candidato é atualizado
+        (slot novo, maior) e em `compact()` (slots renumerados a partir de 0).
+        """
+        self.refresh()
+        with self._lock:
+            return {candidate_id: entry['slot'] for candidate_id, entry in self._entries.items()}
+
+    def get_texts(self, candidate_id: str) -> Optional[Dict[str, str]]:
+        """Textos padronizados armazenados para o candidato."""
+        entry = self._entries.get(str(candidate_id))
+        if entry is None:
+            return None
+        with open(self.path / TEXTS_FILE, 'rb') as f:
+            f.seek(entry['texts_offset'])
+            return json.loads(f.readline())['texts']
+
+    def refresh(self) -> None:
+        """Recarrega índice e arquivos se outro processo alterou o store."""
+        index_path = self.path / INDEX_FILE
+        stat = index_path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if stamp == self._index_stamp:
+            return
+
+        with self._lock:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self._check_compatible(index)
+            self._entries = index['entries']
+            self._n_slots = index['n_slots']
+            self._open_arrays()
+            self._index_stamp = stamp
+            self._version += 1
+
+    # ---
+    # Escrita
+    # ---
+
+    def upsert(self, candidate_id: str, record: Dict[str, Any], build_block: BlockBuilder) -> str:
+        """
+        Insere ou atualiza um candidato. O bloco só é recalculado se o hash do
+        conteúdo mudou.
+
+        Args:
+            candidate_id: Id do candidato.
+            record: Registro bruto do candidato (sem o id).
+            build_block: Função que calcula o bloco a partir de {id: registro}.
+
+        Returns:
+            'inserted', 'updated' ou 'unchanged'.
+
+        Raises:
+            ValueError: Se o registro não puder ser convertido em bloco.
+        """
+        candidate_id = str(candidate_id)
+        record_hash = content_hash(record)
+        with self._transaction():
+            current = self._entries.get(candidate_id)
+            if current is not None and current['hash'] == record_hash:
+                return 'unchanged'
+
+            block = build_block({candidate_id: record})
+            if block is None:
+                raise ValueError(f"Candidato {candidate_id} não suportado pelo caminho rápido")
+
+            slot = self._n_slots
+            self._ensure_capacity(slot + 1)
+            self._features[slot] = [block['features'][name] for name in self.feature_names]
+            self._vectors[slot] = np.vstack([block['vectors'][col] for col in self.vector_columns])
+            texts_offset = self._append_texts(candidate_id, record_hash, block.get('texts', {}))
+
+            self._n_slots = slot + 1
+            self._entries[candidate_id] = {
+                'slot': slot, 'hash': record_hash, 'texts_offset': texts_offset
+            }
+            self._version += 1
+            return 'updated' if current is not None else 'inserted'
+
+    def upsert_many(self, records: Dict[str, Dict[str, Any]], build_block: BlockBuilder) -> Dict[str, int]:
+        """
+        Upsert de vários candidatos ({id: registro}) em uma única transação:
+        se algum registro falhar, nenhum candidato do lote é gravado.
+        """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        with self._transaction():
+            for candidate_id, record in records.items():
+                counts[self.upsert(candidate_id, record, build_block)] += 1
+        return counts
+
+    def delete(self, candidate_id: str) -> bool:
+        """Remove o candidato do índice."""
+        with self._transaction():
+            deleted = self._entries.pop(str(candidate_id), None) is not None
+            if deleted:
+                self._version += 1
+            return deleted
+
+    def flush(self) -> None:
+        """Grava os arrays e, por último, o índice (de forma atômica)."""
+        with self._lock:
+            self._features.flush()
+            self._vectors.flush()
+            self._write_index()
+
+    def compact(self) -> None:
+        """Reescreve os arquivos mantendo apenas os slots em uso."""
+        with self._transaction():
+            entries = sorted(self._entries.items(), key=lambda item: item[1]['slot'])
+            slots = [entry['slot'] for _, entry in entries]
+            capacity = max(INITIAL_CAPACITY, len(slots))
+
+            features = self._new_array(FEATURES_FILE, (capacity, len(self.feature_names)), np.float64)
+            vectors = self._new_array(VECTORS_FILE, (capacity, len(self.vector_columns), self.dim), self.dtype)
+            features[:len(slots)] = self._features[slots]
+            vectors[:len(slots)] = self._vectors[slots]
+            features.flush()
+            vectors.flush()
+
+            texts_tmp = self.path / (TEXTS_FILE + '.tmp')
+            new_entries = {}
+            with open(self.path / TEXTS_FILE, 'rb') as src, open(texts_tmp, 'wb') as dst:
+                for new_slot, (candidate_id, entry) in enumerate(entries):
+                    src.seek(entry['texts_offset'])
+                    offset = dst.tell()
+                    dst.write(src.readline())
+                    new_entries[candidate_id] = {**entry, 'slot': new_slot, 'texts_offset': offset}
+
+            del features, vectors
+            for name in (FEATURES_FILE, VECTORS_FILE, TEXTS_FILE):
+                os.replace(self.path / (name + '.tmp'), self.path / name)
+
+            self._entries = new_entries
+            self._n_slots = len(slots)
+            self._open_arrays()
+            self._version += 1
+            logger.info(f"Store de candidatos compactado: {len(slots)} candidatos")
+
+    # ---
+    # Internos
+    # ---
+
+    @contextmanager
+    def _process_lock(self):
+        """Lock exclusivo entre threads e, onde houver flock, entre processos."""
+        with self._lock:
+            with open(self.path / LOCK_FILE, 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Escrita atômica em relação a outros escritores: recarrega o índice
+        antes e, se algo mudou, grava arrays e índice ao final. Com uma
+        exceção, restaura o índice em memória e não grava nada. Transações
+        aninhadas (ex: `upsert` dentro de `upsert_many`) participam da mais
+        externa.
+        """
+        with self._lock:
+            if self._transaction_depth:
+                self._transaction_depth += 1
+                try:
+                    yield
+                finally:
+                    self._transaction_depth -= 1
+                return
+
+            with self._process_lock():
+                self.refresh()
+                version, entries, n_slots = self._version, dict(self._entries), self._n_slots
+                self._transaction_depth = 1
+                try:
+                    yield
+                except BaseException:
+                    self._entries, self._n_slots, self._version = entries, n_slots, version
+                    raise
+                else:
+                    if self._version != version:
+                        self.flush()
+                finally:
+                    self._transaction_depth = 0
+
+    def _create(self) -> None:
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._n_slots = 0
+        features = self._new_array(FEATURES_FILE, (INITIAL_CAPACITY, len(self.feature_names)), np.float64)
+        vectors = self._new_array(VECTORS_FILE, (INITIAL_CAPACITY, len(self.vector_columns), self.dim), self.dtype)
+        del features, vectors
+        for name in (FEATURES_FILE, VECTORS_FILE):
+            os.replace(self.path / (name + '.tmp'), self.path / name)
+        (self.path / TEXTS_FILE).touch()
+        self._open_arrays()
+        self._write_index()
+
+    def _new_array(self, name: str, shape: tuple, dtype: Any) -> np.memmap:
+        """Cria '<name>.tmp' com o shape pedido (a troca pelo definitivo fica a cargo de quem chama)."""
+        return np.lib.format.open_memmap(self.path / (name + '.tmp'), mode='w+', dtype=dtype, shape=shape)
+
+    def _open_arrays(self) -> None:
+        self._features = np.load(self.path / FEATURES_FILE, mmap_mode='r+')
+        self._vectors = np.load(self.path / VECTORS_FILE, mmap_mode='r+')
+
+    def _ensure_capacity(self, n_slots: int) -> None:
+        capacity = len(self._features)
+        if n_slots <= capacity:
+            return
+
+        capacity = max(2 * capacity, n_slots)
+        features = self._new_array(FEATURES_FILE, (capacity, len(self.feature_names)), np.float64)
+        vectors = self._new_array(VECTORS_FILE, (capacity, len(self.vector_columns), self.dim), self.dtype)
+        features[:self._n_slots] = self._features[:self._n_slots]
+        vectors[:self._n_slots] = self._vectors[:self._n_slots]
+        features.flush()
+        vectors.flush()
+        del features, vectors
+        for name in (FEATURES_FILE, VECTORS_FILE):
+            os.replace(self.path / (name + '.tmp'), self.path / name)
+        self._open_arrays()
+
+    def _append_texts(self, candidate_id: str, record_hash: str, texts: Dict[str, str]) -> int:
+        line = json.dumps({'id': candidate_id, 'hash': record_hash, 'texts': texts}, ensure_ascii=False)
+        with open(self.path / TEXTS_FILE, 'ab') as f:
+            offset = f.tell()
+            f.write(line.encode('utf-8') + b'\n')
+        return offset
+
+    def _write_index(self) -> None:
+        index = {
+            'version': STORE_VERSION,
+            'fingerprint': self.fingerprint,
+            'vector_columns': self.vector_columns,
+            'feature_names': self.feature_names,
+            'dim': self.dim,
+            'dtype': self.dtype.name,
+            'n_slots': self._n_slots,
+            'entries': self._entries
+        }
+        index_path = self.path / INDEX_FILE
+        tmp_path = self.path / (INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+        stat = index_path.stat()
+        self._index_stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _check_compatible(self, index: Dict[str, Any]) -> None:
+        expected = {
+            'version': STORE_VERSION,
+            'fingerprint': self.fingerprint,
+            'vector_columns': self.vector_columns,
+            'feature_names': self.feature_names,
+            'dim': self.dim,
+            'dtype': self.dtype.name
+        }
+        mismatched = [key for key, value in expected.items() if index.get(key) != value]
+        if mismatched:
+            raise ValueError(
+                f"Store de candidatos em {self.path} incompatível com a configuração atual "
+                f"({', '.join(mismatched)}); recrie o store"
+            )
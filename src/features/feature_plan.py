@@ -0,0 +1,75 @@
+"""
+Plano de features derivado da ordem de features do modelo
+
+O pipeline de predição embute 14 colunas de texto, mas o modelo consome apenas
+as similaridades de cosseno listadas em `model_features_order`. O plano abaixo
+resolve, a partir dessa lista, quais similaridades precisam ser calculadas e
+quais vetores de documento elas exigem, evitando embeddings desnecessários.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+
+# Colunas de texto (pós-merge) que possuem embedding no pipeline de predição
+TEXT_EMBEDDING_COLUMNS: List[str] = [
+    'objetivo_profissional_cand', 'outro_idioma_cand', 'area_atuacao_cand',
+    'conhecimentos_tecnicos_cand', 'certificacoes_cand',
+    'outras_certificacoes_cand', 'cargo_atual_cand', 'cv_pt_cand',
+    'titulo_vaga_vaga', 'nivel profissional_vaga', 'outro_idioma_vaga',
+    'areas_atuacao_vaga', 'principais_atividades_vaga',
+    'competencia_tecnicas_e_comportamentais_vaga'
+]
+
+# Similaridades de cosseno: feature -> (coluna do candidato, coluna da vaga)
+SIMILARITY_FEATURES: Dict[str, Tuple[str, str]] = {
+    'objetivo_sim': ('objetivo_profissional_cand', 'titulo_vaga_vaga'),
+    'cargo_sim': ('cargo_atual_cand', 'titulo_vaga_vaga'),
+    'exp_sim': ('area_atuacao_cand', 'titulo_vaga_vaga'),
+    'outro_idioma_sim': ('outro_idioma_cand', 'outro_idioma_vaga'),
+    'area_atuacao_sim': ('area_atuacao_cand', 'areas_atuacao_vaga'),
+    'certificacoes_sim': ('certificacoes_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+    'outras_certificacoes_sim': ('outras_certificacoes_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+    'conhecimentos_tecnicos_sim': ('conhecimentos_tecnicos_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+    'atividades_sim': ('cv_pt_cand', 'principais_atividades_vaga'),
+    'competencias_sim': ('cv_pt_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+}
+
+
+@dataclass
+class FeaturePlan:
+    """Similaridades e vetores de documento necessários para o modelo."""
+    similarity_features: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    embedding_columns: List[str] = field(default_factory=list)
+
+    @property
+    def candidate_columns(self) -> List[str]:
+        """Colunas de texto do candidato que precisam de vetor de documento."""
+        return [col for col in self.embedding_columns if col.endswith('_cand')]
+
+    @property
+    def vacancy_columns(self) -> List[str]:
+        """Colunas de texto da vaga que precisam de vetor de documento."""
+        return [col for col in self.embedding_columns if col.endswith('_vaga')]
+
+
+def build_feature_plan(model_features_order: Sequence[str]) -> FeaturePlan:
+    """
+    Monta o plano de features a partir da ordem de features do modelo.
+
+    Args:
+        model_features_order: Features consumidas pelo modelo, na ordem de treino.
+
+    Returns:
+        FeaturePlan com as similaridades usadas pelo modelo e as colunas de
+        texto (na ordem de TEXT_EMBEDDING_COLUMNS) cujos vetores elas exigem.
+    """
+    wanted = set(model_features_order)
+    similarity_features = {
+        name: pair for name, pair in SIMILARITY_FEATURES.items() if name in wanted
+    }
+    needed = {col for pair in similarity_features.values() for col in pair}
+    embedding_columns = [col for col in TEXT_EMBEDDING_COLUMNS if col in needed]
+
+    return FeaturePlan(similarity_features=similarity_features,
+                       embedding_columns=embedding_columns)
@@ -0,0 +1,226 @@
+"""
+Leitura em streaming dos dumps JSON brutos (applicants, prospects e vagas)
+
+Os dumps são um único objeto JSON `{id: registro, ...}` com seções aninhadas
+em cada registro. `pd.read_json(..., orient='index')` seguido de um
+`json_normalize` por seção mantém em memória o arquivo inteiro, o DataFrame
+bruto e uma cópia por seção. Aqui o arquivo é lido em blocos e decodificado
+registro a registro (`json.JSONDecoder.raw_decode`); de cada registro são
+extraídos apenas os campos usados pelo treino, gravados direto em buffers
+por coluna. Strings repetidas (níveis, áreas, status) são armazenadas uma
+única vez, então o pico de memória acompanha as colunas selecionadas e não o
+JSON bruto.
+
+Os valores seguem as regras do `json_normalize`: campo ausente ou objeto
+aninhado vira NaN, `null` vira None e, se um campo aparece em mais de uma
+seção, vale a primeira ocorrência (campos de topo antes das seções, seções na
+ordem dada).
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Caracteres lidos do arquivo por vez
+DEFAULT_READ_SIZE = 1 << 20
+
+# Seções aninhadas de cada dump (para cada seção, usa a primeira chave encontrada)
+APPLICANT_SECTIONS: List[Tuple[str, ...]] = [
+    ('infos_basicas',), ('informacoes_pessoais',), ('informacoes_profissionais',),
+    ('formacao_e_idiomas',), ('cargo_atual',)
+]
+VACANCY_SECTIONS: List[Tuple[str, ...]] = [
+    ('informacoes_basicas',), ('perfil_vaga',), ('beneficios',)
+]
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _JsonStream:
+    """Buffer de leitura com decodificação incremental de valores JSON."""
+
+    def __init__(self, file, read_size: int):
+        self._file = file
+        self._read_size = read_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Lê mais um bloco do arquivo, descartando o trecho já consumido."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._read_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Próximo caractere que não é espaço em branco ('' no fim do arquivo)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON inválido: esperado {char!r}, encontrado {found or 'fim do arquivo'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decodifica o próximo valor, lendo mais blocos enquanto ele estiver incompleto."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Um número no fim do buffer pode continuar no próximo bloco
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
+
+
+def iter_json_object(path: Union[str, Path], read_size: int = DEFAULT_READ_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Itera os pares (chave, valor) de um arquivo com um objeto JSON no topo,
+    decodificando um valor por vez.
+
+    Args:
+        path: Caminho do arquivo JSON.
+        read_size: Caracteres lidos do arquivo por vez.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f, read_size)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            yield key, stream.value()
+            if stream.peek() == ',':
+                stream.expect(',')
+                continue
+            stream.expect('}')
+            return
+
+
+def flatten_record(record: Any, sections: Sequence[Tuple[str, ...]],
+                   fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Extrai os campos selecionados de um registro com seções aninhadas.
+
+    Args:
+        record: Registro do dump (dict); outros valores geram apenas NaN.
+        sections: Seções a expandir; para cada uma usa a primeira chave presente.
+        fields: Campos a extrair.
+
+    Returns:
+        Dict campo -> valor para cada campo de `fields`.
+    """
+    if not isinstance(record, dict):
+        return {field: np.nan for field in fields}
+
+    used_sections = []
+    for keys in sections:
+        used_key = next((key for key in keys if key in record), None)
+        if used_key is not None:
+            used_sections.append(used_key)
+    nested = [record[key] for key in used_sections if isinstance(record[key], dict)]
+
+    values: Dict[str, Any] = {}
+    for field in fields:
+        if field in record and field not in used_sections:
+            value = record[field]
+        else:
+            value = next((part[field] for part in nested if field in part), np.nan)
+        # Objetos aninhados viram colunas 'campo.subcampo' no json_normalize
+        values[field] = np.nan if isinstance(value, dict) else value
+    return values
+
+
+class _ColumnBuffer:
+    """Valores de uma coluna, com strings repetidas armazenadas uma única vez."""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._strings: Dict[str, str] = {}
+
+    def append(self, value: Any) -> None:
+        if isinstance(value, str):
+            value = self._strings.setdefault(value, value)
+        self.values.append(value)
+
+
+def _to_frame(buffers: Dict[str, _ColumnBuffer]) -> pd.DataFrame:
+    return pd.DataFrame({column: buffer.values for column, buffer in buffers.items()})
+
+
+def load_records(path: Union[str, Path], sections: Sequence[Tuple[str, ...]], fields: Sequence[str],
+                 id_column: str = 'id', read_size: int = DEFAULT_READ_SIZE) -> pd.DataFrame:
+    """
+    Carrega um dump `{id: registro}` com apenas os campos selecionados.
+
+    Args:
+        path: Caminho do dump JSON.
+        sections: Seções aninhadas dos registros (ex.: APPLICANT_SECTIONS).
+        fields: Campos a manter, após expandir as seções.
+        id_column: Nome da coluna com o id (chave do registro, como string).
+        read_size: Caracteres lidos do arquivo por vez.
+
+    Returns:
+        DataFrame com `id_column` + `fields`, um registro por linha, na ordem do arquivo.
+    """
+    buffers = {column: _ColumnBuffer() for column in [id_column, *fields]}
+    for record_id, record in iter_json_object(path, read_size):
+        buffers[id_column].append(record_id)
+        for field, value in flatten_record(record, sections, fields).items():
+            buffers[field].append(value)
+    return _to_frame(buffers)
+
+
+def load_prospects(path: Union[str, Path], vacancy_fields: Sequence[str], prospect_fields: Sequence[str],
+                   list_key: str = 'prospects', id_column: str = 'id_vaga',
+                   read_size: int = DEFAULT_READ_SIZE) -> pd.DataFrame:
+    """
+    Carrega o dump de prospects com uma linha por prospect (equivalente a
+    `explode` da lista `list_key` seguido de `json_normalize`).
+
+    Args:
+        path: Caminho do dump JSON `{id_vaga: {..., list_key: [prospect, ...]}}`.
+        vacancy_fields: Campos de topo de cada vaga repetidos em cada linha.
+        prospect_fields: Campos de cada prospect.
+        list_key: Chave da lista de prospects.
+        id_column: Nome da coluna com o id da vaga.
+        read_size: Caracteres lidos do arquivo por vez.
+
+    Returns:
+        DataFrame com `id_column` + `vacancy_fields` + `prospect_fields`. Vagas
+        sem prospects geram uma linha com os campos do prospect em NaN.
+    """
+    buffers = {column: _ColumnBuffer() for column in [id_column, *vacancy_fields, *prospect_fields]}
+    for vacancy_id, vacancy in iter_json_object(path, read_size):
+        vacancy_values = flatten_record(vacancy, [], vacancy_fields)
+        prospects: Optional[list] = vacancy.get(list_key) if isinstance(vacancy, dict) else None
+        for prospect in (prospects or [None]):
+            buffers[id_column].append(vacancy_id)
+            for field, value in vacancy_values.items():
+                buffers[field].append(value)
+            for field, value in flatten_record(prospect, [], prospect_fields).items():
+                buffers[field].append(value)
+    return _to_frame(buffers)
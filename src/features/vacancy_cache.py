@@ -0,0 +1,117 @@
+"""
+Cache em memória de blocos de features de vagas
+
+O lado da vaga (padronização de oito colunas, regex de senioridade, one-hot
+dos tipos de contratação e vetores de documento) é recalculado a cada par
+candidato/vaga. Vagas "quentes" recebem dezenas de predições por dia com o
+mesmo conteúdo, então o bloco calculado por
+`PredictionPipeline.build_vacancy_block` é guardado por id de vaga, junto com
+o hash do conteúdo, em um LRU com tempo de expiração.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.features.candidate_store import content_hash
+
+
+BlockBuilder = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# Eventos reportados ao listener (ver `VacancyFeatureCache.listener`)
+CACHE_HIT = 'hit'
+CACHE_MISS = 'miss'
+CACHE_PUT = 'put'
+EVICTION_CAPACITY = 'capacity'
+EVICTION_EXPIRED = 'expired'
+
+
+class VacancyFeatureCache:
+    """LRU + TTL de blocos de vagas, seguro para uso entre threads."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_size: Quantidade máxima de vagas em cache.
+            ttl_seconds: Tempo de vida de cada entrada (desde o cálculo do bloco).
+            clock: Relógio monotônico (injetável nos testes).
+        """
+        if max_size <= 0:
+            raise ValueError("max_size deve ser positivo")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds deve ser positivo")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: 'OrderedDict[str, Tuple[str, Dict[str, Any], float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Chamado como listener(evento, motivo); motivo só é usado em remoções
+        self.listener: Optional[Callable[[str, Optional[str]], None]] = None
+        self.stats = {CACHE_HIT: 0, CACHE_MISS: 0, CACHE_PUT: 0, EVICTION_CAPACITY: 0, EVICTION_EXPIRED: 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, vacancy_id: str, record_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Bloco da vaga em cache, ou None se ausente, expirado ou (quando
+        `record_hash` é informado) calculado a partir de outro conteúdo.
+        """
+        vacancy_id = str(vacancy_id)
+        with self._lock:
+            entry = self._entries.get(vacancy_id)
+            if entry is not None and entry[2] <= self._clock():
+                del self._entries[vacancy_id]
+                self._record('eviction', EVICTION_EXPIRED)
+                entry = None
+
+            if entry is None or (record_hash is not None and entry[0] != record_hash):
+                self._record(CACHE_MISS)
+                return None
+
+            self._entries.move_to_end(vacancy_id)
+            self._record(CACHE_HIT)
+            return entry[1]
+
+    def put(self, vacancy_id: str, record_hash: str, block: Dict[str, Any]) -> None:
+        """Guarda o bloco da vaga, removendo as entradas menos usadas se necessário."""
+        vacancy_id = str(vacancy_id)
+        with self._lock:
+            self._entries[vacancy_id] = (record_hash, block, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(vacancy_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._record('eviction', EVICTION_CAPACITY)
+            self._record(CACHE_PUT)
+
+    def get_or_build(self, vacancy_id: str, record: Dict[str, Any],
+                     build_block: BlockBuilder) -> Optional[Dict[str, Any]]:
+        """
+        Bloco da vaga `{vacancy_id: record}`, calculado só se não estiver em
+        cache com o mesmo conteúdo. Retorna None se o builder não suportar o
+        registro (nada é guardado nesse caso).
+        """
+        record_hash = content_hash(record)
+        block = self.get(vacancy_id, record_hash)
+        if block is None:
+            block = build_block({str(vacancy_id): record})
+            if block is not None:
+                self.put(vacancy_id, record_hash, block)
+        return block
+
+    def invalidate(self, vacancy_id: str) -> bool:
+        """Remove uma vaga do cache; retorna False se ela não estava em cache."""
+        with self._lock:
+            return self._entries.pop(str(vacancy_id), None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _record(self, event: str, reason: Optional[str] = None) -> None:
+        self.stats[reason or event] += 1
+        if self.listener is not None:
+            self.listener(event, reason)
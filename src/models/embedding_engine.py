@@ -0,0 +1,113 @@
+"""
+Motor de vetores de documento em lote
+
+`utils.document_vector` monta, para cada texto, uma lista Python com o vetor de
+cada palavra (`model[word]`) e chama `np.mean`. Este módulo calcula os mesmos
+vetores para um lote inteiro de textos:
+
+- cada texto distinto é tokenizado uma única vez em um array int32 de ids do
+  vocabulário (com cache LRU, já que vagas e cargos se repetem entre linhas);
+- a média é acumulada posição a posição sobre a matriz de embeddings: os
+  documentos são ordenados por tamanho e, para cada posição j, os vetores do
+  j-ésimo token de todos os documentos com mais de j tokens são somados com
+  um único gather. A ordem das somas é a mesma do `np.mean`, então o
+  resultado é idêntico bit a bit ao de `document_vector`.
+
+Uso:
+    engine = EmbeddingEngine(model_w2v)
+    matriz = engine.embed(textos)   # (n_textos x dim), float32
+"""
+
+from functools import lru_cache
+from typing import Any, List, Sequence
+
+import numpy as np
+import pandas as pd
+from gensim.models import KeyedVectors
+
+
+# Textos tokenizados mantidos em cache por instância
+DEFAULT_TOKEN_CACHE_SIZE = 8192
+
+_SEM_TOKENS = np.zeros(0, dtype=np.int32)
+
+
+class EmbeddingEngine:
+    """Vetores médios de Word2Vec para lotes de textos."""
+
+    def __init__(self, model: KeyedVectors, token_cache_size: int = DEFAULT_TOKEN_CACHE_SIZE):
+        self.model = model
+        self.dim = model.vector_size
+        self._vectors = model.vectors
+        self._key_to_index = model.key_to_index
+        self.token_ids = lru_cache(maxsize=token_cache_size)(self._token_ids)
+
+    def _token_ids(self, text: str) -> np.ndarray:
+        """Ids (int32) das palavras do texto presentes no vocabulário, na ordem do texto."""
+        index = self._key_to_index
+        ids = [index[word] for word in text.split() if word in index]
+        return np.array(ids, dtype=np.int32) if ids else _SEM_TOKENS
+
+    def _mean_vectors(self, docs: List[np.ndarray]) -> np.ndarray:
+        """Média dos vetores de cada documento (linhas de zeros para documentos sem tokens)."""
+        counts = np.fromiter((len(ids) for ids in docs), dtype=np.int64, count=len(docs))
+        sums = np.zeros((len(docs), self.dim), dtype=self._vectors.dtype)
+        if not counts.any():
+            return sums.astype(np.float32, copy=False)
+
+        # Documentos em ordem decrescente de tamanho: na posição j, os que
+        # ainda têm tokens formam um prefixo [:ativos]
+        order = np.argsort(-counts, kind='stable')
+        sorted_counts = counts[order]
+        flat_ids = np.concatenate([docs[i] for i in order])
+        starts = np.concatenate(([0], np.cumsum(sorted_counts)[:-1]))
+
+        sorted_sums = sums[order]
+        ativos = int(np.count_nonzero(sorted_counts))
+        for posicao in range(int(sorted_counts[0])):
+            while sorted_counts[ativos - 1] <= posicao:
+                ativos -= 1
+            sorted_sums[:ativos] += self._vectors[flat_ids[starts[:ativos] + posicao]]
+
+        sorted_sums /= np.maximum(sorted_counts, 1).astype(sorted_sums.dtype)[:, None]
+        sums[order] = sorted_sums
+        return sums.astype(np.float32, copy=False)
+
+    def embed(self, texts: Sequence[Any]) -> np.ndarray:
+        """
+        Vetores de documento de uma sequência de textos.
+
+        Args:
+            texts: Textos já padronizados; valores que não são texto (None,
+                   NaN) geram um vetor de zeros, como em `document_vector`.
+
+        Returns:
+            Matriz densa (len(texts) x dim) em float32.
+        """
+        # Cada texto distinto é calculado uma vez; -1 aponta para a linha de zeros
+        distinct = {}
+        rows = np.fromiter(
+            (distinct.setdefault(text, len(distinct)) if isinstance(text, str) else -1 for text in texts),
+            dtype=np.int64, count=len(texts)
+        )
+        vectors = self._mean_vectors([self.token_ids(text) for text in distinct])
+        vectors = np.vstack([vectors, np.zeros((1, self.dim), dtype=np.float32)])
+        return vectors[rows]
+
+    def embed_one(self, text: Any) -> np.ndarray:
+        """Vetor de documento (dim,) em float32 de um único texto."""
+        return self.embed([text])[0]
+
+    def expand(self, df: pd.DataFrame, feature_list: List[str]) -> pd.DataFrame:
+        """
+        Equivalente em lote de `utils.expand_vector`: remove as colunas de
+        texto de `df` e retorna um DataFrame com as colunas `<feature>_emb_<i>`.
+        """
+        frames = []
+        for feature in feature_list:
+            columns = [f'{feature}_emb_{i}' for i in range(self.dim)]
+            frames.append(pd.DataFrame(self.embed(df[feature].tolist()), columns=columns, index=df.index))
+            df.drop(columns=[feature], inplace=True)
+        if not frames:
+            return pd.DataFrame(index=df.index)
+        return pd.concat(frames, axis=1)
@@ -0,0 +1,368 @@
+"""
+Busca paralela de hiperparâmetros do XGBRegressor com successive halving
+
+O bloco `model_params.xgbregressor` do `config/config.yaml` era ajustado à mão,
+com um único `model.fit` por tentativa. Este módulo:
+
+- parte da matriz de features gravada por `train.py` (etapa `features` do
+  `StageCache`), sem refazer o pré-processamento. A chave da etapa é
+  recalculada como no treino (`training_stages.stage_keys`), então a busca só
+  usa uma matriz produzida pelos dados, pelo código e pela `feature_list`
+  atuais;
+- repete a divisão treino/teste do `train.py` e separa uma fração do treino
+  como validação, usada no early stopping;
+- sorteia candidatos do espaço de busca e os avalia por successive halving:
+  cada rodada treina os candidatos restantes com `eta` vezes mais árvores que
+  a anterior e mantém apenas o melhor `1/eta` (RMSE de validação);
+- distribui os treinos por um pool de processos, cada worker com `n_jobs`
+  fixo em uma fatia dos núcleos (workers x threads <= CPUs), evitando
+  disputa entre as threads do XGBoost;
+- grava a tabela de resultados (`trials.csv`) e uma nova versão do config
+  (`config/versions/config_vNNN.yaml`) com os melhores parâmetros, que pode
+  ser usada no treino via `TRAIN_CONFIG_PATH`.
+
+Uso:
+    python -m src.models.hyperparameter_search --n-candidates 27 --n-workers 4
+"""
+
+import argparse
+import logging
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import yaml
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+from sklearn.model_selection import ParameterSampler, train_test_split
+from xgboost import XGBRegressor
+
+from src.models.stage_cache import StageCache
+from src.models.training_stages import stage_keys
+
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CONFIG_PATH = PROJECT_ROOT / 'config' / 'config.yaml'
+
+# Espaço de busca padrão (sobrescrito por `hyperparameter_search.space` no config)
+DEFAULT_SEARCH_SPACE: Dict[str, List[Any]] = {
+    'max_depth': [3, 4, 5, 6, 7, 8, 9, 10],
+    'learning_rate': [0.005, 0.01, 0.02, 0.05, 0.1],
+    'subsample': [0.6, 0.7, 0.8, 0.9, 1.0],
+    'colsample_bytree': [0.5, 0.6, 0.7, 0.8, 0.9, 1.0],
+    'gamma': [0, 0.1, 0.5, 1],
+    'reg_alpha': [0, 0.01, 0.1, 1],
+    'reg_lambda': [0.5, 1, 2, 5],
+}
+
+# Divisão treino/teste idêntica à do train.py
+TEST_SIZE = 0.2
+SPLIT_RANDOM_STATE = 42
+
+# Dados de treino/validação de cada worker (definidos em `_init_worker`)
+_DATA: Optional[Dict[str, Any]] = None
+
+
+def sample_candidates(space: Dict[str, Sequence[Any]], n_candidates: int,
+                      random_state: int = 0) -> List[Dict[str, Any]]:
+    """
+    Sorteia combinações distintas de hiperparâmetros.
+
+    Args:
+        space: Parâmetro -> lista de valores (ou distribuição do scipy).
+        n_candidates: Número de candidatos; limitado ao tamanho do grid
+                      quando todos os valores são listas.
+        random_state: Semente do sorteio.
+    """
+    return list(ParameterSampler(space, n_iter=n_candidates, random_state=random_state))
+
+
+def rung_budgets(min_n_estimators: int, max_n_estimators: int, eta: int) -> List[int]:
+    """
+    Número de árvores de cada rodada do successive halving.
+
+    Args:
+        min_n_estimators: Árvores da primeira rodada.
+        max_n_estimators: Limite de árvores da última rodada.
+        eta: Fator de crescimento do orçamento (e de redução dos candidatos).
+
+    Returns:
+        Lista crescente de orçamentos, começando em `min_n_estimators`.
+    """
+    if eta < 2:
+        raise ValueError(f"eta deve ser pelo menos 2: {eta}")
+    if not 0 < min_n_estimators <= max_n_estimators:
+        raise ValueError(f"Orçamento inválido: min={min_n_estimators}, max={max_n_estimators}")
+    n_rungs = int(math.floor(math.log(max_n_estimators / min_n_estimators, eta) + 1e-9)) + 1
+    return [min_n_estimators * eta ** i for i in range(n_rungs)]
+
+
+def split_train_validation(X: pd.DataFrame, y: pd.Series, sample_weight: pd.Series,
+                           validation_size: float = 0.2,
+                           random_state: int = SPLIT_RANDOM_STATE) -> Dict[str, Any]:
+    """
+    Divide a matriz final em treino, validação e teste.
+
+    O teste é o mesmo do train.py (20%, random_state=42) e fica fora da busca;
+    a validação sai do treino e é usada no early stopping e na poda.
+    """
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=SPLIT_RANDOM_STATE
+    )
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=validation_size, random_state=random_state
+    )
+    return {
+        'X_fit': X_fit, 'y_fit': y_fit, 'w_fit': sample_weight.loc[X_fit.index],
+        'X_val': X_val, 'y_val': y_val,
+        'X_train': X_train, 'y_train': y_train, 'w_train': sample_weight.loc[X_train.index],
+        'X_test': X_test, 'y_test': y_test,
+    }
+
+
+def _init_worker(data: Dict[str, Any]) -> None:
+    global _DATA
+    _DATA = data
+
+
+def _fit_trial(trial: Dict[str, Any]) -> Dict[str, Any]:
+    """Treina um candidato com o orçamento da rodada e mede o RMSE de validação."""
+    params = {**trial['params'], 'n_estimators': trial['n_estimators'], 'n_jobs': trial['n_jobs'],
+              'early_stopping_rounds': trial['early_stopping_rounds'], 'eval_metric': 'rmse'}
+    start = time.perf_counter()
+    model = XGBRegressor(**params)
+    model.fit(_DATA['X_fit'], _DATA['y_fit'], sample_weight=_DATA['w_fit'],
+              eval_set=[(_DATA['X_val'], _DATA['y_val'])], verbose=False)
+    return {
+        'candidate': trial['candidate'],
+        'rung': trial['rung'],
+        'n_estimators': trial['n_estimators'],
+        'best_iteration': int(model.best_iteration),
+        'val_rmse': float(model.best_score),
+        'fit_seconds': time.perf_counter() - start,
+        **trial['candidate_params'],
+    }
+
+
+def successive_halving(data: Dict[str, Any], candidates: List[Dict[str, Any]],
+                       base_params: Optional[Dict[str, Any]] = None,
+                       min_n_estimators: int = 50, max_n_estimators: int = 1350, eta: int = 3,
+                       early_stopping_rounds: int = 30, n_workers: Optional[int] = None,
+                       threads_per_worker: Optional[int] = None) -> pd.DataFrame:
+    """
+    Avalia os candidatos por successive halving em um pool de processos.
+
+    Args:
+        data: Saída de `split_train_validation`.
+        candidates: Combinações de hiperparâmetros (ver `sample_candidates`).
+        base_params: Parâmetros fixos, sobrescritos pelos de cada candidato
+                     (ex.: `model_params.xgbregressor` atual).
+        min_n_estimators: Árvores da primeira rodada.
+        max_n_estimators: Limite de árvores da última rodada.
+        eta: A cada rodada o orçamento é multiplicado e os candidatos divididos por `eta`.
+        early_stopping_rounds: Rodadas sem melhora na validação antes de parar.
+        n_workers: Processos (padrão: CPUs / threads_per_worker). Com 1 os
+                   treinos rodam no próprio processo.
+        threads_per_worker: `n_jobs` do XGBoost em cada worker (padrão:
+                            CPUs / n_workers).
+
+    Returns:
+        Tabela com uma linha por treino (candidato x rodada), incluindo
+        `val_rmse`, `best_iteration` e os hiperparâmetros do candidato.
+    """
+    if not candidates:
+        raise ValueError("Nenhum candidato para avaliar")
+    base_params = {key: value for key, value in (base_params or {}).items()
+                   if key not in ('n_estimators', 'n_jobs', 'early_stopping_rounds', 'eval_metric')}
+    cpus = os.cpu_count() or 1
+    if n_workers is None:
+        n_workers = max(1, cpus // (threads_per_worker or 1))
+    n_workers = max(1, min(n_workers, len(candidates)))
+    threads_per_worker = threads_per_worker or max(1, cpus // n_workers)
+
+    executor = None
+    if n_workers > 1:
+        executor = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(data,))
+    else:
+        _init_worker(data)
+
+    rows: List[Dict[str, Any]] = []
+    alive = list(range(len(candidates)))
+    try:
+        for rung, n_estimators in enumerate(rung_budgets(min_n_estimators, max_n_estimators, eta)):
+            trials = [{
+                'candidate': i,
+                'rung': rung,
+                'n_estimators': n_estimators,
+                'n_jobs': threads_per_worker,
+                'early_stopping_rounds': early_stopping_rounds,
+                'params': {**base_params, **candidates[i]},
+                'candidate_params': candidates[i],
+            } for i in alive]
+            results = list(executor.map(_fit_trial, trials)) if executor else [_fit_trial(t) for t in trials]
+            rows.extend(results)
+            logger.info(f"Rodada {rung}: {len(results)} candidatos com {n_estimators} árvores, "
+                        f"melhor val_rmse={min(r['val_rmse'] for r in results):.5f}")
+
+            ranked = sorted(results, key=lambda r: (r['val_rmse'], r['candidate']))
+            alive = [r['candidate'] for r in ranked[:max(1, len(ranked) // eta)]]
+            if len(ranked) == 1:
+                break
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return pd.DataFrame(rows)
+
+
+def best_params(results: pd.DataFrame, candidates: List[Dict[str, Any]],
+                base_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parâmetros do melhor treino da última rodada, com `n_estimators` ajustado
+    para a melhor iteração do early stopping.
+    """
+    last = results[results['rung'] == results['rung'].max()]
+    best = last.sort_values(['val_rmse', 'candidate']).iloc[0]
+    params = {**(base_params or {}), **candidates[int(best['candidate'])]}
+    params['n_estimators'] = int(best['best_iteration']) + 1
+    return {key: value.item() if isinstance(value, np.generic) else value for key, value in params.items()}
+
+
+def write_versioned_config(config: Dict[str, Any], params: Dict[str, Any],
+                           versions_dir: Union[str, Path], summary: Dict[str, Any]) -> Path:
+    """
+    Grava uma cópia do config com `model_params.xgbregressor` substituído.
+
+    Args:
+        config: Config atual.
+        params: Novos hiperparâmetros do XGBRegressor.
+        versions_dir: Diretório das versões (`config_vNNN.yaml`).
+        summary: Resumo da busca, gravado como comentário no topo do arquivo.
+
+    Returns:
+        Caminho da nova versão.
+    """
+    versions_dir = Path(versions_dir)
+    versions_dir.mkdir(parents=True, exist_ok=True)
+    existing = [int(m.group(1)) for path in versions_dir.glob('config_v*.yaml')
+                if (m := re.fullmatch(r'config_v(\d+)\.yaml', path.name))]
+    path = versions_dir / f'config_v{max(existing, default=0) + 1:03d}.yaml'
+
+    new_config = {**config, 'model_params': {**config.get('model_params', {}), 'xgbregressor': params}}
+    header = ''.join(f'# {key}: {value}\n' for key, value in summary.items())
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        yaml.safe_dump(new_config, f, sort_keys=False, allow_unicode=True)
+    return path
+
+
+def load_features(cache_dir: Union[str, Path], feature_list: List[str]) -> Tuple[Dict[str, Any], str]:
+    """
+    Matriz final do treino para os dados, o código e a `feature_list` atuais.
+
+    Args:
+        cache_dir: Raiz do `StageCache` do treino.
+        feature_list: `feature_list` do config.
+
+    Returns:
+        (saídas da etapa `features`, chave da etapa).
+
+    Raises:
+        SystemExit: Se os arquivos de entrada do treino não existirem ou se
+            `train.py` ainda não gravou a matriz com essa chave.
+    """
+    cache = StageCache(cache_dir)
+    try:
+        key = stage_keys(cache, feature_list)['features']
+    except FileNotFoundError as e:
+        raise SystemExit(f"Entrada do treino não encontrada ({e.filename}); "
+                         f"a chave da etapa 'features' depende dela")
+    features = cache.load('features', key)
+    if features is None:
+        raise SystemExit(f"Matriz de features {key[:12]} ausente em {cache_dir}; "
+                         f"execute train.py com os dados e o código atuais antes da busca")
+    return features, key
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Busca de hiperparâmetros do XGBRegressor com successive halving'
+    )
+    parser.add_argument('--config', default=str(CONFIG_PATH), help='Config base')
+    parser.add_argument('--cache-dir', default=None,
+                        help='Cache das etapas do treino (padrão: stage_cache.path do config)')
+    parser.add_argument('--output-dir', default=str(PROJECT_ROOT / 'artifacts' / 'search'),
+                        help='Diretório da tabela de resultados')
+    parser.add_argument('--versions-dir', default=None,
+                        help='Diretório das versões do config (padrão: <config>/versions)')
+    parser.add_argument('--n-candidates', type=int, default=None)
+    parser.add_argument('--n-workers', type=int, default=None)
+    parser.add_argument('--threads-per-worker', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config_path = Path(args.config)
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    search_config = config.get('hyperparameter_search', {})
+    seed = args.seed if args.seed is not None else search_config.get('seed', 0)
+
+    cache_dir = args.cache_dir or PROJECT_ROOT / config.get('stage_cache', {}).get('path', 'artifacts/cache')
+    features, features_key = load_features(cache_dir, config['feature_list'])
+    logger.info(f"Matriz de features da etapa 'features' com chave {features_key}")
+
+    data = split_train_validation(features['X'], features['y'], features['sample_weight'],
+                                  validation_size=search_config.get('validation_size', 0.2),
+                                  random_state=seed)
+    base_params = config['model_params']['xgbregressor']
+    candidates = sample_candidates(search_config.get('space', DEFAULT_SEARCH_SPACE),
+                                   args.n_candidates or search_config.get('n_candidates', 27),
+                                   random_state=seed)
+    results = successive_halving(
+        data, candidates, base_params=base_params,
+        min_n_estimators=search_config.get('min_n_estimators', 50),
+        max_n_estimators=search_config.get('max_n_estimators', 1350),
+        eta=search_config.get('eta', 3),
+        early_stopping_rounds=search_config.get('early_stopping_rounds', 30),
+        n_workers=args.n_workers or search_config.get('n_workers'),
+        threads_per_worker=args.threads_per_worker or search_config.get('threads_per_worker')
+    )
+
+    output_dir = Path(args.output_dir) / datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results.to_csv(output_dir / 'trials.csv', index=False)
+
+    # Avaliação final no teste do train.py, treinando no treino completo
+    params = best_params(results, candidates, base_params)
+    model = XGBRegressor(**params)
+    model.fit(data['X_train'], data['y_train'], sample_weight=data['w_train'])
+    y_pred = model.predict(data['X_test'])
+    summary = {
+        'gerado_por': 'src.models.hyperparameter_search',
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'base': config_path.name,
+        'features': features_key,
+        'treinos': len(results),
+        'val_rmse': round(float(results[results['rung'] == results['rung'].max()]['val_rmse'].min()), 6),
+        'test_rmse': round(float(np.sqrt(mean_squared_error(data['y_test'], y_pred))), 6),
+        'test_mae': round(float(mean_absolute_error(data['y_test'], y_pred)), 6),
+        'resultados': str(output_dir / 'trials.csv'),
+    }
+    version_path = write_versioned_config(config, params,
+                                          args.versions_dir or config_path.parent / 'versions', summary)
+    logger.info(f"Melhores parâmetros: {params}")
+    logger.info(f"Teste: RMSE={summary['test_rmse']} MAE={summary['test_mae']}")
+    logger.info(f"Resultados em {output_dir / 'trials.csv'}; config salvo em {version_path}")
+
+
+if __name__ == '__main__':
+    main()
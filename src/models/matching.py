@@ -0,0 +1,60 @@
+"""
+Matching em matriz: um conjunto de candidatos contra um conjunto de vagas
+
+Cada lado é processado uma única vez (features numéricas e vetores de documento
+normalizados) e as similaridades de cosseno de todos os pares M x N saem de
+multiplicações de matrizes por blocos. Os blocos limitam a memória: cada um
+tem no máximo `chunk_size` pares.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class MatchingSide:
+    """Um lado do matching (candidatos ou vagas) já pré-processado."""
+    ids: List[str]
+    features: Dict[str, np.ndarray] = field(default_factory=dict)
+    unit_vectors: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """Normaliza as linhas pela norma L2 (linhas nulas continuam nulas)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=(norms != 0))
+
+
+def build_side(ids: List[str], blocks: List[Dict[str, Any]], dtype: Any) -> MatchingSide:
+    """
+    Empilha os blocos de um lado (ver `PredictionPipeline.build_candidate_block`)
+    em arrays por feature e matrizes de vetores unitários por coluna de texto.
+    """
+    side = MatchingSide(ids=list(ids))
+    if not blocks:
+        return side
+
+    for name in blocks[0]['features']:
+        side.features[name] = np.array([block['features'][name] for block in blocks])
+    for col in blocks[0]['vectors']:
+        matrix = np.vstack([block['vectors'][col] for block in blocks]).astype(dtype, copy=False)
+        side.unit_vectors[col] = unit_rows(matrix)
+    return side
+
+
+def iter_blocks(n_rows: int, n_cols: int, chunk_size: int) -> Iterator[Tuple[slice, slice]]:
+    """
+    Percorre a grade n_rows x n_cols em blocos retangulares de no máximo
+    `chunk_size` células, linha a linha.
+    """
+    block_cols = max(1, min(n_cols, chunk_size))
+    block_rows = max(1, chunk_size // block_cols)
+    for row_start in range(0, n_rows, block_rows):
+        rows = slice(row_start, min(row_start + block_rows, n_rows))
+        for col_start in range(0, n_cols, block_cols):
+            yield rows, slice(col_start, min(col_start + block_cols, n_cols))
@@ -0,0 +1,156 @@
+"""
+Exportação do booster do XGBoost e predição nativa
+
+`model.joblib` é um `XGBRegressor` serializado com pickle: depende da mesma
+versão do xgboost/sklearn para carregar e cada `model.predict` passa pelo
+wrapper do sklearn (validação do DataFrame/array, nomes de features, cópia
+para o formato interno). O treino passa a gravar também:
+
+- `model.ubj`: o booster em UBJSON (formato nativo e portável do xgboost);
+- `model.features.json`: ordem das features, faixa de iterações usada na
+  predição e versão do xgboost que gerou o arquivo.
+
+`NativePredictor` chama `Booster.inplace_predict` direto sobre uma matriz
+float32 contígua (o xgboost trabalha internamente em float32, então os scores
+são idênticos aos do `XGBRegressor.predict`), sem DataFrame e sem DMatrix.
+
+Uso (converter um model.joblib já treinado):
+    python -m src.models.native_model artifacts/model.joblib \
+        --artifacts artifacts/preprocessing_artifacts.joblib
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import joblib
+import numpy as np
+import xgboost
+from xgboost import Booster, XGBModel
+
+
+logger = logging.getLogger(__name__)
+
+BOOSTER_SUFFIX = '.ubj'
+METADATA_SUFFIX = '.features.json'
+
+
+def metadata_path(booster_path: Union[str, Path]) -> Path:
+    """Caminho do arquivo de metadados de um booster exportado."""
+    booster_path = Path(booster_path)
+    return booster_path.with_name(booster_path.stem + METADATA_SUFFIX)
+
+
+def _iteration_range(booster: Booster) -> Tuple[int, int]:
+    """Mesma faixa de árvores usada pelo `XGBRegressor.predict` (melhor iteração do early stopping)."""
+    best_iteration = booster.attr('best_iteration')
+    if best_iteration is None:
+        return 0, 0
+    return 0, int(best_iteration) + 1
+
+
+def export_booster(model: Union[XGBModel, Booster], path: Union[str, Path],
+                   feature_names: Optional[Sequence[str]] = None) -> Path:
+    """
+    Grava o booster em UBJSON e os metadados das features ao lado.
+
+    Args:
+        model: XGBRegressor treinado (ou o Booster).
+        path: Caminho do booster (a extensão é trocada para `.ubj`).
+        feature_names: Ordem das colunas esperada na predição. Padrão: os
+                       nomes registrados no booster.
+
+    Returns:
+        Caminho do booster gravado.
+    """
+    booster = model.get_booster() if isinstance(model, XGBModel) else model
+    path = Path(path).with_suffix(BOOSTER_SUFFIX)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    booster.save_model(str(path))
+
+    metadata = {
+        'feature_names': list(feature_names if feature_names is not None else booster.feature_names or []),
+        'iteration_range': list(_iteration_range(booster)),
+        'xgboost_version': xgboost.__version__,
+    }
+    with open(metadata_path(path), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    logger.info(f"Booster exportado em {path} ({booster.num_boosted_rounds()} árvores)")
+    return path
+
+
+class NativePredictor:
+    """
+    Predição direta no booster do XGBoost, sem o wrapper do sklearn.
+
+    Args:
+        booster: Booster treinado.
+        feature_names: Ordem das colunas das matrizes recebidas em `predict`.
+        iteration_range: Faixa de árvores usada na predição ((0, 0) = todas).
+    """
+
+    def __init__(self, booster: Booster, feature_names: Sequence[str],
+                 iteration_range: Tuple[int, int] = (0, 0)):
+        self.booster = booster
+        self.feature_names: List[str] = list(feature_names)
+        self.iteration_range = tuple(iteration_range)
+        self.n_features = booster.num_features()
+        if self.feature_names and len(self.feature_names) != self.n_features:
+            raise ValueError(f"O booster espera {self.n_features} features, "
+                             f"metadados com {len(self.feature_names)}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'NativePredictor':
+        """Carrega um booster exportado por `export_booster`."""
+        booster = Booster()
+        booster.load_model(str(path))
+        with open(metadata_path(path), 'r', encoding='utf-8') as f:
+            metadata: Dict[str, Any] = json.load(f)
+        return cls(booster, metadata['feature_names'], tuple(metadata['iteration_range']))
+
+    @classmethod
+    def from_model(cls, model: XGBModel,
+                   feature_names: Optional[Sequence[str]] = None) -> 'NativePredictor':
+        """Preditor sobre o booster de um XGBRegressor já carregado."""
+        booster = model.get_booster()
+        return cls(booster, feature_names if feature_names is not None else booster.feature_names or [],
+                   _iteration_range(booster))
+
+    def predict(self, features: Any) -> np.ndarray:
+        """
+        Scores de uma matriz de features (n_linhas x n_features), na ordem de
+        `feature_names`. Aceita array, lista ou DataFrame; uma linha 1-D é
+        tratada como matriz 1 x n_features.
+        """
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        if features.ndim == 1:
+            features = features.reshape(1, -1)
+        if features.shape[1] != self.n_features:
+            raise ValueError(f"Esperadas {self.n_features} features, recebidas {features.shape[1]}")
+        return self.booster.inplace_predict(features, iteration_range=self.iteration_range,
+                                            validate_features=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Exporta o booster de um model.joblib para UBJSON + metadados das features'
+    )
+    parser.add_argument('model_path', help='XGBRegressor serializado (model.joblib)')
+    parser.add_argument('--artifacts', default=None,
+                        help='preprocessing_artifacts.joblib (ordem das features em model_features)')
+    parser.add_argument('--output', '-o', default=None,
+                        help='Booster de saída (padrão: <model_path>.ubj)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    model = joblib.load(args.model_path)
+    feature_names = None
+    if args.artifacts:
+        feature_names = joblib.load(args.artifacts).get('model_features')
+    export_booster(model, args.output or Path(args.model_path).with_suffix(BOOSTER_SUFFIX), feature_names)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,149 @@
 import pandas as pd
 import numpy as np
 import joblib
+import hashlib
+import json
 import re
+import tempfile
 import unicodedata
-from gensim.models import KeyedVectors
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 import shap
 
 # Importa as funções de pré-processamento do seu arquivo de utilitários
 from src.models import utils
+from src.models.word2vec_store import carregar_word2vec
+from src.models.embedding_engine import EmbeddingEngine
+from src.models.matching import build_side, iter_blocks
+from src.models.tree_ensemble import TREES_SUFFIX, TreeEnsemble
+try:
+    from src.models.native_model import BOOSTER_SUFFIX, NativePredictor
+except ImportError:  # imagem sem xgboost: apenas o backend 'numpy' com model.trees.npz
+    BOOSTER_SUFFIX, NativePredictor = '.ubj', None
+from src.features.feature_plan import TEXT_EMBEDDING_COLUMNS, build_feature_plan
+from src.core.constants import (
+    EXPLAIN_MODES, DEFAULT_EXPLAIN_MODE, DEFAULT_EXPLAIN_TOP_K, DEFAULT_MATRIX_CHUNK_SIZE,
+    MODEL_BACKENDS, DEFAULT_MODEL_BACKEND
+)
+
+# Seções aninhadas de cada registro (para cada seção, usa a primeira chave encontrada)
+CANDIDATE_SECTIONS: List[Tuple[str, ...]] = [
+    ('infos_basicas', 'informacoes_basicas'), ('informacoes_pessoais',),
+    ('informacoes_profissionais',), ('formacao_e_idiomas',), ('cargo_atual',)
+]
+VACANCY_SECTIONS: List[Tuple[str, ...]] = [
+    ('informacoes_basicas',), ('perfil_vaga',), ('beneficios',)
+]
+
+# Campos brutos usados de cada lado (os ausentes são preenchidos com '')
+CANDIDATE_FIELDS: List[str] = [
+    'pcd', 'objetivo_profissional', 'area_atuacao', 'conhecimentos_tecnicos',
+    'certificacoes', 'outras_certificacoes', 'nivel_academico', 'nivel_ingles',
+    'nivel_espanhol', 'outro_idioma', 'cursos', 'cargo_atual', 'data_admissao',
+    'data_ultima_promocao', 'cv_pt'
+]
+VACANCY_FIELDS: List[str] = [
+    'titulo_vaga', 'vaga_sap', 'cliente', 'solicitante_cliente',
+    'tipo_contratacao', 'vaga_especifica_para_pcd', 'nivel profissional',
+    'nivel_academico', 'nivel_ingles', 'nivel_espanhol', 'outro_idioma',
+    'areas_atuacao', 'principais_atividades', 'competencia_tecnicas_e_comportamentais'
+]
+
+# Campos de texto padronizados por `utils.padroniza_texto`
+CANDIDATE_TEXT_FIELDS: List[str] = [
+    'area_atuacao', 'conhecimentos_tecnicos', 'objetivo_profissional',
+    'certificacoes', 'outras_certificacoes', 'nivel_academico', 'outro_idioma',
+    'cursos', 'cargo_atual', 'cv_pt'
+]
+VACANCY_TEXT_FIELDS: List[str] = [
+    'titulo_vaga', 'vaga_sap', 'vaga_especifica_para_pcd', 'outro_idioma',
+    'areas_atuacao', 'principais_atividades',
+    'competencia_tecnicas_e_comportamentais', 'nivel_academico'
+]
+
+IDIOMA_FIELDS: List[str] = ['nivel_ingles', 'nivel_espanhol']
+
+# Features de comparação entre candidato e vaga calculadas no passo 5
+PAIR_FEATURES: List[str] = [
+    'ingles', 'espanhol', 'gap_senioridade', 'possui_senioridade_minima',
+    'possui_nivel_academico_minimo', 'possui_nivel_ingles_minimo',
+    'possui_nivel_espanhol_minimo', 'compatibilidade_pcd'
+]
+
+# Colunas numéricas de cada lado disponíveis para o modelo (sem sufixo)
+CANDIDATE_BLOCK_FEATURES: List[str] = [
+    'pcd', 'senioridade', 'nivel_ingles_encoded', 'nivel_espanhol_encoded',
+    'nivel_academico_encoded'
+]
+VACANCY_BLOCK_FEATURES: List[str] = [
+    'vaga_sap', 'vaga_especifica_para_pcd', 'senioridade', 'nivel_ingles_encoded',
+    'nivel_espanhol_encoded', 'nivel_academico_encoded'
+]
+
+
+def nome_coluna_contratacao(tipo_contrato: str) -> str:
+    """Nome da coluna indicadora de um tipo de contratação (sem o sufixo '_vaga')."""
+    tipo_normalizado = tipo_contrato.lower()
+    tipo_normalizado = (
+        unicodedata
+        .normalize('NFKD', str(tipo_normalizado))
+        .encode('ascii', 'ignore')
+        .decode('utf-8')
+    )
+    return f"contratacao_{re.sub(r'[^a-zA-Z0-9s]', '', tipo_normalizado).strip().replace(' ', '_')}"
+
 
 class PredictionPipeline:
     """
     Classe para encapsular o pipeline de predição.
     Carrega os artefatos de treinamento e aplica a pipeline em novos dados.
     """
-    def __init__(self, model_path: str, artifacts_path: str, w2v_model_path: str):
+    def __init__(self, model_path: str, artifacts_path: str, w2v_model_path: str,
+                 w2v_format: str = 'auto', backend: str = DEFAULT_MODEL_BACKEND):
         """
         Inicializa o pipeline carregando todos os artefatos necessários.
 
         Args:
-            model_path (str): Caminho para o arquivo do modelo treinado (ex: 'model.joblib').
+            model_path (str): Caminho para o arquivo do modelo treinado: 'model.joblib'
+                              (XGBRegressor), o booster exportado 'model.ubj'
+                              (ver `src.models.native_model`) ou as árvores
+                              compiladas 'model.trees.npz' (`src.models.tree_ensemble`).
             artifacts_path (str): Caminho para os artefatos de pré-processamento 
                                   (encoders, listas de colunas, etc.).
             w2v_model_path (str): Caminho para o modelo Word2Vec pré-treinado.
+            w2v_format (str): 'text', 'binary' (memory-map somente leitura, ver
+                              `src.models.word2vec_store`) ou 'auto'.
+            backend (str): 'xgboost' (`Booster.inplace_predict`) ou 'numpy'
+                           (`TreeEnsemble`, avaliação vetorizada sem xgboost).
         """
+        if backend not in MODEL_BACKENDS:
+            raise ValueError(f"Backend inválido: {backend}. Use um de {MODEL_BACKENDS}")
+        self.backend = backend
         print("Inicializando o pipeline de predição...")
 
         # Carrega o modelo de machine learning
+        self.predictor: Optional[Any] = None
         try:
-            self.model = joblib.load(model_path)
+            if str(model_path).endswith(TREES_SUFFIX):
+                if backend != 'numpy':
+                    raise ValueError(f"{model_path} só pode ser usado com backend='numpy'")
+                self.predictor = TreeEnsemble.load(model_path)
+                self.model = self.predictor
+            elif Path(model_path).suffix == BOOSTER_SUFFIX:
+                if NativePredictor is None:
+                    raise ImportError(f"{model_path} requer o xgboost instalado; sem ele, use "
+                                      f"model{TREES_SUFFIX} com backend='numpy'")
+                self.predictor = NativePredictor.load(model_path)
+                self.model = self.predictor.booster
+            else:
+                self.model = joblib.load(model_path)
         except Exception as e:
             print(f"Erro ao carregar o modelo: {e}")
             raise
 
+        # O explainer SHAP é construído uma única vez e reutilizado em todas as predições
+        self.explainer = self._build_explainer()
+
         # Carrega os artefatos de pré-processamento
         try:
             artifacts = joblib.load(artifacts_path)
@@ -52,8 +161,15 @@ class PredictionPipeline:
             self.ordinal_encoders = {}
             self.model_features_order = []
 
-        # Carrega o modelo Word2Vec
-        self.model_w2v = KeyedVectors.load_word2vec_format(w2v_model_path)
+        self._init_predictor()
+
+        # Similaridades e vetores de documento efetivamente consumidos pelo modelo
+        self.feature_plan = build_feature_plan(self.model_features_order)
+        self._init_fast_path()
+
+        # Carrega o modelo Word2Vec (no formato binário a matriz é compartilhada
+        # entre processos via page cache)
+        self.model_w2v = carregar_word2vec(w2v_model_path, w2v_format)
         self.NUM_FEATURES_W2V = self.model_w2v.vector_size
 
         print("Pipeline pronto para uso.")
@@ -82,87 +198,49 @@ class PredictionPipeline:
             if key_to_use:
                 # Garante que a coluna contenha dicionários, substituindo nulos/outros por dict vazio
                 data_series = df[key_to_use].apply(lambda x: x if isinstance(x, dict) else {})
-                return pd.json_normalize(data_series), key_to_use
+                df_normalized = pd.json_normalize(data_series.tolist())
+                # Alinha ao índice dos registros: sem isso o concat abaixo gera uma
+                # linha por seção em vez de uma linha por registro
+                df_normalized.index = df.index
+                return df_normalized, key_to_use
             
             return pd.DataFrame(), None
 
-        df_infos_basicas, used_key_infos = safe_json_normalize(df_applicants, ['infos_basicas', 'informacoes_basicas'])
-        df_informacoes_pessoais, used_key_pessoais = safe_json_normalize(df_applicants, 'informacoes_pessoais')
-        df_informacoes_profissionais, used_key_profissionais = safe_json_normalize(df_applicants, 'informacoes_profissionais')
-        df_formacao_e_idiomas, used_key_formacao = safe_json_normalize(df_applicants, 'formacao_e_idiomas')
-        df_cargo_atual, used_key_cargo = safe_json_normalize(df_applicants, 'cargo_atual')
-
-        # Coleta as chaves que foram usadas para poder removê-las
-        keys_to_drop_cand = [k for k in [used_key_infos, used_key_pessoais, used_key_profissionais, used_key_formacao, used_key_cargo] if k]
-
-        df_applicants = pd.concat(
-            [
-                df_applicants.drop(columns=keys_to_drop_cand, errors='ignore'),
-                df_infos_basicas,
-                df_informacoes_pessoais,
-                df_informacoes_profissionais,
-                df_formacao_e_idiomas,
-                df_cargo_atual
-            ],
-            axis=1
-        )
+        def normalize_sections(df, sections):
+            """Expande as seções aninhadas de cada registro em colunas."""
+            dfs_normalized = []
+            # Coleta as chaves que foram usadas para poder removê-las
+            keys_to_drop = []
+            for keys in sections:
+                df_section, used_key = safe_json_normalize(df, list(keys))
+                dfs_normalized.append(df_section)
+                if used_key:
+                    keys_to_drop.append(used_key)
 
-        df_informacoes_basicas_vaga, used_key_vaga_basicas = safe_json_normalize(df_vagas, 'informacoes_basicas')
-        df_perfil_vaga, used_key_vaga_perfil = safe_json_normalize(df_vagas, 'perfil_vaga')
-        df_beneficios, used_key_vaga_beneficios = safe_json_normalize(df_vagas, 'beneficios')
-        
-        keys_to_drop_vaga = [k for k in [used_key_vaga_basicas, used_key_vaga_perfil, used_key_vaga_beneficios] if k]
-
-        df_vagas = pd.concat(
-            [
-                df_vagas.drop(columns=keys_to_drop_vaga, errors='ignore'),
-                df_informacoes_basicas_vaga,
-                df_perfil_vaga,
-                df_beneficios
-            ],
-            axis=1
-        )
+            return pd.concat(
+                [df.drop(columns=keys_to_drop, errors='ignore')] + dfs_normalized,
+                axis=1
+            )
+
+        df_applicants = normalize_sections(df_applicants, CANDIDATE_SECTIONS)
+        df_vagas = normalize_sections(df_vagas, VACANCY_SECTIONS)
 
         # ---
         # 2. Filtragem de features
         # ---
         # Garante que todas as colunas esperadas existam, preenchendo com um valor padrão (vazio) se não existirem
-        all_expected_cand_features = [
-            'pcd', 'objetivo_profissional', 'area_atuacao', 'conhecimentos_tecnicos', 
-            'certificacoes', 'outras_certificacoes', 'nivel_academico', 'nivel_ingles', 
-            'nivel_espanhol', 'outro_idioma', 'cursos', 'cargo_atual', 'data_admissao', 
-            'data_ultima_promocao', 'cv_pt'
-        ]
-        for col in all_expected_cand_features:
+        for col in CANDIDATE_FIELDS:
             if col not in df_applicants.columns:
                 df_applicants[col] = '' # ou np.nan, dependendo do tratamento downstream
 
-        all_expected_vaga_features = [
-            'titulo_vaga', 'vaga_sap', 'cliente', 'solicitante_cliente',
-            'tipo_contratacao', 'vaga_especifica_para_pcd', 'nivel profissional', 
-            'nivel_academico', 'nivel_ingles', 'nivel_espanhol', 'outro_idioma', 
-            'areas_atuacao', 'principais_atividades', 'competencia_tecnicas_e_comportamentais'
-        ]
-        for col in all_expected_vaga_features:
+        for col in VACANCY_FIELDS:
             if col not in df_vagas.columns:
                 df_vagas[col] = '' # ou np.nan
 
-        features_vagas = ['titulo_vaga', 'vaga_sap', 'cliente', 'solicitante_cliente',
-                          'tipo_contratacao', 'vaga_especifica_para_pcd',
-                          'nivel profissional', 'nivel_academico', 'nivel_ingles',
-                          'nivel_espanhol', 'outro_idioma', 'areas_atuacao',
-                          'principais_atividades',
-                          'competencia_tecnicas_e_comportamentais']
-        df_vagas = df_vagas[features_vagas]
+        df_vagas = df_vagas[VACANCY_FIELDS]
         df_vagas = df_vagas.reset_index()
         df_vagas = df_vagas.rename(columns={'index': 'id'})
-        features_applicants = ['pcd', 'objetivo_profissional', 'area_atuacao',
-                            'conhecimentos_tecnicos', 'certificacoes',
-                            'outras_certificacoes', 'nivel_academico',
-                            'nivel_ingles', 'nivel_espanhol', 'outro_idioma',
-                            'cursos', 'cargo_atual', 'data_admissao',
-                            'data_ultima_promocao', 'cv_pt']
-        df_applicants = df_applicants[features_applicants]
+        df_applicants = df_applicants[CANDIDATE_FIELDS]
         df_applicants = df_applicants.reset_index()
         df_applicants = df_applicants.rename(columns={'index': 'id'})
 
@@ -186,24 +264,14 @@ class PredictionPipeline:
         df_applicants['tempo_exp'] = df_applicants['tempo_exp'].fillna(0)
 
         # tratamento das colunas de texto
-        features_applicants = ['area_atuacao', 'conhecimentos_tecnicos',
-                            'objetivo_profissional', 'certificacoes',
-                            'outras_certificacoes',
-                            'nivel_academico', 'outro_idioma',
-                            'cursos', 'cargo_atual', 'cv_pt']
-        utils.padroniza_texto(df_applicants, features_applicants)
-
-        features_vagas = ['titulo_vaga', 'vaga_sap',
-                        'vaga_especifica_para_pcd',
-                        'outro_idioma', 'areas_atuacao', 'principais_atividades',
-                        'competencia_tecnicas_e_comportamentais', 'nivel_academico']
-        utils.padroniza_texto(df_vagas, features_vagas)
+        utils.padroniza_texto(df_applicants, CANDIDATE_TEXT_FIELDS)
+        utils.padroniza_texto(df_vagas, VACANCY_TEXT_FIELDS)
 
         # tratamento das colunas de idiomas
         idioma_encoders = self.ordinal_encoders.get('idioma_encoders', {})
         if not idioma_encoders:
             # Se não há encoders, criar colunas encodadas com valores padrão
-            for lang in ['nivel_ingles', 'nivel_espanhol']:
+            for lang in IDIOMA_FIELDS:
                 if lang in df_applicants.columns:
                     df_applicants[f'{lang}_encoded'] = 0
                     df_applicants = df_applicants.drop(columns=[lang])
@@ -259,14 +327,7 @@ class PredictionPipeline:
         # CRÍTICO: Usa a lista de tipos de contratação salva do treinamento
         # para garantir que as colunas sejam consistentes.
         for tipo_contrato in self.tipos_contratacao:
-            tipo_normalizado = tipo_contrato.lower()
-            tipo_normalizado = (
-                unicodedata
-                .normalize('NFKD', str(tipo_normalizado))
-                .encode('ascii', 'ignore')
-                .decode('utf-8')
-            )
-            nome_coluna = f"contratacao_{re.sub(r'[^a-zA-Z0-9s]', '', tipo_normalizado).strip().replace(' ', '_')}"
+            nome_coluna = nome_coluna_contratacao(tipo_contrato)
             df_vagas[nome_coluna] = (
                 df_vagas['tipo_contratacao_cleaned']
                 .apply(lambda lista_tipos: 1 if tipo_contrato in lista_tipos else 0)
@@ -298,81 +359,22 @@ class PredictionPipeline:
         # ---
         # 5. Embeddings e Similaridades
         # ---
-        text_features_list = ['objetivo_profissional_cand',
-                            'outro_idioma_cand', 'area_atuacao_cand',
-                            'conhecimentos_tecnicos_cand', 'certificacoes_cand',
-                            'outras_certificacoes_cand', 'cargo_atual_cand',
-                            'cv_pt_cand', 'titulo_vaga_vaga',
-                            'nivel profissional_vaga', 'outro_idioma_vaga',
-                            'areas_atuacao_vaga', 'principais_atividades_vaga',
-                            'competencia_tecnicas_e_comportamentais_vaga']
-        df_embeddings = utils.expand_vector(df=df_merged,
-                                            feature_list=text_features_list,
-                                            model=self.model_w2v,
-                                            num_features=100)
-        df_final = pd.concat([df_merged, df_embeddings], axis=1)
-        df_final = df_final.dropna()
-
-        utils.similaridade(
-            df_final,
-            'objetivo_profissional_cand',
-            'titulo_vaga_vaga',
-            'objetivo_sim'
-        )
-        utils.similaridade(
-            df_final,
-            'cargo_atual_cand',
-            'titulo_vaga_vaga',
-            'cargo_sim'
-        )
-        utils.similaridade(
-            df_final,
-            'area_atuacao_cand',
-            'titulo_vaga_vaga',
-            'exp_sim'
-        )
-        utils.similaridade(
-            df_final,
-            'outro_idioma_cand',
-            'outro_idioma_vaga',
-            'outro_idioma_sim'
-        )
-        utils.similaridade(
-            df_final,
-            'area_atuacao_cand',
-            'areas_atuacao_vaga',
-            'area_atuacao_sim'
-        )
-        utils.similaridade(
-            df_final,
-            'certificacoes_cand',
-            'competencia_tecnicas_e_comportamentais_vaga',
-            'certificacoes_sim'
-        )
-        utils.similaridade(
-            df_final,
-            'outras_certificacoes_cand',
-            'competencia_tecnicas_e_comportamentais_vaga',
-            'outras_certificacoes_sim'
-        )
-        utils.similaridade(
-            df_final,
-            'conhecimentos_tecnicos_cand',
-            'competencia_tecnicas_e_comportamentais_vaga',
-            'conhecimentos_tecnicos_sim'
-        )
-        utils.similaridade(
-            df_final,
-            'cv_pt_cand',
-            'principais_atividades_vaga',
-            'atividades_sim'
-        )
-        utils.similaridade(
-            df_final,
-            'cv_pt_cand',
-            'competencia_tecnicas_e_comportamentais_vaga',
-            'competencias_sim'
-        )
+        # Apenas os vetores de documento exigidos pelas similaridades que o
+        # modelo consome (ver `feature_plan`) são calculados, como arrays NumPy.
+        doc_vectors = {
+            col: self.embedding_engine.embed(df_merged[col].tolist())
+            for col in self.feature_plan.embedding_columns
+        }
+        df_final = df_merged.drop(columns=TEXT_EMBEDDING_COLUMNS)
+        rows_validas = df_final.notna().all(axis=1).to_numpy()
+        df_final = df_final[rows_validas].copy()
+
+        for feature, (cand_col, vaga_col) in self.feature_plan.similarity_features.items():
+            df_final[feature] = utils.cosine_similarity_rows(
+                doc_vectors[cand_col][rows_validas],
+                doc_vectors[vaga_col][rows_validas]
+            )
+
         df_final['ingles'] = (
             df_final['nivel_ingles_encoded_cand']
             - df_final['nivel_ingles_encoded_vaga']
@@ -438,31 +440,587 @@ class PredictionPipeline:
 
         return final_features_df
 
-    def predict(self, candidate_data: Dict[str, Any], vacancy_data: Dict[str, Any]) -> float:
+    # ---
+    # Caminho rápido para um único par candidato/vaga
+    # ---
+    # Reproduz `_prepare_data` diretamente sobre os dicionários, sem DataFrames:
+    # cada lado vira um bloco (features numéricas + vetores de documento) e os
+    # blocos são combinados no vetor de features na ordem do modelo. Payloads
+    # que o caminho rápido não cobre (vários registros, valores não textuais,
+    # chaves duplicadas entre seções) seguem pelo `_prepare_data`.
+
+    def _init_fast_path(self) -> None:
+        """Pré-computa as tabelas de lookup usadas pelo caminho rápido."""
+        idioma_encoders = self.ordinal_encoders.get('idioma_encoders', {})
+        self._idioma_lookups = {
+            lang: self._encoder_lookup(encoder) for lang, encoder in idioma_encoders.items()
+        }
+        educ_encoder = self.ordinal_encoders.get('educacao_encoder')
+        self._educacao_lookup = self._encoder_lookup(educ_encoder) if educ_encoder else None
+
+        # Em caso de nomes repetidos vale o último tipo, como no `_prepare_data`
+        self._contratacao_columns = {
+            nome_coluna_contratacao(tipo): tipo
+            for tipo in getattr(self, 'tipos_contratacao', [])
+        }
+
+        self._candidate_text_columns = [
+            (col, col[:-len('_cand')]) for col in self.feature_plan.candidate_columns
+        ]
+        self._vacancy_text_columns = [
+            (col, col[:-len('_vaga')]) for col in self.feature_plan.vacancy_columns
+        ]
+
+        supported = set(PAIR_FEATURES) | set(self.feature_plan.similarity_features)
+        supported |= {f'{col}_cand' for col in CANDIDATE_BLOCK_FEATURES}
+        supported |= {f'{col}_vaga' for col in VACANCY_BLOCK_FEATURES}
+        supported |= {f'{col}_vaga' for col in self._contratacao_columns}
+
+        self.fast_path_enabled = (
+            bool(self.model_features_order)
+            and set(self.model_features_order) <= supported
+            and (not idioma_encoders or (
+                set(idioma_encoders) == set(IDIOMA_FIELDS)
+                and all(self._idioma_lookups.values())
+            ))
+            and (educ_encoder is None or self._educacao_lookup is not None)
+        )
+
+    @staticmethod
+    def _encoder_lookup(encoder: Any) -> Optional[Tuple[Dict[str, float], Optional[float]]]:
+        """
+        Converte um OrdinalEncoder de uma coluna em (categoria -> código, código
+        para categorias desconhecidas). Retorna None se o encoder não for suportado.
+        """
+        categories = getattr(encoder, 'categories_', None)
+        if not isinstance(categories, list) or len(categories) != 1:
+            return None
+        mapping = {category: float(code) for code, category in enumerate(categories[0])}
+        unknown_value = None
+        if getattr(encoder, 'handle_unknown', 'error') == 'use_encoded_value':
+            unknown_value = float(encoder.unknown_value)
+        return mapping, unknown_value
+
+    @staticmethod
+    def _single_record_fields(payload: Dict[str, Any], sections: Sequence[Tuple[str, ...]],
+                              fields: Sequence[str]) -> Optional[Dict[str, str]]:
+        """
+        Extrai os campos usados de um payload com um único registro, aplicando a
+        mesma regra de seções do `_prepare_data`. Retorna None quando o payload
+        precisa do caminho com DataFrames.
+        """
+        if not isinstance(payload, dict) or len(payload) != 1:
+            return None
+        record = next(iter(payload.values()))
+        if not isinstance(record, dict) or not record:
+            return None
+
+        used_sections = []
+        for keys in sections:
+            used_key = next((key for key in keys if key in record), None)
+            if used_key is not None:
+                used_sections.append(used_key)
+
+        parts = [{k: v for k, v in record.items() if k not in used_sections}]
+        parts += [record[key] for key in used_sections if isinstance(record[key], dict)]
+
+        wanted = set(fields)
+        values: Dict[str, str] = {}
+        for part in parts:
+            for key, value in part.items():
+                if key not in wanted:
+                    continue
+                # Chave repetida vira coluna duplicada e valores não textuais
+                # (None, números, dicts aninhados) têm regras próprias no pandas
+                if key in values or not isinstance(value, str):
+                    return None
+                values[key] = value
+        return values
+
+    @staticmethod
+    def _encode(lookup: Tuple[Dict[str, float], Optional[float]], value: str) -> Optional[float]:
+        mapping, unknown_value = lookup
+        return mapping.get(value, unknown_value)
+
+    def _encode_levels(self, fields: Dict[str, str], nivel_academico: str) -> Optional[Dict[str, float]]:
+        """Codifica os níveis de idioma e de educação de um lado do par."""
+        encoded = {}
+        for lang in IDIOMA_FIELDS:
+            lookup = self._idioma_lookups.get(lang)
+            encoded[f'{lang}_encoded'] = (
+                self._encode(lookup, fields.get(lang, '')) if lookup else 0
+            )
+
+        if nivel_academico in ('nan', 'NaN'):
+            nivel_academico = ''
+        encoded['nivel_academico_encoded'] = (
+            self._encode(self._educacao_lookup, nivel_academico) if self._educacao_lookup else 0
+        )
+
+        if any(value is None for value in encoded.values()):
+            return None
+        return encoded
+
+    @property
+    def embedding_engine(self) -> EmbeddingEngine:
+        """Motor de vetores de documento do Word2Vec carregado (criado sob demanda)."""
+        engine = self.__dict__.get('_embedding_engine')
+        if engine is None or engine.model is not self.model_w2v:
+            engine = self._embedding_engine = EmbeddingEngine(self.model_w2v)
+        return engine
+
+    def _text_features(self, fields: Dict[str, str],
+                       text_columns: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Textos padronizados e vetores de documento das colunas de texto de um lado."""
+        texts = {col: utils.padroniza_valor(fields.get(field, '')) for col, field in text_columns}
+        vectors = self.embedding_engine.embed(list(texts.values()))
+        return {
+            'texts': texts,
+            'vectors': dict(zip(texts, vectors))
+        }
+
+    def build_candidate_block(self, candidate_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Bloco do candidato: features numéricas (com sufixo '_cand'), textos
+        padronizados e vetores de documento, ou None se o payload não for
+        suportado pelo caminho rápido.
+        """
+        fields = self._single_record_fields(candidate_data, CANDIDATE_SECTIONS, CANDIDATE_FIELDS)
+        if fields is None:
+            return None
+
+        encoded = self._encode_levels(fields, utils.padroniza_valor(fields.get('nivel_academico', '')))
+        if encoded is None:
+            return None
+
+        features = {
+            'pcd': int(fields.get('pcd', '') == 'Sim'),
+            'senioridade': utils.classifica_senioridade(fields.get('cargo_atual', '')),
+            **encoded
+        }
+        return {
+            'features': {f'{name}_cand': value for name, value in features.items()},
+            **self._text_features(fields, self._candidate_text_columns)
+        }
+
+    def build_vacancy_block(self, vacancy_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Bloco da vaga: features numéricas (com sufixo '_vaga'), textos
+        padronizados e vetores de documento, ou None se o payload não for
+        suportado pelo caminho rápido.
+        """
+        fields = self._single_record_fields(vacancy_data, VACANCY_SECTIONS, VACANCY_FIELDS)
+        if fields is None:
+            return None
+
+        encoded = self._encode_levels(fields, utils.padroniza_valor(fields.get('nivel_academico', '')))
+        if encoded is None:
+            return None
+
+        # Assim como no `_prepare_data`, as flags binárias da vaga são comparadas
+        # depois da padronização do texto
+        features = {
+            'vaga_sap': int(utils.padroniza_valor(fields.get('vaga_sap', '')) == 'Sim'),
+            'vaga_especifica_para_pcd': int(
+                utils.padroniza_valor(fields.get('vaga_especifica_para_pcd', '')) == 'Sim'
+            ),
+            'senioridade': utils.classifica_senioridade(fields.get('nivel profissional', '')),
+            **encoded
+        }
+
+        tipos = [item.strip() for item in fields.get('tipo_contratacao', '').split(',') if item.strip()]
+        for nome_coluna, tipo_contrato in self._contratacao_columns.items():
+            features[nome_coluna] = int(tipo_contrato in tipos)
+
+        return {
+            'features': {f'{name}_vaga': value for name, value in features.items()},
+            **self._text_features(fields, self._vacancy_text_columns)
+        }
+
+    def feature_fingerprint(self) -> str:
+        """
+        Identifica a configuração que determina os blocos (plano de features,
+        encoders, tipos de contratação e Word2Vec). Blocos persistidos com outra
+        impressão digital não podem ser reutilizados.
+        """
+        vectors = self.model_w2v.vectors
+        lookups = dict(self._idioma_lookups)
+        lookups['educacao'] = self._educacao_lookup
+        payload = {
+            'candidate_columns': self.feature_plan.candidate_columns,
+            'vacancy_columns': self.feature_plan.vacancy_columns,
+            'encoders': {
+                name: None if lookup is None else [sorted((str(k), v) for k, v in lookup[0].items()), lookup[1]]
+                for name, lookup in lookups.items()
+            },
+            'contratacao': list(self._contratacao_columns.items()),
+            'w2v': [self.NUM_FEATURES_W2V, len(vectors), str(vectors.dtype),
+                    hashlib.sha256(np.ascontiguousarray(vectors[:256]).tobytes()).hexdigest()]
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _pair_features(cand: Dict[str, Any], vaga: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Features de comparação (PAIR_FEATURES) a partir das features de cada
+        lado. Aceita escalares ou arrays que façam broadcast entre si.
+        """
+        features: Dict[str, Any] = {}
+        features['ingles'] = cand['nivel_ingles_encoded_cand'] - vaga['nivel_ingles_encoded_vaga']
+        features['espanhol'] = cand['nivel_espanhol_encoded_cand'] - vaga['nivel_espanhol_encoded_vaga']
+        features['gap_senioridade'] = cand['senioridade_cand'] - vaga['senioridade_vaga']
+        features['possui_senioridade_minima'] = (
+            cand['senioridade_cand'] >= vaga['senioridade_vaga']
+        ).astype(int)
+        features['possui_nivel_academico_minimo'] = (
+            cand['nivel_academico_encoded_cand'] >= vaga['nivel_academico_encoded_vaga']
+        ).astype(int)
+        features['possui_nivel_ingles_minimo'] = (
+            cand['nivel_ingles_encoded_cand'] >= vaga['nivel_ingles_encoded_vaga']
+        ).astype(int)
+        features['possui_nivel_espanhol_minimo'] = (
+            cand['nivel_espanhol_encoded_cand'] >= vaga['nivel_espanhol_encoded_vaga']
+        ).astype(int)
+
+        condicoes = [
+            (vaga['vaga_especifica_para_pcd_vaga'] == 1) & (cand['pcd_cand'] == 0),
+            (vaga['vaga_especifica_para_pcd_vaga'] == 1) & (cand['pcd_cand'] == 1)
+        ]
+        features['compatibilidade_pcd'] = np.select(condicoes, [0, 2], default=1)
+        return features
+
+    def _combine_blocks(self, candidate_blocks: List[Dict[str, Any]],
+                        vacancy_block: Dict[str, Any]) -> np.ndarray:
+        """
+        Monta a matriz de features (n_candidatos x n_features), na ordem de
+        `model_features_order`, de uma vaga contra vários candidatos.
+        """
+        n_candidates = len(candidate_blocks)
+        cand = {
+            name: np.array([block['features'][name] for block in candidate_blocks])
+            for name in candidate_blocks[0]['features']
+        }
+        vaga = vacancy_block['features']
+        features: Dict[str, Any] = {**cand, **vaga, **self._pair_features(cand, vaga)}
+
+        # Vetores nulos (texto vazio) são float64 e as médias do Word2Vec têm o
+        # dtype do modelo: tudo é convertido para esse dtype para que cada linha
+        # seja calculada com a mesma precisão de uma predição individual
+        dtype = self.model_w2v.vectors.dtype
+        for feature, (cand_col, vaga_col) in self.feature_plan.similarity_features.items():
+            vec_cand = np.vstack([block['vectors'][cand_col] for block in candidate_blocks])
+            features[feature] = utils.cosine_similarity_rows(
+                vec_cand.astype(dtype, copy=False),
+                vacancy_block['vectors'][vaga_col][np.newaxis, :].astype(dtype, copy=False)
+            )
+
+        return np.column_stack([
+            np.broadcast_to(np.asarray(features[col], dtype=float), (n_candidates,))
+            for col in self.model_features_order
+        ])
+
+    def _fast_feature_row(self, candidate_data: Dict[str, Any],
+                          vacancy_data: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Matriz (1 x n_features) equivalente à saída de `_prepare_data` para um
+        único par, ou None quando o par precisa do caminho com DataFrames.
+        """
+        if not self.fast_path_enabled:
+            return None
+        candidate_block = self.build_candidate_block(candidate_data)
+        if candidate_block is None:
+            return None
+        vacancy_block = self.build_vacancy_block(vacancy_data)
+        if vacancy_block is None:
+            return None
+        return self._combine_blocks([candidate_block], vacancy_block)
+
+    def _feature_matrix(self, vacancy_data: Dict[str, Any],
+                        candidate_payloads: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Matriz de features de uma vaga contra vários candidatos (um payload de
+        um registro por candidato). A vaga é processada uma única vez; candidatos
+        fora do caminho rápido usam a primeira linha do `_prepare_data`.
+        """
+        vacancy_block = self.build_vacancy_block(vacancy_data) if self.fast_path_enabled else None
+
+        matrix = np.empty((len(candidate_payloads), len(self.model_features_order)))
+        fast_rows, candidate_blocks = [], []
+        for i, payload in enumerate(candidate_payloads):
+            block = self.build_candidate_block(payload) if vacancy_block is not None else None
+            if block is None:
+                processed_df = self._prepare_data(payload, vacancy_data)
+                matrix[i] = processed_df.iloc[0].to_numpy(dtype=float)
+            else:
+                fast_rows.append(i)
+                candidate_blocks.append(block)
+
+        if candidate_blocks:
+            matrix[fast_rows] = self._combine_blocks(candidate_blocks, vacancy_block)
+        return matrix
+
+    def predict_many(self, vacancy_data: Dict[str, Any], candidates: Dict[str, Any]) -> np.ndarray:
+        """
+        Calcula o score de uma vaga contra vários candidatos em uma única chamada ao modelo.
+
+        Args:
+            vacancy_data (dict): Payload da vaga ({id_vaga: registro}).
+            candidates (dict): Candidatos no formato {id_candidato: registro}.
+
+        Returns:
+            Array de scores na mesma ordem de `candidates`.
+        """
+        candidate_payloads = [{candidate_id: record} for candidate_id, record in candidates.items()]
+        if not candidate_payloads:
+            return np.empty(0)
+
+        features = self._feature_matrix(vacancy_data, candidate_payloads)
+        return self.predict_scores(features)
+
+    def score_matrix(self, candidates: Dict[str, Any], vacancies: Dict[str, Any],
+                     chunk_size: int = DEFAULT_MATRIX_CHUNK_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Calcula o score de todos os pares de M candidatos x N vagas.
+
+        Os dois lados são pré-processados uma única vez (aqui, antes de retornar)
+        e os pares são pontuados em blocos de no máximo `chunk_size` pares, com
+        as similaridades de cosseno calculadas por multiplicação de matrizes.
+        As similaridades diferem das predições individuais apenas por
+        arredondamento de ponto flutuante.
+
+        Args:
+            candidates (dict): Candidatos no formato {id_candidato: registro}.
+            vacancies (dict): Vagas no formato {id_vaga: registro}.
+            chunk_size (int): Quantidade máxima de pares por bloco.
+
+        Returns:
+            Iterador de blocos {'candidate_ids', 'vacancy_ids', 'scores'}, com
+            arrays alinhados (um elemento por par).
+
+        Raises:
+            ValueError: Se o caminho rápido não estiver disponível ou se algum
+                        registro não for suportado por ele.
+        """
+        if not self.fast_path_enabled:
+            raise ValueError("Modo matriz indisponível: features do modelo não suportadas pelo caminho rápido")
+
+        dtype = self.model_w2v.vectors.dtype
+        sides = []
+        for records, build_block, label in ((candidates, self.build_candidate_block, 'candidatos'),
+                                            (vacancies, self.build_vacancy_block, 'vagas')):
+            blocks = {record_id: build_block({record_id: record}) for record_id, record in records.items()}
+            unsupported = [record_id for record_id, block in blocks.items() if block is None]
+            if unsupported:
+                raise ValueError(f"Registros de {label} não suportados no modo matriz: {unsupported[:10]}")
+            sides.append(build_side(list(blocks), list(blocks.values()), dtype))
+        cand_side, vaga_side = sides
+
+        return self._iter_matrix_scores(cand_side, vaga_side, chunk_size)
+
+    def _iter_matrix_scores(self, cand_side, vaga_side, chunk_size: int) -> Iterator[Dict[str, np.ndarray]]:
+        cand_ids = np.array(cand_side.ids, dtype=object)
+        vaga_ids = np.array(vaga_side.ids, dtype=object)
+
+        for rows, cols in iter_blocks(len(cand_side), len(vaga_side), chunk_size):
+            features = self._matrix_block_features(cand_side, vaga_side, rows, cols)
+            n_rows, n_cols = len(cand_ids[rows]), len(vaga_ids[cols])
+            yield {
+                'candidate_ids': np.repeat(cand_ids[rows], n_cols),
+                'vacancy_ids': np.tile(vaga_ids[cols], n_rows),
+                'scores': self.predict_scores(features)
+            }
+
+    def _matrix_block_features(self, cand_side, vaga_side, rows: slice, cols: slice) -> np.ndarray:
+        """Matriz de features de um bloco de pares, uma linha por par (candidato a candidato)."""
+        # (n_candidatos, 1) contra (1, n_vagas): todo o bloco sai por broadcast
+        cand = {name: values[rows, np.newaxis] for name, values in cand_side.features.items()}
+        vaga = {name: values[np.newaxis, cols] for name, values in vaga_side.features.items()}
+        features: Dict[str, Any] = {**cand, **vaga, **self._pair_features(cand, vaga)}
+
+        for feature, (cand_col, vaga_col) in self.feature_plan.similarity_features.items():
+            features[feature] = (
+                cand_side.unit_vectors[cand_col][rows] @ vaga_side.unit_vectors[vaga_col][cols].T
+            )
+
+        shape = (rows.stop - rows.start, cols.stop - cols.start)
+        return np.column_stack([
+            np.broadcast_to(np.asarray(features[col], dtype=float), shape).ravel()
+            for col in self.model_features_order
+        ])
+
+    def _init_predictor(self) -> None:
+        """
+        Predição direta no booster, sem o wrapper do sklearn: `NativePredictor`
+        (inplace_predict sobre float32) ou, no backend 'numpy', as árvores
+        compiladas em `TreeEnsemble`. Modelos que não são do xgboost usam `model.predict`.
+        """
+        feature_names = self.model_features_order or None
+        is_xgboost = type(self.model).__module__.split('.')[0] == 'xgboost'
+        if self.backend == 'numpy':
+            if not isinstance(self.predictor, TreeEnsemble) and is_xgboost:
+                self.predictor = TreeEnsemble.from_booster(self.model, feature_names)
+        elif self.predictor is None and is_xgboost:
+            self.predictor = NativePredictor.from_model(self.model, feature_names)
+
+    def predict_scores(self, features: Any) -> np.ndarray:
+        """
+        Scores de uma matriz de features (linhas na ordem de `model_features_order`),
+        pelo preditor do backend quando disponível.
+        """
+        if self.predictor is not None:
+            return self.predictor.predict(features)
+        return self.model.predict(features)
+
+    def _build_explainer(self) -> Optional[Any]:
+        """Constrói o TreeExplainer do modelo carregado (None se não for suportado)."""
+        if isinstance(self.model, TreeEnsemble):
+            print("Aviso: explicações SHAP exigem o modelo do xgboost (model.joblib ou model.ubj)")
+            return None
+        try:
+            return shap.TreeExplainer(self.model)
+        except Exception as e:
+            print(f"Aviso: explainer SHAP indisponível ({e}), explicações desabilitadas")
+            return None
+
+    def predict(self, candidate_data: Dict[str, Any], vacancy_data: Dict[str, Any],
+                explain: str = DEFAULT_EXPLAIN_MODE, top_k: int = DEFAULT_EXPLAIN_TOP_K,
+                return_features: bool = False):
         """
         Recebe os dados brutos de um candidato e de uma vaga e retorna o score de match.
+
+        Args:
+            explain (str): 'none' (apenas o score), 'values' (array SHAP completo)
+                           ou 'top_k' (as top_k features de maior contribuição).
+            top_k (int): Quantidade de features retornadas no modo 'top_k'.
+            return_features (bool): Se True, devolve também o vetor de features
+                           usado na predição (sem recalcular), na ordem de
+                           `model_features_order` (ex: para o monitoramento de drift).
+
+        Returns:
+            Tupla (score, explicação), onde a explicação depende de `explain`;
+            (score, explicação, features) com `return_features`.
         """
+        if explain not in EXPLAIN_MODES:
+            raise ValueError(f"Modo de explicação inválido: {explain}. Use um de {EXPLAIN_MODES}")
+
+        # Caminho rápido (sem pandas) para um único par; os demais payloads
+        # usam a pipeline completa com DataFrames
+        features = self._fast_feature_row(candidate_data, vacancy_data)
+        if features is not None:
+            return self._predict_features(features, explain, top_k, return_features)
+
         # Prepara os dados usando a pipeline interna
         processed_df = self._prepare_data(candidate_data, vacancy_data)
         # Faz a predição
-        prediction = self.model.predict(processed_df)
-        
-        explainer = shap.TreeExplainer(self.model)
+        prediction = self.predict_scores(processed_df)
 
-        # Pegue a linha de dados do candidato/vaga que você quer analisar
-        # Supondo que 'processed_df' seja o DataFrame com os dados prontos para predição
-        dados_para_explicar = processed_df.iloc[[0]] 
+        if return_features:
+            return (prediction[0], self.explain(processed_df, explain, top_k),
+                    processed_df.iloc[0].to_numpy(dtype=float))
+        return prediction[0], self.explain(processed_df, explain, top_k)
 
-        # Calcule os valores SHAP
-        shap_values = explainer.shap_values(dados_para_explicar)
+    def predict_blocks(self, candidate_block: Dict[str, Any], vacancy_block: Dict[str, Any],
+                       explain: str = DEFAULT_EXPLAIN_MODE, top_k: int = DEFAULT_EXPLAIN_TOP_K,
+                       return_features: bool = False):
+        """
+        Predição a partir de blocos já calculados (ex: `CandidateFeatureStore`),
+        sem nenhum processamento de texto. Mesmo retorno de `predict`.
+        """
+        if explain not in EXPLAIN_MODES:
+            raise ValueError(f"Modo de explicação inválido: {explain}. Use um de {EXPLAIN_MODES}")
 
-        # Visualize a contribuição de cada feature
-        plot = shap.force_plot(explainer.expected_value, shap_values[0], processed_df.iloc[0], show=False)
-            
-        # Salva o plot em um arquivo HTML
-        shap.save_html('shap_plot.html', plot)
-        # Retorna o score e os valores SHAP como tupla
-        return prediction[0], shap_values
+        features = self._combine_blocks([candidate_block], vacancy_block)
+        return self._predict_features(features, explain, top_k, return_features)
+
+    def score_blocks(self, candidate_blocks: List[Dict[str, Any]],
+                     vacancy_block: Dict[str, Any]) -> np.ndarray:
+        """Scores (sem explicação) de vários blocos de candidatos contra uma vaga."""
+        if not candidate_blocks:
+            return np.empty(0)
+        return self.predict_scores(self._combine_blocks(candidate_blocks, vacancy_block))
+
+    def feature_row(self, candidate_data: Dict[str, Any], vacancy_data: Dict[str, Any]) -> np.ndarray:
+        """
+        Linha de features (1 x n_features, na ordem do modelo) do par, pelo
+        caminho rápido quando possível. Usada pelo micro-batching do serviço.
+        """
+        features = self._fast_feature_row(candidate_data, vacancy_data)
+        if features is None:
+            features = self._prepare_data(candidate_data, vacancy_data).iloc[[0]].to_numpy(dtype=float)
+        return features
+
+    def block_features(self, candidate_block: Dict[str, Any], vacancy_block: Dict[str, Any]) -> np.ndarray:
+        """Linha de features (1 x n_features) a partir de blocos já calculados."""
+        return self._combine_blocks([candidate_block], vacancy_block)
+
+    def explain_features(self, features: np.ndarray, explain: str = DEFAULT_EXPLAIN_MODE,
+                         top_k: int = DEFAULT_EXPLAIN_TOP_K) -> Any:
+        """Explicação SHAP de uma linha de features (None no modo 'none')."""
+        processed_df = None
+        if explain != 'none':
+            processed_df = pd.DataFrame(features, columns=self.model_features_order)
+        return self.explain(processed_df, explain, top_k)
+
+    def _predict_features(self, features: np.ndarray, explain: str, top_k: int,
+                          return_features: bool = False):
+        """Score e explicação (e a própria linha, com `return_features`) de uma linha de features."""
+        prediction = self.predict_scores(features)
+        if return_features:
+            return prediction[0], self.explain_features(features, explain, top_k), features[0]
+        return prediction[0], self.explain_features(features, explain, top_k)
+
+    def explain(self, processed_df: pd.DataFrame, explain: str = DEFAULT_EXPLAIN_MODE,
+                top_k: int = DEFAULT_EXPLAIN_TOP_K) -> Any:
+        """
+        Calcula a explicação SHAP da primeira linha de `processed_df`.
+
+        Returns:
+            None no modo 'none', o array de valores SHAP no modo 'values' ou a
+            lista das top_k contribuições ordenadas por magnitude no modo 'top_k'.
+        """
+        if explain == 'none' or self.explainer is None:
+            return None
+
+        shap_values = self.explainer.shap_values(processed_df.iloc[[0]])
+        if explain == 'values':
+            return shap_values
+
+        return self._top_contributions(processed_df, shap_values, top_k)
+
+    def _top_contributions(self, processed_df: pd.DataFrame, shap_values: Any,
+                           top_k: int) -> List[Dict[str, Any]]:
+        """Seleciona as top_k features com maior contribuição absoluta."""
+        contributions = np.asarray(shap_values, dtype=float).reshape(-1)
+        features = list(processed_df.columns)
+        values = processed_df.iloc[0].tolist()
+
+        order = np.argsort(-np.abs(contributions), kind='stable')[:max(int(top_k), 0)]
+        return [
+            {
+                'feature': features[i],
+                'value': float(values[i]),
+                'contribution': float(contributions[i])
+            }
+            for i in order
+        ]
+
+    def save_explanation_html(self, candidate_data: Dict[str, Any], vacancy_data: Dict[str, Any],
+                              output_path: str = 'shap_plot.html') -> str:
+        """
+        Gera o force plot SHAP de um par candidato/vaga e salva em HTML.
+
+        Fica fora do caminho de predição: deve ser chamado apenas quando o
+        gráfico for realmente necessário (ex: análise offline).
+        """
+        if self.explainer is None:
+            raise RuntimeError("Explainer SHAP não disponível para este modelo")
+
+        processed_df = self._prepare_data(candidate_data, vacancy_data)
+        shap_values = self.explainer.shap_values(processed_df.iloc[[0]])
+        plot = shap.force_plot(self.explainer.expected_value, shap_values[0],
+                               processed_df.iloc[0], show=False)
+        shap.save_html(output_path, plot)
+        return output_path
 
 # --- Bloco de Execução Principal (Exemplo de como usar a classe) ---
 if __name__ == '__main__':
@@ -608,4 +1166,11 @@ if __name__ == '__main__':
     print("\n" + "="*30)
     print("\n" + "="*30)
     print(f"  Score de Match Predito: {score:.4f}")
-    print("="*30)
\ No newline at end of file
+    print("="*30)
+
+    # 4. Gera o gráfico de explicação (fora do caminho de predição), fora do repositório
+    html_path = pipeline.save_explanation_html(
+        candidate_data=novo_candidato, vacancy_data=nova_vaga,
+        output_path=str(Path(tempfile.gettempdir()) / 'shap_plot.html')
+    )
+    print(f"  Explicação SHAP salva em {html_path}")
\ No newline at end of file
@@ -0,0 +1,307 @@
+"""
+Recuperação de candidatos por vizinhos mais próximos aproximados (ANN)
+
+Pontuar todo o banco de candidatos com o XGBoost para mostrar os 20 melhores
+não escala. A recuperação acontece em duas etapas:
+
+1. Um índice IVF (k-means esférico + listas invertidas, em NumPy) sobre os
+   vetores de documento dos candidatos devolve uma shortlist por vaga.
+2. O modelo re-ranqueia apenas a shortlist (ver
+   `PredictionService.match_top_k`).
+
+O embedding de recuperação concatena os vetores unitários das colunas do
+candidato em `RETRIEVAL_PAIRS`; a consulta da vaga soma, para cada coluna do
+candidato, os vetores unitários das colunas da vaga com que ela é comparada.
+Assim o produto interno é a soma das similaridades de cosseno
+correspondentes que o modelo usa (`atividades_sim`, `competencias_sim`,
+`conhecimentos_tecnicos_sim`).
+"""
+
+import math
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.matching import unit_rows
+
+
+# (coluna do candidato, coluna da vaga) comparadas na recuperação
+RETRIEVAL_PAIRS: List[Tuple[str, str]] = [
+    ('cv_pt_cand', 'principais_atividades_vaga'),
+    ('cv_pt_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+    ('conhecimentos_tecnicos_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+]
+
+# Abaixo deste tamanho o índice usa uma única lista (busca exata)
+MIN_ROWS_FOR_IVF = 1024
+
+# Refaz o índice quando a maior lista cresce mais que este fator desde o
+# último build (inserções concentradas em poucos centróides)
+MAX_LIST_GROWTH = 2.0
+
+
+def retrieval_pairs(candidate_columns: Sequence[str],
+                    vacancy_columns: Sequence[str]) -> List[Tuple[str, str]]:
+    """Pares de `RETRIEVAL_PAIRS` cujos vetores existem nos dois lados."""
+    return [
+        (cand_col, vaga_col) for cand_col, vaga_col in RETRIEVAL_PAIRS
+        if cand_col in candidate_columns and vaga_col in vacancy_columns
+    ]
+
+
+def candidate_embeddings(vectors: Dict[str, np.ndarray], pairs: List[Tuple[str, str]]) -> np.ndarray:
+    """Embedding de recuperação (n x colunas*dim) a partir de {coluna: matriz n x dim}."""
+    columns = list(dict.fromkeys(cand_col for cand_col, _ in pairs))
+    return np.hstack([unit_rows(np.asarray(vectors[col], dtype=np.float32)) for col in columns])
+
+
+def vacancy_query(vectors: Dict[str, np.ndarray], pairs: List[Tuple[str, str]]) -> np.ndarray:
+    """Consulta de recuperação de uma vaga a partir de {coluna: vetor}."""
+    columns = list(dict.fromkeys(cand_col for cand_col, _ in pairs))
+    parts = []
+    for col in columns:
+        unit = [
+            unit_rows(np.asarray(vectors[vaga_col], dtype=np.float32)[np.newaxis, :])[0]
+            for cand_col, vaga_col in pairs if cand_col == col
+        ]
+        parts.append(np.sum(unit, axis=0))
+    return np.concatenate(parts)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Índices dos k maiores scores, em ordem decrescente."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def brute_force_search(vectors: np.ndarray, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Busca exata por produto interno: (índices, scores) dos k melhores."""
+    scores = vectors @ query
+    top = top_k_indices(scores, k)
+    return top, scores[top]
+
+
+class IVFIndex:
+    """
+    Índice IVF por produto interno: os vetores são agrupados por k-means
+    esférico e a busca só percorre as `n_probe` listas de centróides mais
+    próximos da consulta. Cada lista guarda seus vetores em uma matriz
+    própria, então `upsert`/`remove` só copiam as listas afetadas.
+    """
+
+    def __init__(self, n_lists: Optional[int] = None, n_probe: Optional[int] = None,
+                 n_iter: int = 10, seed: int = 0, max_list_growth: float = MAX_LIST_GROWTH):
+        """
+        Args:
+            n_lists: Quantidade de listas (padrão: ~sqrt(n), ou 1 para bases pequenas).
+            n_probe: Listas visitadas por busca (padrão: ~10% das listas, no mínimo 4).
+            n_iter: Iterações do k-means.
+            seed: Semente do k-means (índices reprodutíveis).
+            max_list_growth: Crescimento da maior lista, desde o último build,
+                a partir do qual o índice precisa ser refeito.
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.seed = seed
+        self.max_list_growth = max_list_growth
+        self.centroids: Optional[np.ndarray] = None
+        self._trained_rows = 0
+        self._built_max_list = 0
+        self._lists: List[np.ndarray] = []
+        self._list_ids: List[List[str]] = []
+        self._labels: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """
+        True se os centróides não representam mais a base: ela dobrou (ou
+        encolheu à metade) desde o último treino, ou a maior lista cresceu
+        mais que `max_list_growth` vezes desde o último build.
+        """
+        if self.centroids is None:
+            return True
+        n_rows = len(self)
+        return not self._trained_rows / 2 <= n_rows <= 2 * self._trained_rows or self._unbalanced()
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Indexa os vetores. Os centróides só são re-treinados quando a base
+        dobrou (ou encolheu à metade) desde o último treino ou quando as
+        listas ficaram desbalanceadas (ver `needs_rebuild`); nas demais
+        chamadas os vetores são apenas redistribuídos entre as listas.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n_rows = len(vectors)
+        if (self.centroids is None or self.centroids.shape[1] != vectors.shape[1]
+                or not self._trained_rows / 2 <= n_rows <= 2 * self._trained_rows
+                or self._unbalanced()):
+            self.centroids = self._train(vectors)
+            self._trained_rows = n_rows
+
+        labels = self._assign(vectors)
+        order = np.argsort(labels, kind='stable')
+        splits = np.cumsum(np.bincount(labels, minlength=len(self.centroids)))[:-1]
+        ids = np.asarray(list(ids), dtype=object)
+        self._lists = np.split(vectors[order], splits)
+        self._list_ids = [part.tolist() for part in np.split(ids[order], splits)]
+        self._labels = dict(zip(ids.tolist(), labels.tolist()))
+        self._built_max_list = self._max_list()
+
+    def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Insere ou substitui vetores, cada um na lista do centróide mais
+        próximo, sem re-treinar nem redistribuir os demais.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.centroids is None:
+            self.build(ids, vectors)
+            return
+        ids = list(ids)
+        self.remove(ids)
+        labels = self._assign(vectors)
+        for label in np.unique(labels):
+            rows = np.flatnonzero(labels == label)
+            self._lists[label] = np.concatenate([self._lists[label], vectors[rows]])
+            self._list_ids[label].extend(ids[i] for i in rows)
+        self._labels.update(zip(ids, labels.tolist()))
+
+    def remove(self, ids: Sequence[str]) -> None:
+        """Remove vetores do índice (ids desconhecidos são ignorados)."""
+        removed = defaultdict(set)
+        for candidate_id in ids:
+            label = self._labels.pop(candidate_id, None)
+            if label is not None:
+                removed[label].add(candidate_id)
+        for label, gone in removed.items():
+            keep = [i for i, candidate_id in enumerate(self._list_ids[label]) if candidate_id not in gone]
+            self._lists[label] = self._lists[label][keep]
+            self._list_ids[label] = [self._list_ids[label][i] for i in keep]
+
+    def search(self, query: np.ndarray, k: int,
+               n_probe: Optional[int] = None) -> Tuple[List[str], np.ndarray]:
+        """(ids, scores) aproximados dos k vetores com maior produto interno."""
+        if not self._labels:
+            return [], np.empty(0, dtype=np.float32)
+
+        query = np.asarray(query, dtype=np.float32)
+        n_lists = len(self.centroids)
+        n_probe = min(n_lists, n_probe or self.n_probe or max(4, math.ceil(n_lists / 10)))
+        lists = top_k_indices(self.centroids @ query, n_probe)
+
+        scores = np.concatenate([self._lists[i] @ query for i in lists])
+        starts = np.cumsum([0] + [len(self._list_ids[i]) for i in lists])
+        top = top_k_indices(scores, k)
+        # posição no resultado concatenado -> (lista visitada, posição na lista)
+        probed = np.searchsorted(starts, top, side='right') - 1
+        ids = [self._list_ids[lists[j]][row - starts[j]] for j, row in zip(probed, top)]
+        return ids, scores[top]
+
+    def _max_list(self) -> int:
+        return max((len(list_ids) for list_ids in self._list_ids), default=0)
+
+    def _unbalanced(self) -> bool:
+        return self._max_list() > self.max_list_growth * max(self._built_max_list, 1)
+
+    def _n_lists(self, n_rows: int) -> int:
+        if self.n_lists:
+            return max(1, min(self.n_lists, n_rows))
+        if n_rows < MIN_ROWS_FOR_IVF:
+            return 1
+        return int(round(math.sqrt(n_rows)))
+
+    def _train(self, vectors: np.ndarray) -> np.ndarray:
+        """K-means esférico sobre uma amostra de até 64 vetores por lista."""
+        n_lists = self._n_lists(len(vectors))
+        if n_lists == 1:
+            return np.zeros((1, vectors.shape[1]), dtype=np.float32)
+
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(len(vectors), 64 * n_lists)
+        sample = unit_rows(vectors[rng.choice(len(vectors), sample_size, replace=False)])
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)]
+
+        for _ in range(self.n_iter):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=n_lists) == 0
+            # Listas vazias recebem vetores aleatórios da amostra
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+            centroids = unit_rows(sums)
+        return centroids
+
+    def _assign(self, vectors: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        labels = np.zeros(len(vectors), dtype=np.int64)
+        if len(self.centroids) > 1:
+            for start in range(0, len(vectors), chunk_size):
+                chunk = vectors[start:start + chunk_size]
+                labels[start:start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return labels
+
+
+class CandidateRetriever:
+    """Índice IVF sincronizado com um `CandidateFeatureStore`."""
+
+    def __init__(self, store: Any, vacancy_columns: Sequence[str], index: Optional[IVFIndex] = None):
+        self.store = store
+        self.pairs = retrieval_pairs(store.vector_columns, vacancy_columns)
+        if not self.pairs:
+            raise ValueError("Nenhuma coluna de texto disponível para a recuperação de candidatos")
+        self.index = index or IVFIndex()
+        self.columns = list(dict.fromkeys(cand_col for cand_col, _ in self.pairs))
+        self._version = None
+        self._slots: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def sync(self) -> None:
+        """
+        Aplica ao índice as alterações do store desde a última sincronização.
+
+        Como os slots do store só são acrescentados, um slot diferente indica
+        candidato novo ou atualizado: só esses vetores são lidos e entram na
+        lista do centróide mais próximo, e os removidos saem da sua lista. O
+        índice é refeito por completo apenas na primeira sincronização, após
+        `compact()` (que renumera os slots para baixo) ou quando
+        `IVFIndex.needs_rebuild`.
+        """
+        self.store.refresh()
+        with self._lock:
+            if self.store.version == self._version:
+                return
+            version = self.store.version
+            slots = self.store.slots()
+            compacted = any(slots.get(candidate_id, slot) < slot for candidate_id, slot in self._slots.items())
+
+            if self._version is None or compacted:
+                self._rebuild()
+            else:
+                self.index.remove([candidate_id for candidate_id in self._slots if candidate_id not in slots])
+                changed = [candidate_id for candidate_id, slot in slots.items()
+                           if self._slots.get(candidate_id) != slot]
+                if changed:
+                    ids, vectors = self.store.column_vectors(self.columns, changed)
+                    self.index.upsert(ids, candidate_embeddings(vectors, self.pairs))
+                if self.index.needs_rebuild:
+                    self._rebuild()
+            self._slots = slots
+            self._version = version
+
+    def _rebuild(self) -> None:
+        ids, vectors = self.store.column_vectors(self.columns)
+        self.index.build(ids, candidate_embeddings(vectors, self.pairs))
+
+    def shortlist(self, vacancy_block: Dict[str, Any], size: int) -> Tuple[List[str], np.ndarray]:
+        """(ids, scores de recuperação) dos `size` candidatos mais próximos da vaga."""
+        self.sync()
+        query = vacancy_query(vacancy_block['vectors'], self.pairs)
+        with self._lock:
+            return self.index.search(query, size)
@@ -0,0 +1,244 @@
+"""
+Cache endereçado por conteúdo das etapas intermediárias do treino
+
+Cada execução de `train.py` refazia a leitura dos dumps, a padronização dos
+textos, os encoders e as similaridades, mesmo quando só os hiperparâmetros do
+XGBoost mudavam. Aqui cada etapa recebe uma chave (sha256) calculada a partir
+de:
+
+- hash do conteúdo dos arquivos de entrada (memorizado por caminho, tamanho e
+  mtime, para não reler arquivos grandes a cada execução);
+- código-fonte das funções/módulos que implementam a etapa;
+- parâmetros da etapa (listas de campos, config);
+- chave da etapa anterior, de modo que uma mudança a montante invalida todas
+  as etapas seguintes.
+
+As saídas de uma etapa (dict nome -> objeto) são gravadas em
+`<raiz>/<etapa>-<chave>/`: DataFrames/Series em pickle do pandas (preserva
+dtypes e a diferença entre None e NaN, da qual `padroniza_texto` depende),
+arrays numéricos em `.npy` e o restante via joblib. A gravação é atômica
+(diretório temporário + rename), então uma execução interrompida nunca deixa
+uma entrada parcial.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato das entradas; alterar invalida todo o cache
+CACHE_FORMAT_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+FILE_HASHES_FILE = 'file_hashes.json'
+
+# Bytes lidos por vez ao calcular o hash de arquivos
+_HASH_READ_SIZE = 1 << 22
+
+
+def _source_of(obj: Any) -> str:
+    """Código-fonte de uma função, classe ou módulo (ou o próprio texto, se str)."""
+    if isinstance(obj, str):
+        return obj
+    return inspect.getsource(obj)
+
+
+class StageCache:
+    """
+    Cache em disco das saídas das etapas do treino.
+
+    Args:
+        root: Diretório raiz do cache.
+        enabled: Se False, `get_or_compute` sempre recalcula e nada é gravado.
+    """
+
+    def __init__(self, root: Union[str, Path], enabled: bool = True):
+        self.root = Path(root)
+        self.enabled = enabled
+        self._file_hashes: Optional[Dict[str, Dict[str, Any]]] = None
+
+    # ------------------------------------------------------------------
+    # Chaves
+    # ------------------------------------------------------------------
+    def _load_file_hashes(self) -> Dict[str, Dict[str, Any]]:
+        if self._file_hashes is None:
+            try:
+                with open(self.root / FILE_HASHES_FILE, 'r', encoding='utf-8') as f:
+                    self._file_hashes = json.load(f)
+            except (OSError, ValueError):
+                self._file_hashes = {}
+        return self._file_hashes
+
+    def _save_file_hashes(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.file_hashes_')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._file_hashes, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.root / FILE_HASHES_FILE)
+
+    def file_hash(self, path: Union[str, Path]) -> str:
+        """
+        sha256 do conteúdo de um arquivo.
+
+        O resultado é memorizado por (caminho, tamanho, mtime); o arquivo só é
+        relido quando um desses valores muda.
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        hashes = self._load_file_hashes()
+        cached = hashes.get(str(path))
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_READ_SIZE), b''):
+                digest.update(block)
+        hashes[str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                             'sha256': digest.hexdigest()}
+        if self.enabled:
+            self._save_file_hashes()
+        return digest.hexdigest()
+
+    def key(self, stage: str, inputs: Iterable[Union[str, Path]] = (), code: Iterable[Any] = (),
+            params: Optional[Dict[str, Any]] = None, upstream: Optional[str] = None) -> str:
+        """
+        Chave de uma etapa.
+
+        Args:
+            stage: Nome da etapa.
+            inputs: Arquivos lidos pela etapa (entra o hash do conteúdo).
+            code: Funções, classes ou módulos da etapa (entra o código-fonte).
+            params: Parâmetros da etapa; precisam ser serializáveis em JSON.
+            upstream: Chave da etapa anterior.
+
+        Returns:
+            sha256 hexadecimal.
+        """
+        description = {
+            'version': CACHE_FORMAT_VERSION,
+            'stage': stage,
+            'inputs': [self.file_hash(path) for path in inputs],
+            'code': [hashlib.sha256(_source_of(obj).encode('utf-8')).hexdigest() for obj in code],
+            'params': params or {},
+            'upstream': upstream,
+        }
+        payload = json.dumps(description, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Entradas
+    # ------------------------------------------------------------------
+    def entry_path(self, stage: str, key: str) -> Path:
+        return self.root / f'{stage}-{key}'
+
+    def load(self, stage: str, key: str) -> Optional[Dict[str, Any]]:
+        """Saídas gravadas para (etapa, chave), ou None se não houver entrada."""
+        entry = self.entry_path(stage, key)
+        try:
+            with open(entry / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        outputs: Dict[str, Any] = {}
+        for name, fmt in manifest['outputs'].items():
+            path = entry / f'{name}.{fmt}'
+            if fmt == 'pkl':
+                outputs[name] = pd.read_pickle(path)
+            elif fmt == 'npy':
+                outputs[name] = np.load(path)
+            else:
+                outputs[name] = joblib.load(path)
+        return outputs
+
+    def latest(self, stage: str) -> Optional[Dict[str, Any]]:
+        """Saídas da entrada mais recente de uma etapa, ou None se não houver nenhuma."""
+        manifests = []
+        for manifest_path in self.root.glob(f'{stage}-*/{MANIFEST_FILE}'):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            manifests.append(manifest)
+        if not manifests:
+            return None
+        newest = max(manifests, key=lambda manifest: manifest['created_at'])
+        return self.load(stage, newest['key'])
+
+    def save(self, stage: str, key: str, outputs: Dict[str, Any]) -> Path:
+        """
+        Grava as saídas de uma etapa.
+
+        Args:
+            stage: Nome da etapa.
+            key: Chave da etapa (ver `key`).
+            outputs: Nome -> objeto. DataFrames/Series vão em pickle do pandas,
+                     arrays numéricos em `.npy` e o restante via joblib.
+
+        Returns:
+            Diretório da entrada.
+        """
+        entry = self.entry_path(stage, key)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.root, prefix=f'.{stage}-'))
+        try:
+            formats = {}
+            for name, value in outputs.items():
+                if isinstance(value, (pd.DataFrame, pd.Series)):
+                    formats[name] = 'pkl'
+                    value.to_pickle(tmp_dir / f'{name}.pkl')
+                elif isinstance(value, np.ndarray) and value.dtype != object:
+                    formats[name] = 'npy'
+                    np.save(tmp_dir / f'{name}.npy', value, allow_pickle=False)
+                else:
+                    formats[name] = 'joblib'
+                    joblib.dump(value, tmp_dir / f'{name}.joblib')
+            manifest = {'stage': stage, 'key': key, 'created_at': time.time(), 'outputs': formats}
+            with open(tmp_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+
+            if entry.exists():
+                shutil.rmtree(entry)
+            os.replace(tmp_dir, entry)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return entry
+
+    def get_or_compute(self, stage: str, key: str,
+                       compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Retorna as saídas em cache de uma etapa ou as calcula e grava.
+
+        Args:
+            stage: Nome da etapa.
+            key: Chave da etapa.
+            compute: Função sem argumentos que retorna o dict de saídas.
+        """
+        if self.enabled:
+            outputs = self.load(stage, key)
+            if outputs is not None:
+                logger.info(f"Etapa '{stage}' carregada do cache ({key[:12]})")
+                return outputs
+
+        start = time.perf_counter()
+        outputs = compute()
+        logger.info(f"Etapa '{stage}' calculada em {time.perf_counter() - start:.1f}s")
+        if self.enabled:
+            self.save(stage, key, outputs)
+        return outputs
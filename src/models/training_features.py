@@ -0,0 +1,173 @@
+"""
+Geração paralela das features de similaridade do treino
+
+`train.py` expandia as 16 colunas de texto da tabela de prospects em 1.600
+colunas de embedding, todas em memória, para depois consumir apenas as 10
+similaridades de cosseno listadas em `feature_list`. Este módulo calcula só
+essas similaridades:
+
+- a tabela é dividida em blocos de linhas, processados por um pool de
+  processos;
+- cada worker abre o Word2Vec no formato binário via memory-map somente
+  leitura (`word2vec_store`), então a matriz de embeddings fica no page cache
+  uma única vez para todos os workers;
+- cada bloco calcula os vetores de documento apenas das colunas exigidas
+  pelas similaridades (`EmbeddingEngine`) e grava o resultado em um `.npy`
+  no diretório de trabalho. O processo principal só monta a matriz final
+  (n_linhas x n_similaridades).
+
+Assim o pico de memória depende do tamanho do bloco e do número de workers,
+não do número de linhas, e o tempo total escala com os núcleos disponíveis.
+"""
+
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.models.embedding_engine import EmbeddingEngine
+from src.models.utils import cosine_similarity_rows
+from src.models.word2vec_store import BINARY_SUFFIX, caminho_binario, carregar_word2vec, converter_para_binario
+
+
+# Similaridades do treino: feature -> (coluna, coluna), na ordem de `train.py`
+TRAINING_SIMILARITY_FEATURES: Dict[str, Tuple[str, str]] = {
+    'objetivo_sim': ('objetivo_profissional_cand', 'titulo'),
+    'cargo_sim': ('cargo_atual_cand', 'titulo'),
+    'exp_sim': ('area_atuacao_cand', 'titulo'),
+    'outro_idioma_sim': ('outro_idioma_cand', 'outro_idioma_vaga'),
+    'area_atuacao_sim': ('area_atuacao_cand', 'areas_atuacao_vaga'),
+    'certificacoes_sim': ('certificacoes_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+    'outras_certificacoes_sim': ('outras_certificacoes_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+    'conhecimentos_tecnicos_sim': ('conhecimentos_tecnicos_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+    'atividades_sim': ('cv_pt_cand', 'principais_atividades_vaga'),
+    'competencias_sim': ('cv_pt_cand', 'competencia_tecnicas_e_comportamentais_vaga'),
+}
+
+# Linhas da tabela de prospects por bloco
+DEFAULT_CHUNK_SIZE = 4096
+
+# Blocos em andamento por worker (limita os blocos de texto aguardando na fila)
+MAX_PENDING_PER_WORKER = 2
+
+# Os workers são criados por fork: `train.py` é um script sem guarda de
+# `__main__`, que seria reexecutado por inteiro com spawn/forkserver
+_MP_CONTEXT = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+
+# Motor de embeddings de cada worker (criado em `_init_worker`)
+_ENGINE: Optional[EmbeddingEngine] = None
+
+
+def similarity_block(engine: EmbeddingEngine, frame: pd.DataFrame,
+                     similarity_features: Dict[str, Tuple[str, str]]) -> np.ndarray:
+    """
+    Similaridades de cosseno de um bloco de linhas.
+
+    Args:
+        engine: Motor de vetores de documento.
+        frame: Linhas do bloco com as colunas de texto usadas pelas similaridades.
+        similarity_features: Feature -> par de colunas de texto.
+
+    Returns:
+        Matriz float32 (len(frame) x len(similarity_features)), com as
+        colunas na ordem de `similarity_features`.
+    """
+    columns = {col for pair in similarity_features.values() for col in pair}
+    vectors = {col: engine.embed(frame[col].tolist()) for col in sorted(columns)}
+    block = np.empty((len(frame), len(similarity_features)), dtype=np.float32)
+    for j, (first, second) in enumerate(similarity_features.values()):
+        block[:, j] = cosine_similarity_rows(vectors[first], vectors[second])
+    return block
+
+
+def _init_worker(w2v_path: str) -> None:
+    global _ENGINE
+    _ENGINE = EmbeddingEngine(carregar_word2vec(w2v_path, 'binary'))
+
+
+def _build_block(frame: pd.DataFrame, similarity_features: Dict[str, Tuple[str, str]],
+                 output_path: str) -> str:
+    np.save(output_path, similarity_block(_ENGINE, frame, similarity_features))
+    return output_path
+
+
+def _binary_w2v(w2v_path: Union[str, Path]) -> Path:
+    """Caminho do Word2Vec binário (memory-map), convertendo o arquivo texto na primeira vez."""
+    w2v_path = Path(w2v_path)
+    if w2v_path.suffix == BINARY_SUFFIX:
+        return w2v_path
+    if caminho_binario(w2v_path).exists():
+        return caminho_binario(w2v_path)
+    return converter_para_binario(w2v_path)
+
+
+def build_similarity_features(df: pd.DataFrame, w2v_path: Union[str, Path],
+                              similarity_features: Optional[Dict[str, Tuple[str, str]]] = None,
+                              n_jobs: Optional[int] = None,
+                              chunk_size: int = DEFAULT_CHUNK_SIZE,
+                              work_dir: Optional[Union[str, Path]] = None) -> pd.DataFrame:
+    """
+    Calcula as similaridades de cosseno do treino em blocos, em paralelo.
+
+    Args:
+        df: Tabela de prospects (pós-merge) com as colunas de texto.
+        w2v_path: Word2Vec em texto ou binário; o texto é convertido para o
+                  formato binário (`.kv`) ao lado do original na primeira vez.
+        similarity_features: Feature -> par de colunas. Padrão:
+                             TRAINING_SIMILARITY_FEATURES.
+        n_jobs: Número de processos (padrão: número de CPUs). Com 1 os
+                blocos são calculados no próprio processo.
+        chunk_size: Linhas por bloco.
+        work_dir: Diretório dos blocos intermediários. Por padrão usa um
+                  diretório temporário removido ao final.
+
+    Returns:
+        DataFrame com uma coluna float32 por similaridade, alinhado ao índice de `df`.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size deve ser positivo: {chunk_size}")
+    similarity_features = similarity_features or TRAINING_SIMILARITY_FEATURES
+    n_jobs = n_jobs or os.cpu_count() or 1
+    w2v_path = str(_binary_w2v(w2v_path))
+    text_columns = sorted({col for pair in similarity_features.values() for col in pair})
+
+    with tempfile.TemporaryDirectory(prefix='training_features_') as tmp_dir:
+        blocks_dir = Path(work_dir or tmp_dir)
+        blocks_dir.mkdir(parents=True, exist_ok=True)
+
+        starts = range(0, len(df), chunk_size)
+        paths = [str(blocks_dir / f'bloco_{i:05d}.npy') for i in range(len(starts))]
+
+        def chunks() -> Iterator[pd.DataFrame]:
+            for start in starts:
+                yield df.iloc[start:start + chunk_size][text_columns]
+
+        if n_jobs == 1 or len(starts) <= 1:
+            _init_worker(w2v_path)
+            for frame, path in zip(chunks(), paths):
+                _build_block(frame, similarity_features, path)
+        else:
+            n_workers = min(n_jobs, len(starts))
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=_MP_CONTEXT,
+                                     initializer=_init_worker, initargs=(w2v_path,)) as executor:
+                pending = set()
+                for frame, path in zip(chunks(), paths):
+                    if len(pending) >= n_workers * MAX_PENDING_PER_WORKER:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    pending.add(executor.submit(_build_block, frame, similarity_features, path))
+                for future in wait(pending).done:
+                    future.result()
+
+        result = np.empty((len(df), len(similarity_features)), dtype=np.float32)
+        for start, path in zip(starts, paths):
+            block = np.load(path, mmap_mode='r')
+            result[start:start + len(block)] = block
+
+    return pd.DataFrame(result, columns=list(similarity_features), index=df.index)
@@ -0,0 +1,426 @@
+"""
+Etapas do treino e suas chaves no `StageCache`
+
+Os caminhos dos dumps, as listas de campos, as funções de cada etapa e o
+cálculo das chaves ficam aqui, fora do script `train.py`, para que a busca de
+hiperparâmetros recalcule a chave da etapa `features` exatamente como o treino
+e carregue a matriz produzida pelos dados e pelo código atuais, e não a
+entrada mais recente do cache.
+"""
+
+import os
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OrdinalEncoder
+
+from src.features import raw_loader
+from src.features.raw_loader import APPLICANT_SECTIONS, VACANCY_SECTIONS, load_prospects, load_records
+from src.models import embedding_engine, training_features, utils, word2vec_store
+from src.models.stage_cache import StageCache
+from src.models.training_features import DEFAULT_CHUNK_SIZE, build_similarity_features
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+APPLICANTS_PATH = PROJECT_ROOT / 'src' / 'data' / 'applicants.json'
+PROSPECTS_PATH = PROJECT_ROOT / 'src' / 'data' / 'prospects.json'
+VAGAS_PATH = PROJECT_ROOT / 'src' / 'data' / 'vagas.json'
+W2V_MODEL_PATH = PROJECT_ROOT / 'src' / 'word2vec' / 'cbow_s100.txt'
+
+# ---
+# Leitura dos dumps em streaming, apenas com os campos usados
+# ---
+# selecao de features relevantes para o problema a ser resolvido
+features_vagas = ['titulo_vaga', 'vaga_sap', 'cliente', 'solicitante_cliente',
+                  'tipo_contratacao', 'vaga_especifica_para_pcd',
+                  'nivel profissional', 'nivel_academico', 'nivel_ingles',
+                  'nivel_espanhol', 'outro_idioma', 'areas_atuacao',
+                  'principais_atividades',
+                  'competencia_tecnicas_e_comportamentais']
+features_applicants = ['pcd', 'objetivo_profissional', 'area_atuacao',
+                       'conhecimentos_tecnicos', 'certificacoes',
+                       'outras_certificacoes', 'nivel_academico',
+                       'nivel_ingles', 'nivel_espanhol', 'outro_idioma',
+                       'cursos', 'cargo_atual', 'data_admissao',
+                       'data_ultima_promocao', 'cv_pt']
+prospect_fields = ['nome', 'codigo', 'situacao_candidado',
+                   'data_candidatura', 'ultima_atualizacao',
+                   'comentario', 'recrutador']
+
+
+def carregar_tabelas():
+    df_applicants = load_records(APPLICANTS_PATH, APPLICANT_SECTIONS, features_applicants)
+    df_vagas = load_records(VAGAS_PATH, VACANCY_SECTIONS, features_vagas)
+    # uma linha por prospect, com o id da vaga e os campos de topo da vaga
+    df_prospects = load_prospects(PROSPECTS_PATH,
+                                  vacancy_fields=['titulo', 'modalidade'],
+                                  prospect_fields=prospect_fields)
+
+    # ajustando nomes das features
+    df_prospects.rename(columns={'codigo': 'id_cand'}, inplace=True)
+    return {'df_applicants': df_applicants, 'df_vagas': df_vagas,
+            'df_prospects': df_prospects}
+
+# ---
+# Feature Engineering
+# ---
+def preprocessar(df_applicants, df_vagas, df_prospects):
+    # criacao de features de senioridade
+    df_applicants['senioridade'] = utils.mapear_senioridade(
+        df_applicants['cargo_atual']
+    )
+
+    df_vagas['senioridade'] = utils.mapear_senioridade(
+        df_vagas['nivel profissional']
+    )
+    # calculo de feature de experiência
+    df_applicants['tempo_exp'] = (pd.to_datetime('2025-07-01') -
+                                  pd.to_datetime(df_applicants['data_admissao'],
+                                                 dayfirst=True,
+                                                 errors='coerce')).dt.days/365.25
+    # considerando que valores faltantes são candidatos sem experiência
+    df_applicants['tempo_exp'] = df_applicants['tempo_exp'].fillna(0)
+
+    # tratamento das colunas de texto
+    textos_applicants = ['area_atuacao', 'conhecimentos_tecnicos',
+                         'objetivo_profissional', 'certificacoes',
+                         'outras_certificacoes',
+                         'nivel_academico', 'outro_idioma',
+                         'cursos', 'cargo_atual', 'cv_pt']
+    utils.padroniza_texto(df_applicants, textos_applicants)
+
+    textos_vagas = ['titulo_vaga', 'vaga_sap',
+                    'vaga_especifica_para_pcd',
+                    'outro_idioma', 'areas_atuacao', 'principais_atividades',
+                    'competencia_tecnicas_e_comportamentais', 'nivel_academico']
+    utils.padroniza_texto(df_vagas, textos_vagas)
+
+    # tratamento das colunas de idiomas
+
+    # ---
+    # ENCODING DE IDIOMAS E EDUCAÇÃO (com nomes de colunas corretos)
+    # ---
+    language_features = ['nivel_ingles', 'nivel_espanhol']
+    idioma_encoders = {}
+    for lang in language_features:
+        df_applicants[lang] = df_applicants[lang].fillna('desconhecido').replace('', 'desconhecido')
+        df_vagas[lang] = df_vagas[lang].fillna('desconhecido').replace('', 'desconhecido')
+        combined = pd.concat([df_applicants[[lang]], df_vagas[[lang]]], ignore_index=True)
+        enc = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+        enc.fit(combined[[lang]])
+        idioma_encoders[lang] = enc
+        df_applicants[f'{lang}_encoded'] = enc.transform(df_applicants[[lang]])
+        df_vagas[f'{lang}_encoded'] = enc.transform(df_vagas[[lang]])
+
+    # Educação
+    # Preenche valores ausentes/vazios
+    df_applicants['nivel_academico'] = df_applicants['nivel_academico'].fillna('desconhecido').replace('', 'desconhecido')
+    df_vagas['nivel_academico'] = df_vagas['nivel_academico'].fillna('desconhecido').replace('', 'desconhecido')
+    combined_educ = pd.concat([df_applicants[['nivel_academico']], df_vagas[['nivel_academico']]], ignore_index=True)
+    educacao_encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+    educacao_encoder.fit(combined_educ[['nivel_academico']])
+    df_applicants['nivel_academico_encoded'] = educacao_encoder.transform(df_applicants[['nivel_academico']])
+    df_vagas['nivel_academico_encoded'] = educacao_encoder.transform(df_vagas[['nivel_academico']])
+
+    # ---
+    # Salva modelo e artefatos
+    # ---
+    artifacts = {
+        'ordinal_encoders': {
+            'idioma_encoders': idioma_encoders,
+            'educacao_encoder': educacao_encoder
+        },
+        # model_features will be set after X is defined
+    }
+
+    # tratamento dos regimes de contratação
+    # separação dos tipos de contratação que estavam como string única
+    df_vagas['tipo_contratacao_cleaned'] = df_vagas['tipo_contratacao'].fillna('')
+    df_vagas['tipo_contratacao_cleaned'] = (
+        df_vagas['tipo_contratacao_cleaned']
+        .apply(lambda x: [item.strip() for item in x.split(',') if item.strip()])
+        )
+
+    # listando tipos únicos de contratação
+    tipos_contratacao = set()
+    for tipo in df_vagas['tipo_contratacao_cleaned']:
+        for t in tipo:
+            tipos_contratacao.add(t)
+
+    # coluna binária para cada categoria
+    for tipo in tipos_contratacao:
+        # Limpa e normaliza o nome do tipo para criar um nome de coluna válido.
+        # O 'tipo' original é preservado para a verificação na lista.
+        tipo_normalizado = tipo.lower()
+        tipo_normalizado = (
+            unicodedata
+            .normalize('NFKD', str(tipo_normalizado))
+            .encode('ascii', 'ignore')
+            .decode('utf-8')
+        )
+        tipo_normalizado = re.sub(r'[^a-zA-Z0-9\s]', '', str(tipo_normalizado))
+        nome_coluna = f"contratacao_{tipo_normalizado.strip().replace(' ', '_')}"
+        df_vagas[nome_coluna] = (
+            df_vagas['tipo_contratacao_cleaned']
+            .apply(lambda lista_tipos: 1 if tipo in lista_tipos else 0)
+        )
+
+    df_vagas = df_vagas.drop(
+        ['tipo_contratacao', 'tipo_contratacao_cleaned'],
+        axis=1
+        )
+
+    # tratamento de colunas binárias
+    df_applicants['pcd'] = (df_applicants['pcd'] == 'Sim').astype(int)
+    df_vagas['vaga_sap'] = (df_vagas['vaga_sap'] == 'Sim').astype(int)
+    df_vagas['vaga_especifica_para_pcd'] = (
+        (df_vagas['vaga_especifica_para_pcd'] == 'Sim')
+        .astype(int)
+    )
+
+    # criação de score para a variável target
+    mapeamento_situacao_candidato = {
+            # Estágios Negativos / Sem Progresso
+            '': 0.0,  # Para NaN ou vazio, representando sem informação/sem match
+            'desistiu': 0.0,
+            'recusado': 0.0,
+            'não aprovado pelo cliente': 0.4,
+            'não aprovado pelo rh': 0.0,
+            'não aprovado pelo requisitante': 0.4,
+            'desistiu da contratacao': 0.7,
+            'sem interesse nesta vaga': 0.0,
+
+            # Estágios Iniciais / Baixo Progresso
+            'prospect': 0.1,  # Estágio inicial, antes de 'Inscrito'
+            'inscrito': 0.15,  # Candidato apenas aplicou
+            'em avaliação pelo rh': 0.2,  # Triagem inicial
+
+            # Estágios Intermediários
+            'encaminhado ao requisitante': 0.4,  # Passou da triagem inicial
+            'entrevista tcnica': 0.5,
+            'entrevista com cliente': 0.6,  # Ponto chave!
+
+            # Estágios Finais / Alta Probabilidade de Match
+            'aprovado': 0.7,  # Aprovado internamente ou em alguma etapa chave
+            'encaminhar proposta': 0.8,
+            'proposta aceita': 0.9,
+            'documentação clt': 0.92,  # Ultimos passos, quase lá
+            'documentação pj': 0.92,
+            'documentação cooperado': 0.92,
+
+            # Estágios de Sucesso (match bem-sucedido)
+            'contratado pela decision': 1.0,
+            'contratado como hunting': 1.0,
+        }
+
+    df_prospects['situacao_candidado'] = (
+        df_prospects['situacao_candidado']
+        .astype(str)
+        .str.lower()
+        .str.strip()
+        .replace('nan', '')
+    )
+    print(df_prospects['situacao_candidado'].unique())
+    df_prospects['target_var'] = (
+        df_prospects['situacao_candidado']
+        .map(mapeamento_situacao_candidato)
+    )
+    df_prospects.drop(columns=['situacao_candidado'], inplace=True)
+
+    # ---
+    # Merge dos dataframes
+    # ---
+    df_vagas_final = df_vagas.add_suffix('_vaga')
+    df_applicants_final = df_applicants.add_suffix('_cand')
+
+    df_prospects['id_cand'] = df_prospects['id_cand'].astype(str)
+    df_applicants_final['id_cand'] = df_applicants_final['id_cand'].astype(str)
+
+    df_merged = pd.merge(df_prospects,
+                         df_applicants_final,
+                         on='id_cand',
+                         how='left'
+                         )
+    df_merged = pd.merge(df_merged,
+                         df_vagas_final,
+                         on='id_vaga',
+                         how='left'
+                         )
+
+    # Removendo casos com target_var == 0.1
+    df_merged = df_merged[df_merged['target_var'] != 0.1]
+
+    return {'df_merged': df_merged, 'artifacts': artifacts,
+            'tipos_contratacao': tipos_contratacao}
+
+# ---
+# Criação dos embeddings dos campos texto
+# ---
+text_features_list = ['titulo', 'modalidade', 'objetivo_profissional_cand',
+                      'outro_idioma_cand', 'area_atuacao_cand',
+                      'conhecimentos_tecnicos_cand', 'certificacoes_cand',
+                      'outras_certificacoes_cand', 'cargo_atual_cand',
+                      'cv_pt_cand', 'titulo_vaga_vaga',
+                      'nivel profissional_vaga', 'outro_idioma_vaga',
+                      'areas_atuacao_vaga', 'principais_atividades_vaga',
+                      'competencia_tecnicas_e_comportamentais_vaga']
+
+
+def calcular_similaridades(df_merged, feature_builder=None):
+    # Apenas as similaridades consumidas pelo modelo são calculadas, em blocos de
+    # linhas distribuídos entre processos (Word2Vec compartilhado via memory-map)
+    feature_builder = feature_builder or {}
+    df_similaridades = build_similarity_features(
+        df_merged,
+        w2v_path=W2V_MODEL_PATH,
+        n_jobs=int(os.environ.get('TRAIN_N_JOBS', 0)) or feature_builder.get('n_jobs'),
+        chunk_size=feature_builder.get('chunk_size', DEFAULT_CHUNK_SIZE),
+        work_dir=feature_builder.get('work_dir')
+    )
+    return {'df_similaridades': df_similaridades}
+
+# ---
+# Definição de Dataframe final para o modelo
+# ---
+def montar_features(df_merged, df_similaridades, feature_list):
+    target_counts = pd.Series({
+        0.00: 7635, 
+        0.15: 3980,
+        0.20: 375,
+        0.40: 20379,
+        0.60: 469,
+        0.70: 209,
+        0.80: 2,
+        0.90: 1,
+        0.92: 9,
+        1.00: 2984
+    })
+
+    # Calcular o peso inverso da frequência para cada score
+    total_samples = target_counts.sum()
+    num_unique_scores = target_counts.shape[0]
+
+    # Calcular pesos de forma que scores mais raros tenham pesos maiores
+    weights_dict = {}
+    for score_value, count in target_counts.items():
+        # Evitar divisão por zero se count for 0 (embora aqui não seja o caso)
+        weights_dict[score_value] = total_samples / count if count > 0 else 0
+
+    # Normalizar os pesos para que a escala seja mais razoável
+    min_weight = min(w for w in weights_dict.values() if w > 0)
+    normalized_weights_dict = {k: v / min_weight for k, v in weights_dict.items()}
+
+    # Para aplicar no seu DataFrame (df_treino_final):
+    sample_weights_series = df_merged['target_var'].map(normalized_weights_dict)
+
+
+    df_final = pd.concat([df_merged.drop(columns=text_features_list), df_similaridades], axis=1)
+    to_cancel_list = ['nivel_ingles_cand', 'nivel_espanhol_cand',
+                      'cursos_cand', 'data_admissao_cand',
+                      'data_ultima_promocao_cand', 'nivel_ingles_vaga',
+                      'nivel_espanhol_vaga', 'data_candidatura',
+                      'ultima_atualizacao', 'nome', 'comentario',
+                      'recrutador', 'cliente_vaga', 'solicitante_cliente_vaga']
+    df_final.drop(columns=to_cancel_list, inplace=True)
+    df_final = df_final.dropna()
+
+    # similaridade para ordinal_encoder e para colunas binárias
+    df_final['ingles'] = (
+        df_final['nivel_ingles_encoded_cand']
+        - df_final['nivel_ingles_encoded_vaga']
+    )
+
+    df_final['espanhol'] = (
+        df_final['nivel_espanhol_encoded_cand']
+        - df_final['nivel_espanhol_encoded_vaga']
+    )
+
+    df_final['gap_senioridade'] = (
+        df_final['senioridade_cand'] - df_final['senioridade_vaga']
+    )
+
+    df_final['possui_senioridade_minima'] = (
+        df_final['senioridade_cand'] >= df_final['senioridade_vaga']
+    ).astype(int)
+
+    df_final['possui_nivel_academico_minimo'] = (
+        df_final['nivel_academico_encoded_cand']
+        >= df_final['nivel_academico_encoded_vaga']
+    ).astype(int)
+
+    df_final['possui_nivel_ingles_minimo'] = (
+        df_final['nivel_ingles_encoded_cand']
+        >= df_final['nivel_ingles_encoded_vaga']
+    ).astype(int)
+
+    df_final['possui_nivel_espanhol_minimo'] = (
+        df_final['nivel_espanhol_encoded_cand']
+        >= df_final['nivel_espanhol_encoded_vaga']
+    ).astype(int)
+
+    # similaridade para features binárias
+    condicoes = [
+        (
+            df_final['vaga_especifica_para_pcd_vaga'] == 1)
+        &
+        (df_final['pcd_cand'] == 0),
+        (df_final['vaga_especifica_para_pcd_vaga'] == 1)
+        &
+        (df_final['pcd_cand'] == 1)
+    ]
+    valores = [0, 2]
+    df_final['compatibilidade_pcd'] = np.select(condicoes, valores, default=1)
+
+    df_final = df_final[feature_list + ['target_var']]
+    return {'X': df_final.drop(columns=['target_var']),
+            'y': df_final['target_var'],
+            'sample_weight': sample_weights_series.loc[df_final.index]}
+
+
+# ---
+# Chaves das etapas
+# ---
+# Cada etapa é identificada pelo hash das entradas, do código e dos parâmetros
+# e pela chave da etapa anterior; se só model_params mudou, todas as chaves se
+# repetem e o treino parte direto da matriz final
+def stage_keys(cache: StageCache, feature_list: List[str]) -> Dict[str, Any]:
+    """
+    Chaves das etapas do treino, na ordem de execução.
+
+    Args:
+        cache: Cache das etapas (memoriza o hash dos arquivos de entrada).
+        feature_list: `feature_list` do config.
+
+    Returns:
+        Dict etapa -> chave ('tabelas', 'preprocessamento', 'similaridades', 'features').
+    """
+    chave_tabelas = cache.key(
+        'tabelas',
+        inputs=[APPLICANTS_PATH, VAGAS_PATH, PROSPECTS_PATH],
+        code=[carregar_tabelas, raw_loader],
+        params={'features_vagas': features_vagas,
+                'features_applicants': features_applicants,
+                'prospect_fields': prospect_fields}
+    )
+    chave_preprocessamento = cache.key('preprocessamento', code=[preprocessar, utils],
+                                       upstream=chave_tabelas)
+    chave_similaridades = cache.key(
+        'similaridades',
+        inputs=[W2V_MODEL_PATH],
+        code=[calcular_similaridades, training_features, embedding_engine, word2vec_store],
+        upstream=chave_preprocessamento
+    )
+    chave_features = cache.key(
+        'features',
+        code=[montar_features],
+        params={'feature_list': feature_list,
+                'text_features_list': text_features_list},
+        upstream=chave_similaridades
+    )
+    return {'tabelas': chave_tabelas, 'preprocessamento': chave_preprocessamento,
+            'similaridades': chave_similaridades, 'features': chave_features}
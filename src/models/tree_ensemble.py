@@ -0,0 +1,277 @@
+"""
+Avaliação vetorizada do ensemble de árvores em NumPy
+
+Backend opcional de predição (`backend='numpy'` no `PredictionPipeline`) que
+dispensa o xgboost em tempo de execução. As árvores do booster treinado são
+convertidas, a partir do dump JSON do modelo, em arrays planos (feature,
+limiar, direção dos valores ausentes e valor das folhas) e gravadas em
+`model.trees.npz`, carregado só com NumPy.
+
+As árvores são guardadas em layout de árvore binária completa (filhos de `i`
+em `2i + 1` e `2i + 2`) e a predição percorre todas ao mesmo tempo: a cada
+nível, uma matriz (n_linhas x n_árvores) de posições avança com gathers
+vetorizados. A comparação segue a do xgboost (valor convertido para float32,
+`x < limiar` vai para a esquerda, NaN segue `default_left`) e a soma das
+folhas é acumulada em float32, árvore a árvore, a partir do `base_score`,
+de modo que os scores são idênticos aos do `XGBRegressor.predict`.
+
+Uso (gerar o arquivo a partir de um modelo treinado; requer o xgboost):
+    python -m src.models.tree_ensemble artifacts/model.joblib \
+        --artifacts artifacts/preprocessing_artifacts.joblib
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+TREES_SUFFIX = '.trees.npz'
+
+# Objetivos cuja predição é a própria margem (soma das folhas + base_score)
+IDENTITY_OBJECTIVES = ('reg:squarederror', 'reg:absoluteerror', 'reg:pseudohubererror')
+
+# Profundidade máxima aceita: o layout completo ocupa 2**profundidade nós por árvore
+MAX_DEPTH = 12
+
+# Linhas avaliadas por vez (mantém as matrizes linhas x árvores no cache da CPU)
+DEFAULT_CHUNK_SIZE = 256
+
+_ARRAYS = ('feature', 'threshold', 'default_left', 'leaf_value')
+
+
+def trees_path(model_path: Union[str, Path]) -> Path:
+    """Caminho padrão do arquivo de árvores para um modelo (`model.joblib` -> `model.trees.npz`)."""
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.name.split('.')[0] + TREES_SUFFIX)
+
+
+def _parse_float32(value: Any) -> np.float32:
+    """Float do JSON do xgboost (ex.: '2.6722556E-1' ou '[2.6722556E-1]')."""
+    if isinstance(value, str):
+        value = value.strip('[]').split(',')[0]
+    return np.float32(value)
+
+
+def _tree_depth(left: List[int], right: List[int]) -> int:
+    """Profundidade (número de splits no caminho mais longo) de uma árvore."""
+    depth, stack = 0, [(0, 0)]
+    while stack:
+        node, level = stack.pop()
+        if left[node] == -1:
+            depth = max(depth, level)
+        else:
+            stack.append((left[node], level + 1))
+            stack.append((right[node], level + 1))
+    return depth
+
+
+class TreeEnsemble:
+    """
+    Ensemble de árvores de regressão em layout de árvore binária completa.
+
+    Cada árvore ocupa uma linha de cada array: os nós internos ficam nas
+    posições 0..2**d - 2 (filhos de `i` em `2i + 1` e `2i + 2`) e as folhas no
+    último nível. Folhas mais rasas que `d` são replicadas em todo o intervalo
+    de folhas abaixo delas, então o caminho tem sempre `d` passos e o próximo
+    nó é calculado, sem gather dos filhos.
+
+    Args:
+        feature: Feature de cada nó interno (int32, n_árvores x 2**d - 1).
+        threshold: Limiar de cada nó interno (float32, mesma forma).
+        default_left: Se o valor ausente segue para a esquerda (bool, mesma forma).
+        leaf_value: Valor de cada folha do último nível (float32, n_árvores x 2**d).
+        base_score: Margem inicial.
+        feature_names: Ordem das colunas esperada em `predict`.
+        n_features: Número de colunas esperado em `predict`.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, default_left: np.ndarray,
+                 leaf_value: np.ndarray, base_score: float, feature_names: Sequence[str], n_features: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.default_left = default_left
+        self.leaf_value = leaf_value
+        self.base_score = np.float32(base_score)
+        self.feature_names: List[str] = list(feature_names)
+        self.n_features = int(n_features)
+        self.n_trees, n_leaves = leaf_value.shape
+        self.depth = n_leaves.bit_length() - 1
+
+        # Arrays planos e deslocamentos de cada árvore usados em `predict`
+        self._feature = feature.ravel().astype(np.intp)
+        self._threshold = threshold.ravel()
+        self._default_left = default_left.ravel()
+        self._leaf_value = leaf_value.ravel()
+        self._node_offsets = np.arange(self.n_trees, dtype=np.intp) * feature.shape[1]
+        self._leaf_offsets = np.arange(self.n_trees, dtype=np.intp) * n_leaves - feature.shape[1]
+
+    @classmethod
+    def from_model_json(cls, model: Dict[str, Any], feature_names: Optional[Sequence[str]] = None,
+                        iteration_range: Tuple[int, int] = (0, 0)) -> 'TreeEnsemble':
+        """
+        Converte o dump JSON de um booster (`Booster.save_raw('json')`).
+
+        Args:
+            model: JSON do modelo já decodificado.
+            feature_names: Ordem das colunas (padrão: nomes do booster).
+            iteration_range: Iterações usadas na predição ((0, 0) = todas).
+
+        Raises:
+            ValueError: Objetivo com transformação da margem, booster que não
+                        é de árvores, splits categóricos ou árvores mais
+                        profundas que MAX_DEPTH.
+        """
+        learner = model['learner']
+        objective = learner['objective']['name']
+        if objective not in IDENTITY_OBJECTIVES:
+            raise ValueError(f"Objetivo não suportado pelo backend numpy: {objective}")
+        booster = learner['gradient_booster']
+        if booster['name'] != 'gbtree':
+            raise ValueError(f"Booster não suportado pelo backend numpy: {booster['name']}")
+
+        trees = booster['model']['trees']
+        indptr = booster['model'].get('iteration_indptr') or list(range(len(trees) + 1))
+        start, end = iteration_range
+        if end <= 0:
+            end = len(indptr) - 1
+        trees = trees[indptr[start]:indptr[end]]
+        if any(any(tree.get('split_type', [])) for tree in trees):
+            raise ValueError("Splits categóricos não são suportados pelo backend numpy")
+
+        depth = max((_tree_depth(t['left_children'], t['right_children']) for t in trees), default=0)
+        if depth > MAX_DEPTH:
+            raise ValueError(f"Árvores com profundidade {depth} excedem o limite do backend numpy ({MAX_DEPTH})")
+        n_internal = (1 << depth) - 1
+
+        feature = np.zeros((len(trees), n_internal), dtype=np.int32)
+        threshold = np.zeros((len(trees), n_internal), dtype=np.float32)
+        default_left = np.ones((len(trees), n_internal), dtype=bool)
+        leaf_value = np.zeros((len(trees), 1 << depth), dtype=np.float32)
+        for t, tree in enumerate(trees):
+            left, right = tree['left_children'], tree['right_children']
+            # nas folhas, `split_conditions` guarda o valor da folha (já com o learning rate)
+            conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+            stack = [(0, 0, 0)]  # (nó do xgboost, posição no layout completo, nível)
+            while stack:
+                node, pos, level = stack.pop()
+                if left[node] == -1:
+                    first = ((pos + 1) << (depth - level)) - 1 - n_internal
+                    leaf_value[t, first:first + (1 << (depth - level))] = conditions[node]
+                    continue
+                feature[t, pos] = tree['split_indices'][node]
+                threshold[t, pos] = conditions[node]
+                default_left[t, pos] = bool(tree['default_left'][node])
+                stack.append((left[node], 2 * pos + 1, level + 1))
+                stack.append((right[node], 2 * pos + 2, level + 1))
+
+        params = learner['learner_model_param']
+        names = feature_names if feature_names is not None else learner.get('feature_names', [])
+        return cls(feature, threshold, default_left, leaf_value,
+                   base_score=_parse_float32(params['base_score']),
+                   feature_names=names, n_features=int(params['num_feature']))
+
+    @classmethod
+    def from_booster(cls, booster: Any, feature_names: Optional[Sequence[str]] = None,
+                     iteration_range: Optional[Tuple[int, int]] = None) -> 'TreeEnsemble':
+        """
+        Converte um `xgboost.Booster` (ou XGBRegressor). Por padrão usa as
+        mesmas iterações do `XGBRegressor.predict` (melhor iteração do early stopping).
+        """
+        if hasattr(booster, 'get_booster'):
+            booster = booster.get_booster()
+        if iteration_range is None:
+            best_iteration = booster.attr('best_iteration')
+            iteration_range = (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+        model = json.loads(bytes(booster.save_raw('json')))
+        return cls.from_model_json(model, feature_names, iteration_range)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Grava os arrays e os metadados em um `.npz` (carregável sem pickle)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {'base_score': float(self.base_score), 'feature_names': self.feature_names,
+                    'n_features': self.n_features}
+        with open(path, 'wb') as f:
+            np.savez(f, metadata=np.array(json.dumps(metadata)),
+                     **{name: getattr(self, name) for name in _ARRAYS})
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'TreeEnsemble':
+        """Carrega um ensemble gravado por `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data['metadata']))
+            arrays = {name: data[name] for name in _ARRAYS}
+        return cls(**arrays, **metadata)
+
+    def predict(self, features: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """
+        Scores de uma matriz de features (n_linhas x n_features), na ordem de
+        `feature_names`. Uma linha 1-D é tratada como matriz 1 x n_features.
+
+        Returns:
+            Array float32 com um score por linha.
+        """
+        X = np.asarray(features, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Esperadas {self.n_features} features, recebidas {X.shape[1]}")
+        if len(X) <= chunk_size:
+            return self._predict_chunk(X)
+        return np.concatenate([self._predict_chunk(X[start:start + chunk_size])
+                               for start in range(0, len(X), chunk_size)])
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        values = np.ascontiguousarray(X).ravel()
+        row_offsets = np.arange(len(X), dtype=np.intp)[:, np.newaxis] * X.shape[1]
+
+        # Posição de cada (linha, árvore) no layout completo, um nível por passo
+        pos = np.zeros((len(X), self.n_trees), dtype=np.intp)
+        for _ in range(self.depth):
+            node = self._node_offsets + pos
+            x = values[row_offsets + self._feature[node]]
+            go_right = ~((x < self._threshold[node]) | (np.isnan(x) & self._default_left[node]))
+            pos = 2 * pos + 1 + go_right
+
+        # Soma sequencial em float32 a partir do base_score, como no xgboost
+        margins = np.empty((len(X), self.n_trees + 1), dtype=np.float32)
+        margins[:, 0] = self.base_score
+        margins[:, 1:] = self._leaf_value[self._leaf_offsets + pos]
+        return np.cumsum(margins, axis=1, dtype=np.float32)[:, -1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Converte o booster treinado em arrays para o backend numpy'
+    )
+    parser.add_argument('model_path', help='model.joblib (XGBRegressor) ou model.ubj (booster)')
+    parser.add_argument('--artifacts', default=None,
+                        help='preprocessing_artifacts.joblib (ordem das features em model_features)')
+    parser.add_argument('--output', '-o', default=None,
+                        help=f'Arquivo de saída (padrão: <modelo>{TREES_SUFFIX})')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    import joblib
+    from xgboost import Booster
+
+    if args.model_path.endswith('.ubj'):
+        booster = Booster()
+        booster.load_model(args.model_path)
+    else:
+        booster = joblib.load(args.model_path).get_booster()
+    feature_names = joblib.load(args.artifacts).get('model_features') if args.artifacts else None
+    ensemble = TreeEnsemble.from_booster(booster, feature_names)
+    output = ensemble.save(args.output or trees_path(args.model_path))
+    logger.info(f"{ensemble.n_trees} árvores (profundidade {ensemble.depth}) salvas em {output}")
+
+
+if __name__ == '__main__':
+    main()
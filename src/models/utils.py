@@ -2,7 +2,8 @@ import pandas as pd
 import numpy as np
 import re
 import unicodedata
-from typing import List
+from functools import lru_cache
+from typing import Iterable, List
 from sklearn.preprocessing import OrdinalEncoder
 from gensim.models import KeyedVectors
 from sklearn.metrics import mean_squared_error, mean_absolute_error
@@ -12,20 +13,61 @@ from sklearn.metrics import mean_squared_error, mean_absolute_error
 # ---
 
 
+# Bytes ASCII removidos pela padronização (equivalente a re.sub(r'[^a-zA-Z0-9\s]', ''))
+_BYTES_REMOVIDOS = bytes(i for i in range(128) if not re.match(r'[a-zA-Z0-9\s]', chr(i)))
+
+# Textos até este tamanho (níveis, áreas, cargos) passam pelo cache de `_padroniza_curto`
+TAMANHO_MAXIMO_MEMO = 64
+
+
+def _remove_acentos_e_especiais(texto: str) -> str:
+    # NFKD + descarte de não-ASCII + remoção de especiais, tudo em C; texto já
+    # ASCII não muda com NFKD e pula a normalização
+    if texto.isascii():
+        dados = texto.encode('ascii')
+    else:
+        dados = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore')
+    return dados.translate(None, _BYTES_REMOVIDOS).decode('ascii')
+
+
+def _padroniza(valor: str) -> str:
+    return _remove_acentos_e_especiais(valor.lower().strip())
+
+
+@lru_cache(maxsize=8192)
+def _padroniza_curto(valor: str) -> str:
+    return _padroniza(valor)
+
+
+def padroniza_valor(valor: str) -> str:
+    '''Versão escalar de `padroniza_texto` para um único valor de texto'''
+    if len(valor) <= TAMANHO_MAXIMO_MEMO:
+        return _padroniza_curto(valor)
+    return _padroniza(valor)
+
+
+def _padroniza_nao_texto(valor) -> str:
+    # Mesmo resultado do `.str` do pandas seguido de str(x): nulos (None, NaN,
+    # NA, NaT) são repassados como estão e os demais valores viram NaN
+    nulo = valor is None or valor is pd.NA or valor is pd.NaT or (isinstance(valor, float) and valor != valor)
+    return _remove_acentos_e_especiais(str(valor)) if nulo else 'nan'
+
+
+def padroniza_valores(valores: Iterable) -> List[str]:
+    '''
+    Versão em lote de `padroniza_texto` para uma sequência de valores.
+    Valores que não são texto recebem o mesmo tratamento de `padroniza_texto`
+    (None vira 'None' e números viram 'nan').
+    '''
+    return [padroniza_valor(valor) if isinstance(valor, str) else _padroniza_nao_texto(valor)
+            for valor in valores]
+
+
 def padroniza_texto(df: pd.DataFrame, features_list: List[str]) -> None:
     '''Remove espaços, torna todas as letras minúsculas e
        remove caracteres especiais dos campos texto'''
     for feature in features_list:
-        df[f'{feature}'] = df[f'{feature}'].str.lower().str.strip()
-        df[feature] = df[feature].apply(
-                lambda x: unicodedata.normalize('NFKD', str(x))
-                .encode(
-                    'ascii', 'ignore'
-                )
-                .decode(
-                    'utf-8'
-                ))
-        df[feature] = df[feature].apply(lambda x: re.sub(r'[^a-zA-Z0-9\s]', '', str(x)))
+        df[feature] = padroniza_valores(df[feature].tolist())
 
     return None
 
@@ -43,6 +85,14 @@ def document_vector(text: str, model: KeyedVectors, num_features: int) -> np.nda
     return np.mean([model[word] for word in words], axis=0)
 
 
+def document_vector_matrix(texts, model: KeyedVectors, num_features: int) -> np.ndarray:
+    '''Empilha os vetores de documento de uma sequência de textos em uma matriz
+       (n_textos x num_features), sem expandir colunas em DataFrame'''
+    if len(texts) == 0:
+        return np.zeros((0, num_features))
+    return np.vstack([document_vector(text, model, num_features) for text in texts])
+
+
 def expand_vector(df: pd.DataFrame, feature_list: List[str], model: KeyedVectors, num_features: int) -> pd.DataFrame:
     df_embeddings = pd.DataFrame()
     # criação de nomes para as colunas
@@ -104,27 +154,68 @@ def nivel_educacao(df: pd.DataFrame) -> OrdinalEncoder:
     return enc_ed
 
 
+# níveis de senioridade em ordem de precedência (o primeiro que casar vence)
+NIVEIS_SENIORIDADE = {
+    'Liderança': {'valor': 5, 'padrao': r'\bgerente\b|\blíder\b|lider|\bsupervisor\b|\bcoordenador\b'},
+    'Especialista': {'valor': 4, 'padrao': r'\bespecialista\b|\bexpert\b|\bconsultor\(a\)\b|consultor'},
+    'Sênior': {'valor': 3, 'padrao': r'\bsênior\b|\bsenior\b|\bsr\b|\biii\b'},
+    'Pleno': {'valor': 2, 'padrao': r'\bpleno\b|\bpl\b|\bii\b'},
+    'Júnior': {'valor': 1, 'padrao': r'\bjúnior\b|\bjr\b|\bi\b'},
+    'Entrada': {'valor': 0, 'padrao': r'\btrainee\b|\bauxiliar\b|\baprendiz\b|\bassistente\btecnico\btécnico\b'}
+}
+
+
+def _compila_senioridade():
+    '''
+    Compila NIVEIS_SENIORIDADE para classificação em uma passada: alternativas
+    `\\bpalavra\\b` viram um dicionário palavra -> nível (casam exatamente
+    quando a palavra é um token `\\w+` do texto) e as demais ficam como uma
+    regex por nível, na ordem de precedência.
+    '''
+    palavras = {}
+    restantes = []
+    for info in NIVEIS_SENIORIDADE.values():
+        outros = []
+        for alternativa in info['padrao'].split('|'):
+            palavra = re.fullmatch(r'\\b(\w+)\\b', alternativa)
+            if palavra:
+                palavras.setdefault(palavra.group(1), info['valor'])
+            else:
+                outros.append(alternativa)
+        if outros:
+            restantes.append((info['valor'], re.compile('|'.join(outros))))
+    return palavras, restantes
+
+
+_PALAVRAS_SENIORIDADE, _PADROES_SENIORIDADE = _compila_senioridade()
+_TOKEN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=8192)
+def _classifica_texto(text: str) -> int:
+    text = text.lower()
+    # O nível é o de maior precedência entre os termos encontrados; o valor
+    # padrão -1 indica que nenhum termo de senioridade foi encontrado
+    valor = max((_PALAVRAS_SENIORIDADE.get(token, -1) for token in _TOKEN.findall(text)), default=-1)
+    # Padrões que não são palavras inteiras só importam se superarem o nível atual
+    for nivel, padrao in _PADROES_SENIORIDADE:
+        if nivel <= valor:
+            break
+        if padrao.search(text):
+            return nivel
+    return valor
+
+
 def mapear_senioridade(serie: pd.Series) -> pd.Series:
-    text = serie.astype(str).str.lower().fillna('')
-    niveis_map = {
-        'Liderança': {'valor': 5, 'padrao': r'\bgerente\b|\blíder\b|lider|\bsupervisor\b|\bcoordenador\b'},
-        'Especialista': {'valor': 4, 'padrao': r'\bespecialista\b|\bexpert\b|\bconsultor\(a\)\b|consultor'},
-        'Sênior': {'valor': 3, 'padrao': r'\bsênior\b|\bsenior\b|\bsr\b|\biii\b'},
-        'Pleno': {'valor': 2, 'padrao': r'\bpleno\b|\bpl\b|\bii\b'},
-        'Júnior': {'valor': 1, 'padrao': r'\bjúnior\b|\bjr\b|\bi\b'},
-        'Entrada': {'valor': 0, 'padrao': r'\btrainee\b|\bauxiliar\b|\baprendiz\b|\bassistente\btecnico\btécnico\b'}
-    }
-    condicoes = []
-    valores = []
-
-    for nivel in niveis_map:
-        info = niveis_map[nivel]
-        condicoes.append(text.str.contains(info['padrao'], regex=True, na=False))
-        valores.append(info['valor'])
-
-    # np.select é uma forma vetorizada e eficiente de fazer um "if/elif/else"
-    # O valor padrão -1 indica que nenhum termo de senioridade foi encontrado
-    return pd.Series(np.select(condicoes, valores, default=-1), index=serie.index)
+    # Classifica cada texto distinto uma única vez (cargos e níveis se repetem muito)
+    codigos, textos = pd.factorize(serie.astype(str))
+    valores = np.fromiter((_classifica_texto(text) for text in textos), dtype=np.int64, count=len(textos))
+    return pd.Series(valores[codigos], index=serie.index)
+
+
+def classifica_senioridade(valor) -> int:
+    '''Versão escalar de `mapear_senioridade` para um único valor'''
+    return _classifica_texto(str(valor))
 
 
 # função para obter similaridade por cosseno
@@ -135,6 +226,13 @@ def similaridade(df: pd.DataFrame, vaga_column: str, cand_column: str, return_co
     # conversão de colunas para arrays NumPy
     vec_vaga = df[vaga_emb_cols].to_numpy()
     vec_cand = df[cand_emb_cols].to_numpy()
+    df[f'{return_column}'] = cosine_similarity_rows(vec_vaga, vec_cand)
+
+    return
+
+
+def cosine_similarity_rows(vec_vaga: np.ndarray, vec_cand: np.ndarray) -> np.ndarray:
+    '''Similaridade por cosseno linha a linha entre duas matrizes de vetores'''
     # calculo de similaridade apenas das diagonais
     dot_product = np.sum(vec_vaga * vec_cand, axis=1)
     # Calcular a norma (magnitude) de cada vetor
@@ -149,9 +247,8 @@ def similaridade(df: pd.DataFrame, vaga_column: str, cand_column: str, return_co
     # Isso evita warnings de RuntimeWarning sobre divisão inválida
     with np.errstate(divide='ignore', invalid='ignore'):
         pair_similarity = np.divide(dot_product, denominator, out=np.zeros_like(dot_product), where=(denominator != 0))
-    df[f'{return_column}'] = pair_similarity
 
-    return
+    return pair_similarity
 
 
 # ---
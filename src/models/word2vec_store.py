@@ -0,0 +1,117 @@
+"""
+Armazenamento binário do modelo Word2Vec
+
+O arquivo texto `cbow_s100.txt` (~890 MB) precisa ser parseado inteiro a cada
+inicialização e cada worker da API acaba com uma cópia privada da matriz.
+Este módulo converte o modelo, uma única vez, para o formato nativo do gensim
+(matriz float32 contígua em `.npy` + índice do vocabulário) e carrega esse
+formato via memory-map somente leitura, de forma que vários processos no
+mesmo host compartilhem as mesmas páginas do page cache.
+
+Uso:
+    python -m src.models.word2vec_store src/models/word2vec/cbow_s100.txt
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from gensim.models import KeyedVectors
+
+
+logger = logging.getLogger(__name__)
+
+# Extensão do arquivo binário (o gensim grava a matriz em '<arquivo>.vectors.npy')
+BINARY_SUFFIX = '.kv'
+
+W2V_FORMATS = ('auto', 'text', 'binary')
+
+
+def caminho_binario(text_path: Union[str, Path]) -> Path:
+    """Retorna o caminho padrão do arquivo binário para um modelo em texto."""
+    return Path(text_path).with_suffix(BINARY_SUFFIX)
+
+
+def converter_para_binario(text_path: Union[str, Path],
+                           output_path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Converte um modelo Word2Vec em formato texto para o formato binário.
+
+    Args:
+        text_path: Caminho do modelo no formato texto do word2vec.
+        output_path: Caminho do arquivo binário de saída. Por padrão usa o
+                     mesmo nome do arquivo texto com a extensão `.kv`.
+
+    Returns:
+        Caminho do arquivo binário gerado.
+    """
+    output_path = Path(output_path) if output_path else caminho_binario(text_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Carregando modelo Word2Vec em texto: {text_path}")
+    model = KeyedVectors.load_word2vec_format(str(text_path))
+
+    # Garante uma matriz float32 contígua para que o memory-map seja direto
+    model.vectors = np.ascontiguousarray(model.vectors, dtype=np.float32)
+    # Força a matriz em arquivo .npy separado, mesmo para modelos pequenos
+    model.save(str(output_path), sep_limit=0)
+
+    logger.info(f"Modelo binário salvo em {output_path} "
+                f"({len(model.index_to_key)} palavras, {model.vector_size} dimensões)")
+    return output_path
+
+
+def carregar_word2vec(path: Union[str, Path], w2v_format: str = 'auto') -> KeyedVectors:
+    """
+    Carrega o modelo Word2Vec no formato indicado.
+
+    Args:
+        path: Caminho do modelo (texto ou binário).
+        w2v_format: 'text' para o formato texto do word2vec, 'binary' para o
+                    formato gerado por `converter_para_binario` (memory-map
+                    somente leitura) ou 'auto' para decidir pela extensão.
+                    No modo 'auto', se existir um `.kv` ao lado do arquivo
+                    texto ele é usado no lugar.
+
+    Returns:
+        KeyedVectors pronto para uso.
+    """
+    if w2v_format not in W2V_FORMATS:
+        raise ValueError(f"Formato de Word2Vec inválido: {w2v_format}. "
+                         f"Use um de {W2V_FORMATS}")
+
+    path = Path(path)
+    if w2v_format == 'auto':
+        if path.suffix == BINARY_SUFFIX:
+            w2v_format = 'binary'
+        elif caminho_binario(path).exists():
+            path = caminho_binario(path)
+            w2v_format = 'binary'
+        else:
+            w2v_format = 'text'
+
+    if w2v_format == 'binary':
+        logger.info(f"Carregando Word2Vec binário via memory-map: {path}")
+        return KeyedVectors.load(str(path), mmap='r')
+
+    logger.info(f"Carregando Word2Vec em texto: {path}")
+    return KeyedVectors.load_word2vec_format(str(path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Converte o modelo Word2Vec em texto para o formato binário com memory-map'
+    )
+    parser.add_argument('text_path', help='Modelo Word2Vec no formato texto')
+    parser.add_argument('--output', '-o', default=None,
+                        help='Arquivo binário de saída (padrão: <text_path>.kv)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    converter_para_binario(args.text_path, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,13 +7,19 @@ to monitor model performance degradation in production.
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from scipy import stats
 from sklearn.metrics import accuracy_score, precision_score, recall_score
 import logging
 from datetime import datetime, timedelta
 import json
+import math
+import os
+import threading
+import time
 import warnings
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass
 
 # Configure logging
@@ -31,6 +37,182 @@ class DriftAlert:
     threshold: float
     message: str
     
+class FeatureWindow:
+    """
+    Fixed-size ring buffer with the most recent live values of one feature
+    
+    Backed by a preallocated NumPy array: appending never reallocates and the
+    oldest value is overwritten once the window is full.
+    """
+    
+    def __init__(self, capacity: int):
+        """
+        Initialize Feature Window
+        
+        Args:
+            capacity: Maximum number of values kept
+        """
+        if capacity < 1:
+            raise ValueError("Window capacity must be at least 1")
+        self.capacity = capacity
+        self._buffer = np.empty(capacity, dtype=np.float64)
+        self._next = 0
+        self._size = 0
+        self.total_seen = 0
+        
+    def append(self, value: float) -> None:
+        """Add one value, overwriting the oldest one if the window is full"""
+        self._buffer[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self.total_seen += 1
+        
+    def extend(self, values: np.ndarray) -> None:
+        """Add several values in arrival order"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n = len(values)
+        if n >= self.capacity:
+            self._buffer[:] = values[-self.capacity:]
+            self._next = 0
+            self._size = self.capacity
+        elif n:
+            positions = (self._next + np.arange(n)) % self.capacity
+            self._buffer[positions] = values
+            self._next = (self._next + n) % self.capacity
+            self._size = min(self._size + n, self.capacity)
+        self.total_seen += n
+        
+    def values(self) -> np.ndarray:
+        """Copy of the window contents, oldest value first"""
+        if self._size < self.capacity:
+            return self._buffer[:self._size].copy()
+        return np.concatenate((self._buffer[self._next:], self._buffer[:self._next]))
+        
+    def __len__(self) -> int:
+        return self._size
+
+
+def _psi(expected: np.ndarray, actual: np.ndarray, epsilon: float = 1e-4) -> float:
+    """Population Stability Index between two bin proportion vectors"""
+    expected = np.maximum(expected, epsilon)
+    actual = np.maximum(actual, epsilon)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _js_divergence(p: np.ndarray, q: np.ndarray) -> float:
+    """Jensen-Shannon divergence (base 2, between 0 and 1) between two bin proportion vectors"""
+    m = (p + q) / 2
+    divergence = 0.0
+    for dist in (p, q):
+        nonzero = dist > 0
+        divergence += 0.5 * np.sum(dist[nonzero] * np.log2(dist[nonzero] / m[nonzero]))
+    return float(max(divergence, 0.0))
+
+
+class ReferenceDistribution:
+    """
+    Reference sample of one feature, preprocessed once for drift statistics
+    
+    Keeps the sorted values (the ECDF is a `searchsorted` into them), their
+    prefix sums, mean/variance and the PSI bins. Every statistic against a
+    current window of n values then costs O(n log m) and never touches the
+    m reference values again.
+    """
+    
+    def __init__(self, values: np.ndarray, psi_bins: int = 10):
+        """
+        Initialize Reference Distribution
+        
+        Args:
+            values: Reference sample (NaN values are dropped)
+            psi_bins: Number of reference-quantile bins for the PSI
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            raise ValueError("Reference sample is empty")
+            
+        self.sorted_values = np.sort(values)
+        self.size = len(values)
+        self.mean = float(np.mean(values))
+        self.var = float(np.var(values, ddof=1)) if self.size > 1 else 0.0
+        self._prefix_sums = np.concatenate(([0.0], np.cumsum(self.sorted_values)))
+        
+        # Quantile bins (duplicated edges of discrete features are merged)
+        self.psi_edges = np.unique(np.quantile(self.sorted_values, np.linspace(0, 1, psi_bins + 1)[1:-1]))
+        self.psi_expected = self._bin_proportions(self.sorted_values)
+        
+    def ecdf(self, x: np.ndarray, side: str = 'right') -> np.ndarray:
+        """Reference ECDF at `x` (side='left' gives the limit from the left)"""
+        return np.searchsorted(self.sorted_values, x, side=side) / self.size
+        
+    def _bin_proportions(self, values: np.ndarray) -> np.ndarray:
+        counts = np.bincount(np.searchsorted(self.psi_edges, values, side='right'),
+                             minlength=len(self.psi_edges) + 1)
+        return counts / len(values)
+        
+    def ks_test(self, current_sorted: np.ndarray) -> Tuple[float, float]:
+        """
+        Two-sample Kolmogorov-Smirnov test against a sorted current window
+        
+        Both ECDFs are step functions, so the supremum of their difference is
+        reached at the current values: evaluating the reference ECDF there
+        (and just before them) gives the same statistic as `stats.ks_2samp`.
+        The p-value uses the asymptotic distribution (`kstwo`), whose cost
+        does not depend on the sample sizes.
+        """
+        n = len(current_sorted)
+        current_right = np.searchsorted(current_sorted, current_sorted, side='right') / n
+        current_left = np.searchsorted(current_sorted, current_sorted, side='left') / n
+        statistic = max(
+            np.max(current_right - self.ecdf(current_sorted, 'right')),
+            np.max(self.ecdf(current_sorted, 'left') - current_left)
+        )
+        effective_n = max(1.0, np.round(self.size * n / (self.size + n)))
+        p_value = float(np.clip(stats.kstwo.sf(statistic, effective_n), 0.0, 1.0))
+        return float(statistic), p_value
+        
+    def _quantile_integral(self, u: np.ndarray) -> np.ndarray:
+        """Integral of the reference quantile function from 0 to `u`"""
+        k = np.minimum(np.floor(u * self.size).astype(np.int64), self.size - 1)
+        return self._prefix_sums[k] / self.size + (u - k / self.size) * self.sorted_values[k]
+        
+    def wasserstein(self, current_sorted: np.ndarray) -> float:
+        """
+        1-Wasserstein distance to a sorted current window
+        
+        Integrates |Q_ref(u) - Q_cur(u)| over u: the current quantile function
+        is constant on each (i/n, (i+1)/n] and the reference one is integrated
+        with the prefix sums, split where it crosses the current value.
+        """
+        n = len(current_sorted)
+        start = np.arange(n) / n
+        end = np.arange(1, n + 1) / n
+        split = np.clip(self.ecdf(current_sorted, 'right'), start, end)
+        integral_start = self._quantile_integral(start)
+        integral_end = self._quantile_integral(end)
+        integral_split = self._quantile_integral(split)
+        below = current_sorted * (split - start) - (integral_split - integral_start)
+        above = (integral_end - integral_split) - current_sorted * (end - split)
+        return float(np.sum(below + above))
+        
+    def psi(self, current: np.ndarray, epsilon: float = 1e-4) -> float:
+        """Population Stability Index over the reference quantile bins"""
+        return _psi(self.psi_expected, self._bin_proportions(current), epsilon)
+        
+    def effect_size(self, current: np.ndarray) -> float:
+        """Cohen's d effect size against the precomputed reference moments"""
+        n = len(current)
+        if self.size + n <= 2:
+            return 0.0
+        current_var = float(np.var(current, ddof=1)) if n > 1 else 0.0
+        pooled_std = np.sqrt(((self.size - 1) * self.var + (n - 1) * current_var) / (self.size + n - 2))
+        if pooled_std == 0:
+            return 0.0
+        return float(abs(self.mean - np.mean(current)) / pooled_std)
+
+
 class DataDriftDetector:
     """
     Detects data drift using statistical tests
@@ -41,7 +223,9 @@ class DataDriftDetector:
     def __init__(self, 
                  significance_level: float = 0.05,
                  reference_window_size: int = 1000,
-                 detection_window_size: int = 100):
+                 detection_window_size: int = 100,
+                 psi_bins: int = 10,
+                 max_alerts: int = 1000):
         """
         Initialize Data Drift Detector
         
@@ -49,27 +233,43 @@ class DataDriftDetector:
             significance_level: P-value threshold for statistical tests
             reference_window_size: Size of reference data window  
             detection_window_size: Size of current data window
+            psi_bins: Number of reference-quantile bins for the PSI
+            max_alerts: Most recent alerts kept in `alerts` (`alerts_total` counts all)
         """
         self.significance_level = significance_level
         self.reference_window_size = reference_window_size
         self.detection_window_size = detection_window_size
+        self.psi_bins = psi_bins
         self.reference_data = {}
-        self.alerts = []
+        self.reference_distributions: Dict[str, ReferenceDistribution] = {}
+        self.alerts: deque = deque(maxlen=max_alerts)
+        self.alerts_total = 0
         
     def set_reference_data(self, data: Dict[str, np.ndarray]) -> None:
         """
         Set reference data for drift comparison
         
+        Each feature is sorted and summarized once here (`ReferenceDistribution`);
+        the checks in `detect_drift` only work on the current window.
+        
         Args:
             data: Dictionary with feature names as keys and arrays as values
         """
         self.reference_data = {}
+        self.reference_distributions = {}
         for feature, values in data.items():
             if len(values) > self.reference_window_size:
                 # Use most recent reference_window_size samples
                 self.reference_data[feature] = values[-self.reference_window_size:]
             else:
                 self.reference_data[feature] = values
+            try:
+                self.reference_distributions[feature] = ReferenceDistribution(
+                    self.reference_data[feature], psi_bins=self.psi_bins
+                )
+            except ValueError as e:
+                logger.warning(f"Reference data for feature {feature} ignored: {e}")
+                del self.reference_data[feature]
                 
         logger.info(f"Reference data set for {len(self.reference_data)} features")
         
@@ -77,6 +277,8 @@ class DataDriftDetector:
         """
         Detect data drift using Kolmogorov-Smirnov test
         
+        Also reports the PSI and the 1-Wasserstein distance of each feature.
+        
         Args:
             current_data: Current data to compare against reference
             
@@ -101,30 +303,32 @@ class DataDriftDetector:
                 continue
                 
             # Limit current data to detection window size
-            current_values = current_data[feature]
+            current_values = np.asarray(current_data[feature], dtype=np.float64).ravel()
             if len(current_values) > self.detection_window_size:
                 current_values = current_values[-self.detection_window_size:]
+            current_values = current_values[~np.isnan(current_values)]
+            if len(current_values) == 0:
+                logger.warning(f"Feature {feature} has no current values")
+                continue
                 
-            # Perform Kolmogorov-Smirnov test
+            # Perform Kolmogorov-Smirnov test against the presorted reference
             try:
-                ks_statistic, p_value = stats.ks_2samp(
-                    self.reference_data[feature], 
-                    current_values
-                )
+                reference = self.reference_distributions[feature]
+                current_sorted = np.sort(current_values)
+                ks_statistic, p_value = reference.ks_test(current_sorted)
                 
                 drift_detected = p_value < self.significance_level
                 
                 # Calculate effect size (practical significance)
-                effect_size = self._calculate_effect_size(
-                    self.reference_data[feature], 
-                    current_values
-                )
+                effect_size = reference.effect_size(current_values)
                 
                 feature_result = {
                     'ks_statistic': ks_statistic,
                     'p_value': p_value,
                     'drift_detected': drift_detected,
                     'effect_size': effect_size,
+                    'psi': reference.psi(current_values),
+                    'wasserstein': reference.wasserstein(current_sorted),
                     'severity': self._classify_severity(ks_statistic, effect_size)
                 }
                 
@@ -148,6 +352,7 @@ class DataDriftDetector:
                     )
                     
                     self.alerts.append(alert)
+                    self.alerts_total += 1
                     drift_results['alerts'].append(alert)
                     
                     logger.warning(f"Data drift detected in {feature}: "
@@ -163,23 +368,6 @@ class DataDriftDetector:
         
         return drift_results
         
-    def _calculate_effect_size(self, reference: np.ndarray, current: np.ndarray) -> float:
-        """Calculate Cohen's d effect size"""
-        try:
-            pooled_std = np.sqrt(
-                ((len(reference) - 1) * np.var(reference, ddof=1) + 
-                 (len(current) - 1) * np.var(current, ddof=1)) / 
-                (len(reference) + len(current) - 2)
-            )
-            
-            if pooled_std == 0:
-                return 0.0
-                
-            effect_size = abs(np.mean(reference) - np.mean(current)) / pooled_std
-            return effect_size
-        except:
-            return 0.0
-            
     def _classify_severity(self, ks_statistic: float, effect_size: float) -> str:
         """Classify drift severity based on statistical measures"""
         if ks_statistic > 0.5 or effect_size > 0.8:
@@ -190,6 +378,345 @@ class DataDriftDetector:
             return 'low'
 
 
+class SlidingHistogram:
+    """
+    Constant-memory histogram of the most recent values of one feature
+    
+    Values are counted into fixed bins (`edges` are the interior edges, so the
+    first and last bins are open-ended) plus a last bin for missing values.
+    The window is split into `n_buckets` buckets of `bucket_size` values:
+    when the active bucket fills up, the oldest one is subtracted from the
+    totals, so `counts` always covers the last (n_buckets - 1) * bucket_size
+    to n_buckets * bucket_size values.
+    """
+    
+    def __init__(self, edges: np.ndarray, bucket_size: int, n_buckets: int):
+        """
+        Initialize Sliding Histogram
+        
+        Args:
+            edges: Sorted interior bin edges
+            bucket_size: Values per bucket
+            n_buckets: Number of buckets in the window
+        """
+        if bucket_size < 1 or n_buckets < 1:
+            raise ValueError("bucket_size and n_buckets must be at least 1")
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self._edge_list = self.edges.tolist()  # bisect on a list is cheaper than np.searchsorted per value
+        self.n_bins = len(self.edges) + 2
+        self.bucket_size = bucket_size
+        self.n_buckets = n_buckets
+        self.counts = np.zeros(self.n_bins, dtype=np.int64)
+        self._buckets = np.zeros((n_buckets, self.n_bins), dtype=np.int64)
+        self._active = 0
+        self._filled = 0
+        
+    def bin_index(self, values: np.ndarray) -> np.ndarray:
+        """Bin of each value (the last bin holds the missing values)"""
+        values = np.asarray(values, dtype=np.float64)
+        index = np.searchsorted(self.edges, values, side='right')
+        return np.where(np.isnan(values), self.n_bins - 1, index)
+        
+    def bin_counts(self, values: np.ndarray) -> np.ndarray:
+        """Counts of `values` per bin, without adding them to the window"""
+        return np.bincount(self.bin_index(np.ravel(values)), minlength=self.n_bins)
+        
+    def add(self, value: float) -> None:
+        """Count one value"""
+        if math.isnan(value):
+            index = self.n_bins - 1
+        else:
+            index = bisect_right(self._edge_list, value)
+        self._buckets[self._active, index] += 1
+        self.counts[index] += 1
+        self._filled += 1
+        if self._filled == self.bucket_size:
+            self._rotate()
+            
+    def extend(self, values: np.ndarray) -> None:
+        """Count several values in arrival order"""
+        indices = self.bin_index(np.ravel(values))
+        start = 0
+        while start < len(indices):
+            take = min(self.bucket_size - self._filled, len(indices) - start)
+            chunk = np.bincount(indices[start:start + take], minlength=self.n_bins)
+            self._buckets[self._active] += chunk
+            self.counts += chunk
+            self._filled += take
+            start += take
+            if self._filled == self.bucket_size:
+                self._rotate()
+                
+    def _rotate(self) -> None:
+        """Start a new bucket, dropping the oldest one from the totals"""
+        self._active = (self._active + 1) % self.n_buckets
+        self.counts -= self._buckets[self._active]
+        self._buckets[self._active] = 0
+        self._filled = 0
+        
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+
+class SketchDriftDetector:
+    """
+    Detects data drift from fixed-bin histograms (PSI and Jensen-Shannon)
+    
+    The reference of each feature is reduced to counts over its own quantile
+    bins, and live values only increment the counts of a `SlidingHistogram`.
+    Memory is O(features x bins x buckets) regardless of traffic (the alert
+    history is bounded by `max_alerts` as well), each check
+    costs O(bins) per feature, and the counts of several workers can be
+    merged by summing them (`export_counts` / `merge_counts`).
+    """
+    
+    def __init__(self,
+                 n_bins: int = 10,
+                 window_size: int = 1000,
+                 n_buckets: int = 10,
+                 psi_threshold: float = 0.2,
+                 js_threshold: float = 0.1,
+                 min_samples: int = 30,
+                 max_alerts: int = 1000):
+        """
+        Initialize Sketch Drift Detector
+        
+        Args:
+            n_bins: Number of reference-quantile bins per feature
+            window_size: Approximate number of live values in the current window
+            n_buckets: Buckets the window slides by
+            psi_threshold: PSI at or above which a feature is flagged
+            js_threshold: Jensen-Shannon divergence at or above which a feature is flagged
+            min_samples: Minimum current count for a feature to be checked
+            max_alerts: Most recent alerts kept in `alerts` (`alerts_total` counts all)
+        """
+        self.n_bins = n_bins
+        self.window_size = window_size
+        self.n_buckets = n_buckets
+        self.bucket_size = max(1, window_size // n_buckets)
+        self.psi_threshold = psi_threshold
+        self.js_threshold = js_threshold
+        self.min_samples = min_samples
+        self.reference_counts: Dict[str, np.ndarray] = {}
+        self.windows: Dict[str, SlidingHistogram] = {}
+        self.alerts: deque = deque(maxlen=max_alerts)
+        self.alerts_total = 0
+        
+    def set_reference_data(self, data: Dict[str, np.ndarray]) -> None:
+        """
+        Set reference data for drift comparison
+        
+        Only the bin edges and counts are kept; the live windows restart.
+        
+        Args:
+            data: Dictionary with feature names as keys and arrays as values
+        """
+        self.reference_counts = {}
+        self.windows = {}
+        for feature, values in data.items():
+            values = np.asarray(values, dtype=np.float64).ravel()
+            valid = values[~np.isnan(values)]
+            if len(valid) == 0:
+                logger.warning(f"Reference data for feature {feature} ignored: no valid values")
+                continue
+            edges = np.unique(np.quantile(valid, np.linspace(0, 1, self.n_bins + 1)[1:-1]))
+            window = SlidingHistogram(edges, self.bucket_size, self.n_buckets)
+            self.windows[feature] = window
+            self.reference_counts[feature] = window.bin_counts(values)
+            
+        logger.info(f"Reference histograms set for {len(self.windows)} features")
+        
+    def update(self, features: Dict[str, Any]) -> None:
+        """
+        Count live feature values (features without reference are ignored)
+        
+        Args:
+            features: Feature name -> scalar value or sequence of values
+        """
+        for feature, value in features.items():
+            window = self.windows.get(feature)
+            if window is None:
+                continue
+            if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+                window.add(value)
+            elif isinstance(value, (list, np.ndarray)):
+                window.extend(value)
+                
+    def current_counts(self) -> Dict[str, np.ndarray]:
+        """Bin counts of the current window of each feature"""
+        return {feature: window.counts.copy() for feature, window in self.windows.items()}
+        
+    def export_counts(self) -> Dict[str, Dict[str, List[float]]]:
+        """JSON-serializable bin edges and current counts, to be merged across workers"""
+        return {
+            feature: {'edges': window.edges.tolist(), 'counts': window.counts.tolist()}
+            for feature, window in self.windows.items()
+        }
+        
+    def merge_counts(self, exports: Iterable[Dict[str, Dict[str, List[float]]]]) -> Dict[str, np.ndarray]:
+        """
+        Sum the current counts exported by several workers
+        
+        Args:
+            exports: Results of `export_counts` (this worker's included, if wanted)
+            
+        Returns:
+            Merged counts per feature, to be passed to `detect_drift`
+            
+        Raises:
+            ValueError: If an export was built from a different reference
+        """
+        merged = {feature: np.zeros_like(counts) for feature, counts in self.reference_counts.items()}
+        for export in exports:
+            for feature, sketch in export.items():
+                if feature not in merged:
+                    continue
+                if not np.array_equal(np.asarray(sketch['edges'], dtype=np.float64), self.windows[feature].edges):
+                    raise ValueError(f"Bin edges of feature {feature} differ; the reference data must be the same")
+                merged[feature] += np.asarray(sketch['counts'], dtype=np.int64)
+        return merged
+        
+    def detect_drift(self, current_counts: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
+        """
+        Detect data drift from PSI and Jensen-Shannon divergence of the histograms
+        
+        Args:
+            current_counts: Bin counts per feature (default: this detector's
+                            current windows; see `merge_counts`)
+            
+        Returns:
+            Dictionary with drift detection results
+        """
+        if not self.reference_counts:
+            raise ValueError("Reference data not set. Call set_reference_data() first.")
+        if current_counts is None:
+            current_counts = self.current_counts()
+            
+        drift_results = {
+            'timestamp': datetime.now(),
+            'features_analyzed': 0,
+            'features_with_drift': 0,
+            'drift_detected': False,
+            'feature_results': {},
+            'alerts': []
+        }
+        
+        for feature, reference in self.reference_counts.items():
+            current = current_counts.get(feature)
+            if current is None or current.sum() < self.min_samples:
+                continue
+                
+            expected = reference / reference.sum()
+            actual = current / current.sum()
+            psi = _psi(expected, actual)
+            js_divergence = _js_divergence(expected, actual)
+            drift_detected = psi >= self.psi_threshold or js_divergence >= self.js_threshold
+            
+            feature_result = {
+                'psi': psi,
+                'js_divergence': js_divergence,
+                'sample_size': int(current.sum()),
+                'drift_detected': drift_detected,
+                'severity': self._classify_severity(psi, js_divergence)
+            }
+            drift_results['feature_results'][feature] = feature_result
+            drift_results['features_analyzed'] += 1
+            
+            if drift_detected:
+                drift_results['features_with_drift'] += 1
+                drift_results['drift_detected'] = True
+                
+                alert = DriftAlert(
+                    timestamp=datetime.now(),
+                    drift_type='data',
+                    severity=feature_result['severity'],
+                    metric=f'psi_{feature}',
+                    value=psi,
+                    threshold=self.psi_threshold,
+                    message=f"Data drift detected in feature '{feature}' "
+                           f"(PSI={psi:.4f}, JS={js_divergence:.4f})"
+                )
+                self.alerts.append(alert)
+                self.alerts_total += 1
+                drift_results['alerts'].append(alert)
+                
+                logger.warning(f"Data drift detected in {feature}: "
+                             f"PSI={psi:.4f}, JS={js_divergence:.4f}")
+                
+        drift_results['drift_percentage'] = (
+            drift_results['features_with_drift'] /
+            max(drift_results['features_analyzed'], 1) * 100
+        )
+        
+        return drift_results
+        
+    def _classify_severity(self, psi: float, js_divergence: float) -> str:
+        """Classify drift severity (PSI above 0.25 is the usual "major shift" mark)"""
+        if psi > 0.25 or js_divergence > 0.3:
+            return 'high'
+        elif psi > 0.1 or js_divergence > 0.1:
+            return 'medium'
+        else:
+            return 'low'
+
+
+class SharedSketchCounts:
+    """
+    Histogram counts of several worker processes, shared through a directory
+    
+    Each process (e.g. a gunicorn worker) publishes the `export_counts` of its
+    `SketchDriftDetector` to its own JSON file; `collect` reads the files of
+    every process so they can be summed with `merge_counts`, and the PSI/JS of
+    a check reflect the traffic of all workers instead of the one that ran it.
+    Files are replaced atomically, so readers never see a partial write.
+    """
+    
+    FILE_PREFIX = 'drift_sketch_'
+    
+    def __init__(self, directory: str):
+        """
+        Initialize Shared Sketch Counts
+        
+        Args:
+            directory: Directory shared by all worker processes
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        
+    def path(self, pid: Optional[int] = None) -> str:
+        """File of a process (default: the current one)"""
+        return os.path.join(self.directory, f"{self.FILE_PREFIX}{pid or os.getpid()}.json")
+        
+    def publish(self, counts: Dict[str, Dict[str, List[float]]]) -> None:
+        """Write this process' exported counts, replacing its previous file"""
+        path = self.path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(counts, f)
+        os.replace(tmp_path, path)
+        
+    def collect(self) -> List[Dict[str, Dict[str, List[float]]]]:
+        """Exported counts of every process that published (unreadable files are skipped)"""
+        exports = []
+        for name in sorted(os.listdir(self.directory)):
+            if not (name.startswith(self.FILE_PREFIX) and name.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    exports.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring sketch counts in {name}: {e}")
+        return exports
+        
+    def remove(self, pid: int) -> None:
+        """Drop the file of a process that exited"""
+        try:
+            os.remove(self.path(pid))
+        except FileNotFoundError:
+            pass
+
+
 class ConceptDriftDetector:
     """
     Detects concept drift by monitoring model performance metrics
@@ -328,7 +855,18 @@ class DriftMonitor:
     """
     Unified drift monitoring system for the Decision ML pipeline
     
-    Combines data drift and concept drift detection with alerting
+    Combines data drift and concept drift detection with alerting.
+    Live feature values are accumulated in per-feature ring buffers
+    (`FeatureWindow`) and the KS tests run on those windows every
+    `check_every` predictions and/or every `check_interval_seconds`,
+    not on every request; the last result is cached for the status endpoint.
+    The same values also feed the constant-memory histograms of the
+    `SketchDriftDetector` (PSI and Jensen-Shannon), checked on the same schedule.
+    
+    With `sketch_drift.shared_dir` set, each check first publishes this
+    process' histogram counts there and runs on the counts of all processes
+    (`SharedSketchCounts`), so several workers report one server-wide PSI/JS.
+    The KS windows need the raw values and stay per process.
     """
     
     def __init__(self, 
@@ -346,15 +884,34 @@ class DriftMonitor:
             'data_drift': {
                 'significance_level': 0.05,
                 'reference_window_size': 1000,
-                'detection_window_size': 100
+                'detection_window_size': 100,
+                'max_alerts': 1000
             },
             'concept_drift': {
                 'degradation_threshold': 0.1,
                 'window_size': 100
+            },
+            'schedule': {
+                'check_every': 50,               # run the KS tests every N recorded predictions
+                'check_interval_seconds': None,  # and/or when this much time has passed
+                'min_samples': 30                # minimum window size for a feature to be tested
+            },
+            'sketch_drift': {
+                'enabled': True,
+                'n_bins': 10,
+                'window_size': 1000,
+                'n_buckets': 10,
+                'psi_threshold': 0.2,
+                'js_threshold': 0.1,
+                'max_alerts': 1000,
+                'shared_dir': None               # directory to merge the counts of several workers
             }
         }
         
-        self.config = {**default_config, **(config or {})}
+        config = config or {}
+        self.config = {**default_config, **config}
+        for section, defaults in default_config.items():
+            self.config[section] = {**defaults, **config.get(section, {})}
         
         # Initialize detectors
         self.data_drift_detector = DataDriftDetector(**self.config['data_drift'])
@@ -368,11 +925,35 @@ class DriftMonitor:
             self.concept_drift_detector = None
             logger.warning("Concept drift detector not initialized - baseline performance not provided")
             
+        sketch_config = dict(self.config['sketch_drift'])
+        shared_dir = sketch_config.pop('shared_dir')
+        self.shared_sketch_counts: Optional[SharedSketchCounts] = None
+        if sketch_config.pop('enabled'):
+            self.sketch_drift_detector = SketchDriftDetector(
+                min_samples=self.config['schedule']['min_samples'], **sketch_config
+            )
+            if shared_dir:
+                self.shared_sketch_counts = SharedSketchCounts(shared_dir)
+        else:
+            self.sketch_drift_detector = None
+            
         self.monitoring_active = True
         
+        # Live windows (one ring buffer per feature) and detection schedule
+        self.window_size = self.config['data_drift']['detection_window_size']
+        self.feature_windows: Dict[str, FeatureWindow] = {}
+        self.last_data_drift: Optional[Dict[str, Any]] = None
+        self.last_sketch_drift: Optional[Dict[str, Any]] = None
+        self._samples_since_check = 0
+        self._last_check_time = time.monotonic()
+        self._lock = threading.RLock()
+        
     def initialize_reference_data(self, reference_data: Dict[str, np.ndarray]) -> None:
         """Initialize reference data for data drift detection"""
-        self.data_drift_detector.set_reference_data(reference_data)
+        with self._lock:
+            self.data_drift_detector.set_reference_data(reference_data)
+            if self.sketch_drift_detector:
+                self.sketch_drift_detector.set_reference_data(reference_data)
         logger.info("Reference data initialized for drift monitoring")
         
     def monitor_prediction(self, 
@@ -389,6 +970,27 @@ class DriftMonitor:
             y_pred: Predicted label (if available)
             y_pred_proba: Prediction probability (if available)
             
+        Returns:
+            Monitoring results dictionary
+        """
+        return self.monitor_batch([{
+            'features': features,
+            'y_true': y_true,
+            'y_pred': y_pred,
+            'y_pred_proba': y_pred_proba
+        }])
+        
+    def monitor_batch(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Monitor several predictions for drift at once
+        
+        All feature values are appended to the windows under a single lock and
+        the schedule is evaluated once for the whole batch.
+        
+        Args:
+            records: Predictions as dicts with 'features' and, optionally,
+                     'y_true', 'y_pred' and 'y_pred_proba'
+            
         Returns:
             Monitoring results dictionary
         """
@@ -398,39 +1000,44 @@ class DriftMonitor:
         results = {
             'timestamp': datetime.now(),
             'monitoring_active': True,
+            'records': len(records),
             'data_drift': None,
+            'sketch_drift': None,
             'concept_drift': None,
             'alerts': []
         }
         
-        # Convert features to arrays for drift detection
-        feature_arrays = {}
-        for key, value in features.items():
-            if isinstance(value, (int, float)):
-                feature_arrays[key] = np.array([value])
-            elif isinstance(value, (list, np.ndarray)):
-                feature_arrays[key] = np.array(value)
-                
-        # Monitor data drift (requires accumulated data)
-        try:
-            if len(feature_arrays) > 0:
-                # Note: In practice, you'd accumulate features over time
-                # This is a simplified version for demonstration
-                drift_result = self.data_drift_detector.detect_drift(feature_arrays)
-                results['data_drift'] = drift_result
-                results['alerts'].extend(drift_result.get('alerts', []))
-        except Exception as e:
-            logger.error(f"Data drift detection failed: {e}")
+        # Accumulate the values; the KS tests only run when a check is due
+        with self._lock:
+            self.record_batch([record['features'] for record in records])
+            check_due = self._check_due()
+            
+        if check_due:
+            try:
+                drift_result = self.check_data_drift()
+                if drift_result is not None:
+                    results['data_drift'] = drift_result
+                    results['alerts'].extend(drift_result.get('alerts', []))
+            except Exception as e:
+                logger.error(f"Data drift detection failed: {e}")
+            try:
+                sketch_result = self.check_sketch_drift()
+                if sketch_result is not None:
+                    results['sketch_drift'] = sketch_result
+                    results['alerts'].extend(sketch_result.get('alerts', []))
+            except Exception as e:
+                logger.error(f"Sketch drift detection failed: {e}")
             
         # Monitor concept drift (requires labels)
-        if (self.concept_drift_detector and 
-            y_true is not None and 
-            y_pred is not None):
+        labeled = [record for record in records
+                   if record.get('y_true') is not None and record.get('y_pred') is not None]
+        if self.concept_drift_detector and labeled:
             try:
+                probabilities = [record.get('y_pred_proba') for record in labeled]
                 concept_result = self.concept_drift_detector.update_performance(
-                    np.array([y_true]), 
-                    np.array([y_pred]),
-                    np.array([y_pred_proba]) if y_pred_proba else None
+                    np.array([record['y_true'] for record in labeled]), 
+                    np.array([record['y_pred'] for record in labeled]),
+                    np.array(probabilities) if all(probabilities) else None
                 )
                 results['concept_drift'] = concept_result
                 if 'drift_results' in concept_result:
@@ -442,16 +1049,198 @@ class DriftMonitor:
                 
         return results
         
+    def record_features(self, features: Dict[str, Any]) -> None:
+        """
+        Append feature values to their live windows
+        
+        Args:
+            features: Feature name -> scalar value or sequence of values
+        """
+        self.record_batch([features])
+        
+    def record_batch(self, features_list: List[Dict[str, Any]]) -> None:
+        """
+        Append the feature values of several predictions to their live windows
+        
+        Values are grouped per feature first, so each window and histogram is
+        updated once per batch. NaN values are left out of the KS windows (the
+        histograms count them in their missing-value bin).
+        
+        Args:
+            features_list: One dict of feature name -> scalar value or
+                           sequence of values per prediction
+        """
+        columns: Dict[str, List[float]] = {}
+        recorded = 0
+        for features in features_list:
+            has_values = False
+            for key, value in features.items():
+                if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+                    columns.setdefault(key, []).append(value)
+                elif isinstance(value, (list, np.ndarray)):
+                    columns.setdefault(key, []).extend(np.ravel(value).tolist())
+                else:
+                    continue
+                has_values = True
+            recorded += has_values
+            
+        arrays = {key: np.asarray(values, dtype=np.float64) for key, values in columns.items()}
+        with self._lock:
+            for key, values in arrays.items():
+                self._window(key).extend(values[~np.isnan(values)])
+            self._samples_since_check += recorded
+            if self.sketch_drift_detector:
+                self.sketch_drift_detector.update(arrays)
+                
+    def _window(self, feature: str) -> FeatureWindow:
+        window = self.feature_windows.get(feature)
+        if window is None:
+            window = self.feature_windows[feature] = FeatureWindow(self.window_size)
+        return window
+        
+    def _check_due(self) -> bool:
+        """Whether the schedule asks for a new data drift check"""
+        if self._samples_since_check == 0:
+            return False
+        schedule = self.config['schedule']
+        check_every = schedule.get('check_every')
+        if check_every and self._samples_since_check >= check_every:
+            return True
+        interval = schedule.get('check_interval_seconds')
+        return bool(interval) and time.monotonic() - self._last_check_time >= interval
+        
+    def check_data_drift(self) -> Optional[Dict[str, Any]]:
+        """
+        Run the KS tests on the current live windows
+        
+        Only features with at least `min_samples` values are tested. The
+        result is cached in `last_data_drift`.
+        
+        Returns:
+            Drift detection results, or None if there is no reference data
+            or no window is large enough yet
+        """
+        with self._lock:
+            self._samples_since_check = 0
+            self._last_check_time = time.monotonic()
+            if not self.data_drift_detector.reference_data:
+                return None
+            min_samples = self.config['schedule']['min_samples']
+            current_data = {
+                feature: window.values()
+                for feature, window in self.feature_windows.items()
+                if feature in self.data_drift_detector.reference_data and len(window) >= min_samples
+            }
+            if not current_data:
+                return None
+            drift_result = self.data_drift_detector.detect_drift(current_data)
+            drift_result['window_sizes'] = {feature: len(values) for feature, values in current_data.items()}
+            self.last_data_drift = drift_result
+            return drift_result
+            
+    def check_sketch_drift(self) -> Optional[Dict[str, Any]]:
+        """
+        Compute PSI and Jensen-Shannon divergence of the current histograms
+        
+        With shared counts, this process' counts are published first and the
+        check runs on the sum over all processes (`workers` in the result).
+        The result is cached in `last_sketch_drift`.
+        
+        Returns:
+            Sketch drift results, or None if the sketch detector is disabled
+            or has no reference data
+        """
+        with self._lock:
+            detector = self.sketch_drift_detector
+            if not detector or not detector.reference_counts:
+                return None
+            current_counts, workers = None, 1
+            if self.shared_sketch_counts is not None:
+                self.shared_sketch_counts.publish(detector.export_counts())
+                exports = self.shared_sketch_counts.collect()
+                try:
+                    current_counts, workers = detector.merge_counts(exports), len(exports)
+                except ValueError as e:
+                    # e.g. one worker reloaded a different reference: fall back to local counts
+                    logger.warning(f"Sketch counts of other workers not merged: {e}")
+            sketch_result = detector.detect_drift(current_counts)
+            sketch_result['workers'] = workers
+            self.last_sketch_drift = sketch_result
+            return sketch_result
+            
+    def _last_sketch_drift_summary(self) -> Optional[Dict[str, Any]]:
+        """JSON-friendly view of the cached sketch drift result"""
+        result = self.last_sketch_drift
+        if result is None:
+            return None
+        return {
+            'timestamp': result['timestamp'].isoformat(),
+            'features_analyzed': result['features_analyzed'],
+            'features_with_drift': result['features_with_drift'],
+            'drift_detected': bool(result['drift_detected']),
+            'drift_percentage': float(result['drift_percentage']),
+            'workers': result.get('workers', 1),
+            'feature_results': {
+                feature: {
+                    'psi': float(feature_result['psi']),
+                    'js_divergence': float(feature_result['js_divergence']),
+                    'sample_size': feature_result['sample_size'],
+                    'drift_detected': bool(feature_result['drift_detected']),
+                    'severity': feature_result['severity']
+                }
+                for feature, feature_result in result['feature_results'].items()
+            }
+        }
+        
+    def _last_data_drift_summary(self) -> Optional[Dict[str, Any]]:
+        """JSON-friendly view of the cached data drift result"""
+        result = self.last_data_drift
+        if result is None:
+            return None
+        return {
+            'timestamp': result['timestamp'].isoformat(),
+            'features_analyzed': result['features_analyzed'],
+            'features_with_drift': result['features_with_drift'],
+            'drift_detected': bool(result['drift_detected']),
+            'drift_percentage': float(result['drift_percentage']),
+            'feature_results': {
+                feature: {
+                    'ks_statistic': float(feature_result['ks_statistic']),
+                    'p_value': float(feature_result['p_value']),
+                    'drift_detected': bool(feature_result['drift_detected']),
+                    'effect_size': float(feature_result['effect_size']),
+                    'psi': float(feature_result['psi']),
+                    'wasserstein': float(feature_result['wasserstein']),
+                    'severity': feature_result['severity'],
+                    'window_size': result['window_sizes'].get(feature)
+                }
+                for feature, feature_result in result['feature_results'].items()
+            }
+        }
+        
     def get_drift_summary(self) -> Dict[str, Any]:
         """Get comprehensive drift monitoring summary"""
         return {
             'monitoring_active': self.monitoring_active,
-            'data_drift_alerts': len(self.data_drift_detector.alerts),
+            'reference_loaded': bool(self.data_drift_detector.reference_data),
+            'last_data_drift_check': self._last_data_drift_summary(),
+            'last_sketch_drift_check': self._last_sketch_drift_summary(),
+            'window_sizes': {feature: len(window) for feature, window in self.feature_windows.items()},
+            'samples_since_last_check': self._samples_since_check,
+            'data_drift_alerts': self.data_drift_detector.alerts_total,
             'concept_drift_alerts': (
                 len(self.concept_drift_detector.alerts) 
                 if self.concept_drift_detector else 0
             ),
-            'last_data_drift_alerts': self.data_drift_detector.alerts[-5:],
+            'sketch_drift_alerts': (
+                self.sketch_drift_detector.alerts_total
+                if self.sketch_drift_detector else 0
+            ),
+            'last_data_drift_alerts': list(self.data_drift_detector.alerts)[-5:],
+            'last_sketch_drift_alerts': (
+                list(self.sketch_drift_detector.alerts)[-5:]
+                if self.sketch_drift_detector else []
+            ),
             'last_concept_drift_alerts': (
                 self.concept_drift_detector.alerts[-5:] 
                 if self.concept_drift_detector else []
@@ -463,7 +1252,12 @@ class DriftMonitor:
         }
         
     def export_alerts(self, filepath: str) -> None:
-        """Export all alerts to JSON file"""
+        """
+        Export the retained alerts to JSON file
+        
+        Data and sketch drift detectors only keep their last `max_alerts`
+        alerts; the log line reports how many were raised in total.
+        """
         all_alerts = []
         
         # Data drift alerts
@@ -478,6 +1272,19 @@ class DriftMonitor:
                 'message': alert.message
             })
             
+        # Data drift alerts from the histogram sketches
+        sketch_alerts = self.sketch_drift_detector.alerts if self.sketch_drift_detector else []
+        for alert in sketch_alerts:
+            all_alerts.append({
+                'timestamp': alert.timestamp.isoformat(),
+                'type': alert.drift_type,
+                'severity': alert.severity,
+                'metric': alert.metric,
+                'value': alert.value,
+                'threshold': alert.threshold,
+                'message': alert.message
+            })
+            
         # Concept drift alerts
         if self.concept_drift_detector:
             for alert in self.concept_drift_detector.alerts:
@@ -494,4 +1301,71 @@ class DriftMonitor:
         with open(filepath, 'w') as f:
             json.dump(all_alerts, f, indent=2)
             
-        logger.info(f"Exported {len(all_alerts)} alerts to {filepath}")
+        total_alerts = self.data_drift_detector.alerts_total + (
+            self.sketch_drift_detector.alerts_total if self.sketch_drift_detector else 0
+        ) + (len(self.concept_drift_detector.alerts) if self.concept_drift_detector else 0)
+        logger.info(f"Exported {len(all_alerts)} alerts ({total_alerts} raised in total) to {filepath}")
+
+
+REFERENCE_PREDICTION_KEY = 'prediction_value'
+
+
+def save_reference_data(filepath: str,
+                        features: np.ndarray,
+                        feature_names: List[str],
+                        predictions: Optional[np.ndarray] = None,
+                        max_rows: int = 10000,
+                        random_state: int = 42) -> None:
+    """
+    Persist the training feature matrix as the drift reference
+    
+    Written at training time so the monitor compares live traffic against
+    the exact features the model was fitted on. Matrices larger than
+    `max_rows` are uniformly subsampled (same rows for every column).
+    
+    Args:
+        filepath: Destination `.npz` file
+        features: Training feature matrix (n_rows x n_features)
+        feature_names: Column names, in the model's feature order
+        predictions: Model outputs on the same rows (stored as `prediction_value`)
+        max_rows: Maximum number of rows kept
+        random_state: Seed for the subsampling
+    """
+    features = np.asarray(features, dtype=np.float64)
+    if features.ndim != 2 or features.shape[1] != len(feature_names):
+        raise ValueError(f"Expected a matrix with {len(feature_names)} columns, got shape {features.shape}")
+    if predictions is not None:
+        predictions = np.asarray(predictions, dtype=np.float64).ravel()
+        if len(predictions) != len(features):
+            raise ValueError("predictions must have one value per feature row")
+    
+    if len(features) > max_rows:
+        rows = np.sort(np.random.default_rng(random_state).choice(len(features), max_rows, replace=False))
+        features = features[rows]
+        if predictions is not None:
+            predictions = predictions[rows]
+    
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    np.savez_compressed(
+        filepath,
+        feature_names=np.asarray(feature_names, dtype=str),
+        features=features,
+        predictions=predictions if predictions is not None else np.empty(0)
+    )
+    logger.info(f"Saved drift reference with {len(features)} rows to {filepath}")
+
+
+def load_reference_data(filepath: str) -> Dict[str, np.ndarray]:
+    """
+    Load a reference saved by `save_reference_data`
+    
+    Returns:
+        Dictionary feature name -> reference values, plus `prediction_value`
+        when predictions were stored; ready for `DriftMonitor.initialize_reference_data`
+    """
+    with np.load(filepath, allow_pickle=False) as data:
+        features = data['features']
+        reference = {str(name): features[:, i] for i, name in enumerate(data['feature_names'])}
+        if len(data['predictions']):
+            reference[REFERENCE_PREDICTION_KEY] = data['predictions']
+    return reference
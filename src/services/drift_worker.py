@@ -0,0 +1,133 @@
+"""
+Monitoramento de drift fora do caminho da requisição
+
+O `/predict` rodava o bloco de drift inteiro (montagem das features,
+`monitor_prediction`, testes estatísticos e métricas do Prometheus) antes de
+responder. O `DriftWorker` separa as duas coisas: a requisição só enfileira um
+registro compacto (features e score) e segue; uma thread de fundo junta os
+registros em lotes e os repassa ao `DriftMonitor.monitor_batch`.
+
+A fila é limitada: com ela cheia, o registro novo é descartado (`submit`
+retorna False e `dropped` é incrementado) em vez de bloquear a requisição ou
+crescer a memória sem limite. Como no `MicroBatcher`, a thread é criada sob
+demanda e recriada após um fork (preload do gunicorn).
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.monitoring.drift_detection import DriftMonitor
+
+
+logger = logging.getLogger(__name__)
+
+# listener(resultado do monitor_batch, tamanho do lote, atraso do registro mais antigo em segundos)
+BatchListener = Callable[[Dict[str, Any], int, float], None]
+
+
+class DriftWorker:
+    """Consome registros de predições em uma thread de fundo e os repassa em lotes ao `DriftMonitor`."""
+
+    def __init__(self, monitor: DriftMonitor, max_queue_size: int = 10000,
+                 max_batch_size: int = 256, max_wait_ms: float = 100.0):
+        """
+        Args:
+            monitor: Monitor de drift que recebe os lotes.
+            max_queue_size: Registros aguardando na fila; acima disso são descartados.
+            max_batch_size: Máximo de registros por chamada ao `monitor_batch`.
+            max_wait_ms: Tempo máximo que o primeiro registro de um lote espera por outros.
+        """
+        if max_queue_size <= 0 or max_batch_size <= 0:
+            raise ValueError("max_queue_size e max_batch_size devem ser positivos")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms não pode ser negativo")
+
+        self.monitor = monitor
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.listener: Optional[BatchListener] = None
+        self.dropped = 0
+        self.processed = 0
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._queue: 'queue.Queue[Tuple[float, Dict[str, Any]]]' = queue.Queue(maxsize=max_queue_size)
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Enfileira o registro de uma predição sem bloquear.
+
+        Args:
+            record: Dict com 'features' e, opcionalmente, 'y_true', 'y_pred' e
+                    'y_pred_proba' (ver `DriftMonitor.monitor_batch`).
+
+        Returns:
+            False se a fila estava cheia e o registro foi descartado.
+        """
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((time.monotonic(), record))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Espera os registros enfileirados serem processados; False se o tempo acabar antes."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def _ensure_worker(self) -> None:
+        if self._pid == os.getpid() and self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Processo novo (fork): a fila herdada pode ter locks em estado inconsistente
+                self._queue = queue.Queue(maxsize=self.max_queue_size)
+                self._pid = os.getpid()
+                self._worker = None
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='drift-worker', daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> List[Tuple[float, Dict[str, Any]]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            # Atraso entre a requisição mais antiga do lote e o início do processamento
+            lag = time.monotonic() - batch[0][0]
+            try:
+                results = self.monitor.monitor_batch([record for _, record in batch])
+                self.processed += len(batch)
+                if self.listener is not None:
+                    self.listener(results, len(batch), lag)
+            except Exception as e:
+                logger.error(f"Erro no monitoramento de drift de {len(batch)} registros: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
@@ -0,0 +1,122 @@
+"""
+Micro-batching de inferência
+
+Cada `/predict` chamava o `model.predict` do XGBoost com uma única linha. O
+`MicroBatcher` fica entre as threads que atendem as requisições e o modelo:
+as linhas de features enfileiradas são agrupadas por até `max_wait_ms` (ou
+até `max_batch_size` linhas), pontuadas em uma única chamada ao modelo e os
+scores são devolvidos a cada requisição por um `Future`.
+
+A API é WSGI síncrona (Flask/gunicorn com threads), então o agrupamento usa
+uma thread de fundo e `queue.Queue` em vez de asyncio. A thread é criada sob
+demanda e recriada após um fork (preload do gunicorn), já que threads não
+sobrevivem ao fork.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+PredictFn = Callable[[np.ndarray], np.ndarray]
+
+
+class MicroBatcher:
+    """Agrupa linhas de features de várias requisições em uma chamada ao modelo."""
+
+    def __init__(self, predict_fn: PredictFn, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        """
+        Args:
+            predict_fn: Função do modelo (matriz n x n_features -> n scores).
+            max_batch_size: Máximo de linhas por chamada ao modelo.
+            max_wait_ms: Tempo máximo que a primeira linha de um lote espera por outras.
+        """
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size deve ser positivo")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms não pode ser negativo")
+
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        # Chamado como listener(tamanho_do_lote, profundidade_da_fila) após cada lote
+        self.listener: Optional[Callable[[int, int], None]] = None
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._queue: 'queue.Queue[Tuple[np.ndarray, Future]]' = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, features: np.ndarray) -> Future:
+        """Enfileira uma linha de features (1 x n_features); o Future recebe o score."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((np.asarray(features, dtype=float).reshape(1, -1), future))
+        return future
+
+    def predict(self, features: np.ndarray, timeout: Optional[float] = None) -> float:
+        """Score de uma linha de features, pontuada junto com as demais da fila."""
+        future = self.submit(features)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def _ensure_worker(self) -> None:
+        if self._pid == os.getpid() and self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Processo novo (fork): a fila herdada pode ter locks em estado inconsistente
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._worker = None
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> List[Tuple[np.ndarray, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            # Requisições canceladas (ex: timeout do chamador) saem do lote
+            pending = [(features, future) for features, future in self._collect()
+                       if future.set_running_or_notify_cancel()]
+            if not pending:
+                continue
+            try:
+                scores = self.predict_fn(np.vstack([features for features, _ in pending]))
+                for (_, future), score in zip(pending, scores):
+                    future.set_result(float(score))
+            except Exception as e:
+                logger.error(f"Erro no lote de {len(pending)} predições: {e}")
+                for _, future in pending:
+                    future.set_exception(e)
+
+            if self.listener is not None:
+                try:
+                    self.listener(len(pending), self.queue_depth)
+                except Exception as e:
+                    logger.warning(f"Erro ao registrar métricas do micro-batching: {e}")
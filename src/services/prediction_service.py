@@ -3,10 +3,19 @@ Serviço de predição centralizado
 """
 
 import logging
-from typing import Dict, Tuple, Any, Optional
+from typing import Dict, Iterator, List, Tuple, Any, Optional
 from src.core.config import config
+from src.core.constants import (
+    EXPLAIN_MODES, DEFAULT_EXPLAIN_MODE, DEFAULT_EXPLAIN_TOP_K, MAX_BATCH_CANDIDATES,
+    DEFAULT_MATRIX_CHUNK_SIZE, MAX_MATRIX_CHUNK_SIZE, DEFAULT_MATCH_TOP_K, MAX_MATCH_TOP_K,
+    MATCH_SHORTLIST_FACTOR, MIN_MATCH_SHORTLIST
+)
 from src.core.exceptions import ModelLoadError, PredictionError, DataValidationError
-from src.models.predict import PredictionPipeline
+from src.features.candidate_store import CandidateFeatureStore
+from src.features.vacancy_cache import VacancyFeatureCache
+from src.services.micro_batcher import MicroBatcher
+from src.models.predict import PredictionPipeline, CANDIDATE_BLOCK_FEATURES
+from src.models.retrieval import CandidateRetriever
 
 
 logger = logging.getLogger(__name__)
@@ -17,7 +26,14 @@ class PredictionService:
     
     def __init__(self):
         self._pipeline: Optional[PredictionPipeline] = None
+        self._candidate_store: Optional[CandidateFeatureStore] = None
+        self._vacancy_cache: Optional[VacancyFeatureCache] = None
+        self._retriever: Optional[CandidateRetriever] = None
+        self._batcher: Optional[MicroBatcher] = None
         self._load_pipeline()
+        self._load_candidate_store()
+        self._load_vacancy_cache()
+        self._load_micro_batcher()
     
     def _load_pipeline(self) -> None:
         """Carrega o pipeline de predição"""
@@ -25,23 +41,115 @@ class PredictionService:
             self._pipeline = PredictionPipeline(
                 model_path=config.model.model_path,
                 artifacts_path=config.model.artifacts_path,
-                w2v_model_path=config.model.w2v_model_path
+                w2v_model_path=config.model.w2v_model_path,
+                w2v_format=config.model.w2v_format,
+                backend=config.model.model_backend
             )
             logger.info("Pipeline de predição carregado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao carregar pipeline: {e}")
             raise ModelLoadError(f"Falha ao carregar o modelo: {e}")
     
-    def predict(self, candidate_data: Dict[str, Any], vacancy_data: Dict[str, Any]) -> Tuple[float, Any]:
+    def _load_candidate_store(self) -> None:
+        """Abre o store de features de candidatos, se configurado"""
+        store_path = config.model.candidate_store_path
+        if not store_path:
+            return
+        if not self._pipeline.fast_path_enabled:
+            logger.warning("Store de candidatos desabilitado: caminho rápido indisponível para o modelo")
+            return
+        
+        try:
+            self._candidate_store = CandidateFeatureStore(
+                store_path,
+                fingerprint=self._pipeline.feature_fingerprint(),
+                vector_columns=self._pipeline.feature_plan.candidate_columns,
+                feature_names=[f'{name}_cand' for name in CANDIDATE_BLOCK_FEATURES],
+                dim=self._pipeline.NUM_FEATURES_W2V,
+                dtype=self._pipeline.model_w2v.vectors.dtype
+            )
+            logger.info(f"Store de candidatos carregado: {len(self._candidate_store)} candidatos")
+        except Exception as e:
+            logger.error(f"Erro ao abrir store de candidatos em {store_path}: {e}")
+            self._candidate_store = None
+    
+    def _load_vacancy_cache(self) -> None:
+        """Cria o cache de blocos de vagas, se habilitado"""
+        if config.model.vacancy_cache_size <= 0:
+            return
+        if not self._pipeline.fast_path_enabled:
+            logger.warning("Cache de vagas desabilitado: caminho rápido indisponível para o modelo")
+            return
+        
+        self._vacancy_cache = VacancyFeatureCache(
+            max_size=config.model.vacancy_cache_size,
+            ttl_seconds=config.model.vacancy_cache_ttl
+        )
+        logger.info(
+            f"Cache de vagas habilitado: {config.model.vacancy_cache_size} vagas, "
+            f"TTL de {config.model.vacancy_cache_ttl}s"
+        )
+    
+    def _load_micro_batcher(self) -> None:
+        """Cria o micro-batcher de inferência, se habilitado"""
+        if config.model.micro_batch_max_size <= 0:
+            return
+        
+        self._batcher = MicroBatcher(
+            self._pipeline.predict_scores,
+            max_batch_size=config.model.micro_batch_max_size,
+            max_wait_ms=config.model.micro_batch_wait_ms
+        )
+        logger.info(
+            f"Micro-batching habilitado: até {config.model.micro_batch_max_size} predições "
+            f"ou {config.model.micro_batch_wait_ms} ms por lote"
+        )
+    
+    @property
+    def micro_batcher(self) -> Optional[MicroBatcher]:
+        """Micro-batcher de inferência (None se desabilitado)"""
+        return self._batcher
+    
+    @property
+    def vacancy_cache(self) -> Optional[VacancyFeatureCache]:
+        """Cache de blocos de vagas (None se desabilitado)"""
+        return self._vacancy_cache
+    
+    @property
+    def feature_names(self) -> List[str]:
+        """Nomes das features do modelo, na ordem do vetor devolvido com `return_features`"""
+        if not self._pipeline:
+            raise ModelLoadError("Pipeline não está carregado")
+        return list(self._pipeline.model_features_order)
+    
+    def predict(self, candidate_data: Optional[Dict[str, Any]], vacancy_data: Dict[str, Any],
+                explain: str = DEFAULT_EXPLAIN_MODE,
+                top_k: int = DEFAULT_EXPLAIN_TOP_K,
+                candidate_id: Optional[str] = None,
+                vacancy_id: Optional[str] = None,
+                return_features: bool = False) -> Tuple[Any, ...]:
         """
         Realiza predição para um candidato e vaga
         
+        Com `candidate_id`, o candidato vem do store de features: se os dados
+        forem enviados eles atualizam o store (só reprocessados se mudaram);
+        se não, é usado o bloco já armazenado. Com `vacancy_id` (ou uma vaga
+        única no formato {id: dados}), a vaga vem do cache de vagas e só é
+        reprocessada se o conteúdo mudou ou a entrada expirou.
+        
         Args:
-            candidate_data: Dados do candidato
-            vacancy_data: Dados da vaga
+            candidate_data: Dados do candidato (opcional com candidate_id)
+            vacancy_data: Dados da vaga (opcional com vacancy_id já em cache)
+            explain: Modo de explicação ('none', 'values' ou 'top_k')
+            top_k: Quantidade de features no modo 'top_k'
+            candidate_id: Id do candidato no store de features
+            vacancy_id: Id da vaga no cache de vagas
+            return_features: Devolve também o vetor de features usado no score
+                             (na ordem de `feature_names`), sem recalcular
             
         Returns:
-            Tuple com score de predição e dados adicionais
+            Tuple com score de predição e dados adicionais (e o vetor de
+            features, com `return_features`)
             
         Raises:
             PredictionError: Se houver erro na predição
@@ -51,19 +159,308 @@ class PredictionService:
             raise ModelLoadError("Pipeline não está carregado")
         
         try:
+            if vacancy_id is None and self._vacancy_cache is not None:
+                vacancy_id, vacancy_data = self._single_vacancy(vacancy_data)
+            if candidate_id is not None or vacancy_id is not None:
+                return self._predict_from_blocks(
+                    candidate_id, candidate_data, vacancy_id, vacancy_data, explain, top_k,
+                    return_features
+                )
+            
             # Validar dados de entrada
             self._validate_input_data(candidate_data, vacancy_data)
+            self._validate_explain_options(explain, top_k)
             
             # Realizar predição
-            prediction, additional_data = self._pipeline.predict(candidate_data, vacancy_data)
+            if self._batcher is not None:
+                features = self._pipeline.feature_row(candidate_data, vacancy_data)
+                result = self._predict_batched(features, explain, top_k, return_features)
+            else:
+                result = self._pipeline.predict(
+                    candidate_data, vacancy_data, explain=explain, top_k=top_k,
+                    **self._feature_options(return_features)
+                )
             
-            logger.info(f"Predição realizada com sucesso: {prediction}")
-            return prediction, additional_data
+            logger.info(f"Predição realizada com sucesso: {result[0]}")
+            return result
             
         except Exception as e:
             logger.error(f"Erro na predição: {e}")
             raise PredictionError(f"Falha na predição: {e}")
     
+    @staticmethod
+    def _single_vacancy(vacancy_data: Any) -> Tuple[Optional[str], Any]:
+        """Separa id e dados de uma vaga única no formato {id: dados}"""
+        if isinstance(vacancy_data, dict) and len(vacancy_data) == 1:
+            (vacancy_id, record), = vacancy_data.items()
+            if isinstance(record, dict) and record:
+                return str(vacancy_id), record
+        return None, vacancy_data
+    
+    @staticmethod
+    def _feature_options(return_features: bool) -> Dict[str, Any]:
+        """Repassa `return_features` ao pipeline só quando pedido (a assinatura padrão segue igual)"""
+        return {'return_features': True} if return_features else {}
+    
+    def _predict_from_blocks(self, candidate_id: Optional[str], candidate_data: Optional[Dict[str, Any]],
+                             vacancy_id: Optional[str], vacancy_data: Optional[Dict[str, Any]],
+                             explain: str, top_k: int, return_features: bool = False) -> Tuple[Any, ...]:
+        """Predição com candidato do store e/ou vaga do cache de vagas"""
+        self._validate_explain_options(explain, top_k)
+        candidate_block = self._candidate_block(candidate_id, candidate_data)
+        vacancy_block = self._vacancy_block(vacancy_id, vacancy_data)
+        
+        if candidate_block is None or vacancy_block is None:
+            # Payload fora do caminho rápido: usa o pipeline completo
+            if candidate_id is not None:
+                raise DataValidationError("Vaga não suportada pelo caminho rápido")
+            if vacancy_id is not None:
+                vacancy_data = {vacancy_id: vacancy_data}
+            self._validate_input_data(candidate_data, vacancy_data)
+            return self._pipeline.predict(candidate_data, vacancy_data, explain=explain, top_k=top_k,
+                                          **self._feature_options(return_features))
+        
+        if self._batcher is not None:
+            features = self._pipeline.block_features(candidate_block, vacancy_block)
+            result = self._predict_batched(features, explain, top_k, return_features)
+        else:
+            result = self._pipeline.predict_blocks(
+                candidate_block, vacancy_block, explain=explain, top_k=top_k,
+                **self._feature_options(return_features)
+            )
+        logger.info(
+            f"Predição realizada com sucesso (candidato {candidate_id}, vaga {vacancy_id}): {result[0]}"
+        )
+        return result
+    
+    def _predict_batched(self, features: Any, explain: str, top_k: int,
+                         return_features: bool = False) -> Tuple[Any, ...]:
+        """Score pelo micro-batcher (junto com as requisições concorrentes) e explicação da linha"""
+        prediction = self._batcher.predict(features, timeout=config.model.prediction_timeout)
+        if return_features:
+            return prediction, self._pipeline.explain_features(features, explain, top_k), features[0]
+        return prediction, self._pipeline.explain_features(features, explain, top_k)
+    
+    def _candidate_block(self, candidate_id: Optional[str],
+                         candidate_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Bloco do candidato, do store de features quando há `candidate_id`"""
+        if candidate_id is None:
+            if not candidate_data:
+                raise DataValidationError("Dados do candidato não podem estar vazios")
+            return self._pipeline.build_candidate_block(candidate_data)
+        
+        store = self._require_candidate_store()
+        candidate_id = str(candidate_id)
+        if candidate_data:
+            store.upsert(candidate_id, candidate_data, self._pipeline.build_candidate_block)
+        candidate_block = store.get(candidate_id)
+        if candidate_block is None:
+            raise DataValidationError(f"Candidato {candidate_id} não encontrado no store")
+        return candidate_block
+    
+    def _vacancy_block(self, vacancy_id: Optional[str],
+                       vacancy_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Bloco da vaga, do cache de vagas quando há `vacancy_id`"""
+        if vacancy_id is None or self._vacancy_cache is None:
+            if not vacancy_data:
+                if vacancy_id is not None:
+                    raise DataValidationError("Cache de vagas não habilitado; envie os dados da vaga")
+                raise DataValidationError("Dados da vaga não podem estar vazios")
+            if vacancy_id is not None:
+                vacancy_data = {vacancy_id: vacancy_data}
+            return self._pipeline.build_vacancy_block(vacancy_data)
+        
+        if vacancy_data:
+            return self._vacancy_cache.get_or_build(
+                vacancy_id, vacancy_data, self._pipeline.build_vacancy_block
+            )
+        vacancy_block = self._vacancy_cache.get(vacancy_id)
+        if vacancy_block is None:
+            raise DataValidationError(f"Vaga {vacancy_id} não está em cache; envie os dados da vaga")
+        return vacancy_block
+    
+    def match_top_k(self, vacancy_data: Optional[Dict[str, Any]], k: int = DEFAULT_MATCH_TOP_K,
+                    vacancy_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Melhores candidatos do store de features para uma vaga
+        
+        Um índice ANN sobre os vetores de documento dos candidatos seleciona uma
+        shortlist (`MATCH_SHORTLIST_FACTOR` x k, no mínimo `MIN_MATCH_SHORTLIST`)
+        que é re-ranqueada pelo modelo.
+        
+        Args:
+            vacancy_data: Dados da vaga (opcional com vacancy_id já em cache)
+            k: Quantidade de candidatos retornados
+            vacancy_id: Id da vaga no cache de vagas
+            
+        Returns:
+            Lista de {'candidate_id', 'score', 'rank', 'retrieval_score'} ordenada por score
+            
+        Raises:
+            PredictionError: Se houver erro na predição
+            DataValidationError: Se os dados forem inválidos
+        """
+        store = self._require_candidate_store()
+        if not isinstance(k, int) or isinstance(k, bool) or not 0 < k <= MAX_MATCH_TOP_K:
+            raise DataValidationError(f"k deve ser um inteiro entre 1 e {MAX_MATCH_TOP_K}")
+        
+        try:
+            if vacancy_id is None and self._vacancy_cache is not None:
+                vacancy_id, vacancy_data = self._single_vacancy(vacancy_data)
+            vacancy_block = self._vacancy_block(vacancy_id, vacancy_data)
+            if vacancy_block is None:
+                raise DataValidationError("Vaga não suportada pelo caminho rápido")
+            
+            if self._retriever is None:
+                self._retriever = CandidateRetriever(store, self._pipeline.feature_plan.vacancy_columns)
+            shortlist_size = max(k * MATCH_SHORTLIST_FACTOR, MIN_MATCH_SHORTLIST)
+            ids, retrieval_scores = self._retriever.shortlist(vacancy_block, shortlist_size)
+            
+            # Candidatos removidos entre a busca e a leitura são descartados
+            blocks = [store.get(candidate_id) for candidate_id in ids]
+            found = [i for i, block in enumerate(blocks) if block is not None]
+            scores = self._pipeline.score_blocks([blocks[i] for i in found], vacancy_block)
+            
+            ranked = sorted(zip(found, scores), key=lambda item: item[1], reverse=True)[:k]
+            logger.info(f"Top-{k} calculado: {len(found)} candidatos re-ranqueados de {len(store)}")
+            return [
+                {'candidate_id': ids[i], 'score': float(score), 'rank': rank,
+                 'retrieval_score': float(retrieval_scores[i])}
+                for rank, (i, score) in enumerate(ranked, start=1)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Erro no top-k de candidatos: {e}")
+            raise PredictionError(f"Falha no top-k de candidatos: {e}")
+    
+    def upsert_candidates(self, candidates: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Insere ou atualiza candidatos no store de features
+        
+        Args:
+            candidates: Candidatos no formato {id_candidato: dados}
+            
+        Returns:
+            Contagem de candidatos 'inserted', 'updated' e 'unchanged'
+            
+        Raises:
+            PredictionError: Se algum candidato não puder ser processado
+            DataValidationError: Se os dados forem inválidos
+        """
+        store = self._require_candidate_store()
+        if not candidates or not isinstance(candidates, dict):
+            raise DataValidationError("Candidatos devem ser um objeto {id: dados} não vazio")
+        if len(candidates) > MAX_BATCH_CANDIDATES:
+            raise DataValidationError(f"Máximo de {MAX_BATCH_CANDIDATES} candidatos por requisição")
+        if not all(isinstance(record, dict) and record for record in candidates.values()):
+            raise DataValidationError("Os dados de cada candidato devem ser um objeto não vazio")
+        
+        try:
+            counts = store.upsert_many(candidates, self._pipeline.build_candidate_block)
+            logger.info(f"Store de candidatos atualizado: {counts}")
+            return counts
+        except Exception as e:
+            logger.error(f"Erro ao atualizar store de candidatos: {e}")
+            raise PredictionError(f"Falha ao atualizar candidatos: {e}")
+    
+    def delete_candidate(self, candidate_id: str) -> bool:
+        """Remove um candidato do store de features; retorna False se ele não existir"""
+        store = self._require_candidate_store()
+        return store.delete(str(candidate_id))
+    
+    def _require_candidate_store(self) -> CandidateFeatureStore:
+        if not self._pipeline:
+            raise ModelLoadError("Pipeline não está carregado")
+        if self._candidate_store is None:
+            raise DataValidationError(
+                "Store de candidatos não configurado (defina CANDIDATE_STORE_PATH)"
+            )
+        return self._candidate_store
+    
+    def predict_many(self, vacancy_data: Dict[str, Any], candidates: Dict[str, Any],
+                     top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Ranqueia vários candidatos para uma vaga
+        
+        Args:
+            vacancy_data: Dados da vaga
+            candidates: Candidatos no formato {id_candidato: dados}
+            top_n: Se informado, retorna apenas os top_n melhores candidatos
+            
+        Returns:
+            Lista de {'candidate_id', 'score', 'rank'} ordenada por score decrescente
+            
+        Raises:
+            PredictionError: Se houver erro na predição
+            DataValidationError: Se os dados forem inválidos
+        """
+        if not self._pipeline:
+            raise ModelLoadError("Pipeline não está carregado")
+        
+        try:
+            self._validate_batch_data(vacancy_data, candidates, top_n)
+            
+            scores = self._pipeline.predict_many(vacancy_data, candidates)
+            
+            ranked = sorted(zip(candidates, scores), key=lambda item: item[1], reverse=True)
+            if top_n is not None:
+                ranked = ranked[:top_n]
+            
+            logger.info(f"Predição em lote realizada com sucesso: {len(candidates)} candidatos")
+            return [
+                {'candidate_id': candidate_id, 'score': float(score), 'rank': rank}
+                for rank, (candidate_id, score) in enumerate(ranked, start=1)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Erro na predição em lote: {e}")
+            raise PredictionError(f"Falha na predição em lote: {e}")
+    
+    def predict_matrix(self, candidates: Dict[str, Any], vacancies: Dict[str, Any],
+                       chunk_size: int = DEFAULT_MATRIX_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Pontua todos os pares de um conjunto de candidatos contra um conjunto de vagas
+        
+        A validação e o pré-processamento dos dois lados acontecem nesta chamada;
+        os pares são pontuados sob demanda, bloco a bloco, ao consumir o iterador.
+        
+        Args:
+            candidates: Candidatos no formato {id_candidato: dados}
+            vacancies: Vagas no formato {id_vaga: dados}
+            chunk_size: Quantidade máxima de pares por bloco
+            
+        Returns:
+            Iterador de blocos, cada um uma lista de {'candidate_id', 'vacancy_id', 'score'}
+            
+        Raises:
+            PredictionError: Se houver erro na preparação dos dados
+            DataValidationError: Se os dados forem inválidos
+        """
+        if not self._pipeline:
+            raise ModelLoadError("Pipeline não está carregado")
+        
+        try:
+            self._validate_matrix_data(candidates, vacancies, chunk_size)
+            chunks = self._pipeline.score_matrix(candidates, vacancies, chunk_size=chunk_size)
+            logger.info(
+                f"Matriz de predição preparada: {len(candidates)} candidatos x {len(vacancies)} vagas"
+            )
+        except Exception as e:
+            logger.error(f"Erro na predição em matriz: {e}")
+            raise PredictionError(f"Falha na predição em matriz: {e}")
+        
+        return self._format_matrix_chunks(chunks)
+    
+    @staticmethod
+    def _format_matrix_chunks(chunks: Iterator[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        for chunk in chunks:
+            yield [
+                {'candidate_id': candidate_id, 'vacancy_id': vacancy_id, 'score': float(score)}
+                for candidate_id, vacancy_id, score in zip(
+                    chunk['candidate_ids'], chunk['vacancy_ids'], chunk['scores']
+                )
+            ]
+    
     def _validate_input_data(self, candidate_data: Dict[str, Any], vacancy_data: Dict[str, Any]) -> None:
         """Valida dados de entrada"""
         if not candidate_data:
@@ -73,13 +470,59 @@ class PredictionService:
             raise DataValidationError("Dados da vaga não podem estar vazios")
         
         # Validações específicas podem ser adicionadas aqui
+    
+    def _validate_batch_data(self, vacancy_data: Dict[str, Any], candidates: Dict[str, Any],
+                             top_n: Optional[int]) -> None:
+        """Valida dados de entrada da predição em lote"""
+        if not vacancy_data:
+            raise DataValidationError("Dados da vaga não podem estar vazios")
+        
+        if not candidates or not isinstance(candidates, dict):
+            raise DataValidationError("Candidatos devem ser um objeto {id: dados} não vazio")
+        
+        if len(candidates) > MAX_BATCH_CANDIDATES:
+            raise DataValidationError(
+                f"Máximo de {MAX_BATCH_CANDIDATES} candidatos por requisição"
+            )
+        
+        if not all(isinstance(record, dict) for record in candidates.values()):
+            raise DataValidationError("Os dados de cada candidato devem ser um objeto")
+        
+        if top_n is not None and (not isinstance(top_n, int) or isinstance(top_n, bool) or top_n <= 0):
+            raise DataValidationError("top_n deve ser um inteiro positivo")
+    
+    def _validate_matrix_data(self, candidates: Dict[str, Any], vacancies: Dict[str, Any],
+                              chunk_size: int) -> None:
+        """Valida dados de entrada da predição em matriz"""
+        for records, label in ((candidates, 'Candidatos'), (vacancies, 'Vagas')):
+            if not records or not isinstance(records, dict):
+                raise DataValidationError(f"{label} devem ser um objeto {{id: dados}} não vazio")
+            if not all(isinstance(record, dict) for record in records.values()):
+                raise DataValidationError(f"{label}: os dados de cada registro devem ser um objeto")
+        
+        if (not isinstance(chunk_size, int) or isinstance(chunk_size, bool)
+                or not 0 < chunk_size <= MAX_MATRIX_CHUNK_SIZE):
+            raise DataValidationError(
+                f"chunk_size deve ser um inteiro entre 1 e {MAX_MATRIX_CHUNK_SIZE}"
+            )
+    
+    def _validate_explain_options(self, explain: str, top_k: int) -> None:
+        """Valida as opções de explicabilidade da requisição"""
+        if explain not in EXPLAIN_MODES:
+            raise DataValidationError(
+                f"Modo de explicação inválido: {explain}. Use um de {EXPLAIN_MODES}"
+            )
+        
+        if not isinstance(top_k, int) or isinstance(top_k, bool) or top_k <= 0:
+            raise DataValidationError("top_k deve ser um inteiro positivo")
         
     def health_check(self) -> Dict[str, Any]:
         """Verifica saúde do serviço"""
         return {
             "service": "prediction",
             "status": "healthy" if self._pipeline else "unhealthy",
-            "pipeline_loaded": self._pipeline is not None
+            "pipeline_loaded": self._pipeline is not None,
+            "candidate_store_size": len(self._candidate_store) if self._candidate_store is not None else None
         }
     
     def get_model_info(self) -> Dict[str, Any]:
@@ -91,5 +534,7 @@ class PredictionService:
             "model_loaded": True,
             "model_path": config.model.model_path,
             "artifacts_path": config.model.artifacts_path,
-            "w2v_model_path": config.model.w2v_model_path
+            "w2v_model_path": config.model.w2v_model_path,
+            "w2v_format": config.model.w2v_format,
+            "model_backend": config.model.model_backend
         }
@@ -216,7 +216,7 @@ class TestEndToEndWorkflow:
             
             # Mock dos arquivos necessários
             with patch('src.models.predict.joblib.load') as mock_joblib, \
-                 patch('src.models.predict.KeyedVectors.load_word2vec_format') as mock_kv, \
+                 patch('src.models.word2vec_store.KeyedVectors.load_word2vec_format') as mock_kv, \
                  patch('shap.TreeExplainer') as mock_shap, \
                  patch('shap.force_plot') as mock_force_plot, \
                  patch('shap.save_html') as mock_save_html:
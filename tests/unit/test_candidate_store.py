@@ -0,0 +1,163 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.features.candidate_store import CandidateFeatureStore, content_hash
+
+
+VECTOR_COLUMNS = ['cv_pt_cand', 'cargo_atual_cand']
+FEATURE_NAMES = ['pcd_cand', 'senioridade_cand']
+DIM = 4
+
+
+def fake_block(payload):
+    """Bloco determinístico derivado do texto do candidato (None se 'cv_pt' faltar)."""
+    (candidate_id, record), = payload.items()
+    if 'cv_pt' not in record:
+        return None
+    seed = sum(map(ord, record['cv_pt']))
+    rng = np.random.default_rng(seed)
+    return {
+        'features': {'pcd_cand': float(seed % 2), 'senioridade_cand': float(len(record['cv_pt']))},
+        'texts': {col: record['cv_pt'] for col in VECTOR_COLUMNS},
+        'vectors': {col: rng.normal(size=DIM).astype(np.float32) for col in VECTOR_COLUMNS}
+    }
+
+
+def open_store(path, fingerprint='fp'):
+    return CandidateFeatureStore(path, fingerprint, VECTOR_COLUMNS, FEATURE_NAMES, DIM)
+
+
+def assert_same_block(stored, expected):
+    assert stored['features'] == expected['features']
+    for col in VECTOR_COLUMNS:
+        np.testing.assert_array_equal(stored['vectors'][col], expected['vectors'][col])
+
+
+@pytest.mark.unit
+class TestCandidateFeatureStore:
+    """Testes para o store persistente de blocos de candidatos."""
+
+    def test_content_hash_independe_da_ordem(self):
+        assert content_hash({'a': 1, 'b': 'x'}) == content_hash({'b': 'x', 'a': 1})
+        assert content_hash({'a': 1}) != content_hash({'a': 2})
+
+    def test_upsert_e_get(self, tmp_path):
+        store = open_store(tmp_path)
+        record = {'cv_pt': 'python sql'}
+
+        assert store.upsert('1', record, fake_block) == 'inserted'
+
+        assert '1' in store and len(store) == 1
+        assert store.get_hash('1') == content_hash(record)
+        assert store.get_texts('1') == {col: 'python sql' for col in VECTOR_COLUMNS}
+        assert_same_block(store.get('1'), fake_block({'1': record}))
+
+    def test_conteudo_igual_nao_recalcula(self, tmp_path):
+        store = open_store(tmp_path)
+        store.upsert('1', {'cv_pt': 'python'}, fake_block)
+
+        def falha(payload):
+            raise AssertionError('bloco não deveria ser recalculado')
+
+        assert store.upsert('1', {'cv_pt': 'python'}, falha) == 'unchanged'
+
+    def test_atualizacao_e_remocao(self, tmp_path):
+        store = open_store(tmp_path)
+        store.upsert('1', {'cv_pt': 'python'}, fake_block)
+
+        assert store.upsert('1', {'cv_pt': 'java'}, fake_block) == 'updated'
+        assert_same_block(store.get('1'), fake_block({'1': {'cv_pt': 'java'}}))
+
+        assert store.delete('1')
+        assert not store.delete('1')
+        assert store.get('1') is None
+
+    def test_registro_nao_suportado(self, tmp_path):
+        store = open_store(tmp_path)
+
+        with pytest.raises(ValueError):
+            store.upsert('1', {'cargo_atual': 'gerente'}, fake_block)
+        assert '1' not in store
+
+    def test_lote_com_falha_nao_grava_nada(self, tmp_path):
+        store = open_store(tmp_path)
+        store.upsert('0', {'cv_pt': 'existente'}, fake_block)
+        lote = {'a': {'cv_pt': 'python'}, '0': {'cv_pt': 'java'}, 'c': {'cargo_atual': 'gerente'}}
+
+        with pytest.raises(ValueError):
+            store.upsert_many(lote, fake_block)
+
+        for aberto in (store, open_store(tmp_path)):
+            assert len(aberto) == 1 and 'a' not in aberto
+            assert_same_block(aberto.get('0'), fake_block({'0': {'cv_pt': 'existente'}}))
+        assert store.upsert_many({'a': {'cv_pt': 'python'}}, fake_block)['inserted'] == 1
+        assert_same_block(open_store(tmp_path).get('a'), fake_block({'a': {'cv_pt': 'python'}}))
+
+    def test_persistencia_e_memory_map(self, tmp_path):
+        store = open_store(tmp_path)
+        records = {str(i): {'cv_pt': f'texto {i}'} for i in range(5)}
+        counts = store.upsert_many(records, fake_block)
+        store.delete('3')
+
+        reaberto = open_store(tmp_path)
+
+        assert counts == {'inserted': 5, 'updated': 0, 'unchanged': 0}
+        assert len(reaberto) == 4 and '3' not in reaberto
+        assert isinstance(reaberto._vectors, np.memmap)
+        assert reaberto._vectors.dtype == np.float32
+        for candidate_id in ('0', '4'):
+            assert_same_block(reaberto.get(candidate_id), fake_block({candidate_id: records[candidate_id]}))
+
+    def test_leitor_enxerga_alteracoes_de_outro_escritor(self, tmp_path):
+        escritor = open_store(tmp_path)
+        leitor = open_store(tmp_path)
+
+        escritor.upsert('1', {'cv_pt': 'python'}, fake_block)
+
+        assert_same_block(leitor.get('1'), fake_block({'1': {'cv_pt': 'python'}}))
+
+    def test_dois_escritores_nao_sobrescrevem_slots(self, tmp_path):
+        primeiro = open_store(tmp_path)
+        segundo = open_store(tmp_path)
+
+        primeiro.upsert('1', {'cv_pt': 'python'}, fake_block)
+        segundo.upsert('2', {'cv_pt': 'java'}, fake_block)
+        primeiro.upsert('3', {'cv_pt': 'sql'}, fake_block)
+
+        reaberto = open_store(tmp_path)
+        assert len(reaberto) == 3
+        for candidate_id, texto in (('1', 'python'), ('2', 'java'), ('3', 'sql')):
+            assert_same_block(reaberto.get(candidate_id), fake_block({candidate_id: {'cv_pt': texto}}))
+
+    def test_crescimento_alem_da_capacidade(self, tmp_path, monkeypatch):
+        monkeypatch.setattr('src.features.candidate_store.INITIAL_CAPACITY', 2)
+        store = open_store(tmp_path)
+        records = {str(i): {'cv_pt': f'cv {i}'} for i in range(7)}
+
+        store.upsert_many(records, fake_block)
+
+        assert len(store._features) >= 7
+        for candidate_id, record in records.items():
+            assert_same_block(store.get(candidate_id), fake_block({candidate_id: record}))
+
+    def test_compactacao_descarta_slots_orfaos(self, tmp_path):
+        store = open_store(tmp_path)
+        store.upsert_many({'1': {'cv_pt': 'a'}, '2': {'cv_pt': 'b'}}, fake_block)
+        store.upsert_many({'1': {'cv_pt': 'c'}}, fake_block)
+        store.delete('2')
+
+        store.compact()
+
+        assert store._n_slots == 1
+        assert store.get_texts('1') == {col: 'c' for col in VECTOR_COLUMNS}
+        assert_same_block(open_store(tmp_path).get('1'), fake_block({'1': {'cv_pt': 'c'}}))
+
+    def test_configuracao_diferente_invalida_store(self, tmp_path):
+        open_store(tmp_path, fingerprint='antigo')
+
+        with pytest.raises(ValueError, match='fingerprint'):
+            open_store(tmp_path, fingerprint='novo')
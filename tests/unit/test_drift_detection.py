@@ -3,9 +3,11 @@ Testes para o módulo de Drift Detection
 """
 
 import pytest
+import json
 import numpy as np
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
+from scipy import stats
 import sys
 import os
 
@@ -17,7 +19,14 @@ try:
         DataDriftDetector, 
         ConceptDriftDetector, 
         DriftMonitor, 
-        DriftAlert
+        DriftAlert,
+        FeatureWindow,
+        ReferenceDistribution,
+        SharedSketchCounts,
+        SketchDriftDetector,
+        SlidingHistogram,
+        load_reference_data,
+        save_reference_data
     )
     DRIFT_MODULE_AVAILABLE = True
 except ImportError:
@@ -39,7 +48,8 @@ class TestDataDriftDetector:
         assert detector.reference_window_size == 100
         assert detector.detection_window_size == 50
         assert detector.reference_data == {}
-        assert detector.alerts == []
+        assert list(detector.alerts) == []
+        assert detector.alerts_total == 0
         
     def test_set_reference_data(self):
         """Teste de configuração de dados de referência"""
@@ -295,6 +305,483 @@ class TestDriftMonitor:
         mock_json_dump.assert_called_once()
 
 
+@pytest.mark.skipif(not DRIFT_MODULE_AVAILABLE, reason="Drift detection module not available")
+class TestReferenceDistribution:
+    """Testes para as estatísticas sobre a referência pré-ordenada"""
+    
+    @staticmethod
+    def _amostras():
+        rng = np.random.default_rng(3)
+        yield rng.normal(0, 1, 1000), rng.normal(0.3, 1.2, 80)
+        yield rng.normal(0, 1, 37), rng.normal(0, 1, 200)
+        # Features discretas (empates entre referência e janela)
+        yield rng.integers(0, 5, 500).astype(float), rng.integers(0, 7, 60).astype(float)
+        yield np.array([2.0]), np.array([1.0, 2.0, 3.0])
+        
+    def test_ks_igual_ao_scipy(self):
+        """Estatística KS e p-valor iguais ao ks_2samp assintótico"""
+        for reference, current in self._amostras():
+            statistic, p_value = ReferenceDistribution(reference).ks_test(np.sort(current))
+            esperado = stats.ks_2samp(reference, current, method='asymp')
+            
+            assert statistic == pytest.approx(esperado.statistic, abs=1e-12)
+            assert p_value == pytest.approx(esperado.pvalue, rel=1e-9, abs=1e-12)
+            
+    def test_wasserstein_igual_ao_scipy(self):
+        """Distância de Wasserstein igual à do scipy"""
+        for reference, current in self._amostras():
+            distancia = ReferenceDistribution(reference).wasserstein(np.sort(current))
+            
+            assert distancia == pytest.approx(stats.wasserstein_distance(reference, current), rel=1e-9, abs=1e-12)
+            
+    def test_psi(self):
+        """PSI perto de zero sem mudança e alto com deslocamento da distribuição"""
+        rng = np.random.default_rng(4)
+        reference = ReferenceDistribution(rng.normal(0, 1, 5000))
+        
+        assert reference.psi(rng.normal(0, 1, 5000)) < 0.02
+        assert reference.psi(rng.normal(1.5, 1, 500)) > 0.5
+        
+    def test_momentos_pre_calculados(self):
+        """Cohen's d com os momentos guardados igual ao calculado do zero"""
+        rng = np.random.default_rng(5)
+        reference, current = rng.normal(0, 1, 300), rng.normal(0.5, 2, 40)
+        pooled_std = np.sqrt((299 * np.var(reference, ddof=1) + 39 * np.var(current, ddof=1)) / 338)
+        
+        assert ReferenceDistribution(reference).effect_size(current) == pytest.approx(
+            abs(reference.mean() - current.mean()) / pooled_std)
+            
+    def test_referencia_vazia(self):
+        with pytest.raises(ValueError):
+            ReferenceDistribution(np.array([np.nan]))
+            
+    def test_detector_reporta_psi_e_wasserstein(self):
+        """detect_drift inclui PSI e Wasserstein por feature"""
+        detector = DataDriftDetector()
+        detector.set_reference_data({'feature1': np.random.normal(0, 1, 500)})
+        
+        result = detector.detect_drift({'feature1': np.random.normal(3, 1, 50)})['feature_results']['feature1']
+        
+        assert result['psi'] > 0.5
+        assert result['wasserstein'] == pytest.approx(3, abs=0.6)
+
+
+@pytest.mark.skipif(not DRIFT_MODULE_AVAILABLE, reason="Drift detection module not available")
+class TestSlidingHistogram:
+    """Testes para o histograma de janela deslizante"""
+    
+    def test_contagens_da_janela(self):
+        """As contagens cobrem só os últimos baldes completos mais o ativo"""
+        histogram = SlidingHistogram(np.array([0.0, 1.0]), bucket_size=10, n_buckets=3)
+        valores = np.random.default_rng(6).normal(0.5, 1, 95)
+        for value in valores:
+            histogram.add(value)
+            
+        # 95 valores: baldes [70, 80), [80, 90) e o ativo com [90, 95)
+        np.testing.assert_array_equal(histogram.counts, histogram.bin_counts(valores[70:]))
+        assert histogram.total == 25
+        
+    def test_extend_igual_a_add(self):
+        """extend em blocos produz as mesmas contagens que add valor a valor"""
+        valores = np.random.default_rng(7).normal(size=257)
+        valores[::13] = np.nan
+        por_add = SlidingHistogram(np.array([-1.0, 0.0, 1.0]), bucket_size=16, n_buckets=4)
+        por_extend = SlidingHistogram(np.array([-1.0, 0.0, 1.0]), bucket_size=16, n_buckets=4)
+        for value in valores:
+            por_add.add(value)
+        por_extend.extend(valores[:5])
+        por_extend.extend(valores[5:200])
+        por_extend.extend(valores[200:])
+        
+        np.testing.assert_array_equal(por_extend.counts, por_add.counts)
+        
+    def test_valores_ausentes_no_ultimo_bin(self):
+        histogram = SlidingHistogram(np.array([0.0]), bucket_size=10, n_buckets=2)
+        histogram.extend([np.nan, -1.0, 1.0, np.nan])
+        
+        np.testing.assert_array_equal(histogram.counts, [1, 1, 2])
+        
+    def test_memoria_constante(self):
+        """O estado não cresce com o número de valores contados"""
+        histogram = SlidingHistogram(np.linspace(-2, 2, 9), bucket_size=100, n_buckets=10)
+        histogram.extend(np.random.default_rng(8).normal(size=100000))
+        
+        assert histogram._buckets.shape == (10, 11)
+        assert 900 <= histogram.total <= 1000
+
+
+@pytest.mark.skipif(not DRIFT_MODULE_AVAILABLE, reason="Drift detection module not available")
+class TestSketchDriftDetector:
+    """Testes para o detector de drift por histogramas (PSI e Jensen-Shannon)"""
+    
+    @staticmethod
+    def _detector(**kwargs):
+        detector = SketchDriftDetector(n_bins=10, window_size=500, n_buckets=5, **kwargs)
+        rng = np.random.default_rng(9)
+        detector.set_reference_data({'feature1': rng.normal(0, 1, 5000), 'feature2': rng.integers(0, 3, 5000)})
+        return detector
+        
+    def test_sem_drift(self):
+        detector = self._detector()
+        rng = np.random.default_rng(10)
+        detector.update({'feature1': rng.normal(0, 1, 500), 'feature2': rng.integers(0, 3, 500)})
+        
+        result = detector.detect_drift()
+        
+        assert result['features_analyzed'] == 2
+        assert result['drift_detected'] == False
+        assert result['feature_results']['feature1']['psi'] < 0.1
+        
+    def test_drift_detectado(self):
+        detector = self._detector()
+        rng = np.random.default_rng(11)
+        for value in rng.normal(1.5, 1, 500):
+            detector.update({'feature1': value, 'feature2': 2})
+            
+        result = detector.detect_drift()
+        
+        assert result['features_with_drift'] == 2
+        assert result['feature_results']['feature1']['psi'] > 0.5
+        assert len(result['alerts']) == 2
+        assert result['alerts'][0].metric == 'psi_feature1'
+        
+    def test_historico_de_alertas_limitado(self):
+        """Drift contínuo não cresce a memória: só os últimos max_alerts ficam guardados"""
+        detector = self._detector(max_alerts=3)
+        detector.update({'feature1': np.full(500, 5.0), 'feature2': np.full(500, 2)})
+        
+        for _ in range(4):
+            detector.detect_drift()
+            
+        assert len(detector.alerts) == 3
+        assert detector.alerts_total == 8
+        
+    def test_js_igual_ao_scipy(self):
+        """Divergência de Jensen-Shannon (base 2) igual à do scipy"""
+        from scipy.spatial.distance import jensenshannon
+        detector = self._detector()
+        detector.update({'feature1': np.random.default_rng(12).normal(0.7, 1.3, 400)})
+        
+        result = detector.detect_drift()['feature_results']['feature1']
+        reference = detector.reference_counts['feature1']
+        current = detector.windows['feature1'].counts
+        esperado = jensenshannon(reference / reference.sum(), current / current.sum(), base=2) ** 2
+        
+        assert result['js_divergence'] == pytest.approx(esperado)
+        assert 0 <= result['js_divergence'] <= 1
+        
+    def test_contagens_combinadas_entre_workers(self):
+        """Somar as contagens de dois workers equivale a um worker com todo o tráfego"""
+        valores = np.random.default_rng(13).normal(0.3, 1, 400)
+        unico, worker_a, worker_b = self._detector(), self._detector(), self._detector()
+        unico.update({'feature1': valores})
+        worker_a.update({'feature1': valores[:250]})
+        worker_b.update({'feature1': valores[250:]})
+        
+        exports = json.loads(json.dumps([worker_a.export_counts(), worker_b.export_counts()]))
+        combinado = worker_a.merge_counts(exports)
+        
+        np.testing.assert_array_equal(combinado['feature1'], unico.windows['feature1'].counts)
+        assert (worker_a.detect_drift(combinado)['feature_results']['feature1']
+                == unico.detect_drift()['feature_results']['feature1'])
+                
+    def test_referencias_diferentes_nao_combinam(self):
+        detector = self._detector()
+        outro = SketchDriftDetector(n_bins=10)
+        outro.set_reference_data({'feature1': np.random.normal(5, 1, 100)})
+        
+        with pytest.raises(ValueError):
+            detector.merge_counts([outro.export_counts()])
+            
+    def test_amostra_minima(self):
+        detector = self._detector(min_samples=50)
+        detector.update({'feature1': np.zeros(10)})
+        
+        assert detector.detect_drift()['features_analyzed'] == 0
+        
+    def test_monitor_agenda_sketch(self):
+        """DriftMonitor alimenta os histogramas e calcula PSI/JS na checagem agendada"""
+        monitor = DriftMonitor(config={'schedule': {'check_every': 40, 'min_samples': 10}})
+        monitor.initialize_reference_data({'feature1': np.random.normal(0, 1, 1000)})
+        
+        for value in np.random.normal(2, 1, 40):
+            result = monitor.monitor_prediction({'feature1': value})
+            
+        assert result['sketch_drift']['drift_detected']
+        summary = monitor.get_drift_summary()
+        assert summary['last_sketch_drift_check']['feature_results']['feature1']['sample_size'] == 40
+        assert summary['sketch_drift_alerts'] == 1
+        json.dumps(summary['last_sketch_drift_check'])
+
+
+@pytest.mark.skipif(not DRIFT_MODULE_AVAILABLE, reason="Drift detection module not available")
+class TestFeatureWindow:
+    """Testes para a janela circular de valores ao vivo"""
+    
+    def test_janela_parcial(self):
+        """Antes de encher, a janela devolve os valores na ordem de chegada"""
+        window = FeatureWindow(5)
+        for value in [1.0, 2.0, 3.0]:
+            window.append(value)
+            
+        assert len(window) == 3
+        np.testing.assert_array_equal(window.values(), [1.0, 2.0, 3.0])
+        
+    def test_sobrescreve_os_mais_antigos(self):
+        """Janela cheia mantém só os últimos `capacity` valores"""
+        window = FeatureWindow(4)
+        for value in range(10):
+            window.append(value)
+            
+        assert len(window) == 4
+        assert window.total_seen == 10
+        np.testing.assert_array_equal(window.values(), [6, 7, 8, 9])
+        
+    def test_extend_igual_a_append(self):
+        """extend produz o mesmo conteúdo que vários append"""
+        valores = np.arange(13, dtype=float)
+        por_append, por_extend = FeatureWindow(5), FeatureWindow(5)
+        for value in valores:
+            por_append.append(value)
+        por_extend.extend(valores[:3])
+        por_extend.extend(valores[3:4])
+        por_extend.extend(valores[4:])
+        
+        np.testing.assert_array_equal(por_extend.values(), por_append.values())
+        
+    def test_capacidade_invalida(self):
+        with pytest.raises(ValueError):
+            FeatureWindow(0)
+
+
+@pytest.mark.skipif(not DRIFT_MODULE_AVAILABLE, reason="Drift detection module not available")
+class TestReferencePersistence:
+    """Testes para a referência gravada a partir da matriz de treino"""
+    
+    def test_ida_e_volta(self, tmp_path):
+        """Colunas e scores voltam com os nomes das features do modelo"""
+        features = np.arange(12, dtype=float).reshape(4, 3)
+        path = tmp_path / 'drift_reference.npz'
+        save_reference_data(str(path), features, ['a', 'b', 'c'], predictions=[0.1, 0.2, 0.3, 0.4])
+        
+        reference = load_reference_data(str(path))
+        
+        assert list(reference) == ['a', 'b', 'c', 'prediction_value']
+        np.testing.assert_array_equal(reference['b'], features[:, 1])
+        np.testing.assert_array_equal(reference['prediction_value'], [0.1, 0.2, 0.3, 0.4])
+        
+    def test_amostra_as_mesmas_linhas(self, tmp_path):
+        """Acima de max_rows, a mesma amostra de linhas vale para todas as colunas"""
+        linhas = np.arange(1000, dtype=float)
+        features = np.column_stack([linhas, linhas * 2])
+        path = tmp_path / 'drift_reference.npz'
+        save_reference_data(str(path), features, ['a', 'b'], predictions=linhas / 10, max_rows=100)
+        
+        reference = load_reference_data(str(path))
+        
+        assert len(reference['a']) == 100
+        assert len(np.unique(reference['a'])) == 100
+        np.testing.assert_array_equal(reference['b'], reference['a'] * 2)
+        np.testing.assert_array_equal(reference['prediction_value'], reference['a'] / 10)
+        
+    def test_sem_predicoes(self, tmp_path):
+        path = tmp_path / 'drift_reference.npz'
+        save_reference_data(str(path), np.ones((5, 2)), ['a', 'b'])
+        
+        assert list(load_reference_data(str(path))) == ['a', 'b']
+        
+    def test_colunas_inconsistentes(self, tmp_path):
+        with pytest.raises(ValueError):
+            save_reference_data(str(tmp_path / 'ref.npz'), np.ones((5, 2)), ['a', 'b', 'c'])
+        with pytest.raises(ValueError):
+            save_reference_data(str(tmp_path / 'ref.npz'), np.ones((5, 2)), ['a', 'b'], predictions=[1.0])
+            
+    def test_caminho_compartilhado_por_treino_e_api(self, monkeypatch):
+        """A referência fica ao lado do modelo servido, salvo DRIFT_REFERENCE_PATH"""
+        from src.core.config import Config
+        monkeypatch.delenv('DRIFT_REFERENCE_PATH', raising=False)
+        monkeypatch.delenv('MODEL_PATH', raising=False)
+        config = Config()
+        
+        assert config.model.drift_reference_path == str(config.base_dir / 'artifacts' / 'drift_reference.npz')
+        
+        monkeypatch.setenv('MODEL_PATH', '/modelos/model.ubj')
+        assert Config().model.drift_reference_path == '/modelos/drift_reference.npz'
+        monkeypatch.setenv('DRIFT_REFERENCE_PATH', '/referencias/ref.npz')
+        assert Config().model.drift_reference_path == '/referencias/ref.npz'
+        
+    def test_inicializa_o_monitor(self, tmp_path):
+        """A referência carregada alimenta os testes KS e os histogramas do monitor"""
+        rng = np.random.default_rng(0)
+        path = tmp_path / 'drift_reference.npz'
+        save_reference_data(str(path), rng.normal(size=(500, 2)), ['a', 'b'], predictions=rng.random(500))
+        monitor = DriftMonitor()
+        assert monitor.get_drift_summary()['reference_loaded'] is False
+        
+        monitor.initialize_reference_data(load_reference_data(str(path)))
+        
+        assert monitor.get_drift_summary()['reference_loaded'] is True
+        assert set(monitor.data_drift_detector.reference_data) == {'a', 'b', 'prediction_value'}
+        assert set(monitor.sketch_drift_detector.reference_counts) == {'a', 'b', 'prediction_value'}
+
+
+@pytest.mark.skipif(not DRIFT_MODULE_AVAILABLE, reason="Drift detection module not available")
+class TestSharedSketchCounts:
+    """Testes para as contagens dos histogramas compartilhadas entre workers"""
+    
+    @staticmethod
+    def _reference():
+        return {'feature1': np.random.default_rng(20).normal(0, 1, 2000)}
+        
+    def test_publica_e_coleta(self, tmp_path):
+        shared = SharedSketchCounts(str(tmp_path))
+        detector = SketchDriftDetector()
+        detector.set_reference_data(self._reference())
+        detector.update({'feature1': np.zeros(40)})
+        
+        shared.publish(detector.export_counts())
+        
+        assert shared.collect() == [detector.export_counts()]
+        shared.remove(os.getpid())
+        assert shared.collect() == []
+        
+    def test_checagem_soma_os_workers(self, tmp_path):
+        """O check de um worker usa as contagens publicadas por todos"""
+        config = {'sketch_drift': {'shared_dir': str(tmp_path)}}
+        monitor, outro_worker = DriftMonitor(config=config), SketchDriftDetector()
+        monitor.initialize_reference_data(self._reference())
+        outro_worker.set_reference_data(self._reference())
+        monitor.record_batch([{'feature1': value} for value in np.zeros(40)])
+        outro_worker.update({'feature1': np.ones(60)})
+        with open(monitor.shared_sketch_counts.path(os.getpid() + 1), 'w') as f:
+            json.dump(outro_worker.export_counts(), f)
+            
+        result = monitor.check_sketch_drift()
+        
+        assert result['workers'] == 2
+        assert result['feature_results']['feature1']['sample_size'] == 100
+        
+    def test_referencia_diferente_usa_contagens_locais(self, tmp_path):
+        config = {'sketch_drift': {'shared_dir': str(tmp_path)}}
+        monitor, outro_worker = DriftMonitor(config=config), SketchDriftDetector()
+        monitor.initialize_reference_data(self._reference())
+        outro_worker.set_reference_data({'feature1': np.arange(100.0)})
+        monitor.record_batch([{'feature1': value} for value in np.zeros(40)])
+        outro_worker.update({'feature1': np.ones(60)})
+        with open(monitor.shared_sketch_counts.path(os.getpid() + 1), 'w') as f:
+            json.dump(outro_worker.export_counts(), f)
+            
+        result = monitor.check_sketch_drift()
+        
+        assert result['workers'] == 1
+        assert result['feature_results']['feature1']['sample_size'] == 40
+
+
+@pytest.mark.skipif(not DRIFT_MODULE_AVAILABLE, reason="Drift detection module not available")
+class TestAlertHistory:
+    """Testes para o histórico limitado de alertas de data drift"""
+    
+    def test_resumo_conta_todos_os_alertas(self):
+        """O resumo informa o total de alertas, não só os guardados"""
+        monitor = DriftMonitor(config={'data_drift': {'max_alerts': 2}, 'sketch_drift': {'enabled': False}})
+        rng = np.random.default_rng(0)
+        monitor.initialize_reference_data({'feature1': rng.normal(0, 1, 1000)})
+        
+        for _ in range(3):
+            monitor.data_drift_detector.detect_drift({'feature1': rng.normal(3, 1, 100)})
+        summary = monitor.get_drift_summary()
+        
+        assert summary['data_drift_alerts'] == 3
+        assert len(summary['last_data_drift_alerts']) == 2
+
+
+@pytest.mark.skipif(not DRIFT_MODULE_AVAILABLE, reason="Drift detection module not available")
+class TestDriftMonitorSchedule:
+    """Testes para a detecção agendada sobre as janelas acumuladas"""
+    
+    @staticmethod
+    def _monitor(check_every=20, min_samples=10, window=50):
+        monitor = DriftMonitor(config={
+            'data_drift': {'detection_window_size': window},
+            'schedule': {'check_every': check_every, 'min_samples': min_samples}
+        })
+        rng = np.random.default_rng(0)
+        monitor.initialize_reference_data({'feature1': rng.normal(0, 1, 500)})
+        return monitor
+        
+    def test_ks_apenas_quando_agendado(self):
+        """O teste KS roda a cada `check_every` predições, não em toda predição"""
+        monitor = self._monitor(check_every=20)
+        
+        with patch.object(monitor.data_drift_detector, 'detect_drift',
+                          wraps=monitor.data_drift_detector.detect_drift) as detect:
+            resultados = [monitor.monitor_prediction({'feature1': float(v)}) for v in np.zeros(60)]
+            
+        assert detect.call_count == 3
+        com_drift = [i for i, r in enumerate(resultados) if r['data_drift'] is not None]
+        assert com_drift == [19, 39, 59]
+        
+    def test_janela_minima(self):
+        """Features com menos de `min_samples` valores não são testadas"""
+        monitor = self._monitor(check_every=5, min_samples=10)
+        
+        for _ in range(5):
+            result = monitor.monitor_prediction({'feature1': 0.1})
+            
+        assert result['data_drift'] is None
+        assert monitor.last_data_drift is None
+        
+    def test_drift_na_janela(self):
+        """Drift detectado sobre a janela e resultado guardado para /drift/status"""
+        monitor = self._monitor(check_every=50, min_samples=10, window=50)
+        rng = np.random.default_rng(1)
+        
+        for value in rng.normal(5, 1, 50):
+            result = monitor.monitor_prediction({'feature1': value})
+            
+        assert result['data_drift']['drift_detected']
+        assert result['data_drift']['window_sizes'] == {'feature1': 50}
+        status = monitor.get_drift_summary()['last_data_drift_check']
+        assert status['drift_detected'] is True
+        assert status['feature_results']['feature1']['window_size'] == 50
+        json.dumps(status)
+        
+    def test_intervalo_de_tempo(self):
+        """Com `check_interval_seconds`, a checagem roda quando o intervalo passa"""
+        monitor = DriftMonitor(config={'schedule': {'check_every': None, 'check_interval_seconds': 30,
+                                                    'min_samples': 1}})
+        monitor.initialize_reference_data({'feature1': np.random.normal(0, 1, 100)})
+        
+        with patch('src.monitoring.drift_detection.time.monotonic', return_value=monitor._last_check_time + 10):
+            assert monitor.monitor_prediction({'feature1': 0.0})['data_drift'] is None
+        with patch('src.monitoring.drift_detection.time.monotonic', return_value=monitor._last_check_time + 31):
+            assert monitor.monitor_prediction({'feature1': 0.0})['data_drift'] is not None
+            
+    def test_lote_igual_a_predicoes_individuais(self):
+        """monitor_batch deixa as janelas e a agenda iguais às de várias monitor_prediction"""
+        valores = np.random.default_rng(2).normal(0, 1, (45, 2))
+        individual, em_lote = self._monitor(check_every=20), self._monitor(check_every=20)
+        for a, b in valores:
+            individual.monitor_prediction({'feature1': a, 'feature2': b})
+        result = em_lote.monitor_batch([{'features': {'feature1': a, 'feature2': b}} for a, b in valores])
+        
+        for feature in ('feature1', 'feature2'):
+            np.testing.assert_array_equal(em_lote.feature_windows[feature].values(),
+                                          individual.feature_windows[feature].values())
+        assert result['records'] == 45
+        assert result['data_drift'] is not None
+        assert em_lote._samples_since_check == 0
+        
+    def test_valores_invalidos_ignorados(self):
+        """NaN e valores não numéricos não entram nas janelas"""
+        monitor = self._monitor()
+        monitor.record_features({'feature1': float('nan'), 'texto': 'abc', 'lista': [1.0, np.nan, 2.0]})
+        
+        assert len(monitor.feature_windows['lista']) == 2
+        assert 'texto' not in monitor.feature_windows
+        assert len(monitor.feature_windows.get('feature1', [])) == 0
+
+
 @pytest.mark.skipif(not DRIFT_MODULE_AVAILABLE, reason="Drift detection module not available")
 class TestDriftAlert:
     """Testes para DriftAlert"""
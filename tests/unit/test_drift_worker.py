@@ -0,0 +1,114 @@
+import pytest
+import threading
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.monitoring.drift_detection import DriftMonitor
+from src.services.drift_worker import DriftWorker
+
+
+class RecordingMonitor:
+    """Monitor falso: registra os lotes e pode segurar o processamento até `release`."""
+
+    def __init__(self, blocked=False):
+        self.batches = []
+        self.release = threading.Event()
+        if not blocked:
+            self.release.set()
+        self.started = threading.Event()
+
+    def monitor_batch(self, records):
+        self.started.set()
+        self.release.wait(timeout=5)
+        self.batches.append(records)
+        return {'records': len(records)}
+
+
+@pytest.mark.unit
+class TestDriftWorker:
+    """Testes para o consumidor de drift em segundo plano"""
+
+    def test_registros_processados_em_lote(self):
+        monitor = RecordingMonitor()
+        worker = DriftWorker(monitor, max_batch_size=64, max_wait_ms=50)
+
+        for i in range(100):
+            assert worker.submit({'features': {'f': float(i)}})
+
+        assert worker.flush(timeout=5)
+        processados = [record['features']['f'] for batch in monitor.batches for record in batch]
+        assert processados == [float(i) for i in range(100)]
+        assert len(monitor.batches) < 100
+        assert max(len(batch) for batch in monitor.batches) <= 64
+        assert worker.processed == 100
+
+    def test_descarta_com_fila_cheia(self):
+        """Com a fila cheia o registro novo é descartado sem bloquear a requisição"""
+        monitor = RecordingMonitor(blocked=True)
+        worker = DriftWorker(monitor, max_queue_size=5, max_batch_size=1, max_wait_ms=0)
+
+        worker.submit({'features': {'f': 0.0}})
+        assert monitor.started.wait(timeout=5)  # primeiro registro em processamento, fila vazia
+        aceitos = [worker.submit({'features': {'f': float(i)}}) for i in range(1, 9)]
+
+        assert aceitos == [True] * 5 + [False] * 3
+        assert worker.dropped == 3
+        assert worker.queue_depth == 5
+
+        monitor.release.set()
+        assert worker.flush(timeout=5)
+        assert worker.processed == 6
+
+    def test_listener_recebe_lote_e_atraso(self):
+        monitor = RecordingMonitor()
+        worker = DriftWorker(monitor, max_wait_ms=10)
+        chamadas = []
+        worker.listener = lambda results, batch_size, lag: chamadas.append((results, batch_size, lag))
+
+        worker.submit({'features': {'f': 1.0}})
+        assert worker.flush(timeout=5)
+
+        results, batch_size, lag = chamadas[0]
+        assert results == {'records': 1}
+        assert batch_size == 1
+        assert lag >= 0
+
+    def test_erro_no_monitor_nao_derruba_o_worker(self):
+        class FailingMonitor(RecordingMonitor):
+            def monitor_batch(self, records):
+                if not self.batches:
+                    self.batches.append(None)
+                    raise RuntimeError('falha')
+                return super().monitor_batch(records)
+
+        monitor = FailingMonitor()
+        worker = DriftWorker(monitor, max_wait_ms=0)
+
+        worker.submit({'features': {'f': 1.0}})
+        assert worker.flush(timeout=5)
+        worker.submit({'features': {'f': 2.0}})
+        assert worker.flush(timeout=5)
+
+        assert monitor.batches[-1] == [{'features': {'f': 2.0}}]
+
+    def test_com_drift_monitor(self):
+        """Os lotes chegam às janelas do DriftMonitor e disparam a checagem agendada"""
+        monitor = DriftMonitor(config={'schedule': {'check_every': 50, 'min_samples': 10}})
+        monitor.initialize_reference_data({'f': np.random.normal(0, 1, 500)})
+        worker = DriftWorker(monitor, max_wait_ms=20)
+
+        for value in np.random.normal(4, 1, 50):
+            worker.submit({'features': {'f': float(value)}, 'y_pred': 1, 'y_pred_proba': 0.9})
+        assert worker.flush(timeout=5)
+
+        assert len(monitor.feature_windows['f']) == 50
+        assert monitor.last_data_drift['drift_detected']
+
+    @pytest.mark.parametrize('kwargs', [{'max_queue_size': 0}, {'max_batch_size': 0}, {'max_wait_ms': -1}])
+    def test_parametros_invalidos(self, kwargs):
+        with pytest.raises(ValueError):
+            DriftWorker(RecordingMonitor(), **kwargs)
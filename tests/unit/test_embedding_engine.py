@@ -0,0 +1,86 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+from gensim.models import KeyedVectors
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models import utils
+from src.models.embedding_engine import EmbeddingEngine
+
+
+@pytest.fixture(scope='module')
+def w2v():
+    """Word2Vec pequeno em float32, como o modelo carregado em produção."""
+    rng = np.random.default_rng(7)
+    words = [f'palavra{i}' for i in range(200)] + ['python', 'dados', 'analista']
+    kv = KeyedVectors(16)
+    kv.add_vectors(words, rng.normal(size=(len(words), 16)).astype(np.float32))
+    return kv
+
+
+@pytest.fixture(scope='module')
+def textos(w2v):
+    rng = np.random.default_rng(3)
+    vocab = list(w2v.key_to_index) + ['desconhecida', 'outra']
+    textos = [' '.join(rng.choice(vocab, size)) for size in rng.integers(1, 80, 60)]
+    return textos + ['', '   ', None, np.nan, 'desconhecida outra', 'python dados', 'python dados']
+
+
+@pytest.mark.unit
+class TestEmbeddingEngine:
+    """Testes para o cálculo de vetores de documento em lote."""
+
+    def test_igual_ao_document_vector(self, w2v, textos):
+        engine = EmbeddingEngine(w2v)
+
+        matriz = engine.embed(textos)
+
+        esperado = np.vstack([utils.document_vector(texto, w2v, 16) for texto in textos])
+        assert matriz.dtype == np.float32
+        assert matriz.shape == (len(textos), 16)
+        np.testing.assert_array_equal(matriz, esperado.astype(np.float32))
+
+    def test_textos_sem_tokens_geram_zeros(self, w2v):
+        matriz = EmbeddingEngine(w2v).embed(['', None, 'desconhecida'])
+
+        assert not matriz.any()
+
+    def test_lote_vazio(self, w2v):
+        assert EmbeddingEngine(w2v).embed([]).shape == (0, 16)
+
+    def test_embed_one(self, w2v):
+        engine = EmbeddingEngine(w2v)
+
+        np.testing.assert_array_equal(engine.embed_one('analista python'),
+                                      utils.document_vector('analista python', w2v, 16))
+
+    def test_tokeniza_cada_texto_distinto_uma_vez(self, w2v):
+        engine = EmbeddingEngine(w2v)
+
+        engine.embed(['python dados'] * 10 + ['analista'])
+        engine.embed(['python dados'])
+
+        info = engine.token_ids.cache_info()
+        assert info.misses == 2
+        assert info.hits == 1
+
+    def test_token_ids_int32(self, w2v):
+        ids = EmbeddingEngine(w2v).token_ids('python desconhecida dados')
+
+        assert ids.dtype == np.int32
+        assert ids.tolist() == [w2v.key_to_index['python'], w2v.key_to_index['dados']]
+
+    def test_expand_igual_ao_expand_vector(self, w2v, textos):
+        df_engine = pd.DataFrame({'a': textos, 'b': textos[::-1], 'outra': 1})
+        df_utils = df_engine.copy()
+
+        resultado = EmbeddingEngine(w2v).expand(df_engine, ['a', 'b'])
+        esperado = utils.expand_vector(df_utils, ['a', 'b'], w2v, 16)
+
+        assert list(resultado.columns) == list(esperado.columns)
+        np.testing.assert_array_equal(resultado.to_numpy(), esperado.to_numpy(dtype=np.float32))
+        assert list(df_engine.columns) == list(df_utils.columns) == ['outra']
@@ -0,0 +1,55 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.features.feature_plan import (
+    SIMILARITY_FEATURES,
+    TEXT_EMBEDDING_COLUMNS,
+    build_feature_plan
+)
+
+MODEL_FEATURES = ['ingles', 'espanhol', 'outro_idioma_sim', 'cargo_sim',
+                  'area_atuacao_sim', 'certificacoes_sim',
+                  'outras_certificacoes_sim', 'gap_senioridade',
+                  'possui_senioridade_minima', 'possui_nivel_academico_minimo',
+                  'compatibilidade_pcd', 'conhecimentos_tecnicos_sim',
+                  'atividades_sim', 'competencias_sim', 'objetivo_sim']
+
+
+@pytest.mark.unit
+class TestFeaturePlan:
+    """Testes para o plano de features derivado do modelo."""
+
+    def test_plano_do_modelo_atual(self):
+        plan = build_feature_plan(MODEL_FEATURES)
+
+        # exp_sim não é consumida pelo modelo
+        assert 'exp_sim' not in plan.similarity_features
+        assert len(plan.similarity_features) == 9
+        # 'nivel profissional_vaga' nunca entra em uma similaridade
+        assert 'nivel profissional_vaga' not in plan.embedding_columns
+        assert len(plan.embedding_columns) == 13
+
+    def test_colunas_respeitam_ordem_e_lado(self):
+        plan = build_feature_plan(MODEL_FEATURES)
+
+        assert plan.embedding_columns == [
+            col for col in TEXT_EMBEDDING_COLUMNS if col in plan.embedding_columns
+        ]
+        assert all(col.endswith('_cand') for col in plan.candidate_columns)
+        assert all(col.endswith('_vaga') for col in plan.vacancy_columns)
+        assert len(plan.candidate_columns) + len(plan.vacancy_columns) == len(plan.embedding_columns)
+
+    def test_apenas_vetores_necessarios(self):
+        plan = build_feature_plan(['ingles', 'atividades_sim'])
+
+        assert plan.similarity_features == {'atividades_sim': SIMILARITY_FEATURES['atividades_sim']}
+        assert plan.embedding_columns == ['cv_pt_cand', 'principais_atividades_vaga']
+
+    def test_sem_similaridades(self):
+        plan = build_feature_plan([])
+
+        assert plan.similarity_features == {}
+        assert plan.embedding_columns == []
@@ -0,0 +1,136 @@
+import pytest
+import numpy as np
+import pandas as pd
+import yaml
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models import hyperparameter_search
+from src.models.hyperparameter_search import (
+    best_params,
+    load_features,
+    rung_budgets,
+    sample_candidates,
+    split_train_validation,
+    successive_halving,
+    write_versioned_config
+)
+from src.models.stage_cache import StageCache
+
+
+SPACE = {'max_depth': [2, 3, 4], 'learning_rate': [0.05, 0.1, 0.3]}
+
+
+@pytest.fixture(scope='module')
+def data():
+    """Matriz de features pequena no formato da etapa `features` do treino."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 4)), columns=['a', 'b', 'c', 'd'], index=np.arange(300) * 3)
+    y = pd.Series(0.5 * X['a'] - 0.2 * X['b'] + rng.normal(scale=0.1, size=300), index=X.index)
+    weights = pd.Series(1.0, index=X.index)
+    return split_train_validation(X, y, weights)
+
+
+@pytest.mark.unit
+class TestSearchBuildingBlocks:
+    """Testes para os componentes da busca de hiperparâmetros."""
+
+    def test_rung_budgets(self):
+        assert rung_budgets(50, 1350, 3) == [50, 150, 450, 1350]
+        assert rung_budgets(50, 1000, 3) == [50, 150, 450]
+        assert rung_budgets(10, 10, 2) == [10]
+
+    @pytest.mark.parametrize('args', [(0, 10, 3), (20, 10, 3), (10, 100, 1)])
+    def test_rung_budgets_invalido(self, args):
+        with pytest.raises(ValueError):
+            rung_budgets(*args)
+
+    def test_sample_candidates_distintos_e_reprodutiveis(self):
+        candidates = sample_candidates(SPACE, 5, random_state=1)
+
+        assert len({tuple(sorted(c.items())) for c in candidates}) == 5
+        assert candidates == sample_candidates(SPACE, 5, random_state=1)
+
+    def test_split_mantem_teste_do_train(self, data):
+        assert len(data['X_test']) == 60
+        assert len(data['X_fit']) + len(data['X_val']) == len(data['X_train']) == 240
+        assert data['w_fit'].index.equals(data['X_fit'].index)
+
+    def test_write_versioned_config_incrementa_versao(self, tmp_path):
+        config = {'model_params': {'xgbregressor': {'max_depth': 9}}, 'feature_list': ['a']}
+
+        first = write_versioned_config(config, {'max_depth': 3}, tmp_path, {'val_rmse': 0.1})
+        second = write_versioned_config(config, {'max_depth': 4}, tmp_path, {'val_rmse': 0.2})
+
+        assert [first.name, second.name] == ['config_v001.yaml', 'config_v002.yaml']
+        assert first.read_text(encoding='utf-8').startswith('# val_rmse: 0.1\n')
+        loaded = yaml.safe_load(second.read_text(encoding='utf-8'))
+        assert loaded == {'model_params': {'xgbregressor': {'max_depth': 4}}, 'feature_list': ['a']}
+        assert config['model_params']['xgbregressor'] == {'max_depth': 9}
+
+    def test_load_features_usa_chave_do_treino(self, tmp_path, monkeypatch):
+        # a entrada mais recente do cache é de outros dados/código: não pode ser usada
+        cache = StageCache(tmp_path)
+        cache.save('features', 'atual', {'X': np.zeros(1)})
+        cache.save('features', 'outra', {'X': np.ones(1)})
+        monkeypatch.setattr(hyperparameter_search, 'stage_keys',
+                            lambda cache, feature_list: {'features': 'atual'})
+
+        features, key = load_features(tmp_path, ['a'])
+
+        assert key == 'atual'
+        np.testing.assert_array_equal(features['X'], np.zeros(1))
+
+    def test_load_features_sem_entrada_da_chave(self, tmp_path, monkeypatch):
+        StageCache(tmp_path).save('features', 'outra', {'X': np.ones(1)})
+        monkeypatch.setattr(hyperparameter_search, 'stage_keys',
+                            lambda cache, feature_list: {'features': 'atual'})
+
+        with pytest.raises(SystemExit, match='train.py'):
+            load_features(tmp_path, ['a'])
+
+
+@pytest.mark.unit
+class TestSuccessiveHalving:
+    """Testes para a avaliação dos candidatos por successive halving."""
+
+    def test_poda_por_rodada(self, data):
+        candidates = sample_candidates(SPACE, 9, random_state=0)
+
+        results = successive_halving(data, candidates, min_n_estimators=5, max_n_estimators=45,
+                                     eta=3, early_stopping_rounds=5, n_workers=1)
+
+        assert results.groupby('rung')['candidate'].count().tolist() == [9, 3, 1]
+        assert results.groupby('rung')['n_estimators'].first().tolist() == [5, 15, 45]
+        # os sobreviventes de cada rodada são os melhores da anterior
+        primeira = results[results['rung'] == 0].sort_values('val_rmse')
+        assert set(results[results['rung'] == 1]['candidate']) == set(primeira['candidate'][:3])
+
+    def test_pool_de_processos_igual_ao_sequencial(self, data):
+        candidates = sample_candidates(SPACE, 4, random_state=2)
+        kwargs = dict(min_n_estimators=5, max_n_estimators=20, eta=2, early_stopping_rounds=5)
+
+        sequencial = successive_halving(data, candidates, n_workers=1, **kwargs)
+        paralelo = successive_halving(data, candidates, n_workers=2, threads_per_worker=1, **kwargs)
+
+        columns = ['candidate', 'rung', 'best_iteration', 'val_rmse']
+        pd.testing.assert_frame_equal(paralelo[columns], sequencial[columns])
+
+    def test_best_params_usa_melhor_iteracao(self, data):
+        candidates = sample_candidates(SPACE, 3, random_state=0)
+        results = successive_halving(data, candidates, base_params={'subsample': 0.8, 'n_estimators': 400},
+                                     min_n_estimators=10, max_n_estimators=30, eta=3,
+                                     early_stopping_rounds=5, n_workers=1)
+
+        params = best_params(results, candidates, {'subsample': 0.8, 'n_estimators': 400})
+
+        last = results[results['rung'] == results['rung'].max()].iloc[0]
+        assert params['n_estimators'] == last['best_iteration'] + 1
+        assert params['subsample'] == 0.8
+        assert params['max_depth'] == candidates[int(last['candidate'])]['max_depth']
+
+    def test_sem_candidatos(self, data):
+        with pytest.raises(ValueError):
+            successive_halving(data, [])
@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.matching import build_side, iter_blocks, unit_rows
+
+
+@pytest.mark.unit
+class TestMatching:
+    """Testes para os utilitários do modo matriz."""
+
+    @pytest.mark.parametrize('n_rows, n_cols, chunk_size', [
+        (7, 3, 4), (3, 10, 4), (5, 5, 100), (1, 1, 1), (10, 1, 3)
+    ])
+    def test_blocos_cobrem_a_grade(self, n_rows, n_cols, chunk_size):
+        grade = np.zeros((n_rows, n_cols), dtype=int)
+
+        for rows, cols in iter_blocks(n_rows, n_cols, chunk_size):
+            assert (rows.stop - rows.start) * (cols.stop - cols.start) <= chunk_size
+            grade[rows, cols] += 1
+
+        assert (grade == 1).all()
+
+    def test_grade_vazia(self):
+        assert list(iter_blocks(0, 5, 10)) == []
+        assert list(iter_blocks(5, 0, 10)) == []
+
+    def test_unit_rows_preserva_linhas_nulas(self):
+        matrix = np.array([[3.0, 4.0], [0.0, 0.0]], dtype=np.float32)
+
+        result = unit_rows(matrix)
+
+        np.testing.assert_allclose(result, [[0.6, 0.8], [0.0, 0.0]])
+        assert result.dtype == np.float32
+
+    def test_build_side(self):
+        blocks = [
+            {'features': {'pcd_cand': 1}, 'vectors': {'cv_pt_cand': np.array([1.0, 0.0])}},
+            {'features': {'pcd_cand': 0}, 'vectors': {'cv_pt_cand': np.zeros(2)}},
+        ]
+
+        side = build_side(['a', 'b'], blocks, np.float32)
+
+        assert len(side) == 2
+        np.testing.assert_array_equal(side.features['pcd_cand'], [1, 0])
+        assert side.unit_vectors['cv_pt_cand'].shape == (2, 2)
+        assert side.unit_vectors['cv_pt_cand'].dtype == np.float32
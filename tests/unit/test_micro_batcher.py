@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+import threading
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.services.micro_batcher import MicroBatcher
+
+
+class RecordingModel:
+    """Modelo falso: score = soma da linha; registra o tamanho de cada lote."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, matrix):
+        self.batch_sizes.append(len(matrix))
+        return matrix.sum(axis=1)
+
+
+def run_concurrently(batcher, n_requests):
+    barrier = threading.Barrier(n_requests)
+    results = [None] * n_requests
+
+    def request(i):
+        barrier.wait()
+        results[i] = batcher.predict(np.array([[i, 1.0]]), timeout=5)
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(n_requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.unit
+class TestMicroBatcher:
+    """Testes para o micro-batching de inferência."""
+
+    def test_requisicoes_concorrentes_sao_agrupadas(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict, max_batch_size=64, max_wait_ms=200)
+
+        results = run_concurrently(batcher, 16)
+
+        assert results == [i + 1.0 for i in range(16)]
+        assert sum(model.batch_sizes) == 16
+        assert len(model.batch_sizes) < 16
+
+    def test_respeita_tamanho_maximo(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict, max_batch_size=4, max_wait_ms=200)
+
+        run_concurrently(batcher, 12)
+
+        assert max(model.batch_sizes) <= 4
+        assert sum(model.batch_sizes) == 12
+
+    def test_erro_do_modelo_chega_a_cada_requisicao(self):
+        def falha(matrix):
+            raise RuntimeError('modelo indisponível')
+
+        batcher = MicroBatcher(falha, max_wait_ms=0)
+
+        with pytest.raises(RuntimeError, match='indisponível'):
+            batcher.predict(np.ones((1, 3)), timeout=5)
+
+    def test_listener_recebe_tamanho_do_lote(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict, max_wait_ms=0)
+        lotes = []
+        batcher.listener = lambda batch_size, queue_depth: lotes.append((batch_size, queue_depth))
+
+        assert batcher.predict(np.array([[2.0, 3.0]]), timeout=5) == 5.0
+        assert lotes == [(1, 0)]
+
+    @pytest.mark.parametrize('max_batch_size, max_wait_ms', [(0, 1), (8, -1)])
+    def test_parametros_invalidos(self, max_batch_size, max_wait_ms):
+        with pytest.raises(ValueError):
+            MicroBatcher(RecordingModel().predict, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
@@ -0,0 +1,76 @@
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+from xgboost import XGBRegressor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.native_model import NativePredictor, export_booster, metadata_path
+
+
+FEATURES = ['ingles', 'cargo_sim', 'gap_senioridade', 'compatibilidade_pcd']
+
+
+@pytest.fixture(scope='module')
+def dados():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, len(FEATURES))), columns=FEATURES)
+    X.iloc[::9, 1] = np.nan
+    y = 0.3 * X['ingles'] - 0.1 * X['gap_senioridade'] + rng.normal(scale=0.05, size=400)
+    return X, y
+
+
+@pytest.fixture(scope='module')
+def model(dados):
+    X, y = dados
+    return XGBRegressor(n_estimators=30, max_depth=4).fit(X, y)
+
+
+@pytest.mark.unit
+class TestNativePredictor:
+    """Testes para a exportação do booster e a predição com inplace_predict."""
+
+    def test_mesmos_scores_do_xgbregressor(self, model, dados):
+        X, _ = dados
+
+        scores = NativePredictor.from_model(model).predict(X.to_numpy())
+
+        assert scores.dtype == np.float32
+        np.testing.assert_array_equal(scores, model.predict(X))
+
+    def test_exporta_e_carrega_ubj(self, model, dados, tmp_path):
+        X, _ = dados
+
+        path = export_booster(model, tmp_path / 'model.joblib', FEATURES)
+        predictor = NativePredictor.load(path)
+
+        assert path.name == 'model.ubj'
+        assert json.loads(metadata_path(path).read_text(encoding='utf-8'))['feature_names'] == FEATURES
+        assert predictor.feature_names == FEATURES
+        np.testing.assert_array_equal(predictor.predict(X.to_numpy()), model.predict(X))
+
+    def test_linha_unica(self, model, dados):
+        X, _ = dados
+        predictor = NativePredictor.from_model(model)
+
+        assert predictor.predict(X.iloc[0].tolist()).shape == (1,)
+        assert predictor.predict(X.iloc[0].tolist())[0] == model.predict(X.iloc[[0]])[0]
+
+    def test_respeita_melhor_iteracao_do_early_stopping(self, dados, tmp_path):
+        X, y = dados
+        model = XGBRegressor(n_estimators=300, learning_rate=0.3, early_stopping_rounds=3)
+        model.fit(X[:300], y[:300], eval_set=[(X[300:], y[300:])], verbose=False)
+        assert model.best_iteration + 1 < model.get_booster().num_boosted_rounds()
+
+        predictor = NativePredictor.load(export_booster(model, tmp_path / 'model.ubj'))
+
+        assert predictor.iteration_range == (0, model.best_iteration + 1)
+        np.testing.assert_array_equal(predictor.predict(X.to_numpy()), model.predict(X))
+
+    def test_numero_de_features_invalido(self, model):
+        with pytest.raises(ValueError):
+            NativePredictor.from_model(model).predict(np.zeros((2, len(FEATURES) + 1)))
@@ -127,4 +127,83 @@ class TestPredictionPipeline:
             pipeline.predict(candidate_data, vacancy_data)
 
             # Verifica se _prepare_data foi chamado
-            mock_prepare_data.assert_called_once_with(candidate_data, vacancy_data)
\ No newline at end of file
+            mock_prepare_data.assert_called_once_with(candidate_data, vacancy_data)
+
+@pytest.mark.unit
+class TestPredictionExplain:
+    """Testes para o explainer SHAP em cache e os modos de explicação."""
+
+    @pytest.fixture
+    def pipeline_with_explainer(self):
+        mock_model = MagicMock()
+        mock_model.predict.return_value = np.array([0.7])
+        mock_explainer = MagicMock()
+        mock_explainer.shap_values.return_value = np.array([[0.05, -0.4, 0.2]])
+        mock_explainer.expected_value = 0.5
+
+        with patch('shap.TreeExplainer', return_value=mock_explainer) as mock_tree_explainer, \
+             patch('gensim.models.KeyedVectors.load_word2vec_format', return_value=MagicMock()), \
+             patch('src.models.predict.joblib.load', side_effect=[mock_model, {}]):
+            pipeline = PredictionPipeline(
+                model_path='mock/path/model.joblib',
+                artifacts_path='mock/path/artifacts.joblib',
+                w2v_model_path='mock/path/word2vec.bin'
+            )
+
+        processed_df = pd.DataFrame([[1.0, 2.0, 3.0]], columns=['f1', 'f2', 'f3'])
+        pipeline._prepare_data = MagicMock(return_value=processed_df)
+        return pipeline, mock_explainer, mock_tree_explainer
+
+    def test_explainer_built_once(self, pipeline_with_explainer):
+        pipeline, mock_explainer, mock_tree_explainer = pipeline_with_explainer
+
+        pipeline.predict({"c": {}}, {"v": {}})
+        pipeline.predict({"c": {}}, {"v": {}})
+
+        mock_tree_explainer.assert_called_once()
+        assert pipeline.explainer is mock_explainer
+        assert mock_explainer.shap_values.call_count == 2
+
+    @patch('shap.save_html')
+    @patch('shap.force_plot')
+    def test_predict_does_not_render_html(self, mock_force_plot, mock_save_html, pipeline_with_explainer):
+        pipeline, _, _ = pipeline_with_explainer
+
+        pipeline.predict({"c": {}}, {"v": {}})
+
+        mock_force_plot.assert_not_called()
+        mock_save_html.assert_not_called()
+
+    def test_explain_none_skips_shap(self, pipeline_with_explainer):
+        pipeline, mock_explainer, _ = pipeline_with_explainer
+
+        prediction, explanation = pipeline.predict({"c": {}}, {"v": {}}, explain='none')
+
+        assert prediction == 0.7
+        assert explanation is None
+        mock_explainer.shap_values.assert_not_called()
+
+    def test_explain_top_k(self, pipeline_with_explainer):
+        pipeline, _, _ = pipeline_with_explainer
+
+        _, explanation = pipeline.predict({"c": {}}, {"v": {}}, explain='top_k', top_k=2)
+
+        assert [item['feature'] for item in explanation] == ['f2', 'f3']
+        assert explanation[0] == {'feature': 'f2', 'value': 2.0, 'contribution': -0.4}
+
+    def test_explain_invalid_mode(self, pipeline_with_explainer):
+        pipeline, _, _ = pipeline_with_explainer
+
+        with pytest.raises(ValueError):
+            pipeline.predict({"c": {}}, {"v": {}}, explain='full')
+
+    @patch('shap.save_html')
+    @patch('shap.force_plot')
+    def test_save_explanation_html(self, mock_force_plot, mock_save_html, pipeline_with_explainer):
+        pipeline, _, _ = pipeline_with_explainer
+
+        output = pipeline.save_explanation_html({"c": {}}, {"v": {}}, output_path='plot.html')
+
+        assert output == 'plot.html'
+        mock_force_plot.assert_called_once()
+        mock_save_html.assert_called_once_with('plot.html', mock_force_plot.return_value)
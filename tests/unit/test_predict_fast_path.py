@@ -0,0 +1,325 @@
+import copy
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.models import utils
+from src.models.native_model import export_booster
+from src.models.tree_ensemble import TreeEnsemble
+from src.models.predict import PredictionPipeline
+from tests.fixtures.sample_data import (
+    SAMPLE_CANDIDATE_COMPLETE,
+    SAMPLE_CANDIDATE_INCOMPLETE,
+    SAMPLE_CANDIDATE_MINIMAL,
+    SAMPLE_VACANCY_COMPLETE,
+    SAMPLE_VACANCY_INCOMPLETE,
+    SAMPLE_VACANCY_MINIMAL
+)
+
+MODEL_PATH = os.path.join(project_root, 'artifacts', 'model.joblib')
+ARTIFACTS_PATH = os.path.join(project_root, 'artifacts', 'preprocessing_artifacts.joblib')
+
+PAIRS = [
+    (SAMPLE_CANDIDATE_COMPLETE, SAMPLE_VACANCY_COMPLETE),
+    (SAMPLE_CANDIDATE_INCOMPLETE, SAMPLE_VACANCY_INCOMPLETE),
+    (SAMPLE_CANDIDATE_MINIMAL, SAMPLE_VACANCY_MINIMAL),
+    (SAMPLE_CANDIDATE_COMPLETE, SAMPLE_VACANCY_MINIMAL),
+    # Payload enviado pelo app Streamlit (apenas textos livres)
+    ({"31001": {"cv_pt": "Desenvolvedor Python, SQL e análise de dados"}},
+     {"5186": {"infos_basicas": {"titulo_vaga": "Analista de Dados Python"}}}),
+    # Seções não-dict, flags e tipos de contratação múltiplos
+    ({"1": {"cargo_atual": "Gerente", "informacoes_pessoais": {"pcd": "Sim"},
+            "cv_pt": "gerente de projetos"}},
+     {"2": {"perfil_vaga": {"vaga_especifica_para_pcd": "Sim", "nivel profissional": "Gerente"},
+            "informacoes_basicas": {"vaga_sap": "Sim",
+                                    "tipo_contratacao": "PJ/Autônomo, CLT Full,  Hunting"}}}),
+    # Níveis desconhecidos pelos encoders
+    ({"1": {"formacao_e_idiomas": {"nivel_ingles": "Técnico", "nivel_academico": "NaN"}}},
+     {"2": {"perfil_vaga": {"nivel_ingles": "Nativo", "nivel_academico": "Mestrado Cursando"}}}),
+]
+
+
+def _textos(obj, acc):
+    if isinstance(obj, dict):
+        for value in obj.values():
+            _textos(value, acc)
+    elif isinstance(obj, str):
+        acc.append(obj)
+    return acc
+
+
+@pytest.fixture(scope='module')
+def pipeline(tmp_path_factory):
+    """Pipeline real (modelo e artefatos do repositório) com um Word2Vec pequeno."""
+    palavras = set()
+    for candidate, vacancy in PAIRS:
+        for texto in _textos(candidate, []) + _textos(vacancy, []):
+            palavras.update(utils.padroniza_valor(texto).split())
+    palavras = sorted(palavras)
+
+    rng = np.random.default_rng(0)
+    vetores = rng.normal(size=(len(palavras), 20)).astype(np.float32)
+    w2v_path = tmp_path_factory.mktemp('w2v') / 'modelo.txt'
+    with open(w2v_path, 'w', encoding='utf-8') as f:
+        f.write(f"{len(palavras)} 20\n")
+        for palavra, vetor in zip(palavras, vetores):
+            f.write(palavra + ' ' + ' '.join(f'{v:.6f}' for v in vetor) + '\n')
+
+    return PredictionPipeline(MODEL_PATH, ARTIFACTS_PATH, str(w2v_path), 'text')
+
+
+@pytest.mark.unit
+class TestFastPathParity:
+    """Paridade entre o caminho rápido e o `_prepare_data` com DataFrames."""
+
+    def test_fast_path_habilitado(self, pipeline):
+        assert pipeline.fast_path_enabled
+
+    @pytest.mark.parametrize('candidate, vacancy', PAIRS)
+    def test_mesmo_vetor_de_features(self, pipeline, candidate, vacancy):
+        esperado = pipeline._prepare_data(copy.deepcopy(candidate), copy.deepcopy(vacancy))
+        obtido = pipeline._fast_feature_row(candidate, vacancy)
+
+        assert obtido is not None
+        assert obtido.shape == (1, len(pipeline.model_features_order))
+        np.testing.assert_array_equal(obtido, esperado.to_numpy(dtype=float))
+
+    @pytest.mark.parametrize('candidate, vacancy', PAIRS)
+    def test_mesmo_score(self, pipeline, candidate, vacancy):
+        esperado = pipeline.model.predict(
+            pipeline._prepare_data(copy.deepcopy(candidate), copy.deepcopy(vacancy))
+        )[0]
+        score, _ = pipeline.predict(candidate, vacancy, explain='none')
+
+        assert score == esperado
+
+    def test_explicacao_no_caminho_rapido(self, pipeline):
+        _, top = pipeline.predict(SAMPLE_CANDIDATE_COMPLETE, SAMPLE_VACANCY_COMPLETE,
+                                  explain='top_k', top_k=3)
+
+        assert len(top) == 3
+        assert all(item['feature'] in pipeline.model_features_order for item in top)
+
+    def test_um_registro_por_par(self, pipeline):
+        """Seções e campos de topo do mesmo registro ficam na mesma linha."""
+        processed = pipeline._prepare_data(copy.deepcopy(SAMPLE_CANDIDATE_COMPLETE),
+                                           copy.deepcopy(SAMPLE_VACANCY_COMPLETE))
+
+        assert len(processed) == 1
+        # cv_pt (campo de topo) e principais_atividades (seção) contribuem juntos
+        assert processed['atividades_sim'].iloc[0] != 0
+
+    def test_booster_ubj_mesmos_scores(self, pipeline, tmp_path):
+        """Pipeline carregado do booster exportado em UBJSON pontua igual ao model.joblib."""
+        booster_path = export_booster(pipeline.model, tmp_path / 'model.ubj', pipeline.model_features_order)
+        w2v_path = tmp_path / 'modelo.txt'
+        pipeline.model_w2v.save_word2vec_format(str(w2v_path))
+        nativo = PredictionPipeline(str(booster_path), ARTIFACTS_PATH, str(w2v_path), 'text')
+
+        for candidate, vacancy in PAIRS:
+            esperado, _ = pipeline.predict(copy.deepcopy(candidate), copy.deepcopy(vacancy), explain='none')
+            score, _ = nativo.predict(copy.deepcopy(candidate), copy.deepcopy(vacancy), explain='none')
+            assert score == esperado
+
+    def test_backend_numpy_mesmos_scores(self, pipeline, tmp_path):
+        """Backend 'numpy' (árvores em arrays) pontua igual ao xgboost."""
+        trees = TreeEnsemble.from_booster(pipeline.model, pipeline.model_features_order)
+        trees_file = trees.save(tmp_path / 'model.trees.npz')
+        w2v_path = tmp_path / 'modelo.txt'
+        pipeline.model_w2v.save_word2vec_format(str(w2v_path))
+
+        for model_path in (MODEL_PATH, str(trees_file)):
+            numpy_pipeline = PredictionPipeline(model_path, ARTIFACTS_PATH, str(w2v_path), 'text', backend='numpy')
+            assert isinstance(numpy_pipeline.predictor, TreeEnsemble)
+            for candidate, vacancy in PAIRS:
+                esperado, _ = pipeline.predict(copy.deepcopy(candidate), copy.deepcopy(vacancy), explain='none')
+                score, _ = numpy_pipeline.predict(copy.deepcopy(candidate), copy.deepcopy(vacancy), explain='none')
+                assert score == esperado
+
+    def test_backend_invalido(self):
+        with pytest.raises(ValueError):
+            PredictionPipeline(MODEL_PATH, ARTIFACTS_PATH, 'modelo.txt', 'text', backend='onnx')
+
+    def test_booster_ubj_sem_xgboost(self, monkeypatch):
+        """Sem o xgboost, model.ubj falha com uma mensagem que aponta o backend 'numpy'."""
+        monkeypatch.setattr('src.models.predict.NativePredictor', None)
+        with pytest.raises(ImportError, match="backend='numpy'"):
+            PredictionPipeline('model.ubj', ARTIFACTS_PATH, 'modelo.txt', 'text')
+
+
+@pytest.mark.unit
+class TestFastPathFallback:
+    """Payloads fora do caminho rápido seguem pelo `_prepare_data`."""
+
+    @pytest.mark.parametrize('candidate, vacancy', [
+        # Mais de um registro
+        ({**SAMPLE_CANDIDATE_COMPLETE, **SAMPLE_CANDIDATE_INCOMPLETE}, SAMPLE_VACANCY_COMPLETE),
+        # Valor não textual
+        ({"1": {"informacoes_pessoais": {"pcd": None}}}, SAMPLE_VACANCY_COMPLETE),
+        # Mesmo campo em duas seções
+        ({"1": {"cv_pt": "texto", "infos_basicas": {"cv_pt": "outro"}}}, SAMPLE_VACANCY_COMPLETE),
+        # Registro vazio
+        (SAMPLE_CANDIDATE_COMPLETE, {"2": {}}),
+    ])
+    def test_payload_nao_suportado(self, pipeline, candidate, vacancy):
+        assert pipeline._fast_feature_row(candidate, vacancy) is None
+
+    def test_features_desconhecidas_desabilitam(self, pipeline):
+        fast_path_enabled = pipeline.fast_path_enabled
+        model_features_order = pipeline.model_features_order
+        try:
+            pipeline.model_features_order = model_features_order + ['tempo_exp_cand']
+            pipeline._init_fast_path()
+            assert not pipeline.fast_path_enabled
+        finally:
+            pipeline.model_features_order = model_features_order
+            pipeline._init_fast_path()
+
+        assert pipeline.fast_path_enabled == fast_path_enabled
+
+
+@pytest.mark.unit
+class TestPredictMany:
+    """Predição em lote: uma vaga contra vários candidatos."""
+
+    def test_mesmo_score_que_predicao_individual(self, pipeline):
+        candidates = {}
+        for i, (candidate, _) in enumerate(PAIRS):
+            candidates[f'c{i}'] = next(iter(candidate.values()))
+
+        scores = pipeline.predict_many(SAMPLE_VACANCY_COMPLETE, candidates)
+
+        esperado = [
+            pipeline.predict({cid: record}, SAMPLE_VACANCY_COMPLETE, explain='none')[0]
+            for cid, record in candidates.items()
+        ]
+        np.testing.assert_array_equal(scores, esperado)
+
+    def test_candidato_fora_do_caminho_rapido(self, pipeline):
+        candidates = {
+            'rapido': next(iter(SAMPLE_CANDIDATE_COMPLETE.values())),
+            'dataframe': {"informacoes_pessoais": {"pcd": None}, "cv_pt": "analista de dados"},
+        }
+
+        scores = pipeline.predict_many(SAMPLE_VACANCY_COMPLETE, candidates)
+
+        esperado = pipeline.model.predict(pipeline._prepare_data(
+            {'dataframe': candidates['dataframe']}, SAMPLE_VACANCY_COMPLETE
+        ))[0]
+        assert scores.shape == (2,)
+        assert scores[1] == esperado
+
+    def test_sem_candidatos(self, pipeline):
+        assert pipeline.predict_many(SAMPLE_VACANCY_COMPLETE, {}).shape == (0,)
+
+
+@pytest.mark.unit
+class TestScoreMatrix:
+    """Modo matriz: M candidatos x N vagas em blocos."""
+
+    @pytest.fixture
+    def pools(self):
+        candidates = {f'c{i}': next(iter(candidate.values())) for i, (candidate, _) in enumerate(PAIRS)}
+        vacancies = {f'v{i}': next(iter(vacancy.values())) for i, (_, vacancy) in enumerate(PAIRS)}
+        return candidates, vacancies
+
+    def test_todos_os_pares_em_blocos_limitados(self, pipeline, pools):
+        candidates, vacancies = pools
+
+        chunks = list(pipeline.score_matrix(candidates, vacancies, chunk_size=5))
+
+        assert all(len(chunk['scores']) <= 5 for chunk in chunks)
+        pares = [pair for chunk in chunks
+                 for pair in zip(chunk['candidate_ids'], chunk['vacancy_ids'])]
+        assert sorted(pares) == sorted((c, v) for c in candidates for v in vacancies)
+
+    def test_mesmo_score_que_predicao_individual(self, pipeline, pools):
+        candidates, vacancies = pools
+
+        for chunk in pipeline.score_matrix(candidates, vacancies, chunk_size=16):
+            for c, v, score in zip(chunk['candidate_ids'], chunk['vacancy_ids'], chunk['scores']):
+                esperado, _ = pipeline.predict({c: candidates[c]}, {v: vacancies[v]}, explain='none')
+                assert score == pytest.approx(esperado, abs=1e-5)
+
+    def test_registro_nao_suportado(self, pipeline, pools):
+        candidates, vacancies = pools
+        candidates = {**candidates, 'invalido': {'cv_pt': None}}
+
+        with pytest.raises(ValueError, match='invalido'):
+            pipeline.score_matrix(candidates, vacancies)
+
+
+@pytest.mark.unit
+class TestPredictBlocks:
+    """Predição a partir de blocos persistidos no `CandidateFeatureStore`."""
+
+    @pytest.mark.parametrize('candidate, vacancy', PAIRS)
+    def test_mesmo_score_do_predict(self, pipeline, tmp_path, candidate, vacancy):
+        from src.features.candidate_store import CandidateFeatureStore
+        from src.models.predict import CANDIDATE_BLOCK_FEATURES
+
+        store = CandidateFeatureStore(
+            tmp_path, pipeline.feature_fingerprint(), pipeline.feature_plan.candidate_columns,
+            [f'{name}_cand' for name in CANDIDATE_BLOCK_FEATURES], pipeline.NUM_FEATURES_W2V,
+            pipeline.model_w2v.vectors.dtype
+        )
+        (candidate_id, record), = candidate.items()
+        store.upsert(candidate_id, record, pipeline.build_candidate_block)
+
+        esperado, _ = pipeline.predict(candidate, vacancy, explain='none')
+        obtido, _ = pipeline.predict_blocks(
+            store.get(candidate_id), pipeline.build_vacancy_block(vacancy), explain='none'
+        )
+
+        assert obtido == esperado
+
+    def test_fingerprint_estavel(self, pipeline):
+        assert pipeline.feature_fingerprint() == pipeline.feature_fingerprint()
+
+
+@pytest.mark.unit
+class TestFeatureRow:
+    """Linhas de features usadas pelo micro-batching do serviço."""
+
+    def test_lote_igual_a_predicoes_individuais(self, pipeline):
+        rows = [pipeline.feature_row(copy.deepcopy(c), copy.deepcopy(v)) for c, v in PAIRS]
+
+        scores = pipeline.model.predict(np.vstack(rows))
+
+        for score, (candidate, vacancy) in zip(scores, PAIRS):
+            esperado, _ = pipeline.predict(copy.deepcopy(candidate), copy.deepcopy(vacancy), explain='none')
+            assert score == esperado
+
+    def test_fallback_com_dataframes(self, pipeline):
+        candidate = {'1': {'cv_pt': 'python'}, '2': {'cv_pt': 'java'}}
+
+        row = pipeline.feature_row(copy.deepcopy(candidate), copy.deepcopy(SAMPLE_VACANCY_COMPLETE))
+        esperado = pipeline._prepare_data(copy.deepcopy(candidate), copy.deepcopy(SAMPLE_VACANCY_COMPLETE))
+
+        np.testing.assert_array_equal(row, esperado.iloc[[0]].to_numpy(dtype=float))
+
+    @pytest.mark.parametrize('candidate, vacancy', PAIRS)
+    def test_return_features_devolve_a_linha_usada(self, pipeline, candidate, vacancy):
+        esperado, _ = pipeline.predict(copy.deepcopy(candidate), copy.deepcopy(vacancy), explain='none')
+        score, _, features = pipeline.predict(copy.deepcopy(candidate), copy.deepcopy(vacancy),
+                                              explain='none', return_features=True)
+
+        assert score == esperado
+        assert features.shape == (len(pipeline.model_features_order),)
+        np.testing.assert_array_equal(
+            features, pipeline.feature_row(copy.deepcopy(candidate), copy.deepcopy(vacancy))[0]
+        )
+
+    def test_return_features_fallback(self, pipeline):
+        candidate = {'1': {'cv_pt': 'python'}, '2': {'cv_pt': 'java'}}
+
+        _, _, features = pipeline.predict(copy.deepcopy(candidate), copy.deepcopy(SAMPLE_VACANCY_COMPLETE),
+                                          explain='none', return_features=True)
+        esperado = pipeline._prepare_data(copy.deepcopy(candidate), copy.deepcopy(SAMPLE_VACANCY_COMPLETE))
+
+        np.testing.assert_array_equal(features, esperado.iloc[0].to_numpy(dtype=float))
@@ -0,0 +1,270 @@
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.core.exceptions import DataValidationError, PredictionError
+from src.features.candidate_store import CandidateFeatureStore
+from src.features.vacancy_cache import VacancyFeatureCache
+from src.services.prediction_service import PredictionService
+from tests.fixtures.sample_data import SAMPLE_VACANCY_COMPLETE
+
+
+@pytest.fixture
+def service():
+    """Serviço com um pipeline mockado (sem carregar artefatos)."""
+    service = PredictionService.__new__(PredictionService)
+    service._pipeline = MagicMock()
+    service._pipeline.predict_many.return_value = np.array([0.2, 0.9, 0.5])
+    service._candidate_store = None
+    service._vacancy_cache = None
+    service._retriever = None
+    service._batcher = None
+    return service
+
+
+CANDIDATES = {'a': {'cv_pt': 'python'}, 'b': {'cv_pt': 'java'}, 'c': {'cv_pt': 'sql'}}
+
+
+@pytest.mark.unit
+class TestPredictMany:
+    """Testes para o ranking de candidatos em lote."""
+
+    def test_ranking_ordenado(self, service):
+        ranking = service.predict_many(SAMPLE_VACANCY_COMPLETE, CANDIDATES)
+
+        assert [item['candidate_id'] for item in ranking] == ['b', 'c', 'a']
+        assert [item['rank'] for item in ranking] == [1, 2, 3]
+        assert ranking[0]['score'] == pytest.approx(0.9)
+        service._pipeline.predict_many.assert_called_once_with(SAMPLE_VACANCY_COMPLETE, CANDIDATES)
+
+    def test_top_n(self, service):
+        ranking = service.predict_many(SAMPLE_VACANCY_COMPLETE, CANDIDATES, top_n=2)
+
+        assert [item['candidate_id'] for item in ranking] == ['b', 'c']
+
+    @pytest.mark.parametrize('candidates, top_n', [
+        ({}, None),
+        ({'a': 'texto'}, None),
+        (CANDIDATES, 0),
+        (CANDIDATES, True),
+    ])
+    def test_entrada_invalida(self, service, candidates, top_n):
+        with pytest.raises(PredictionError):
+            service.predict_many(SAMPLE_VACANCY_COMPLETE, candidates, top_n=top_n)
+
+        service._pipeline.predict_many.assert_not_called()
+
+
+@pytest.mark.unit
+class TestPredictMatrix:
+    """Testes para a predição em matriz (candidatos x vagas)."""
+
+    def test_formata_blocos(self, service):
+        service._pipeline.score_matrix.return_value = iter([{
+            'candidate_ids': np.array(['a', 'a'], dtype=object),
+            'vacancy_ids': np.array(['x', 'y'], dtype=object),
+            'scores': np.array([0.25, 0.75])
+        }])
+
+        chunks = list(service.predict_matrix(CANDIDATES, SAMPLE_VACANCY_COMPLETE, chunk_size=2))
+
+        assert chunks == [[
+            {'candidate_id': 'a', 'vacancy_id': 'x', 'score': 0.25},
+            {'candidate_id': 'a', 'vacancy_id': 'y', 'score': 0.75}
+        ]]
+
+    @pytest.mark.parametrize('candidates, vacancies, chunk_size', [
+        ({}, SAMPLE_VACANCY_COMPLETE, 10),
+        (CANDIDATES, {}, 10),
+        (CANDIDATES, SAMPLE_VACANCY_COMPLETE, 0),
+        (CANDIDATES, SAMPLE_VACANCY_COMPLETE, 10 ** 9),
+    ])
+    def test_entrada_invalida_antes_do_streaming(self, service, candidates, vacancies, chunk_size):
+        with pytest.raises(PredictionError):
+            service.predict_matrix(candidates, vacancies, chunk_size=chunk_size)
+
+        service._pipeline.score_matrix.assert_not_called()
+
+
+@pytest.fixture
+def store_service(service, tmp_path):
+    """Serviço com store de candidatos; os blocos vêm de um builder simples."""
+    def build_block(payload):
+        (_, record), = payload.items()
+        return {
+            'features': {'pcd_cand': float(len(record['cv_pt']))},
+            'texts': {'cv_pt_cand': record['cv_pt']},
+            'vectors': {'cv_pt_cand': np.ones(3, dtype=np.float32)}
+        }
+
+    service._pipeline.build_candidate_block.side_effect = build_block
+    service._pipeline.build_vacancy_block.return_value = {'features': {}, 'vectors': {}}
+    service._pipeline.predict_blocks.return_value = (0.7, None)
+    service._candidate_store = CandidateFeatureStore(tmp_path, 'fp', ['cv_pt_cand'], ['pcd_cand'], 3)
+    return service
+
+
+@pytest.mark.unit
+class TestCandidateStore:
+    """Testes para a predição de candidatos do store de features."""
+
+    def test_predict_por_id(self, store_service):
+        assert store_service.upsert_candidates(CANDIDATES) == {'inserted': 3, 'updated': 0, 'unchanged': 0}
+
+        score, _ = store_service.predict(None, SAMPLE_VACANCY_COMPLETE, explain='none', candidate_id='b')
+
+        assert score == 0.7
+        candidate_block = store_service._pipeline.predict_blocks.call_args[0][0]
+        assert candidate_block['features'] == {'pcd_cand': 4.0}
+        store_service._pipeline.predict.assert_not_called()
+
+    def test_predict_com_dados_atualiza_store(self, store_service):
+        store_service.predict({'cv_pt': 'python'}, SAMPLE_VACANCY_COMPLETE, candidate_id='x')
+        store_service.predict({'cv_pt': 'python'}, SAMPLE_VACANCY_COMPLETE, candidate_id='x')
+
+        assert 'x' in store_service._candidate_store
+        assert store_service._pipeline.build_candidate_block.call_count == 1
+
+    def test_candidato_desconhecido(self, store_service):
+        with pytest.raises(PredictionError, match='não encontrado'):
+            store_service.predict(None, SAMPLE_VACANCY_COMPLETE, candidate_id='inexistente')
+
+    def test_delete(self, store_service):
+        store_service.upsert_candidates(CANDIDATES)
+
+        assert store_service.delete_candidate('a')
+        assert not store_service.delete_candidate('a')
+
+    def test_store_nao_configurado(self, service):
+        service._candidate_store = None
+
+        with pytest.raises(DataValidationError):
+            service.upsert_candidates(CANDIDATES)
+
+
+@pytest.fixture
+def cache_service(service):
+    """Serviço com cache de vagas; os blocos de vaga registram o payload recebido."""
+    service._pipeline.build_candidate_block.return_value = {'features': {}, 'vectors': {}}
+    service._pipeline.build_vacancy_block.side_effect = lambda payload: {'payload': payload}
+    service._pipeline.predict_blocks.return_value = (0.4, None)
+    service._vacancy_cache = VacancyFeatureCache(max_size=10, ttl_seconds=60)
+    return service
+
+
+@pytest.mark.unit
+class TestVacancyCache:
+    """Testes para a predição com o cache de vagas."""
+
+    def test_vaga_unica_usa_cache(self, cache_service):
+        for _ in range(3):
+            score, _ = cache_service.predict({'1': {'cv_pt': 'python'}}, {'9': {'titulo_vaga': 'Dev'}})
+
+        assert score == 0.4
+        assert cache_service._pipeline.build_vacancy_block.call_count == 1
+        assert cache_service._vacancy_cache.stats['hit'] == 2
+        vacancy_block = cache_service._pipeline.predict_blocks.call_args[0][1]
+        assert vacancy_block == {'payload': {'9': {'titulo_vaga': 'Dev'}}}
+
+    def test_vacancy_id_sem_dados(self, cache_service):
+        cache_service.predict({'1': {'cv_pt': 'python'}}, {'titulo_vaga': 'Dev'}, vacancy_id='9')
+
+        cache_service.predict({'1': {'cv_pt': 'java'}}, None, vacancy_id='9')
+
+        assert cache_service._pipeline.build_vacancy_block.call_count == 1
+
+    def test_vacancy_id_desconhecido(self, cache_service):
+        with pytest.raises(PredictionError, match='não está em cache'):
+            cache_service.predict({'1': {'cv_pt': 'python'}}, None, vacancy_id='9')
+
+    def test_payload_fora_do_caminho_rapido(self, cache_service):
+        cache_service._pipeline.build_candidate_block.return_value = None
+        cache_service._pipeline.predict.return_value = (0.1, None)
+
+        score, _ = cache_service.predict({'1': {'cv_pt': 'python'}}, {'9': {'titulo_vaga': 'Dev'}})
+
+        assert score == 0.1
+        cache_service._pipeline.predict.assert_called_once_with(
+            {'1': {'cv_pt': 'python'}}, {'9': {'titulo_vaga': 'Dev'}}, explain='values', top_k=5
+        )
+
+
+@pytest.mark.unit
+class TestMatchTopK:
+    """Testes para o top-k de candidatos (shortlist ANN + re-ranking)."""
+
+    def test_reranqueia_shortlist(self, store_service):
+        store_service._pipeline.feature_plan.vacancy_columns = ['principais_atividades_vaga']
+        store_service._pipeline.build_vacancy_block.return_value = {
+            'features': {}, 'vectors': {'principais_atividades_vaga': np.ones(3)}
+        }
+        store_service._pipeline.score_blocks.side_effect = (
+            lambda blocks, vacancy_block: np.array([block['features']['pcd_cand'] for block in blocks])
+        )
+        store_service.upsert_candidates({'a': {'cv_pt': 'x'}, 'b': {'cv_pt': 'xxx'}, 'c': {'cv_pt': 'xx'}})
+
+        results = store_service.match_top_k({'titulo_vaga': 'Dev'}, k=2)
+
+        assert [item['candidate_id'] for item in results] == ['b', 'c']
+        assert [item['rank'] for item in results] == [1, 2]
+        assert results[0]['score'] == 3.0
+
+    @pytest.mark.parametrize('k', [0, True, 10 ** 6])
+    def test_k_invalido(self, store_service, k):
+        with pytest.raises(DataValidationError):
+            store_service.match_top_k({'titulo_vaga': 'Dev'}, k=k)
+
+
+@pytest.mark.unit
+class TestMicroBatching:
+    """Predição pelo micro-batcher do serviço."""
+
+    def test_predict_usa_o_lote(self, service):
+        from src.services.micro_batcher import MicroBatcher
+        service._pipeline.feature_row.return_value = np.array([[1.0, 2.0]])
+        service._pipeline.explain_features.return_value = [('skill', 0.1)]
+        service._batcher = MicroBatcher(lambda matrix: matrix.sum(axis=1) / 10, max_wait_ms=0)
+
+        score, explicacao = service.predict(CANDIDATES, SAMPLE_VACANCY_COMPLETE, explain='top_k', top_k=1)
+
+        assert score == pytest.approx(0.3)
+        assert explicacao == [('skill', 0.1)]
+        service._pipeline.predict.assert_not_called()
+
+    def test_return_features_no_lote(self, service):
+        from src.services.micro_batcher import MicroBatcher
+        service._pipeline.feature_row.return_value = np.array([[1.0, 2.0]])
+        service._pipeline.explain_features.return_value = None
+        service._batcher = MicroBatcher(lambda matrix: matrix.sum(axis=1) / 10, max_wait_ms=0)
+
+        score, _, features = service.predict(CANDIDATES, SAMPLE_VACANCY_COMPLETE, explain='none',
+                                             return_features=True)
+
+        assert score == pytest.approx(0.3)
+        np.testing.assert_array_equal(features, [1.0, 2.0])
+
+
+@pytest.mark.unit
+class TestReturnFeatures:
+    """Vetor de features devolvido junto com o score (monitoramento de drift)."""
+
+    def test_repassa_ao_pipeline(self, service):
+        service._pipeline.predict.return_value = (0.4, None, np.array([1.0, 2.0]))
+
+        score, _, features = service.predict(CANDIDATES, SAMPLE_VACANCY_COMPLETE, explain='none',
+                                             return_features=True)
+
+        assert score == 0.4
+        np.testing.assert_array_equal(features, [1.0, 2.0])
+        service._pipeline.predict.assert_called_once_with(
+            CANDIDATES, SAMPLE_VACANCY_COMPLETE, explain='none', top_k=5, return_features=True
+        )
+
+    def test_feature_names(self, service):
+        service._pipeline.model_features_order = ['a', 'b']
+
+        assert service.feature_names == ['a', 'b']
@@ -0,0 +1,155 @@
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.features.raw_loader import (
+    APPLICANT_SECTIONS,
+    flatten_record,
+    iter_json_object,
+    load_prospects,
+    load_records
+)
+
+
+APPLICANTS = {
+    '31000': {
+        'infos_basicas': {'codigo_profissional': '31000', 'nome': 'Ana'},
+        'informacoes_pessoais': {'pcd': 'Não'},
+        'informacoes_profissionais': {'area_atuacao': 'TI - "Dados"', 'conhecimentos_tecnicos': 'python\nsql'},
+        'formacao_e_idiomas': {'nivel_academico': 'Ensino Superior Completo', 'nivel_ingles': 'Avançado'},
+        'cargo_atual': {'cargo_atual': 'Analista Sênior', 'data_admissao': '01-02-2020'},
+        'cv_pt': 'Experiência em gestão 😀'
+    },
+    '31001': {
+        'infos_basicas': {'codigo_profissional': '31001'},
+        'informacoes_pessoais': {'pcd': None},
+        'informacoes_profissionais': {'area_atuacao': {'aninhado': 1}},
+        'formacao_e_idiomas': {},
+        'cv_pt': ''
+    }
+}
+FIELDS = ['pcd', 'area_atuacao', 'conhecimentos_tecnicos', 'nivel_academico', 'cargo_atual', 'cv_pt']
+
+PROSPECTS = {
+    '4530': {'titulo': 'Analista', 'modalidade': '', 'prospects': [
+        {'nome': 'Ana', 'codigo': '31000', 'situacao_candidado': 'Contratado pela Decision'},
+        {'nome': 'Bia', 'codigo': '31001', 'situacao_candidado': 'Prospect'}
+    ]},
+    '4531': {'titulo': 'Gerente', 'modalidade': 'CLT', 'prospects': []}
+}
+
+
+@pytest.fixture
+def dump(tmp_path):
+    def _dump(data, name='dump.json', **kwargs):
+        path = tmp_path / name
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **kwargs)
+        return path
+    return _dump
+
+
+def _referencia_read_json(path, sections, fields):
+    """Caminho anterior do train.py: read_json + json_normalize por seção."""
+    df = pd.read_json(path, orient='index')
+    for section in sections:
+        normalized = pd.json_normalize(df[section].apply(lambda x: x if isinstance(x, dict) else {}).tolist())
+        normalized.index = df.index
+        df = pd.concat([df.drop(columns=section), normalized], axis=1)
+    df = df.reindex(columns=fields)
+    df = df.reset_index().rename(columns={'index': 'id'})
+    df['id'] = df['id'].astype(str)
+    return df
+
+
+@pytest.mark.unit
+class TestIterJsonObject:
+    """Testes para a decodificação incremental do objeto JSON de topo."""
+
+    @pytest.mark.parametrize('read_size', [1, 5, 1 << 20])
+    def test_pares_em_ordem(self, dump, read_size):
+        path = dump(APPLICANTS, ensure_ascii=False, indent=2)
+
+        pares = list(iter_json_object(path, read_size=read_size))
+
+        assert pares == list(APPLICANTS.items())
+
+    def test_numeros_na_fronteira_do_bloco(self, tmp_path):
+        path = tmp_path / 'numeros.json'
+        path.write_text(' { "a" : 12345 , "b":[1,2] ,"c":-1.5e3}  ', encoding='utf-8')
+
+        assert list(iter_json_object(path, read_size=2)) == [('a', 12345), ('b', [1, 2]), ('c', -1500.0)]
+
+    def test_objeto_vazio(self, tmp_path):
+        path = tmp_path / 'vazio.json'
+        path.write_text('{}', encoding='utf-8')
+
+        assert list(iter_json_object(path)) == []
+
+    @pytest.mark.parametrize('conteudo', ['[1, 2]', '{"a": 1', '{"a": 1 "b": 2}'])
+    def test_json_invalido(self, tmp_path, conteudo):
+        path = tmp_path / 'invalido.json'
+        path.write_text(conteudo, encoding='utf-8')
+
+        with pytest.raises(ValueError):
+            list(iter_json_object(path, read_size=3))
+
+
+@pytest.mark.unit
+class TestLoadRecords:
+    """Testes para a carga dos dumps com apenas os campos selecionados."""
+
+    def test_igual_a_read_json_com_json_normalize(self, dump):
+        path = dump(APPLICANTS)
+        sections = [keys[0] for keys in APPLICANT_SECTIONS]
+
+        df = load_records(path, APPLICANT_SECTIONS, FIELDS, read_size=16)
+
+        pd.testing.assert_frame_equal(df, _referencia_read_json(path, sections, FIELDS), check_dtype=False)
+
+    def test_nulos_seguem_json_normalize(self):
+        record = APPLICANTS['31001']
+
+        values = flatten_record(record, APPLICANT_SECTIONS, FIELDS)
+
+        assert values['pcd'] is None
+        assert np.isnan(values['area_atuacao'])  # objeto aninhado
+        assert np.isnan(values['nivel_academico'])  # campo ausente
+        assert np.isnan(values['cargo_atual'])  # seção ausente
+        assert values['cv_pt'] == ''
+
+    def test_campo_com_nome_da_secao(self):
+        values = flatten_record(APPLICANTS['31000'], APPLICANT_SECTIONS, ['cargo_atual'])
+
+        assert values == {'cargo_atual': 'Analista Sênior'}
+
+    def test_strings_repetidas_compartilhadas(self, dump):
+        data = {str(i): {'formacao_e_idiomas': {'nivel_academico': 'Ensino Médio ' + 'Completo'}} for i in range(3)}
+
+        df = load_records(dump(data), APPLICANT_SECTIONS, ['nivel_academico'])
+
+        valores = df['nivel_academico'].tolist()
+        assert valores[0] is valores[1] is valores[2]
+
+
+@pytest.mark.unit
+class TestLoadProspects:
+    """Testes para a carga do dump de prospects (uma linha por prospect)."""
+
+    def test_uma_linha_por_prospect(self, dump):
+        df = load_prospects(dump(PROSPECTS), ['titulo', 'modalidade'], ['nome', 'codigo', 'situacao_candidado'])
+
+        assert df.columns.tolist() == ['id_vaga', 'titulo', 'modalidade', 'nome', 'codigo', 'situacao_candidado']
+        assert df['id_vaga'].tolist() == ['4530', '4530', '4531']
+        assert df['codigo'].tolist()[:2] == ['31000', '31001']
+        assert df['titulo'].tolist() == ['Analista', 'Analista', 'Gerente']
+
+    def test_vaga_sem_prospects_gera_linha_vazia(self, dump):
+        df = load_prospects(dump(PROSPECTS), ['titulo'], ['nome'])
+
+        assert df['nome'].isna().tolist() == [False, False, True]
@@ -0,0 +1,229 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.features.candidate_store import CandidateFeatureStore
+from src.models.matching import unit_rows
+from src.models.retrieval import (
+    CandidateRetriever,
+    IVFIndex,
+    brute_force_search,
+    candidate_embeddings,
+    retrieval_pairs,
+    vacancy_query
+)
+from src.models import utils
+
+
+CANDIDATE_COLUMNS = ['cv_pt_cand', 'conhecimentos_tecnicos_cand']
+VACANCY_COLUMNS = ['principais_atividades_vaga', 'competencia_tecnicas_e_comportamentais_vaga']
+DIM = 8
+
+
+def clustered(n_rows, rng, dim=16, n_clusters=20):
+    topics = rng.normal(size=(n_clusters, dim))
+    labels = rng.integers(n_clusters, size=n_rows)
+    return unit_rows((topics[labels] + rng.normal(scale=0.3, size=(n_rows, dim))).astype(np.float32))
+
+
+@pytest.mark.unit
+class TestIVFIndex:
+    """Testes para o índice IVF em NumPy."""
+
+    def test_base_pequena_e_busca_exata(self):
+        rng = np.random.default_rng(0)
+        vectors = clustered(200, rng)
+        index = IVFIndex()
+        index.build([str(i) for i in range(200)], vectors)
+
+        ids, scores = index.search(vectors[7], 10)
+        exact, exact_scores = brute_force_search(vectors, vectors[7], 10)
+
+        assert len(index.centroids) == 1
+        assert ids == [str(i) for i in exact]
+        np.testing.assert_allclose(scores, exact_scores, rtol=1e-6)
+
+    def test_todas_as_listas_e_busca_exata(self):
+        rng = np.random.default_rng(1)
+        vectors = clustered(2000, rng)
+        index = IVFIndex(n_lists=16)
+        index.build([str(i) for i in range(2000)], vectors)
+
+        ids, _ = index.search(vectors[3], 25, n_probe=16)
+        exact, _ = brute_force_search(vectors, vectors[3], 25)
+
+        assert set(ids) == {str(i) for i in exact}
+
+    def test_recall_com_poucas_listas(self):
+        rng = np.random.default_rng(2)
+        vectors = clustered(5000, rng)
+        index = IVFIndex(n_lists=50, n_probe=5)
+        index.build([str(i) for i in range(5000)], vectors)
+
+        recalls = []
+        for query in vectors[:20]:
+            ids, _ = index.search(query, 20)
+            exact, _ = brute_force_search(vectors, query, 20)
+            recalls.append(len(set(ids) & {str(i) for i in exact}) / 20)
+
+        assert np.mean(recalls) >= 0.9
+
+    def test_rebuild_reaproveita_centroides(self):
+        rng = np.random.default_rng(3)
+        vectors = clustered(2000, rng)
+        index = IVFIndex(n_lists=16)
+        index.build([str(i) for i in range(2000)], vectors)
+        centroids = index.centroids
+
+        index.build([str(i) for i in range(1900)], vectors[:1900])
+
+        assert index.centroids is centroids
+        assert len(index) == 1900
+
+    def test_upsert_e_remove_incrementais(self):
+        rng = np.random.default_rng(6)
+        vectors = clustered(2100, rng)
+        index = IVFIndex(n_lists=16)
+        index.build([str(i) for i in range(2000)], vectors[:2000])
+        centroids = index.centroids
+
+        index.remove([str(i) for i in range(100)])
+        index.upsert([str(i) for i in range(2000, 2100)], vectors[2000:])
+        index.upsert(['150'], vectors[7:8])
+
+        expected = vectors[100:].copy()
+        expected[50] = vectors[7]
+        ids, scores = index.search(vectors[7], 25, n_probe=16)
+        exact, exact_scores = brute_force_search(expected, vectors[7], 25)
+        assert index.centroids is centroids
+        assert len(index) == 2000
+        assert ids[0] == '150'
+        assert set(ids) == {str(i + 100) for i in exact}
+        np.testing.assert_allclose(scores, exact_scores, rtol=1e-5)
+        assert not index.needs_rebuild
+
+    def test_lista_desbalanceada_pede_rebuild(self):
+        rng = np.random.default_rng(7)
+        vectors = clustered(2000, rng)
+        index = IVFIndex(n_lists=16)
+        index.build([str(i) for i in range(2000)], vectors)
+        centroids = index.centroids
+
+        # inserções concentradas no mesmo centróide
+        duplicates = np.repeat(vectors[:1], 1000, axis=0)
+        index.upsert([f'dup{i}' for i in range(1000)], duplicates)
+        assert index.needs_rebuild
+
+        index.build([str(i) for i in range(2000)] + [f'dup{i}' for i in range(1000)],
+                    np.vstack([vectors, duplicates]))
+        assert index.centroids is not centroids
+
+    def test_indice_vazio(self):
+        index = IVFIndex()
+        index.build([], np.empty((0, 4), dtype=np.float32))
+
+        assert index.search(np.ones(4), 5)[0] == []
+
+
+@pytest.mark.unit
+class TestRetrievalEmbeddings:
+    """O produto interno de recuperação é a soma das similaridades do modelo."""
+
+    def test_produto_interno_soma_cossenos(self):
+        rng = np.random.default_rng(4)
+        cand = {col: rng.normal(size=(3, DIM)) for col in CANDIDATE_COLUMNS}
+        vaga = {col: rng.normal(size=DIM) for col in VACANCY_COLUMNS}
+        pairs = retrieval_pairs(CANDIDATE_COLUMNS, VACANCY_COLUMNS)
+
+        scores = candidate_embeddings(cand, pairs) @ vacancy_query(vaga, pairs)
+
+        esperado = sum(
+            utils.cosine_similarity_rows(vaga[vaga_col][np.newaxis, :], cand[cand_col])
+            for cand_col, vaga_col in pairs
+        )
+        assert len(pairs) == 3
+        np.testing.assert_allclose(scores, esperado, rtol=1e-5)
+
+    def test_pares_sem_colunas_sao_ignorados(self):
+        assert retrieval_pairs(['cv_pt_cand'], VACANCY_COLUMNS) == [
+            ('cv_pt_cand', 'principais_atividades_vaga'),
+            ('cv_pt_cand', 'competencia_tecnicas_e_comportamentais_vaga')
+        ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandidateFeatureStore(tmp_path, 'fp', CANDIDATE_COLUMNS, ['pcd_cand'], DIM)
+
+
+def block_for(vector):
+    return lambda payload: {
+        'features': {'pcd_cand': 0.0},
+        'vectors': {col: np.asarray(vector, dtype=np.float32) for col in CANDIDATE_COLUMNS}
+    }
+
+
+@pytest.mark.unit
+class TestCandidateRetriever:
+    """Testes para o índice sincronizado com o store de candidatos."""
+
+    def test_shortlist_acompanha_o_store(self, store):
+        rng = np.random.default_rng(5)
+        vectors = rng.normal(size=(30, DIM))
+        for i, vector in enumerate(vectors):
+            store.upsert(str(i), {'n': i}, block_for(vector))
+        retriever = CandidateRetriever(store, VACANCY_COLUMNS)
+        vacancy_block = {'vectors': {col: vectors[12] for col in VACANCY_COLUMNS}}
+
+        ids, _ = retriever.shortlist(vacancy_block, 3)
+        assert ids[0] == '12'
+
+        store.delete('12')
+        store.upsert('novo', {'n': 'novo'}, block_for(vectors[12]))
+        ids, _ = retriever.shortlist(vacancy_block, 3)
+
+        assert ids[0] == 'novo'
+        assert '12' not in ids
+
+    def test_sync_incremental_sem_rebuild(self, store, monkeypatch):
+        rng = np.random.default_rng(8)
+        vectors = rng.normal(size=(40, DIM))
+        for i, vector in enumerate(vectors[:30]):
+            store.upsert(str(i), {'n': i}, block_for(vector))
+        retriever = CandidateRetriever(store, VACANCY_COLUMNS)
+        retriever.sync()
+        builds = []
+        monkeypatch.setattr(retriever.index, 'build', lambda *args: builds.append(args))
+
+        store.upsert('3', {'n': 'novo'}, block_for(vectors[30]))
+        store.delete('4')
+        store.upsert('novo', {'n': 'novo'}, block_for(vectors[31]))
+        ids, _ = retriever.shortlist({'vectors': {col: vectors[30] for col in VACANCY_COLUMNS}}, 40)
+
+        assert builds == []
+        assert ids[0] == '3'
+        assert '4' not in ids and 'novo' in ids and len(ids) == 30
+
+    def test_compactacao_refaz_indice(self, store):
+        rng = np.random.default_rng(9)
+        vectors = rng.normal(size=(20, DIM))
+        for i, vector in enumerate(vectors):
+            store.upsert(str(i), {'n': i}, block_for(vector))
+        store.upsert('0', {'n': 'novo'}, block_for(vectors[5]))
+        retriever = CandidateRetriever(store, VACANCY_COLUMNS)
+        retriever.sync()
+
+        store.compact()
+        ids, _ = retriever.shortlist({'vectors': {col: vectors[5] for col in VACANCY_COLUMNS}}, 2)
+
+        assert retriever._slots == store.slots()
+        assert set(ids) == {'0', '5'}
+
+    def test_sem_colunas_de_recuperacao(self, tmp_path):
+        store = CandidateFeatureStore(tmp_path, 'fp', ['cargo_atual_cand'], ['pcd_cand'], DIM)
+
+        with pytest.raises(ValueError):
+            CandidateRetriever(store, VACANCY_COLUMNS)
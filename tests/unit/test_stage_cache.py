@@ -0,0 +1,131 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.stage_cache import FILE_HASHES_FILE, StageCache
+
+
+def _etapa(x):
+    return x + 1
+
+
+def _outra_etapa(x):
+    return x + 2
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StageCache(tmp_path / 'cache')
+
+
+@pytest.fixture
+def entrada(tmp_path):
+    path = tmp_path / 'dump.json'
+    path.write_text('{"a": 1}', encoding='utf-8')
+    return path
+
+
+@pytest.mark.unit
+class TestStageCacheKey:
+    """Testes para as chaves das etapas."""
+
+    def test_chave_estavel(self, cache, entrada):
+        kwargs = dict(inputs=[entrada], code=[_etapa], params={'campos': ['a', 'b']})
+
+        assert cache.key('etapa', **kwargs) == cache.key('etapa', **kwargs)
+
+    def test_chave_muda_com_conteudo_da_entrada(self, cache, entrada):
+        antes = cache.key('etapa', inputs=[entrada])
+        entrada.write_text('{"a": 2}', encoding='utf-8')
+
+        assert cache.key('etapa', inputs=[entrada]) != antes
+
+    @pytest.mark.parametrize('alteracao', [
+        {'code': [_outra_etapa]},
+        {'params': {'campos': ['a']}},
+        {'upstream': 'outra'},
+    ])
+    def test_chave_muda_com_codigo_parametros_e_etapa_anterior(self, cache, alteracao):
+        base = dict(code=[_etapa], params={'campos': ['a', 'b']}, upstream='anterior')
+
+        assert cache.key('etapa', **{**base, **alteracao}) != cache.key('etapa', **base)
+
+    def test_hash_de_arquivo_memorizado(self, cache, entrada):
+        cache.file_hash(entrada)
+
+        novo = StageCache(cache.root)
+        novo._load_file_hashes()[str(entrada.resolve())]['sha256'] = 'memorizado'
+
+        assert (cache.root / FILE_HASHES_FILE).exists()
+        assert novo.file_hash(entrada) == 'memorizado'
+
+
+@pytest.mark.unit
+class TestStageCacheEntries:
+    """Testes para a gravação e leitura das saídas das etapas."""
+
+    def test_ida_e_volta(self, cache):
+        df = pd.DataFrame({'texto': ['a', None, np.nan], 'valor': np.array([1, 2, 3], dtype=np.int8)},
+                          index=[5, 7, 9])
+        outputs = {'df': df, 'serie': df['valor'], 'matriz': np.arange(6, dtype=np.float32).reshape(2, 3),
+                   'artefatos': {'tipos': {'CLT', 'PJ'}}}
+
+        cache.save('etapa', 'k', outputs)
+        loaded = cache.load('etapa', 'k')
+
+        pd.testing.assert_frame_equal(loaded['df'], df)
+        assert loaded['df']['texto'].iloc[1] is None
+        pd.testing.assert_series_equal(loaded['serie'], df['valor'])
+        np.testing.assert_array_equal(loaded['matriz'], outputs['matriz'])
+        assert loaded['matriz'].dtype == np.float32
+        assert loaded['artefatos'] == {'tipos': {'CLT', 'PJ'}}
+
+    def test_entrada_ausente(self, cache):
+        assert cache.load('etapa', 'inexistente') is None
+
+    def test_get_or_compute_calcula_uma_vez(self, cache):
+        chamadas = []
+
+        def compute():
+            chamadas.append(1)
+            return {'x': np.ones(3)}
+
+        cache.get_or_compute('etapa', 'k', compute)
+        resultado = cache.get_or_compute('etapa', 'k', compute)
+
+        assert len(chamadas) == 1
+        np.testing.assert_array_equal(resultado['x'], np.ones(3))
+
+    def test_desativado_sempre_recalcula(self, tmp_path):
+        cache = StageCache(tmp_path / 'cache', enabled=False)
+        chamadas = []
+
+        for _ in range(2):
+            cache.get_or_compute('etapa', 'k', lambda: chamadas.append(1) or {'x': 1})
+
+        assert len(chamadas) == 2
+        assert not (tmp_path / 'cache').exists()
+
+    def test_falha_na_gravacao_nao_deixa_entrada_parcial(self, cache):
+        class NaoSerializavel:
+            def __reduce__(self):
+                raise TypeError('não serializável')
+
+        with pytest.raises(TypeError):
+            cache.save('etapa', 'k', {'ok': np.ones(2), 'ruim': NaoSerializavel()})
+
+        assert cache.load('etapa', 'k') is None
+        assert list(cache.root.iterdir()) == []
+
+    def test_latest_retorna_entrada_mais_recente(self, cache):
+        assert cache.latest('features') is None
+
+        cache.save('features', 'antiga', {'x': np.zeros(1)})
+        cache.save('features', 'nova', {'x': np.ones(1)})
+        cache.save('outra', 'k', {'x': np.full(1, 2.0)})
+
+        np.testing.assert_array_equal(cache.latest('features')['x'], np.ones(1))
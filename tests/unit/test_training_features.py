@@ -0,0 +1,100 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+from gensim.models import KeyedVectors
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.embedding_engine import EmbeddingEngine
+from src.models.training_features import (
+    TRAINING_SIMILARITY_FEATURES,
+    build_similarity_features
+)
+from src.models.utils import cosine_similarity_rows
+from src.models.word2vec_store import caminho_binario
+
+
+@pytest.fixture(scope='module')
+def w2v_text_file(tmp_path_factory):
+    """Word2Vec pequeno salvo no formato texto."""
+    rng = np.random.default_rng(11)
+    kv = KeyedVectors(8)
+    kv.add_vectors([f'palavra{i}' for i in range(100)], rng.normal(size=(100, 8)).astype(np.float32))
+    path = tmp_path_factory.mktemp('w2v') / 'modelo.txt'
+    kv.save_word2vec_format(str(path))
+    return path
+
+
+@pytest.fixture(scope='module')
+def prospects():
+    """Tabela de prospects com as colunas de texto das similaridades."""
+    rng = np.random.default_rng(5)
+    vocab = [f'palavra{i}' for i in range(100)] + ['desconhecida']
+    columns = sorted({col for pair in TRAINING_SIMILARITY_FEATURES.values() for col in pair})
+    n_rows = 230
+    data = {
+        col: [' '.join(rng.choice(vocab, rng.integers(0, 12))) for _ in range(n_rows)]
+        for col in columns
+    }
+    df = pd.DataFrame(data, index=np.arange(n_rows) * 2 + 7)
+    df.iloc[::17, 0] = None
+    df['outra_coluna'] = 1
+    return df
+
+
+def _similaridades_esperadas(df, w2v_path):
+    engine = EmbeddingEngine(KeyedVectors.load_word2vec_format(str(w2v_path)))
+    return np.column_stack([
+        cosine_similarity_rows(engine.embed(df[first].tolist()), engine.embed(df[second].tolist()))
+        for first, second in TRAINING_SIMILARITY_FEATURES.values()
+    ])
+
+
+@pytest.mark.unit
+class TestBuildSimilarityFeatures:
+    """Testes para a geração em blocos das similaridades do treino."""
+
+    def test_igual_ao_calculo_direto(self, prospects, w2v_text_file):
+        result = build_similarity_features(prospects, w2v_text_file, n_jobs=1, chunk_size=50)
+
+        assert list(result.columns) == list(TRAINING_SIMILARITY_FEATURES)
+        assert result.index.equals(prospects.index)
+        assert (result.dtypes == np.float32).all()
+        np.testing.assert_array_equal(result.to_numpy(), _similaridades_esperadas(prospects, w2v_text_file))
+
+    def test_pool_de_processos_igual_ao_sequencial(self, prospects, w2v_text_file):
+        sequencial = build_similarity_features(prospects, w2v_text_file, n_jobs=1, chunk_size=40)
+        paralelo = build_similarity_features(prospects, w2v_text_file, n_jobs=2, chunk_size=40)
+
+        pd.testing.assert_frame_equal(paralelo, sequencial)
+
+    def test_converte_word2vec_para_binario(self, prospects, w2v_text_file):
+        build_similarity_features(prospects.head(5), w2v_text_file, n_jobs=1)
+
+        assert caminho_binario(w2v_text_file).exists()
+
+    def test_blocos_gravados_no_work_dir(self, prospects, w2v_text_file, tmp_path):
+        build_similarity_features(prospects, w2v_text_file, n_jobs=1, chunk_size=100, work_dir=tmp_path)
+
+        blocos = sorted(tmp_path.glob('bloco_*.npy'))
+        assert [bloco.name for bloco in blocos] == ['bloco_00000.npy', 'bloco_00001.npy', 'bloco_00002.npy']
+        assert np.load(blocos[-1]).shape == (30, len(TRAINING_SIMILARITY_FEATURES))
+
+    def test_similaridades_customizadas(self, prospects, w2v_text_file):
+        features = {'sim': ('cv_pt_cand', 'titulo')}
+
+        result = build_similarity_features(prospects, w2v_text_file, similarity_features=features, n_jobs=1)
+
+        assert list(result.columns) == ['sim']
+
+    def test_tabela_vazia(self, prospects, w2v_text_file):
+        result = build_similarity_features(prospects.iloc[:0], w2v_text_file, n_jobs=1)
+
+        assert result.shape == (0, len(TRAINING_SIMILARITY_FEATURES))
+
+    def test_chunk_size_invalido(self, prospects, w2v_text_file):
+        with pytest.raises(ValueError):
+            build_similarity_features(prospects, w2v_text_file, chunk_size=0)
@@ -0,0 +1,141 @@
+import pytest
+import subprocess
+import numpy as np
+import pandas as pd
+import joblib
+import sys
+import os
+
+from xgboost import XGBRegressor
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.models.tree_ensemble import TREES_SUFFIX, TreeEnsemble, trees_path
+
+MODEL_PATH = os.path.join(project_root, 'artifacts', 'model.joblib')
+ARTIFACTS_PATH = os.path.join(project_root, 'artifacts', 'preprocessing_artifacts.joblib')
+
+
+@pytest.fixture(scope='module')
+def dados():
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(scale=2.0, size=(600, 6)), columns=[f'f{i}' for i in range(6)])
+    X.iloc[::7, 2] = np.nan
+    X.iloc[::11, 4] = np.nan
+    y = np.sin(X['f0']) + 0.3 * X['f1'] * X['f3'].fillna(0) + rng.normal(scale=0.05, size=600)
+    return X, y
+
+
+def _entradas(X, rng):
+    """Linhas de teste: as do treino, novas, infinitos e limiares exatos."""
+    extra = rng.normal(scale=3.0, size=(300, X.shape[1]))
+    extra[::5, 1] = np.nan
+    extra[0, 0], extra[1, 0] = np.inf, -np.inf
+    return np.vstack([X.to_numpy(), extra])
+
+
+@pytest.mark.unit
+class TestTreeEnsembleParity:
+    """Paridade exata entre a avaliação em NumPy e o XGBRegressor.predict."""
+
+    def test_modelo_de_producao(self):
+        model = joblib.load(MODEL_PATH)
+        features = joblib.load(ARTIFACTS_PATH)['model_features']
+        rng = np.random.default_rng(0)
+        X = rng.normal(scale=2.0, size=(2000, len(features)))
+        X[::4, 3] = np.nan
+
+        ensemble = TreeEnsemble.from_booster(model, features)
+
+        assert ensemble.n_trees == model.get_booster().num_boosted_rounds()
+        np.testing.assert_array_equal(ensemble.predict(X), model.predict(X))
+
+    @pytest.mark.parametrize('params', [
+        {'n_estimators': 80, 'max_depth': 9},
+        {'n_estimators': 30, 'max_depth': 3, 'learning_rate': 0.3},
+        {'n_estimators': 20, 'max_depth': 6, 'gamma': 50.0},  # árvores rasas e folhas únicas
+    ])
+    def test_igual_ao_xgbregressor(self, dados, params):
+        X, y = dados
+        model = XGBRegressor(**params).fit(X, y)
+        entradas = _entradas(X, np.random.default_rng(2))
+
+        np.testing.assert_array_equal(TreeEnsemble.from_booster(model).predict(entradas),
+                                      model.predict(entradas))
+
+    def test_limiares_exatos(self, dados):
+        X, y = dados
+        model = XGBRegressor(n_estimators=20, max_depth=5).fit(X, y)
+        ensemble = TreeEnsemble.from_booster(model)
+        # valores iguais aos limiares dos splits (x < limiar vai para a esquerda)
+        limiares = ensemble.threshold[ensemble.threshold != 0][:50]
+        entradas = np.repeat(limiares[:, np.newaxis], X.shape[1], axis=1)
+
+        np.testing.assert_array_equal(ensemble.predict(entradas), model.predict(entradas))
+
+    def test_melhor_iteracao_do_early_stopping(self, dados):
+        X, y = dados
+        model = XGBRegressor(n_estimators=500, learning_rate=0.3, early_stopping_rounds=3)
+        model.fit(X[:450], y[:450], eval_set=[(X[450:], y[450:])], verbose=False)
+
+        ensemble = TreeEnsemble.from_booster(model)
+
+        assert ensemble.n_trees == model.best_iteration + 1
+        np.testing.assert_array_equal(ensemble.predict(X.to_numpy()), model.predict(X))
+
+    def test_blocos_de_linhas(self, dados):
+        X, y = dados
+        ensemble = TreeEnsemble.from_booster(XGBRegressor(n_estimators=10).fit(X, y))
+
+        np.testing.assert_array_equal(ensemble.predict(X.to_numpy(), chunk_size=7),
+                                      ensemble.predict(X.to_numpy()))
+
+
+@pytest.mark.unit
+class TestTreeEnsembleStorage:
+    """Testes para o arquivo de árvores e o uso sem o xgboost."""
+
+    def test_grava_e_carrega(self, dados, tmp_path):
+        X, y = dados
+        model = XGBRegressor(n_estimators=15, max_depth=4).fit(X, y)
+        ensemble = TreeEnsemble.from_booster(model, list(X.columns))
+
+        path = ensemble.save(tmp_path / 'model.trees.npz')
+        loaded = TreeEnsemble.load(path)
+
+        assert loaded.feature_names == list(X.columns)
+        np.testing.assert_array_equal(loaded.predict(X.to_numpy()), model.predict(X))
+
+    def test_trees_path(self):
+        assert trees_path('artifacts/model.joblib').name == 'model' + TREES_SUFFIX
+        assert trees_path('artifacts/model.ubj').name == 'model' + TREES_SUFFIX
+
+    def test_predicao_sem_xgboost(self, dados, tmp_path):
+        X, y = dados
+        path = TreeEnsemble.from_booster(XGBRegressor(n_estimators=5).fit(X, y)).save(tmp_path / 'm.trees.npz')
+        codigo = (
+            "import sys; sys.modules['xgboost'] = None\n"
+            "import numpy as np\n"
+            "from src.models.tree_ensemble import TreeEnsemble\n"
+            f"print(TreeEnsemble.load({str(path)!r}).predict(np.zeros((2, 6))).shape)\n"
+        )
+
+        result = subprocess.run([sys.executable, '-c', codigo], cwd=project_root,
+                                capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == '(2,)'
+
+    def test_objetivo_nao_suportado(self, dados):
+        X, y = dados
+        model = XGBRegressor(n_estimators=3, objective='reg:logistic').fit(X, (y > 0).astype(int))
+
+        with pytest.raises(ValueError):
+            TreeEnsemble.from_booster(model)
+
+    def test_numero_de_features_invalido(self, dados):
+        X, y = dados
+        ensemble = TreeEnsemble.from_booster(XGBRegressor(n_estimators=3).fit(X, y))
+
+        with pytest.raises(ValueError):
+            ensemble.predict(np.zeros((1, 5)))
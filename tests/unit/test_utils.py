@@ -12,11 +12,16 @@ sys.path.insert(0, project_root)
 try:
     from src.models.utils import (
         padroniza_texto, 
+        padroniza_valor,
+        padroniza_valores,
         document_vector, 
         expand_vector,
+        document_vector_matrix,
+        cosine_similarity_rows,
         nivel_idioma,
         nivel_educacao,
         mapear_senioridade,
+        classifica_senioridade,
         similaridade,
         evaluation
     )
@@ -29,11 +34,16 @@ except ImportError:
     spec.loader.exec_module(utils_module)
     
     padroniza_texto = utils_module.padroniza_texto
+    padroniza_valor = utils_module.padroniza_valor
+    padroniza_valores = utils_module.padroniza_valores
     document_vector = utils_module.document_vector
     expand_vector = utils_module.expand_vector
+    document_vector_matrix = utils_module.document_vector_matrix
+    cosine_similarity_rows = utils_module.cosine_similarity_rows
     nivel_idioma = utils_module.nivel_idioma
     nivel_educacao = utils_module.nivel_educacao
     mapear_senioridade = utils_module.mapear_senioridade
+    classifica_senioridade = utils_module.classifica_senioridade
     similaridade = utils_module.similaridade
     evaluation = utils_module.evaluation
 
@@ -65,6 +75,48 @@ class TestPadronizaTexto:
         assert df['text1'].iloc[0] == ''
         assert df['text1'].iloc[2] == 'valid'
 
+    def test_padroniza_valor_igual_ao_dataframe(self):
+        textos = ['  HELLO World!  ', 'Test@123', 'Café  ', 'Açúcar#$', '']
+        df = pd.DataFrame({'text': textos})
+
+        padroniza_texto(df, ['text'])
+
+        assert [padroniza_valor(texto) for texto in textos] == df['text'].tolist()
+
+    @pytest.mark.parametrize('texto, esperado', [
+        ('ﬁnanceiro', 'financeiro'),
+        ('m² e ½', 'm2 e 12'),
+        ('São\u00a0Paulo', 'sao paulo'),
+        ('İstanbul', 'istanbul'),
+        ('Ｐｙｔｈｏｎ　３', 'python 3'),
+        ('straße', 'strae'),
+        ('a\x1cb', 'a\x1cb'),
+        ('ção', 'cao'),
+        ('C++ / Node.js', 'c  nodejs'),
+    ])
+    def test_padroniza_valor_casos_unicode(self, texto, esperado):
+        assert padroniza_valor(texto) == esperado
+
+    def test_padroniza_valor_texto_longo_sem_cache(self):
+        texto = 'Experiência em Gestão ' * 20
+
+        assert padroniza_valor(texto) == 'experiencia em gestao ' * 19 + 'experiencia em gestao'
+
+    def test_padroniza_texto_valores_nao_texto(self):
+        df = pd.DataFrame({'text': pd.Series([None, np.nan, 5, 1.5, ' Ação '], dtype=object)})
+
+        padroniza_texto(df, ['text'])
+
+        assert df['text'].tolist() == ['None', 'nan', 'nan', 'nan', 'acao']
+
+    def test_padroniza_valores_igual_ao_dataframe(self):
+        valores = ['  HELLO World!  ', None, 'Ação', 7, 'ﬁ²']
+        df = pd.DataFrame({'text': pd.Series(valores, dtype=object)})
+
+        padroniza_texto(df, ['text'])
+
+        assert padroniza_valores(valores) == df['text'].tolist()
+
 @pytest.mark.unit
 class TestDocumentVector:
     def test_document_vector_valid_text(self, mock_word2vec_model):
@@ -113,6 +165,25 @@ class TestExpandVector:
         assert all(col in result.columns for col in expected_columns)
         assert len(result) == 2  # Duas linhas no resultado
 
+@pytest.mark.unit
+class TestDocumentVectorMatrix:
+    def test_document_vector_matrix_shape(self):
+        mock_model = MagicMock()
+        mock_model.key_to_index = {'test': 0, 'word': 1}
+        mock_model.__getitem__.side_effect = lambda x: np.array([1.0, 2.0, 3.0]) if x == 'test' else np.array([3.0, 2.0, 1.0])
+
+        result = document_vector_matrix(['test word', '', 'test'], mock_model, 3)
+
+        assert result.shape == (3, 3)
+        np.testing.assert_array_equal(result[0], [2.0, 2.0, 2.0])
+        np.testing.assert_array_equal(result[1], [0.0, 0.0, 0.0])
+        np.testing.assert_array_equal(result[2], [1.0, 2.0, 3.0])
+
+    def test_document_vector_matrix_empty(self):
+        result = document_vector_matrix([], MagicMock(), 3)
+
+        assert result.shape == (0, 3)
+
 class TestNivelIdioma:
     def test_nivel_idioma_encoding(self):
         df = pd.DataFrame({
@@ -176,6 +247,38 @@ class TestMapearSenioridade:
         assert result.iloc[5] == 0  # Trainee
         assert result.iloc[6] == -1  # Desconhecido
 
+    def test_classifica_senioridade_igual_a_serie(self):
+        cargos = ['Desenvolvedor Júnior', 'Analista Sênior', 'Gerente de Projetos',
+                  'Consultor SR', 'Analista II', 'Trainee', 'Cargo Desconhecido', '']
+
+        esperado = mapear_senioridade(pd.Series(cargos)).tolist()
+
+        assert [classifica_senioridade(cargo) for cargo in cargos] == esperado
+
+    @pytest.mark.parametrize('cargo, esperado', [
+        ('Analista Júnior / Coordenador', 5),   # maior precedência vence, não a primeira ocorrência
+        ('Jr - Especialista SAP', 4),
+        ('Liderança técnica', 5),                # 'lider' casa dentro da palavra
+        ('Consultora Pleno', 4),                 # 'consultor' casa dentro da palavra
+        ('Analista III', 3),
+        ('Analista I_II', -1),                   # '_' é caractere de palavra
+        ('Auxiliar (II)', 2),
+        ('assistente técnico', -1),
+        (None, -1),
+        (3, -1),
+    ])
+    def test_classifica_senioridade_precedencia(self, cargo, esperado):
+        assert classifica_senioridade(cargo) == esperado
+
+    def test_mapear_senioridade_preserva_indice_e_nulos(self):
+        series = pd.Series(['Gerente', None, 'Gerente', np.nan, 'Pleno'], index=[10, 11, 12, 13, 14])
+
+        result = mapear_senioridade(series)
+
+        assert result.index.tolist() == [10, 11, 12, 13, 14]
+        assert result.tolist() == [5, -1, 5, -1, 2]
+        assert result.dtype == np.int64
+
 @pytest.mark.unit
 class TestSimilaridade:
     def test_similaridade_calculation(self):
@@ -194,6 +297,14 @@ class TestSimilaridade:
         # Valores devem estar entre -1 e 1 para similaridade cosseno
         assert all(-1 <= val <= 1 for val in df['similarity'])
 
+    def test_cosine_similarity_rows_zero_vector(self):
+        vec_a = np.array([[1.0, 0.0], [0.0, 0.0]])
+        vec_b = np.array([[1.0, 0.0], [1.0, 1.0]])
+
+        result = cosine_similarity_rows(vec_a, vec_b)
+
+        np.testing.assert_array_almost_equal(result, [1.0, 0.0])
+
 @pytest.mark.unit
 class TestEvaluation:
     @patch('src.models.utils.mean_squared_error')
@@ -0,0 +1,102 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.features.vacancy_cache import VacancyFeatureCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    cache = VacancyFeatureCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.events = []
+    cache.listener = lambda event, reason: cache.events.append((event, reason))
+    return cache
+
+
+def build_block(payload):
+    (vacancy_id, record), = payload.items()
+    if 'titulo' not in record:
+        return None
+    return {'id': vacancy_id, 'titulo': record['titulo']}
+
+
+@pytest.mark.unit
+class TestVacancyFeatureCache:
+    """Testes para o cache LRU + TTL de blocos de vagas."""
+
+    def test_hit_e_miss(self, cache):
+        assert cache.get('1') is None
+        cache.put('1', 'h', {'x': 1})
+
+        assert cache.get('1') == {'x': 1}
+        assert cache.events == [('miss', None), ('put', None), ('hit', None)]
+        assert cache.stats['hit'] == 1 and cache.stats['miss'] == 1
+
+    def test_hash_diferente_e_miss(self, cache):
+        cache.put('1', 'h1', {'x': 1})
+
+        assert cache.get('1', 'h2') is None
+        assert cache.get('1', 'h1') == {'x': 1}
+
+    def test_expiracao(self, cache, clock):
+        cache.put('1', 'h', {'x': 1})
+        clock.now = 10
+
+        assert cache.get('1') is None
+        assert len(cache) == 0
+        assert ('eviction', 'expired') in cache.events
+
+    def test_remove_menos_usado(self, cache):
+        cache.put('1', 'h', {'x': 1})
+        cache.put('2', 'h', {'x': 2})
+        cache.get('1')
+        cache.put('3', 'h', {'x': 3})
+
+        assert cache.get('2') is None
+        assert cache.get('1') == {'x': 1}
+        assert cache.stats['capacity'] == 1
+
+    def test_get_or_build_so_recalcula_se_mudou(self, cache):
+        chamadas = []
+
+        def builder(payload):
+            chamadas.append(payload)
+            return build_block(payload)
+
+        primeiro = cache.get_or_build('7', {'titulo': 'Analista'}, builder)
+        segundo = cache.get_or_build('7', {'titulo': 'Analista'}, builder)
+        terceiro = cache.get_or_build('7', {'titulo': 'Gerente'}, builder)
+
+        assert primeiro is segundo
+        assert terceiro['titulo'] == 'Gerente'
+        assert chamadas == [{'7': {'titulo': 'Analista'}}, {'7': {'titulo': 'Gerente'}}]
+
+    def test_registro_nao_suportado_nao_e_guardado(self, cache):
+        assert cache.get_or_build('7', {'outro': 'x'}, build_block) is None
+        assert len(cache) == 0
+
+    def test_invalidate(self, cache):
+        cache.put('1', 'h', {'x': 1})
+
+        assert cache.invalidate('1')
+        assert not cache.invalidate('1')
+
+    @pytest.mark.parametrize('max_size, ttl', [(0, 10), (1, 0)])
+    def test_parametros_invalidos(self, max_size, ttl):
+        with pytest.raises(ValueError):
+            VacancyFeatureCache(max_size=max_size, ttl_seconds=ttl)
@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.word2vec_store import (
+    caminho_binario,
+    carregar_word2vec,
+    converter_para_binario
+)
+
+
+@pytest.fixture
+def w2v_text_file(tmp_path):
+    """Cria um modelo Word2Vec pequeno no formato texto."""
+    rng = np.random.default_rng(42)
+    words = ['python', 'dados', 'analista', 'java']
+    vectors = rng.normal(size=(len(words), 5)).astype(np.float32)
+    path = tmp_path / 'modelo.txt'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"{len(words)} 5\n")
+        for word, vector in zip(words, vectors):
+            f.write(word + ' ' + ' '.join(f'{v:.6f}' for v in vector) + '\n')
+    return path
+
+
+@pytest.mark.unit
+class TestWord2VecStore:
+    """Testes para a conversão e carga binária do Word2Vec."""
+
+    def test_converter_gera_matriz_float32(self, w2v_text_file):
+        output = converter_para_binario(w2v_text_file)
+
+        assert output == caminho_binario(w2v_text_file)
+        assert output.exists()
+        assert output.with_name(output.name + '.vectors.npy').exists()
+
+    def test_carga_binaria_usa_memory_map(self, w2v_text_file):
+        texto = carregar_word2vec(w2v_text_file, 'text')
+        output = converter_para_binario(w2v_text_file)
+
+        binario = carregar_word2vec(output, 'binary')
+
+        assert isinstance(binario.vectors, np.memmap)
+        assert binario.vectors.dtype == np.float32
+        assert not binario.vectors.flags.writeable
+        assert binario.index_to_key == texto.index_to_key
+        np.testing.assert_array_equal(binario['python'], texto['python'])
+
+    def test_auto_prefere_binario_existente(self, w2v_text_file):
+        converter_para_binario(w2v_text_file)
+
+        model = carregar_word2vec(w2v_text_file, 'auto')
+
+        assert isinstance(model.vectors, np.memmap)
+
+    def test_auto_sem_binario_usa_texto(self, w2v_text_file):
+        model = carregar_word2vec(w2v_text_file, 'auto')
+
+        assert not isinstance(model.vectors, np.memmap)
+        assert model.vector_size == 5
+
+    def test_formato_invalido(self, w2v_text_file):
+        with pytest.raises(ValueError):
+            carregar_word2vec(w2v_text_file, 'pickle')